@@ -0,0 +1,270 @@
+"""
+Bulk activity-date resolution for the cleanup phases.
+
+media_processor.get_activity_date_with_hierarchy() answers one series at a
+time: config.json, then up to three Tautulli title searches, then two Sonarr
+calls (episodefile + episode) for the newest file. The dormant and grace
+phases walk every tracked series each cycle, so a library with a few hundred
+series lacking watch history turned every cleanup into hundreds of
+sequential HTTP round trips.
+
+ActivityDateResolver keeps the same precedence but front-loads the external
+sources: the first time a series misses in config it pulls the Tautulli
+episode history (paged, newest first, grouped by grandparent_rating_key) and
+Sonarr's import history once, builds series -> (ts, season, episode) maps,
+and answers every later candidate from memory. run_unified_cleanup builds
+one resolver per cycle and hands it to all three phases.
+
+Sonarr has no all-series episodefile listing, so the newest file per series
+comes from the downloadFolderImported history. Only imports whose episode
+still has a file count - files removed since (cleanup deletes plenty) are
+not on disk any more. Series with no such import in the retained history
+fall back to get_sonarr_latest_file_date().
+"""
+
+import logging
+import re
+import threading
+
+import config_store
+from episeerr_utils import http
+
+logger = logging.getLogger(__name__)
+cleanup_logger = logging.getLogger('cleanup')
+
+TAUTULLI_HISTORY_PAGE_SIZE = 1000
+TAUTULLI_HISTORY_MAX_PAGES = 25
+SONARR_HISTORY_PAGE_SIZE = 1000
+SONARR_HISTORY_MAX_PAGES = 10
+SONARR_EVENT_DOWNLOAD_FOLDER_IMPORTED = 3
+
+
+def normalize_show_title(title):
+    """Lowercase, drop a trailing (year) and punctuation - the title match
+    get_tautulli_last_watched() has always used."""
+    title = (title or '').lower()
+    title = re.sub(r'\s*\(\d{4}\)', '', title)  # Remove year
+    title = re.sub(r'[^\w\s]', ' ', title)      # Remove special chars
+    return ' '.join(title.split())
+
+
+def _media_processor():
+    # Resolved per call: episeerr.reload_module_configs() swaps the module
+    # out (and with it SONARR_URL / SONARR_API_KEY) when settings change.
+    import media_processor
+    return media_processor
+
+
+class ActivityDateResolver:
+    """get_activity_date_with_hierarchy() for a whole cleanup cycle.
+
+    series_lookup is the {series_id: sonarr_series} map the cleanup cycle
+    already fetched. Bulk loads are lazy - a cycle where config answers
+    everything makes no Tautulli or Sonarr history calls at all.
+    """
+
+    def __init__(self, series_lookup):
+        self.series_lookup = series_lookup or {}
+        self._lock = threading.Lock()
+        self._wanted = None
+        self._tautulli = None   # normalized title -> (ts, season, episode, title)
+        self._imports = None    # series_id -> (ts, season, episode)
+        self._fallback = {}     # series_id -> (ts, season, episode) or None
+        self.stats = {'config': 0, 'tautulli': 0, 'sonarr': 0, 'none': 0}
+
+    def _wanted_series(self):
+        """Tracked series config can't fully answer - once the bulk loaders
+        have seen all of them they stop paging."""
+        if self._wanted is None:
+            wanted = set()
+            for sid, (_, entry) in config_store.series_index().items():
+                try:
+                    series_id = int(sid)
+                except (TypeError, ValueError):
+                    continue
+                if series_id not in self.series_lookup:
+                    continue
+                entry = entry if isinstance(entry, dict) else {}
+                if not (entry.get('activity_date') and entry.get('last_season') and entry.get('last_episode')):
+                    wanted.add(series_id)
+            self._wanted = wanted
+        return self._wanted
+
+    def _load_tautulli(self):
+        tautulli_url, tautulli_api_key = _media_processor().get_tautulli_settings()
+        if not tautulli_url or not tautulli_api_key:
+            return {}
+
+        wanted_titles = {
+            normalize_show_title(self.series_lookup[sid].get('title'))
+            for sid in self._wanted_series()
+        }
+        wanted_titles.discard('')
+        latest_by_key = {}
+        pages = 0
+        try:
+            for page in range(TAUTULLI_HISTORY_MAX_PAGES):
+                params = {
+                    'apikey': tautulli_api_key,
+                    'cmd': 'get_history',
+                    'media_type': 'episode',
+                    'order_column': 'date',
+                    'order_dir': 'desc',
+                    'start': page * TAUTULLI_HISTORY_PAGE_SIZE,
+                    'length': TAUTULLI_HISTORY_PAGE_SIZE,
+                }
+                response = http.get(f"{tautulli_url}/api/v2", params=params, timeout=30)
+                if not response.ok:
+                    logger.warning(f"Tautulli history page {page} failed: {response.status_code}")
+                    break
+                body = response.json().get('response', {})
+                if body.get('result') != 'success':
+                    break
+                data = body.get('data') or {}
+                rows = data.get('data') or []
+                pages += 1
+
+                for row in rows:
+                    try:
+                        timestamp = int(row.get('date') or 0)
+                    except (TypeError, ValueError):
+                        continue
+                    key = row.get('grandparent_rating_key') or row.get('grandparent_title')
+                    if not timestamp or not key:
+                        continue
+                    if key in latest_by_key and latest_by_key[key][0] >= timestamp:
+                        continue
+                    try:
+                        season = int(row.get('parent_media_index') or 0) or None
+                        episode = int(row.get('media_index') or 0) or None
+                    except (TypeError, ValueError):
+                        season = episode = None
+                    latest_by_key[key] = (timestamp, season, episode, row.get('grandparent_title') or '')
+
+                seen = {normalize_show_title(v[3]) for v in latest_by_key.values()}
+                if wanted_titles <= seen:
+                    break
+                total = data.get('recordsFiltered') or data.get('recordsTotal') or 0
+                if len(rows) < TAUTULLI_HISTORY_PAGE_SIZE or (page + 1) * TAUTULLI_HISTORY_PAGE_SIZE >= total:
+                    break
+        except Exception as e:
+            logger.error(f"Error loading Tautulli history for activity dates: {str(e)}")
+
+        by_title = {}
+        for timestamp, season, episode, title in latest_by_key.values():
+            normalized = normalize_show_title(title)
+            if normalized and (normalized not in by_title or by_title[normalized][0] < timestamp):
+                by_title[normalized] = (timestamp, season, episode, title)
+        logger.info(f"Loaded Tautulli history for {len(by_title)} shows in {pages} page(s)")
+        return by_title
+
+    def _load_sonarr_imports(self):
+        mp = _media_processor()
+        wanted = self._wanted_series()
+        headers = {'X-Api-Key': mp.SONARR_API_KEY}
+        imports = {}
+        pages = 0
+        try:
+            for page in range(1, SONARR_HISTORY_MAX_PAGES + 1):
+                params = {
+                    'page': page,
+                    'pageSize': SONARR_HISTORY_PAGE_SIZE,
+                    'sortKey': 'date',
+                    'sortDirection': 'descending',
+                    'eventType': SONARR_EVENT_DOWNLOAD_FOLDER_IMPORTED,
+                    'includeEpisode': 'true',
+                }
+                response = http.get(f"{mp.SONARR_URL}/api/v3/history", headers=headers, params=params, timeout=30)
+                if not response.ok:
+                    logger.warning(f"Sonarr history page {page} failed: {response.status_code}")
+                    break
+                data = response.json()
+                records = data.get('records') or []
+                pages += 1
+
+                for record in records:
+                    series_id = record.get('seriesId')
+                    if series_id is None or series_id in imports:
+                        continue  # newest first - first hit per series wins
+                    episode = record.get('episode') or {}
+                    if not episode.get('hasFile'):
+                        continue  # file deleted since (e.g. by cleanup) - not the newest file on disk
+                    timestamp = mp.parse_date_fixed(record.get('date') or '', f"import {record.get('id')}")
+                    if not timestamp:
+                        continue
+                    imports[series_id] = (timestamp, episode.get('seasonNumber'), episode.get('episodeNumber'))
+
+                if wanted <= imports.keys():
+                    break
+                if len(records) < SONARR_HISTORY_PAGE_SIZE or page * SONARR_HISTORY_PAGE_SIZE >= (data.get('totalRecords') or 0):
+                    break
+        except Exception as e:
+            logger.error(f"Error loading Sonarr import history for activity dates: {str(e)}")
+        logger.info(f"Loaded Sonarr import history for {len(imports)} series in {pages} page(s)")
+        return imports
+
+    def _tautulli_match(self, series_title):
+        with self._lock:
+            if self._tautulli is None:
+                self._tautulli = self._load_tautulli()
+        normalized = normalize_show_title(series_title)
+        if not normalized:
+            return None
+        hit = self._tautulli.get(normalized)
+        if hit:
+            return hit
+        # Same containment match get_tautulli_last_watched() accepts
+        loose = [v for k, v in self._tautulli.items() if k in normalized or normalized in k]
+        return max(loose, key=lambda v: v[0]) if loose else None
+
+    def _sonarr_latest(self, series_id):
+        with self._lock:
+            if self._imports is None:
+                self._imports = self._load_sonarr_imports()
+        hit = self._imports.get(series_id)
+        if hit and hit[1] is not None and hit[2] is not None:
+            return hit
+        if series_id not in self._fallback:
+            result = _media_processor().get_sonarr_latest_file_date(series_id)
+            self._fallback[series_id] = result[:3] if result else None
+        return self._fallback[series_id]
+
+    def resolve(self, series_id, series_title=None, return_complete=False):
+        """Drop-in for get_activity_date_with_hierarchy(series_id, series_title, return_complete)."""
+        _, series_data = config_store.get_series_entry(series_id)
+        if isinstance(series_data, dict) and series_data.get('activity_date'):
+            activity_date = series_data['activity_date']
+            if not return_complete:
+                self.stats['config'] += 1
+                return activity_date
+            if series_data.get('last_season') and series_data.get('last_episode'):
+                self.stats['config'] += 1
+                return activity_date, series_data['last_season'], series_data['last_episode']
+
+        if not series_title:
+            series_title = (self.series_lookup.get(series_id) or {}).get('title')
+
+        if series_title:
+            hit = self._tautulli_match(series_title)  # empty map if Tautulli isn't configured
+            if hit:
+                timestamp, season, episode, _ = hit
+                self.stats['tautulli'] += 1
+                if return_complete:
+                    return timestamp, season or 1, episode or 1
+                return timestamp
+
+        hit = self._sonarr_latest(series_id)
+        if hit:
+            self.stats['sonarr'] += 1
+            return hit if return_complete else hit[0]
+
+        self.stats['none'] += 1
+        if return_complete:
+            return None, None, None
+        return None
+
+    def log_summary(self):
+        cleanup_logger.info(
+            f"📊 Activity dates: {self.stats['config']} config, {self.stats['tautulli']} Tautulli, "
+            f"{self.stats['sonarr']} Sonarr, {self.stats['none']} unresolved"
+        )
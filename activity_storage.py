@@ -1,82 +1,222 @@
 """
 Activity Storage Module - WITH BACKDROP SUPPORT + REQUEST SAVING
 Logs watch events, search events, and requests with backdrop images
+
+Watch and search events go to append-only JSONL logs (one event per line)
+instead of JSON arrays that were re-read, filtered and rewritten on every
+event. Each log keeps the recent events in a bounded in-memory ring plus
+the latest event per series, per (series, user) and per series title, so
+the dashboard, unified search and the activity cards read memory instead
+of reparsing files. Lines older than RETENTION_DAYS are dropped by an
+occasional compaction (temp file + rename). An existing searches.json /
+watched.json is migrated on first use.
+
+Backdrops come from series_artwork's cache; only a series' first event
+waits on one Sonarr lookup.
 """
 
 import json
 import os
 import time
 import logging
-import requests
+import threading
+from collections import deque
 
+import dashboard_snapshots
+import series_artwork
 from logging_config import main_logger as logger
 
 ACTIVITY_DIR = '/app/data/activity'
 os.makedirs(ACTIVITY_DIR, exist_ok=True)
 
-SEARCHES_FILE = os.path.join(ACTIVITY_DIR, 'searches.json')
-WATCHES_FILE = os.path.join(ACTIVITY_DIR, 'watched.json')
+SEARCHES_FILE = os.path.join(ACTIVITY_DIR, 'searches.jsonl')
+WATCHES_FILE = os.path.join(ACTIVITY_DIR, 'watched.jsonl')
 REQUESTS_FILE = os.path.join(ACTIVITY_DIR, 'last_request.json')
 
-# Sonarr API settings (will be loaded from config)
+# Pre-JSONL array files, migrated on first load
+LEGACY_SEARCHES_FILE = os.path.join(ACTIVITY_DIR, 'searches.json')
+LEGACY_WATCHES_FILE = os.path.join(ACTIVITY_DIR, 'watched.json')
+
+RETENTION_DAYS = 7
+RING_SIZE = 2000                 # recent events held in memory per log
+COMPACT_EVERY = 500              # appends between compactions
+COMPACT_INTERVAL = 6 * 60 * 60   # ...or seconds, whichever comes first
+
+# Sonarr API settings (kept for callers; artwork comes from series_artwork)
 SONARR_URL = None
 SONARR_API_KEY = None
 
+
+def _stat_sig(path):
+    try:
+        st = os.stat(path)
+        return (st.st_mtime_ns, st.st_size)
+    except OSError:
+        return None
+
+
+class ActivityLog:
+    """One append-only event log plus its in-memory views.
+
+    Loaded lazily and re-loaded when the file changed under us (an external
+    edit or another process); our own appends keep the signature current.
+    """
+
+    def __init__(self, path_attr, legacy_attr):
+        # Paths are looked up on the module so they can be repointed
+        self.path_attr = path_attr
+        self.legacy_attr = legacy_attr
+        self.lock = threading.Lock()
+        self.path = None
+        self.sig = None
+        self.events = deque(maxlen=RING_SIZE)   # oldest -> newest
+        self.by_series = {}
+        self.by_series_user = {}
+        self.by_title = {}
+        self.appends = 0
+        self.compacted_at = 0
+
+    def _index(self, event):
+        self.events.append(event)
+        ts = event.get('timestamp', 0)
+        keys = ((self.by_series, event.get('series_id')),
+                (self.by_series_user, (event.get('series_id'), event.get('user'))),
+                (self.by_title, (event.get('series_title') or '').lower()))
+        for index, key in keys:
+            if key in (None, '', (None, None)):
+                continue
+            current = index.get(key)
+            if current is None or ts >= current.get('timestamp', 0):
+                index[key] = event
+
+    def _reset(self):
+        self.events = deque(maxlen=RING_SIZE)
+        self.by_series = {}
+        self.by_series_user = {}
+        self.by_title = {}
+
+    def _read_file(self):
+        events = []
+        try:
+            with open(self.path, 'r') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        events.append(json.loads(line))
+                    except ValueError:
+                        logger.debug(f"Skipping unreadable line in {self.path}")
+        except FileNotFoundError:
+            pass
+        return events
+
+    def _migrate_legacy(self):
+        legacy = globals()[self.legacy_attr]
+        if os.path.exists(self.path) or not os.path.exists(legacy):
+            return
+        try:
+            with open(legacy, 'r') as f:
+                events = json.load(f)
+            self._write_all(sorted(events, key=lambda e: e.get('timestamp', 0)))
+            os.replace(legacy, legacy + '.migrated')
+            logger.info(f"Migrated {len(events)} events from {legacy} to {self.path}")
+        except Exception as e:
+            logger.error(f"Failed to migrate {legacy}: {e}")
+
+    def _write_all(self, events):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            for event in events:
+                f.write(json.dumps(event) + '\n')
+        os.replace(tmp_path, self.path)
+
+    def _ensure_loaded(self):
+        """Caller holds self.lock."""
+        path = globals()[self.path_attr]
+        if path == self.path and _stat_sig(path) == self.sig:
+            return
+        self.path = path
+        self._migrate_legacy()
+        cutoff = time.time() - RETENTION_DAYS * 86400
+        events = [e for e in self._read_file() if e.get('timestamp', 0) > cutoff]
+        events.sort(key=lambda e: e.get('timestamp', 0))
+        self._reset()
+        for event in events:
+            self._index(event)
+        self.sig = _stat_sig(path)
+
+    def _compact(self):
+        """Rewrite the log without expired lines. Caller holds self.lock."""
+        cutoff = time.time() - RETENTION_DAYS * 86400
+        events = self._read_file()
+        kept = [e for e in events if e.get('timestamp', 0) > cutoff]
+        if len(kept) != len(events):
+            self._write_all(kept)
+            logger.debug(f"Compacted {self.path}: {len(events)} -> {len(kept)} events")
+        # Expired events also leave the in-memory views
+        if self.events and self.events[0].get('timestamp', 0) <= cutoff:
+            self._reset()
+            for event in sorted(kept, key=lambda e: e.get('timestamp', 0)):
+                self._index(event)
+        self.appends = 0
+        self.compacted_at = time.time()
+        self.sig = _stat_sig(self.path)
+
+    def append(self, event):
+        with self.lock:
+            self._ensure_loaded()
+            with open(self.path, 'a') as f:
+                f.write(json.dumps(event) + '\n')
+            self.sig = _stat_sig(self.path)
+            self._index(event)
+            self.appends += 1
+            if self.appends >= COMPACT_EVERY or time.time() - self.compacted_at > COMPACT_INTERVAL:
+                self._compact()
+
+    def recent(self, limit=None):
+        """Copies of the events, newest first (at most RING_SIZE)."""
+        with self.lock:
+            self._ensure_loaded()
+            events = list(reversed(self.events))
+        return [dict(ev) for ev in (events[:limit] if limit else events)]
+
+    def latest(self):
+        with self.lock:
+            self._ensure_loaded()
+            return dict(self.events[-1]) if self.events else None
+
+    def latest_by(self, key):
+        """Copy of one latest-event index: 'series', 'series_user' or 'title'."""
+        with self.lock:
+            self._ensure_loaded()
+            index = {'series': self.by_series,
+                     'series_user': self.by_series_user,
+                     'title': self.by_title}[key]
+            return {k: dict(ev) for k, ev in index.items()}
+
+
+searches = ActivityLog('SEARCHES_FILE', 'LEGACY_SEARCHES_FILE')
+watches = ActivityLog('WATCHES_FILE', 'LEGACY_WATCHES_FILE')
+
+
 def init_sonarr_config(url, api_key):
-    """Initialize Sonarr config for backdrop fetching"""
+    """Record the Sonarr config activity events are logged against"""
     global SONARR_URL, SONARR_API_KEY
     SONARR_URL = url
     SONARR_API_KEY = api_key
     logger.info("✅ Activity storage initialized with Sonarr config")
 
 def get_series_backdrop(series_id):
-    """Fetch backdrop path from Sonarr series data"""
+    """Fanart/banner URL for a series - cached; a first sighting fetches the series once"""
     try:
-        if not SONARR_URL or not SONARR_API_KEY:
-            logger.debug("Sonarr config not initialized, skipping backdrop fetch")
-            return None
-            
-        url = f"{SONARR_URL}/api/v3/series/{series_id}"
-        headers = {'X-Api-Key': SONARR_API_KEY}
-        response = requests.get(url, headers=headers, timeout=5)
-        
-        if response.ok:
-            series_data = response.json()
-            # Get fanart/backdrop image
-            for image in series_data.get('images', []):
-                if image.get('coverType') in ['fanart', 'banner']:
-                    backdrop_url = image.get('remoteUrl')
-                    logger.debug(f"Found backdrop for series {series_id}: {backdrop_url}")
-                    return backdrop_url
-            logger.debug(f"No fanart/banner found for series {series_id}")
-        else:
-            logger.debug(f"Failed to get series {series_id}: {response.status_code}")
-        return None
+        return series_artwork.get_backdrop(series_id)
     except Exception as e:
         logger.debug(f"Could not get backdrop for series {series_id}: {e}")
         return None
 
-def save_search_event(series_id, series_title, season, episode, episode_ids):
-    """Save when Sonarr searches for episodes"""
-    # Get backdrop instead of poster
-    backdrop_url = get_series_backdrop(series_id)
-    
-    event = {
-        'series_id': series_id,
-        'series_title': series_title,
-        'season': season,
-        'episode': episode,
-        'episode_ids': episode_ids,
-        'backdrop_url': backdrop_url,
-        'timestamp': int(time.time())
-    }
-    _append_to_activity_log(SEARCHES_FILE, event, max_entries=10)
-    logger.info(f"📝 Logged search event: {series_title} S{season}E{episode}")
-
 def save_watch_event(series_id, series_title, season, episode, user):
-    """Save when user watches an episode (with 7-day auto-cleanup)"""
-    from datetime import datetime
-    
+    """Save when user watches an episode (kept for RETENTION_DAYS)"""
     # Get backdrop instead of poster
     backdrop_url = get_series_backdrop(series_id)
     
@@ -90,8 +230,9 @@ def save_watch_event(series_id, series_title, season, episode, user):
         'timestamp': int(time.time())
     }
     
-    # Modified append with 7-day cleanup instead of max_entries
-    _append_to_activity_log_with_cleanup(WATCHES_FILE, event, days=7)
+    _append_event(watches, event)
+    # The dashboard calendar hides watched downloads
+    dashboard_snapshots.invalidate('calendar')
     logger.info(f"📝 Logged watch event: {series_title} S{season}E{episode} by {user}")
 def save_request_event(request_data):
     """Save Jellyseerr request before file is deleted"""
@@ -116,9 +257,7 @@ def save_request_event(request_data):
         logger.error(f"Failed to save request event: {e}")
         
 def save_search_event(series_id, series_title, season, episode, episode_ids):
-    """Save when Sonarr searches for episodes (with 7-day auto-cleanup)"""
-    from datetime import datetime
-    
+    """Save when Sonarr searches for episodes (kept for RETENTION_DAYS)"""
     # Get backdrop instead of poster
     backdrop_url = get_series_backdrop(series_id)
     
@@ -132,46 +271,40 @@ def save_search_event(series_id, series_title, season, episode, episode_ids):
         'timestamp': int(time.time())
     }
     
-    # Modified append with 7-day cleanup instead of max_entries
-    _append_to_activity_log_with_cleanup(SEARCHES_FILE, event, days=7)
+    _append_event(searches, event)
     logger.info(f"📝 Logged search event: {series_title} S{season}E{episode}")
 
-# ADD THIS NEW HELPER FUNCTION (after the existing _append_to_activity_log)
-
-def _append_to_activity_log_with_cleanup(filepath, event, days=7):
-    """Helper to append event and auto-cleanup entries older than N days"""
+def _append_event(log, event):
+    """Helper to append an event to one of the activity logs"""
     try:
-        from datetime import datetime
-        
-        if os.path.exists(filepath):
-            with open(filepath, 'r') as f:
-                events = json.load(f)
-        else:
-            events = []
-        
-        # Add new event
-        events.append(event)
-        
-        # Auto-cleanup: keep only last N days
-        cutoff = datetime.now().timestamp() - (days * 24 * 60 * 60)
-        events = [e for e in events if e.get('timestamp', 0) > cutoff]
-        
-        with open(filepath, 'w') as f:
-            json.dump(events, f, indent=2)
-            
+        log.append(event)
     except Exception as e:
         logger.error(f"Failed to save activity: {e}")
 
 
-
-
 def get_last_search():
     """Get most recent search event"""
-    return _get_last_event(SEARCHES_FILE)
+    return _get_last_event(searches)
 
 def get_last_watch():
     """Get most recent watch event"""
-    return _get_last_event(WATCHES_FILE)
+    return _get_last_event(watches)
+
+def get_recent_searches(limit=None):
+    """Recent search events, newest first"""
+    return searches.recent(limit)
+
+def get_recent_watches(limit=None):
+    """Recent watch events, newest first"""
+    return watches.recent(limit)
+
+def get_latest_watches_by_title():
+    """{lowercased series title: most recent watch event}"""
+    return watches.latest_by('title')
+
+def get_latest_watches_by_series_user():
+    """{(series_id, user): most recent watch event}"""
+    return watches.latest_by('series_user')
 
 def get_last_request():
     """Get most recent Overseerr request"""
@@ -186,17 +319,10 @@ def get_last_request():
         logger.error(f"Failed to get last request: {e}")
         return None
 
-def _get_last_event(filepath):
+def _get_last_event(log):
     """Helper to get most recent event from log"""
     try:
-        if not os.path.exists(filepath):
-            return None
-        
-        with open(filepath, 'r') as f:
-            events = json.load(f)
-        
-        return events[0] if events else None
-        
+        return log.latest()
     except Exception as e:
         logger.error(f"Failed to read activity log: {e}")
-        return None
\ No newline at end of file
+        return None
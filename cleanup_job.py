@@ -0,0 +1,208 @@
+"""
+In-process cleanup job.
+
+Scheduled and manual cleanups used to run `python3 media_processor.py` with
+capture_output=True: a fresh interpreter re-importing everything, re-reading
+settings and config from disk and opening new HTTP connections, with no way
+to see how far it had got and no way to stop it short of killing the
+process. The scheduler and /api/force-cleanup now hand cleanup to this
+module, which runs media_processor.run_cleanup_in_process() on a dedicated
+"cleanup-job" thread inside the web process - so it shares the pooled
+session in episeerr_utils.http and config_store's in-memory document.
+
+Only one cleanup runs at a time; asking for another while one is running
+returns the running job. media_processor reports progress through
+set_phase() / start_items() / advance() / add_bytes_freed() and polls
+cancel_requested() between series. All of these are no-ops when no job is
+active (a CLI `python3 media_processor.py` run), so the phases don't need to
+know who called them.
+
+Cancelling is cooperative: series already being deleted finish, series not
+yet reached are deferred on the cleanup pass, and the remaining phases are
+skipped. A cancelled cycle records no incremental cleanup state.
+"""
+
+import logging
+import threading
+import time
+import uuid
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+MAX_JOB_HISTORY = 10
+
+
+class CleanupJob:
+    """One cleanup run.
+
+    status: running -> done | failed | cancelled, or skipped when automation
+    is held. processed/total count series in the current phase; ETA is
+    projected from the phase's own rate, since phases differ wildly in cost.
+    """
+
+    def __init__(self, trigger):
+        self.job_id = uuid.uuid4().hex[:12]
+        self.trigger = trigger
+        self.status = 'running'
+        self.result = None
+        self.error = None
+        self.started_at = time.time()
+        self.finished_at = None
+        self.phase = None
+        self.phase_started_at = None
+        self.phases = []
+        self.processed = 0
+        self.total = None
+        self.bytes_freed = 0
+        self.cancel_event = threading.Event()
+        self.done_event = threading.Event()
+
+    def eta_seconds(self):
+        if not self.total or not self.processed or self.finished_at:
+            return None
+        elapsed = time.time() - self.phase_started_at
+        return round(elapsed / self.processed * (self.total - self.processed), 1)
+
+    def to_dict(self):
+        end = self.finished_at or time.time()
+        return {
+            'job_id': self.job_id,
+            'trigger': self.trigger,
+            'status': self.status,
+            'cancel_requested': self.cancel_event.is_set(),
+            'result': self.result,
+            'error': self.error,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'elapsed_seconds': round(end - self.started_at, 1),
+            'phase': self.phase,
+            'phases_completed': list(self.phases),
+            'series_processed': self.processed,
+            'series_total': self.total,
+            'eta_seconds': self.eta_seconds(),
+            'bytes_freed': self.bytes_freed,
+            'gb_freed': round(self.bytes_freed / (1024 ** 3), 2),
+        }
+
+
+_current = None
+_history = deque(maxlen=MAX_JOB_HISTORY)
+_lock = threading.Lock()
+
+
+def _run(job):
+    # Resolved per run rather than at import: episeerr.reload_module_configs()
+    # swaps the media_processor module out when settings change.
+    global _current
+    try:
+        import media_processor
+        job.result = media_processor.run_cleanup_in_process()
+        if job.result is None:
+            job.status = 'skipped'
+        elif job.cancel_event.is_set():
+            job.status = 'cancelled'
+        else:
+            job.status = 'done'
+    except Exception as e:
+        job.status = 'failed'
+        job.error = str(e)
+        logger.error(f"Cleanup job {job.job_id} failed: {e}", exc_info=True)
+    finally:
+        with _lock:
+            job.finished_at = time.time()
+            if job.phase:
+                job.phases.append(job.phase)
+            job.phase = None
+            _current = None
+            _history.appendleft(job)
+        job.done_event.set()
+
+    logger.info(f"Cleanup job {job.job_id} [{job.trigger}]: {job.status} in "
+                f"{job.finished_at - job.started_at:.1f}s, {job.bytes_freed / (1024 ** 3):.2f}GB freed")
+
+
+def start(trigger='manual'):
+    """Start a cleanup on the cleanup-job thread unless one is running.
+
+    Returns (job, started) - started is False when the returned job is one
+    that was already in progress.
+    """
+    global _current
+    with _lock:
+        if _current is not None:
+            return _current, False
+        job = CleanupJob(trigger)
+        _current = job
+    threading.Thread(target=_run, args=(job,), name='cleanup-job', daemon=True).start()
+    logger.info(f"Started cleanup job {job.job_id} [{trigger}]")
+    return job, True
+
+
+def run(trigger='scheduled'):
+    """Start (or join) a cleanup and block until it finishes."""
+    job, _ = start(trigger)
+    job.done_event.wait()
+    return job
+
+
+def cancel():
+    """Ask the running cleanup to stop. Returns its job, or None if idle."""
+    with _lock:
+        job = _current
+    if job is not None:
+        job.cancel_event.set()
+        logger.info(f"Cancellation requested for cleanup job {job.job_id}")
+    return job
+
+
+def get_status():
+    with _lock:
+        current = _current.to_dict() if _current else None
+        recent = [job.to_dict() for job in _history]
+    return {'running': current is not None, 'current': current, 'recent_jobs': recent}
+
+
+# --- progress hooks used by media_processor --------------------------------
+
+def cancel_requested():
+    job = _current
+    return job is not None and job.cancel_event.is_set()
+
+
+def set_phase(name):
+    with _lock:
+        job = _current
+        if job is None:
+            return
+        if job.phase:
+            job.phases.append(job.phase)
+        job.phase = name
+        job.phase_started_at = time.time()
+        job.processed = 0
+        job.total = None
+
+
+def start_items(total):
+    """The current phase is about to work through `total` series."""
+    with _lock:
+        if _current is not None:
+            _current.processed = 0
+            _current.total = total
+            _current.phase_started_at = time.time()
+
+
+def advance(count=1):
+    with _lock:
+        if _current is not None:
+            _current.processed += count
+
+
+def add_bytes_freed(size):
+    with _lock:
+        if _current is not None:
+            _current.bytes_freed += int(size or 0)
+
+
+def active():
+    return _current is not None
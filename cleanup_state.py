@@ -0,0 +1,252 @@
+"""
+Incremental cleanup state.
+
+run_unified_cleanup used to re-evaluate every managed series in every phase,
+every cycle, even when nothing had changed since the run six hours earlier.
+This module persists, per series, a fingerprint of everything a cleanup
+decision depends on - Sonarr's episodeFileCount / sizeOnDisk / lastAired,
+season and episode totals, tags, the config entry (activity date, last
+watched, grace_cleaned, activation state), the rule's settings and the global
+dry-run switch - plus the next grace/dormant deadline still ahead of it.
+
+A cycle only re-evaluates a series when its fingerprint changed, when one of
+its deadlines has passed since it was last evaluated, or when it has never
+been evaluated. Everything else is provably a no-op and is skipped without a
+single Sonarr call. cleanup_full_rescan_hours (default 168, 0 disables
+incremental mode) forces a full pass now and then as a safety net.
+
+File format: {"series": {"<id>": {"fingerprint", "evaluated_at",
+"next_deadline"}}, "last_full_scan": <unix ts or None>}
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from threading import Lock
+
+logger = logging.getLogger(__name__)
+
+STATE_FILE = os.path.join(os.getcwd(), 'data', 'cleanup_state.json')
+
+DEFAULT_FULL_RESCAN_HOURS = 168
+DEADLINE_FIELDS = ('grace_watched', 'grace_unwatched', 'dormant_days')
+
+_lock = Lock()
+
+
+def _load_raw():
+    try:
+        if os.path.exists(STATE_FILE):
+            with open(STATE_FILE, 'r') as f:
+                data = json.load(f)
+            data.setdefault('series', {})
+            data.setdefault('last_full_scan', None)
+            return data
+    except Exception as e:
+        logger.error(f"Error loading cleanup state: {e}")
+    return {'series': {}, 'last_full_scan': None}
+
+
+def _save_raw(data):
+    try:
+        os.makedirs(os.path.dirname(STATE_FILE), exist_ok=True)
+        tmp_path = STATE_FILE + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, STATE_FILE)
+    except Exception as e:
+        logger.error(f"Error saving cleanup state: {e}")
+
+
+def series_fingerprint(series, entry, rule, global_dry_run):
+    """Stable hash of every input a cleanup phase reads for one series."""
+    stats = (series or {}).get('statistics') or {}
+    parts = {
+        'files': stats.get('episodeFileCount'),
+        'size': stats.get('sizeOnDisk'),
+        'episodes': stats.get('totalEpisodeCount'),
+        'seasons': len((series or {}).get('seasons') or []),
+        'last_aired': (series or {}).get('lastAired'),
+        'tags': sorted((series or {}).get('tags') or []),
+        'entry': entry if isinstance(entry, dict) else {},
+        'rule': {k: v for k, v in (rule or {}).items() if k != 'series'},
+        'dry_run': bool(global_dry_run),
+    }
+    blob = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha1(blob.encode('utf-8')).hexdigest()
+
+
+def rule_deadlines(rule, activity_date, complete_activity_date=None):
+    """Unix timestamps at which this series crosses its rule's dormant /
+    grace thresholds. Grace tiers use the complete (season/episode-aware)
+    activity date, dormant the series-wide one - same as the phases."""
+    deadlines = []
+    for field in DEADLINE_FIELDS:
+        days = (rule or {}).get(field)
+        base = activity_date if field == 'dormant_days' else (complete_activity_date or activity_date)
+        if days and base:
+            try:
+                deadlines.append(int(base + float(days) * 86400))
+            except (TypeError, ValueError):
+                continue
+    return deadlines
+
+
+class CleanupPass:
+    """
+    Which series one cleanup cycle should look at.
+
+    dirty is None for a full pass. Phases call wants(series_id) before doing
+    any per-series work and defer(series_id) for anything they didn't get to
+    finish (storage target reached first, or an error), so it stays dirty.
+    A phase that bails out as a whole calls abort() and nothing is recorded.
+    """
+
+    def __init__(self, dirty, fingerprints, full):
+        self.dirty = dirty
+        self.fingerprints = fingerprints
+        self.full = full
+        self.deferred = set()
+        self.aborted = None
+        self._deferred_lock = Lock()
+
+    def wants(self, series_id):
+        return self.dirty is None or int(series_id) in self.dirty
+
+    def defer(self, series_id):
+        with self._deferred_lock:
+            self.deferred.add(int(series_id))
+
+    def abort(self, reason):
+        self.aborted = reason
+
+    def summary(self):
+        if self.dirty is None:
+            return f"full pass over {len(self.fingerprints)} series"
+        return f"incremental pass: {len(self.dirty)} of {len(self.fingerprints)} series changed or due"
+
+
+def begin_pass(config, series_lookup, global_settings, now=None):
+    """Work out which tracked series need evaluating this cycle."""
+    now = now or int(time.time())
+    global_dry_run = global_settings.get('dry_run_mode', False) or \
+        os.getenv('CLEANUP_DRY_RUN', 'false').lower() == 'true'
+
+    fingerprints = {}
+    for rule in config.get('rules', {}).values():
+        for sid, entry in rule.get('series', {}).items():
+            try:
+                series_id = int(sid)
+            except (TypeError, ValueError):
+                continue
+            if series_id in series_lookup:
+                fingerprints[series_id] = series_fingerprint(series_lookup[series_id], entry, rule, global_dry_run)
+
+    try:
+        rescan_hours = float(global_settings.get('cleanup_full_rescan_hours', DEFAULT_FULL_RESCAN_HOURS))
+    except (TypeError, ValueError):
+        rescan_hours = DEFAULT_FULL_RESCAN_HOURS
+
+    with _lock:
+        state = _load_raw()
+    last_full = state.get('last_full_scan')
+    if rescan_hours <= 0 or not last_full or now - last_full >= rescan_hours * 3600:
+        return CleanupPass(None, fingerprints, full=True)
+
+    known = state['series']
+    dirty = set()
+    for series_id, fingerprint in fingerprints.items():
+        record = known.get(str(series_id))
+        if not record or record.get('fingerprint') != fingerprint:
+            dirty.add(series_id)
+            continue
+        deadline = record.get('next_deadline')
+        if deadline and deadline <= now:
+            dirty.add(series_id)
+    return CleanupPass(dirty, fingerprints, full=False)
+
+
+def finish_pass(cleanup_pass, deadlines_for, now=None):
+    """
+    Record every series this pass evaluated. deadlines_for(series_id) returns
+    that series' rule deadlines; the earliest one still ahead of now becomes
+    its next_deadline. Only call once every phase has run - a cycle that
+    stopped early leaves the state untouched so nothing is skipped wrongly.
+    """
+    if cleanup_pass.aborted:
+        logger.info(f"Cleanup state not updated: {cleanup_pass.aborted}")
+        return
+    now = now or int(time.time())
+    with _lock:
+        state = _load_raw()
+        known = state['series']
+        for series_id, fingerprint in cleanup_pass.fingerprints.items():
+            if series_id in cleanup_pass.deferred or not cleanup_pass.wants(series_id):
+                continue
+            try:
+                upcoming = [d for d in deadlines_for(series_id) if d > now]
+            except Exception as e:
+                logger.error(f"Error computing cleanup deadlines for series {series_id}: {e}")
+                continue
+            known[str(series_id)] = {
+                'fingerprint': fingerprint,
+                'evaluated_at': now,
+                'next_deadline': min(upcoming) if upcoming else None,
+            }
+        # Series no longer tracked by any rule
+        for sid in [sid for sid in known if int(sid) not in cleanup_pass.fingerprints]:
+            del known[sid]
+        if cleanup_pass.full and not cleanup_pass.deferred:
+            state['last_full_scan'] = now
+        _save_raw(state)
+
+
+def next_deadline():
+    """Earliest pending grace/dormant deadline across all series, or None."""
+    with _lock:
+        state = _load_raw()
+    deadlines = [r.get('next_deadline') for r in state['series'].values() if r.get('next_deadline')]
+    return min(deadlines) if deadlines else None
+
+
+def upcoming_deadlines(config, after, movie_events=None):
+    """
+    Every grace/dormant deadline later than `after`, as (due_ts, kind, label).
+
+    Series deadlines come from the config activity date and from the
+    next_deadline the last cycle recorded (which also covers series whose
+    activity only Tautulli or Sonarr knows about). movie_events is the
+    {tmdb_id: watched_ts} map webhooks record; which movie rule a film falls
+    under needs Radarr's tags, so each watch is scheduled once per distinct
+    movie grace_watched value - an early wake for the wrong rule is a no-op.
+    """
+    with _lock:
+        recorded = _load_raw()['series']
+
+    upcoming = []
+    for rule_name, rule in config.get('rules', {}).items():
+        for sid, entry in rule.get('series', {}).items():
+            activity = entry.get('activity_date') if isinstance(entry, dict) else None
+            dues = set(rule_deadlines(rule, activity)) if activity else set()
+            recorded_due = (recorded.get(str(sid)) or {}).get('next_deadline')
+            if recorded_due:
+                dues.add(recorded_due)
+            for due in dues:
+                if due > after:
+                    upcoming.append((due, 'series', f"series {sid} ({rule_name})"))
+
+    graces = sorted({
+        rule.get('grace_watched') for rule in config.get('movie_rules', {}).values()
+        if rule.get('grace_watched')
+    })
+    for tmdb_id, watched_ts in (movie_events or {}).items():
+        for grace in graces:
+            try:
+                due = int(int(watched_ts) + float(grace) * 86400)
+            except (TypeError, ValueError):
+                continue
+            if due > after:
+                upcoming.append((due, 'movie', f"movie tmdb:{tmdb_id}"))
+    return upcoming
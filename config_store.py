@@ -0,0 +1,562 @@
+"""
+Config Store - the single owner of config.json.
+
+episeerr.py kept a 30-second TTL cache, media_processor.py re-read the file
+on every call, and both rewrote the whole indented document (plus a .bak
+copy) on every save - including every activity-date bump from a watch
+event, twice. Everything now goes through this module instead.
+
+The document lives in memory, with a series_id -> rule index so
+get_series_entry() / find_rule_for_series() are dict lookups rather than a
+scan over every rule. Small per-series writes (set_activity, move_series,
+set_series_entry, remove_series) append one line to config.json.journal
+instead of rewriting config.json; whole-document saves and every
+COMPACT_AFTER journal lines fold the journal back into config.json (same
+.bak + tmp + os.replace as before), so config.json on disk is never more
+than that many small edits behind and export_config() always returns the
+existing JSON shape.
+
+The journal is shared across processes (the watch_event_subprocess path and
+cleanup subprocess still run media_processor.py on their own): appends and
+compaction hold an flock on config.json.lock, and every read first checks
+config.json's mtime and the journal's size so edits from another process
+are picked up without reparsing anything that hasn't changed.
+
+Journal ops are idempotent, so replaying one that already made it into
+config.json before a crash is harmless.
+
+load_config() hands out a copy - callers mutate it freely and only
+save_config() publishes the change, exactly as with the old file-backed
+functions. save_config() replaces the whole document, so code that holds a
+copy across Sonarr calls and only changes a few series writes those through
+the per-series API (or sync_series_placement()) instead - otherwise watches
+recorded in the meantime would be rolled back.
+"""
+
+import json
+import logging
+import os
+import shutil
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows dev checkout - in-process locking only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+CONFIG_PATH = os.getenv(
+    'CONFIG_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config', 'config.json'),
+)
+JOURNAL_PATH = CONFIG_PATH + '.journal'
+LOCK_PATH = CONFIG_PATH + '.lock'
+
+COMPACT_AFTER = 200
+
+DEFAULT_CONFIG = {
+    'rules': {
+        'default': {
+            'get_type': 'episodes',
+            'get_count': 1,
+            'keep_type': 'episodes',
+            'keep_count': 1,
+            'action_option': 'search',
+            'monitor_watched': False,
+            'grace_watched': None,
+            'grace_unwatched': None,
+            'dormant_days': None,
+            'grace_scope': 'series',
+            'series': {},
+            'dry_run': False
+        }
+    },
+    'default_rule': 'default'
+}
+
+_lock = threading.RLock()
+_doc = None
+_index = {}               # str(series_id) -> rule name
+_version = 0              # bumped on every change, in-process or replayed
+_snapshot_sig = None      # (mtime_ns, size) of config.json as last read/written
+_journal_offset = 0       # bytes of the journal already applied to _doc
+_journal_entries = 0
+_series_index_cache = (None, None)
+_listeners = []
+
+
+def _clone(obj):
+    """Copy of a JSON-shaped value - several times cheaper than deepcopy."""
+    if isinstance(obj, dict):
+        return {k: _clone(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_clone(v) for v in obj]
+    return obj
+
+
+@contextmanager
+def _file_lock():
+    if fcntl is None:
+        yield
+        return
+    os.makedirs(os.path.dirname(LOCK_PATH), exist_ok=True)
+    with open(LOCK_PATH, 'a') as fh:
+        fcntl.flock(fh, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def _stat_sig(path):
+    try:
+        st = os.stat(path)
+        return (st.st_mtime_ns, st.st_size)
+    except OSError:
+        return None
+
+
+def _journal_size():
+    try:
+        return os.path.getsize(JOURNAL_PATH)
+    except OSError:
+        return 0
+
+
+def _migrate(doc):
+    """Bring an on-disk document up to date. Returns True if it changed."""
+    migrated = False
+    if 'rules' not in doc:
+        doc['rules'] = {}
+        migrated = True
+    # Migration: Add grace_scope to existing rules
+    for rule_details in doc['rules'].values():
+        if 'grace_scope' not in rule_details:
+            rule_details['grace_scope'] = 'series'  # Default to current behavior
+            migrated = True
+    return migrated
+
+
+def _build_index(doc):
+    index = {}
+    for rule_name, rule_details in doc.get('rules', {}).items():
+        for sid in (rule_details.get('series') or {}):
+            index.setdefault(str(sid), rule_name)
+    return index
+
+
+def _write_snapshot(doc):
+    """config.json <- doc, with the usual .bak copy and atomic rename. File lock held."""
+    global _snapshot_sig
+    os.makedirs(os.path.dirname(CONFIG_PATH), exist_ok=True)
+
+    # Backup BEFORE saving (only when actually writing)
+    if os.path.exists(CONFIG_PATH):
+        try:
+            shutil.copy2(CONFIG_PATH, CONFIG_PATH + '.bak')
+        except Exception as e:
+            logger.warning(f"Could not backup config.json: {e}")
+
+    # Write to a temp file then rename so concurrent writes can't corrupt the file
+    tmp_path = CONFIG_PATH + '.tmp'
+    with open(tmp_path, 'w') as fh:
+        json.dump(doc, fh, indent=4)
+    os.replace(tmp_path, CONFIG_PATH)
+    _snapshot_sig = _stat_sig(CONFIG_PATH)
+
+
+def _compact():
+    """Fold the journal into config.json and truncate it. Both locks held."""
+    global _journal_offset, _journal_entries
+    _write_snapshot(_doc)
+    with open(JOURNAL_PATH, 'w'):
+        pass
+    _journal_offset = 0
+    _journal_entries = 0
+
+
+def _apply(doc, index, op):
+    """Apply one journal op to doc/index. Unknown rules/series are a no-op."""
+    kind = op.get('op')
+    sid = str(op.get('series_id'))
+    rules = doc.setdefault('rules', {})
+
+    if kind == 'set_series':
+        rule = rules.get(op.get('rule'))
+        if rule is None:
+            return False
+        current = index.get(sid)
+        if current and current != op['rule'] and current in rules:
+            rules[current].get('series', {}).pop(sid, None)
+        rule.setdefault('series', {})[sid] = op.get('entry')
+        index[sid] = op['rule']
+        return True
+
+    if kind == 'move_series':
+        source = rules.get(op.get('from_rule'))
+        target = rules.get(op.get('to_rule'))
+        if source is None or target is None or sid not in source.get('series', {}):
+            return False
+        target.setdefault('series', {})[sid] = source['series'].pop(sid)
+        index[sid] = op['to_rule']
+        return True
+
+    if kind == 'remove_series':
+        current = index.pop(sid, None)
+        if current and current in rules:
+            rules[current].get('series', {}).pop(sid, None)
+            return True
+        return False
+
+    logger.warning(f"Ignoring unknown config journal op: {kind}")
+    return False
+
+
+def _replay_journal():
+    """Apply journal lines past _journal_offset. Stops at a partial trailing line."""
+    global _journal_offset, _journal_entries, _version
+    try:
+        with open(JOURNAL_PATH, 'rb') as fh:
+            fh.seek(_journal_offset)
+            data = fh.read()
+    except OSError:
+        return
+
+    consumed = 0
+    for raw in data.splitlines(keepends=True):
+        if not raw.endswith(b'\n'):
+            break
+        consumed += len(raw)
+        if not raw.strip():
+            continue
+        try:
+            _apply(_doc, _index, json.loads(raw))
+        except Exception as e:
+            logger.error(f"Skipping unreadable config journal entry: {e}")
+        _journal_entries += 1
+    if consumed:
+        _journal_offset += consumed
+        _version += 1
+
+
+def _reload():
+    """Read config.json from scratch and replay the journal. File lock held."""
+    global _doc, _index, _version, _snapshot_sig, _journal_offset, _journal_entries
+    try:
+        with open(CONFIG_PATH, 'r') as fh:
+            doc = json.load(fh)
+        _snapshot_sig = _stat_sig(CONFIG_PATH)
+        migrated = _migrate(doc)
+    except FileNotFoundError:
+        doc = _clone(DEFAULT_CONFIG)
+        migrated = True
+
+    _doc = doc
+    _index = _build_index(doc)
+    _journal_offset = 0
+    _journal_entries = 0
+    _version += 1
+    _replay_journal()
+
+    if migrated:
+        _compact()
+        logger.info("✓ Wrote config.json (defaults / grace_scope migration)")
+
+
+def _refresh(file_locked=False):
+    """Make _doc current with disk. Cheap when nothing changed: two stat calls."""
+    snapshot_changed = _doc is None or _stat_sig(CONFIG_PATH) != _snapshot_sig
+    journal_grew = not snapshot_changed and _journal_size() != _journal_offset
+    if not (snapshot_changed or journal_grew):
+        return
+
+    if file_locked:
+        # A shrunken journal means another process compacted it
+        if snapshot_changed or _journal_size() < _journal_offset:
+            _reload()
+        else:
+            _replay_journal()
+        return
+    with _file_lock():
+        _refresh(file_locked=True)
+
+
+def _append(op):
+    """Journal + apply one op. Both locks held and _doc refreshed."""
+    global _journal_offset, _journal_entries, _version
+    if not _apply(_doc, _index, op):
+        return False
+    line = (json.dumps(op) + '\n').encode('utf-8')
+    with open(JOURNAL_PATH, 'ab') as fh:
+        fh.write(line)
+    _journal_offset += len(line)
+    _journal_entries += 1
+    _version += 1
+    if _journal_entries >= COMPACT_AFTER:
+        _compact()
+    return True
+
+
+@contextmanager
+def _writing():
+    with _lock, _file_lock():
+        _refresh(file_locked=True)
+        before = _version
+        yield
+        changed = _version != before
+    if changed:
+        _notify()
+
+
+def _notify():
+    for callback in list(_listeners):
+        try:
+            callback()
+        except Exception as e:
+            logger.error(f"Config change listener failed: {e}")
+
+
+def _resolve_rule_name(name):
+    """Case-insensitive rule-name lookup, as the Sonarr tag names are lowercased."""
+    if name in _doc['rules']:
+        return name
+    for rule_name in _doc['rules']:
+        if rule_name.lower() == str(name).lower():
+            return rule_name
+    return None
+
+
+# ─── Whole-document API (drop-in for the old load/save pairs) ───
+
+def load_config():
+    """A private copy of the whole config document."""
+    with _lock:
+        _refresh()
+        return _clone(_doc)
+
+
+def save_config(config):
+    """Replace the whole document and write config.json immediately."""
+    global _doc, _index, _version
+    with _writing():
+        _doc = _clone(config)
+        _doc.setdefault('rules', {})
+        _index = _build_index(_doc)
+        _version += 1
+        _compact()
+        logger.debug("Config saved successfully")
+
+
+def export_config(path=None):
+    """Compact, then return the document in config.json's shape (optionally writing it to path)."""
+    with _writing():
+        if _journal_entries:
+            _compact()
+        doc = _clone(_doc)
+    if path:
+        with open(path, 'w') as fh:
+            json.dump(doc, fh, indent=4)
+    return doc
+
+
+def compact():
+    with _writing():
+        if _journal_entries:
+            _compact()
+
+
+def get_version():
+    """Monotonic change counter - anything cached off the config can key on it."""
+    with _lock:
+        _refresh()
+        return _version
+
+
+def add_listener(callback):
+    """Call callback() after every in-process write that changed the document.
+
+    Runs on the writing thread, after the locks are released - keep it cheap
+    (set an Event, bump a flag). Writes made by another process are not
+    announced; compare get_version() to catch those.
+    """
+    if callback not in _listeners:
+        _listeners.append(callback)
+
+
+# ─── Per-series API ───
+
+def find_rule_for_series(series_id):
+    """Name of the rule tracking series_id, or None."""
+    with _lock:
+        _refresh()
+        return _index.get(str(series_id))
+
+
+def get_series_entry(series_id):
+    """(rule_name, copy of the series' entry) or (None, None)."""
+    with _lock:
+        _refresh()
+        rule_name = _index.get(str(series_id))
+        if rule_name is None:
+            return None, None
+        entry = _doc['rules'][rule_name].get('series', {}).get(str(series_id))
+        return rule_name, _clone(entry)
+
+
+def rule_assignments():
+    """{series_id: rule_name} for every tracked series (a copy of the index)."""
+    with _lock:
+        _refresh()
+        return dict(_index)
+
+
+def series_index():
+    """{series_id: (rule_name, entry)} for every tracked series.
+
+    Built once per config version and shared by every caller until the
+    next change - treat it as read-only.
+    """
+    global _series_index_cache
+    with _lock:
+        _refresh()
+        if _series_index_cache[0] != _version:
+            rules = _doc['rules']
+            index = {sid: (rule_name, _clone(rules[rule_name]['series'][sid]))
+                     for sid, rule_name in _index.items()}
+            _series_index_cache = (_version, index)
+        return _series_index_cache[1]
+
+
+def find_rule_in(config, series_id):
+    """Rule owning series_id within a caller-held config dict, or None.
+
+    The store's index is used as a hint - an O(1) answer whenever config is
+    an unedited load_config() copy - and each rule is only checked when the
+    hint doesn't hold (series moved or added in config but not saved yet).
+    """
+    sid = str(series_id)
+    rules = config.get('rules', {})
+    hint = find_rule_for_series(sid)
+    if hint is not None and sid in (rules.get(hint) or {}).get('series', {}):
+        return hint
+    for rule_name, rule_details in rules.items():
+        if sid in rule_details.get('series', {}):
+            return rule_name
+    return None
+
+
+def get_rule(rule_name, include_series=False):
+    """Copy of one rule's settings, or None. Its series dict only on request."""
+    with _lock:
+        _refresh()
+        rule = _doc['rules'].get(rule_name)
+        if rule is None:
+            return None
+        if include_series:
+            return _clone(rule)
+        return {k: _clone(v) for k, v in rule.items() if k != 'series'}
+
+
+def set_series_entry(rule_name, series_id, entry):
+    """Put series_id under rule_name with the given entry (moving it if tracked elsewhere)."""
+    with _writing():
+        actual = _resolve_rule_name(rule_name)
+        if actual is None:
+            logger.error(f"Rule '{rule_name}' not found in config")
+            return False
+        return _append({'op': 'set_series', 'rule': actual,
+                        'series_id': str(series_id), 'entry': _clone(entry)})
+
+
+def remove_series(series_id):
+    with _writing():
+        if str(series_id) not in _index:
+            return False
+        return _append({'op': 'remove_series', 'series_id': str(series_id)})
+
+
+def move_series(series_id, from_rule, to_rule):
+    """Move a series between rules keeping its activity data. Rule names are case-insensitive."""
+    with _writing():
+        actual_from = _resolve_rule_name(from_rule)
+        actual_to = _resolve_rule_name(to_rule)
+        if actual_from is None:
+            logger.error(f"Source rule '{from_rule}' not found in config")
+            return None
+        if actual_to is None:
+            logger.error(f"Target rule '{to_rule}' not found in config")
+            return None
+        if str(series_id) not in _doc['rules'][actual_from].get('series', {}):
+            logger.warning(f"Series {series_id} not found in rule '{actual_from}'")
+            return None
+        _append({'op': 'move_series', 'series_id': str(series_id),
+                 'from_rule': actual_from, 'to_rule': actual_to})
+        return actual_to
+
+
+def sync_series_placement(config, series_id):
+    """Publish which rule series_id sits under in a caller-held config copy.
+
+    For bulk callers that edit a load_config() copy (drift reconciliation)
+    and would otherwise save_config() it back: that whole-document save
+    would also roll back every set_activity() made since the copy was
+    taken. This writes just the one series as a journal op instead - a move
+    keeps the store's current entry, and only a series the store doesn't
+    track yet takes its entry from config. A series missing from config is
+    left alone - the copy may simply predate its add. Returns the rule the
+    store now has it under, or None.
+    """
+    sid = str(series_id)
+    target = next((name for name, rule in config.get('rules', {}).items()
+                   if sid in rule.get('series', {})), None)
+    with _writing():
+        current = _index.get(sid)
+        if target is None or target not in _doc['rules']:
+            return current
+        if current is None:
+            _append({'op': 'set_series', 'rule': target, 'series_id': sid,
+                     'entry': _clone(config['rules'][target]['series'][sid])})
+        elif current != target:
+            _append({'op': 'move_series', 'series_id': sid,
+                     'from_rule': current, 'to_rule': target})
+        return target
+
+
+def set_activity(series_id, season_number, episode_number, timestamp):
+    """Record a watch: activity date plus last season/episode, and clear grace_cleaned.
+
+    Honors the rule's grace_scope - 'season' keeps per-season activity under
+    'seasons', 'series' (default) replaces the flat entry. Returns the rule
+    name, or None if the series isn't tracked by any rule.
+    """
+    with _writing():
+        sid = str(series_id)
+        rule_name = _index.get(sid)
+        if rule_name is None:
+            return None
+        rule = _doc['rules'][rule_name]
+        current = rule.get('series', {}).get(sid)
+
+        if rule.get('grace_scope', 'series') == 'season':
+            # PER-SEASON TRACKING
+            entry = _clone(current) if isinstance(current, dict) else {}
+            # Overall series activity (for Dormant timer)
+            entry['activity_date'] = timestamp
+            # Specific season activity (for Grace timers)
+            season_data = entry.setdefault('seasons', {}).setdefault(str(season_number), {})
+            season_data['activity_date'] = timestamp
+            season_data['last_episode'] = episode_number
+        else:
+            # PER-SERIES TRACKING (default/legacy behavior)
+            entry = {
+                'activity_date': timestamp,
+                'last_season': season_number,
+                'last_episode': episode_number,
+            }
+        # Watch detected - allows re-entry to grace cleanup
+        entry['grace_cleaned'] = False
+
+        _append({'op': 'set_series', 'rule': rule_name, 'series_id': sid, 'entry': entry})
+        return rule_name
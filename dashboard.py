@@ -10,6 +10,9 @@ import json
 from datetime import datetime, timedelta
 import logging
 from integrations import get_all_integrations
+import sonarr_client
+import series_artwork
+import dashboard_snapshots
 
 dashboard_bp = Blueprint('dashboard', __name__)
 from logging_config import main_logger as logger
@@ -55,18 +58,10 @@ TAUTULLI_URL, TAUTULLI_API_KEY = get_tautulli_config()
 
 
 def get_series_banners_bulk():
-    """Fetch all series from Sonarr in one call and return {series_id: banner_url}."""
+    """{series_id: banner_url} for the whole library, from the shared artwork cache."""
     try:
-        headers = {'X-Api-Key': SONARR_API_KEY}
-        response = requests.get(f"{SONARR_URL}/api/v3/series", headers=headers, timeout=10)
-        if response.ok:
-            banner_map = {}
-            for series in response.json():
-                for image in series.get('images', []):
-                    if image.get('coverType') == 'banner':
-                        banner_map[series['id']] = image.get('remoteUrl')
-                        break
-            return banner_map
+        if SONARR_URL and SONARR_API_KEY:
+            return series_artwork.get_banner_map(url=SONARR_URL, api_key=SONARR_API_KEY)
     except Exception:
         pass
     return {}
@@ -76,7 +71,7 @@ def _enrich_watched_from_jellyfin(watched_episodes: set, recent_downloads: list)
     """
     Supplement watched_episodes with live played-status data from Jellyfin.
 
-    watched.json only captures episodes that flow through Episeerr's webhook
+    The activity watch log only captures episodes that flow through Episeerr's webhook
     processing (series must have a rule AND the watch event must be caught by
     the integration).  This function covers the gaps:
       - Series grabbed by Sonarr but not assigned to an Episeerr rule
@@ -84,7 +79,7 @@ def _enrich_watched_from_jellyfin(watched_episodes: set, recent_downloads: list)
 
     Strategy: one API call to fetch all played episodes for the configured user,
     then match by (normalized title, season, episode) against recent_downloads.
-    Fails silently — the existing watched.json filter still applies.
+    Fails silently — the existing watch-log filter still applies.
     """
     if not recent_downloads:
         return
@@ -181,209 +176,206 @@ def dashboard():
     return render_template('dashboard.html')
 
 
-@dashboard_bp.route('/api/dashboard/calendar')
-def calendar_data():
-    """Get upcoming episodes + recent downloads (two separate lists)"""
+def _build_calendar():
+    """Upcoming episodes + recent downloads for the 'calendar' snapshot. Raises on Sonarr errors."""
+    today = datetime.now()
+    week_ahead = today + timedelta(days=7)
+    
+    logger.info(f"Calendar range: {today.strftime('%Y-%m-%d')} to {week_ahead.strftime('%Y-%m-%d')}")
+    
+    # ──────────────────────────────────────────────────────
+    # 1. GET UPCOMING FROM SONARR (next 7 days)
+    # ──────────────────────────────────────────────────────
+    headers = {'X-Api-Key': SONARR_API_KEY}
+    calendar_url = f"{SONARR_URL}/api/v3/calendar"
+    params = {
+        'start': today.strftime('%Y-%m-%d'),
+        'end': week_ahead.strftime('%Y-%m-%d'),
+        'includeSeries': 'true',
+        'includeUnmonitored': 'false'
+    }
+    
+    response = requests.get(calendar_url, headers=headers, params=params, timeout=10)
+    response.raise_for_status()
+    upcoming_episodes = response.json()
+    
+    logger.info(f"Sonarr returned {len(upcoming_episodes)} upcoming episodes")
+    
+    # ──────────────────────────────────────────────────────
+    # 2. GET RECENT DOWNLOADS (last 7 days)
+    # ──────────────────────────────────────────────────────
+    recent_downloads = []
+    downloads_file = os.path.join(os.getcwd(), 'data', 'recent_downloads.json')
+    
+    if os.path.exists(downloads_file):
+        try:
+            with open(downloads_file, 'r') as f:
+                recent_downloads = json.load(f)
+            logger.info(f"Loaded {len(recent_downloads)} recent downloads")
+        except Exception as e:
+            logger.error(f"Error loading downloads: {e}")
+    
+    # ──────────────────────────────────────────────────────
+    # 2.5 LOAD WATCHED EPISODES TO FILTER OUT
+    # ──────────────────────────────────────────────────────
+    watched_episodes = set()
     try:
-        from datetime import datetime, timedelta
-        import os
-        import json
-        
-        # Check if Sonarr is configured
-        if not SONARR_URL or not SONARR_API_KEY:
-            return jsonify({
-                'success': False,
-                'error': 'Sonarr not configured',
-                'message': 'Please configure Sonarr in the setup page',
-                'configured': False,
-                'upcoming': [],
-                'downloaded': []
-            })
-        
-        today = datetime.now()
-        week_ahead = today + timedelta(days=7)
-        
-        logger.info(f"Calendar range: {today.strftime('%Y-%m-%d')} to {week_ahead.strftime('%Y-%m-%d')}")
-        
-        # ──────────────────────────────────────────────────────
-        # 1. GET UPCOMING FROM SONARR (next 7 days)
-        # ──────────────────────────────────────────────────────
-        headers = {'X-Api-Key': SONARR_API_KEY}
-        calendar_url = f"{SONARR_URL}/api/v3/calendar"
-        params = {
-            'start': today.strftime('%Y-%m-%d'),
-            'end': week_ahead.strftime('%Y-%m-%d'),
-            'includeSeries': 'true',
-            'includeUnmonitored': 'false'
-        }
-        
-        response = requests.get(calendar_url, headers=headers, params=params, timeout=10)
-        response.raise_for_status()
-        upcoming_episodes = response.json()
-        
-        logger.info(f"Sonarr returned {len(upcoming_episodes)} upcoming episodes")
-        
-        # ──────────────────────────────────────────────────────
-        # 2. GET RECENT DOWNLOADS (last 7 days)
-        # ──────────────────────────────────────────────────────
-        recent_downloads = []
-        downloads_file = os.path.join(os.getcwd(), 'data', 'recent_downloads.json')
-        
-        if os.path.exists(downloads_file):
-            try:
-                with open(downloads_file, 'r') as f:
-                    recent_downloads = json.load(f)
-                logger.info(f"Loaded {len(recent_downloads)} recent downloads")
-            except Exception as e:
-                logger.error(f"Error loading downloads: {e}")
-        
-        # ──────────────────────────────────────────────────────
-        # 2.5 LOAD WATCHED EPISODES TO FILTER OUT
-        # ──────────────────────────────────────────────────────
-        watched_episodes = set()
-        watched_file = os.path.join(os.getcwd(), 'data', 'activity', 'watched.json')
-
-        if os.path.exists(watched_file):
+        from activity_storage import get_recent_watches
+        for watch in get_recent_watches():
+            watched_episodes.add((
+                watch.get('series_id'),
+                watch.get('season'),
+                watch.get('episode')
+            ))
+        logger.info(f"Loaded {len(watched_episodes)} watched episodes to filter")
+    except Exception as e:
+        logger.error(f"Error loading watched episodes: {e}")
+
+    # Supplement watched_episodes with live Jellyfin played status.
+    # The watch log only records episodes processed via Episeerr's webhook path
+    # (series must have a rule).  Querying Jellyfin directly covers series
+    # without rules and any watches the integration missed.
+    _enrich_watched_from_jellyfin(watched_episodes, recent_downloads)
+
+    # ──────────────────────────────────────────────────────
+    # 3. LOAD EPISEERR CONFIG FOR RULES + BANNER CACHE
+    # ──────────────────────────────────────────────────────
+    import config_store
+    series_rules = {int(sid): rule_name
+                    for sid, rule_name in config_store.rule_assignments().items()}
+
+    # One bulk Sonarr call for all banners instead of one per episode
+    banner_map = get_series_banners_bulk()
+
+    # ──────────────────────────────────────────────────────
+    # 4. PROCESS UPCOMING EPISODES
+    # ──────────────────────────────────────────────────────
+    upcoming_events = []
+    now = datetime.now()
+    downloaded_ids = {(dl['series_id'], dl['season'], dl['episode']) for dl in recent_downloads}
+
+    for ep in upcoming_episodes:
+        series_id = ep.get('seriesId')
+        season = ep.get('seasonNumber')
+        episode = ep.get('episodeNumber')
+
+        # Skip if already in downloaded list
+        if (series_id, season, episode) in downloaded_ids:
+            continue
+
+        has_rule = series_id in series_rules
+        rule_name = series_rules.get(series_id)
+        has_file = ep.get('hasFile', False)
+        monitored = ep.get('monitored', False)
+
+        air_date_str = ep.get('airDateUtc', '')
+        has_aired = False
+        if air_date_str:
             try:
-                with open(watched_file, 'r') as f:
-                    watched_data = json.load(f)
-                    for watch in watched_data:
-                        watched_episodes.add((
-                            watch.get('series_id'),
-                            watch.get('season'),
-                            watch.get('episode')
-                        ))
-                logger.info(f"Loaded {len(watched_episodes)} watched episodes to filter")
-            except Exception as e:
-                logger.error(f"Error loading watched episodes: {e}")
-
-        # Supplement watched_episodes with live Jellyfin played status.
-        # watched.json only records episodes processed via Episeerr's webhook path
-        # (series must have a rule).  Querying Jellyfin directly covers series
-        # without rules and any watches the integration missed.
-        _enrich_watched_from_jellyfin(watched_episodes, recent_downloads)
-
-        # ──────────────────────────────────────────────────────
-        # 3. LOAD EPISEERR CONFIG FOR RULES + BANNER CACHE
-        # ──────────────────────────────────────────────────────
-        from episeerr import load_config
-        config = load_config()
-
-        series_rules = {}
-        for rule_name, rule_data in config.get('rules', {}).items():
-            for series_id in rule_data.get('series', {}).keys():
-                series_rules[int(series_id)] = rule_name
-
-        # One bulk Sonarr call for all banners instead of one per episode
-        banner_map = get_series_banners_bulk()
-
-        # ──────────────────────────────────────────────────────
-        # 4. PROCESS UPCOMING EPISODES
-        # ──────────────────────────────────────────────────────
-        upcoming_events = []
-        now = datetime.now()
-        downloaded_ids = {(dl['series_id'], dl['season'], dl['episode']) for dl in recent_downloads}
-
-        for ep in upcoming_episodes:
-            series_id = ep.get('seriesId')
-            season = ep.get('seasonNumber')
-            episode = ep.get('episodeNumber')
-
-            # Skip if already in downloaded list
-            if (series_id, season, episode) in downloaded_ids:
-                continue
+                air_date = datetime.fromisoformat(air_date_str.replace('Z', ''))
+                has_aired = air_date < now
+            except:
+                has_aired = False
+
+        # Determine status
+        if has_file:
+            status = 'downloaded'
+            color = 'gray'
+        elif not monitored:
+            status = 'unmonitored'
+            color = 'muted'
+        elif has_rule:
+            status = 'has_rule'
+            color = 'green'
+        elif has_aired and not has_file:
+            status = 'not_grabbed'
+            color = 'blue'
+        else:
+            status = 'no_rule'
+            color = 'yellow'
+
+        upcoming_events.append({
+            'series_id': series_id,
+            'series_title': ep.get('series', {}).get('title', 'Unknown'),
+            'episode_title': ep.get('title', 'TBA'),
+            'season': season,
+            'episode': episode,
+            'air_date': air_date_str,
+            'has_rule': has_rule,
+            'rule_name': rule_name,
+            'status': status,
+            'color': color,
+            'banner': banner_map.get(series_id)
+        })
 
-            has_rule = series_id in series_rules
-            rule_name = series_rules.get(series_id)
-            has_file = ep.get('hasFile', False)
-            monitored = ep.get('monitored', False)
-
-            air_date_str = ep.get('airDateUtc', '')
-            has_aired = False
-            if air_date_str:
-                try:
-                    air_date = datetime.fromisoformat(air_date_str.replace('Z', ''))
-                    has_aired = air_date < now
-                except:
-                    has_aired = False
-
-            # Determine status
-            if has_file:
-                status = 'downloaded'
-                color = 'gray'
-            elif not monitored:
-                status = 'unmonitored'
-                color = 'muted'
-            elif has_rule:
-                status = 'has_rule'
-                color = 'green'
-            elif has_aired and not has_file:
-                status = 'not_grabbed'
-                color = 'blue'
-            else:
-                status = 'no_rule'
-                color = 'yellow'
-
-            upcoming_events.append({
-                'series_id': series_id,
-                'series_title': ep.get('series', {}).get('title', 'Unknown'),
-                'episode_title': ep.get('title', 'TBA'),
-                'season': season,
-                'episode': episode,
-                'air_date': air_date_str,
-                'has_rule': has_rule,
-                'rule_name': rule_name,
-                'status': status,
-                'color': color,
-                'banner': banner_map.get(series_id)
-            })
-
-        # ──────────────────────────────────────────────────────
-        # 5. FORMAT RECENT DOWNLOADS (use grab timestamp)
-        # ──────────────────────────────────────────────────────
-        downloaded_events = []
+    # ──────────────────────────────────────────────────────
+    # 5. FORMAT RECENT DOWNLOADS (use grab timestamp)
+    # ──────────────────────────────────────────────────────
+    downloaded_events = []
+
+    for dl in recent_downloads:
+        # Skip if already watched
+        dl_key = (dl['series_id'], dl['season'], dl['episode'])
+        if dl_key in watched_episodes:
+            continue
+
+        has_rule = dl['series_id'] in series_rules
+
+        downloaded_events.append({
+            'series_id': dl['series_id'],
+            'series_title': dl['series_title'],
+            'episode_title': dl.get('episode_title', ''),
+            'season': dl['season'],
+            'episode': dl['episode'],
+            'grabbed_date': dl['timestamp'],
+            'has_rule': has_rule,
+            'rule_name': series_rules.get(dl['series_id']),
+            'status': 'ready',
+            'color': 'green',
+            'banner': banner_map.get(dl['series_id'])
+        })
+    # Sort by grab time (newest first)
+    downloaded_events.sort(key=lambda x: x['grabbed_date'], reverse=True)
+    
+    return {
+        'upcoming': upcoming_events,
+        'downloaded': downloaded_events,
+        'upcoming_count': len(upcoming_events),
+        'downloaded_count': len(downloaded_events)
+    }
 
-        for dl in recent_downloads:
-            # Skip if already watched
-            dl_key = (dl['series_id'], dl['season'], dl['episode'])
-            if dl_key in watched_episodes:
-                continue
 
-            has_rule = dl['series_id'] in series_rules
-
-            downloaded_events.append({
-                'series_id': dl['series_id'],
-                'series_title': dl['series_title'],
-                'episode_title': dl.get('episode_title', ''),
-                'season': dl['season'],
-                'episode': dl['episode'],
-                'grabbed_date': dl['timestamp'],
-                'has_rule': has_rule,
-                'rule_name': series_rules.get(dl['series_id']),
-                'status': 'ready',
-                'color': 'green',
-                'banner': banner_map.get(dl['series_id'])
-            })
-        # Sort by grab time (newest first)
-        downloaded_events.sort(key=lambda x: x['grabbed_date'], reverse=True)
-        
+@dashboard_bp.route('/api/dashboard/calendar')
+def calendar_data():
+    """Get upcoming episodes + recent downloads (two separate lists)"""
+    # Check if Sonarr is configured
+    if not SONARR_URL or not SONARR_API_KEY:
         return jsonify({
-            'success': True,
-            'upcoming': upcoming_events,
-            'downloaded': downloaded_events,
-            'upcoming_count': len(upcoming_events),
-            'downloaded_count': len(downloaded_events)
+            'success': False,
+            'error': 'Sonarr not configured',
+            'message': 'Please configure Sonarr in the setup page',
+            'configured': False,
+            'upcoming': [],
+            'downloaded': []
         })
-        
-    except Exception as e:
-        logger.error(f"Error fetching calendar data: {str(e)}")
+
+    snap = dashboard_snapshots.get('calendar')
+    if snap['value'] is None:
+        logger.error(f"Error fetching calendar data: {snap['error']}")
         return jsonify({
             'success': False,
-            'error': str(e),
+            'error': snap['error'],
             'upcoming': [],
             'downloaded': []
         }), 500
 
+    return jsonify({
+        'success': True,
+        **snap['value'],
+        'age': snap['age'],
+        'stale': snap['stale']
+    })
+
 @dashboard_bp.route('/api/dashboard/integrations')
 def dashboard_integrations():
     """Get metadata for all integrations (for auto-generating UI)"""
@@ -413,80 +405,116 @@ def dashboard_integrations():
         'integrations': integrations_data
     })
 
+def _sonarr_library_stats():
+    """Series/episode counts and library size for the 'sonarr_library' snapshot."""
+    series_data = sonarr_client.get_all_series(url=SONARR_URL, api_key=SONARR_API_KEY)
+    total_size = sum(s.get('statistics', {}).get('sizeOnDisk', 0) for s in series_data)
+    return {
+        'series_count': len(series_data),
+        'episode_count': sum(s.get('statistics', {}).get('episodeFileCount', 0) for s in series_data),
+        'size_on_disk': total_size,
+        'size_gb': round(total_size / (1024**3), 2)
+    }
+
+
+def _sonarr_queue_stats():
+    """Download queue summary for the 'sonarr_queue' snapshot (dashboard + /api/sonarr-stats)."""
+    response = requests.get(f"{SONARR_URL}/api/v3/queue", headers={'X-Api-Key': SONARR_API_KEY}, timeout=10)
+    response.raise_for_status()
+    queue_data = response.json()
+    records = queue_data.get('records', [])
+    return {
+        'total_records': queue_data.get('totalRecords', 0),
+        'downloading': len([r for r in records if r.get('status') == 'downloading']),
+        'queued': len([r for r in records if r.get('status') in ['queued', 'delay']]),
+        'total': len(records)
+    }
+
+
+def _sonarr_disk_stats():
+    """Root folder space for the 'sonarr_disk' snapshot."""
+    from media_processor import get_sonarr_disk_space
+    return get_sonarr_disk_space()
+
+
+def _integration_stats_producer(service_name):
+    def produce():
+        # Looked up per refresh, so a reload_integrations() is picked up
+        from integrations import get_integration
+        from settings_db import get_service
+        integration = get_integration(service_name)
+        config = get_service(service_name, 'default')
+        if integration is None or not config:
+            return {'configured': False}
+        return integration.get_dashboard_stats(config.get('url', ''), config.get('api_key', ''))
+    return produce
+
+
+def _register_integration_snapshots(integrations):
+    """One 'integration:<name>' snapshot per integration, registered once."""
+    for integration in integrations:
+        name = f"integration:{integration.service_name}"
+        if not dashboard_snapshots.registered(name):
+            dashboard_snapshots.register(name, _integration_stats_producer(integration.service_name), interval=30)
+
+
+dashboard_snapshots.register('calendar', _build_calendar, interval=60)
+dashboard_snapshots.register('sonarr_library', _sonarr_library_stats, interval=60)
+dashboard_snapshots.register('sonarr_queue', _sonarr_queue_stats, interval=30)
+dashboard_snapshots.register('sonarr_disk', _sonarr_disk_stats, interval=300)
+_register_integration_snapshots(get_all_integrations())
+
+
 @dashboard_bp.route('/api/dashboard/stats')
 def dashboard_stats():
     """Get overall statistics for dashboard"""
     try:
         stats = {}
-        
+        ages = {}
+
+        def _snapshot(name):
+            snap = dashboard_snapshots.get(name)
+            ages[name] = snap['age']
+            return snap
+
         # Sonarr stats
         if SONARR_URL and SONARR_API_KEY:
-            try:
-                headers = {'X-Api-Key': SONARR_API_KEY}
-                
-                # Get series count
-                series_response = requests.get(f"{SONARR_URL}/api/v3/series", headers=headers, timeout=10)
-                series_response.raise_for_status()
-                series_data = series_response.json()
-                
-                # Get queue
-                queue_response = requests.get(f"{SONARR_URL}/api/v3/queue", headers=headers, timeout=10)
-                queue_response.raise_for_status()
-                queue_data = queue_response.json()
-                
-                total_episodes = sum(s.get('statistics', {}).get('episodeFileCount', 0) for s in series_data)
-                total_size = sum(s.get('statistics', {}).get('sizeOnDisk', 0) for s in series_data)
-                
+            library = _snapshot('sonarr_library')
+            queue = _snapshot('sonarr_queue')
+            if library['value'] is not None:
                 stats['sonarr'] = {
-                    'series_count': len(series_data),
-                    'episode_count': total_episodes,
-                    'size_on_disk': total_size,
-                    'size_gb': round(total_size / (1024**3), 2),
-                    'queue_count': queue_data.get('totalRecords', 0),
+                    **library['value'],
+                    'queue_count': (queue['value'] or {}).get('total_records', 0),
                     'configured': True
                 }
-            except Exception as e:
-                if isinstance(e, requests.exceptions.ConnectionError):
-                    logger.warning(f"Error fetching Sonarr stats: {e}")
-                else:
-                    logger.error(f"Error fetching Sonarr stats: {e}")
+            else:
+                logger.warning(f"Error fetching Sonarr stats: {library['error']}")
                 stats['sonarr'] = {
                     'configured': True,
                     'error': True,
-                    'error_message': str(e)
+                    'error_message': library['error']
                 }
         else:
             stats['sonarr'] = {'configured': False}
-        
-        
-        
-        # Auto-collect stats from all integrations in parallel
-        from settings_db import get_service
-        from concurrent.futures import ThreadPoolExecutor, as_completed
 
-        integrations = get_all_integrations()
+        # Integration stats, each its own snapshot. Only a first load waits on
+        # upstream, so those still go out in parallel.
+        from concurrent.futures import ThreadPoolExecutor
 
-        def _fetch_integration_stats(integration):
-            try:
-                config = get_service(integration.service_name, 'default')
-                if config:
-                    return integration.service_name, integration.get_dashboard_stats(
-                        config.get('url', ''), config.get('api_key', '')
-                    )
-                return integration.service_name, {'configured': False}
-            except Exception as e:
-                logger.error(f"Error fetching {integration.display_name} stats: {e}")
-                return integration.service_name, {'configured': True, 'error': True}
+        integrations = get_all_integrations()
+        _register_integration_snapshots(integrations)    # no-op unless integrations were reloaded
 
         with ThreadPoolExecutor(max_workers=8) as executor:
-            futures = {executor.submit(_fetch_integration_stats, i): i for i in integrations}
-            for future in as_completed(futures):
-                name, result = future.result()
-                stats[name] = result
+            snaps = executor.map(lambda i: _snapshot(f"integration:{i.service_name}"), integrations)
+            for integration, snap in zip(integrations, snaps):
+                if snap['value'] is None:
+                    logger.error(f"Error fetching {integration.display_name} stats: {snap['error']}")
+                    stats[integration.service_name] = {'configured': True, 'error': True}
+                else:
+                    stats[integration.service_name] = snap['value']
 
-        
         # Episeerr stats
-        from episeerr import load_config
+        from config_store import load_config
         config = load_config()
         
         total_series_in_rules = 0
@@ -500,7 +528,8 @@ def dashboard_stats():
         
         return jsonify({
             'success': True,
-            'stats': stats
+            'stats': stats,
+            'ages': ages
         })
         
     except Exception as e:
@@ -522,56 +551,42 @@ def activity_feed():
         activity_dir = os.path.join(os.getcwd(), 'data', 'activity')
         logger.info(f"Reading activity from: {activity_dir}")
         
-        # Last search (from searches.json) - SORT BY TIMESTAMP DESC
+        from activity_storage import get_last_search, get_last_watch
+
+        # Last search (from the search log's in-memory index)
         try:
-            searches_file = os.path.join(activity_dir, 'searches.json')
-            if os.path.exists(searches_file):
-                with open(searches_file, 'r') as f:
-                    searches = json.load(f)
-                    if searches:
-                        # Sort by timestamp DESC to get truly most recent
-                        searches_sorted = sorted(searches, key=lambda x: x.get('timestamp', 0), reverse=True)
-                        last_search = searches_sorted[0]  # Most recent after sorting
-                        services.append({
-                            'service': 'Sonarr',
-                            'icon': 'fa-tv',
-                            'color': 'primary',
-                            'action': 'Searched',
-                            'details': f"{last_search['series_title']} S{last_search['season']}E{last_search['episode']}",
-                            'timestamp': datetime.fromtimestamp(last_search['timestamp']).isoformat(),
-                            'action_icon': 'fa-search'
-                        })
-                        logger.info(f"Added search: {last_search['series_title']}")
-            else:
-                logger.warning(f"searches.json not found at {searches_file}")
+            last_search = get_last_search()
+            if last_search:
+                services.append({
+                    'service': 'Sonarr',
+                    'icon': 'fa-tv',
+                    'color': 'primary',
+                    'action': 'Searched',
+                    'details': f"{last_search['series_title']} S{last_search['season']}E{last_search['episode']}",
+                    'timestamp': datetime.fromtimestamp(last_search['timestamp']).isoformat(),
+                    'action_icon': 'fa-search'
+                })
+                logger.info(f"Added search: {last_search['series_title']}")
         except Exception as e:
-            logger.error(f"Error reading searches.json: {e}")
+            logger.error(f"Error reading search activity: {e}")
         
-        # Last watched (from watched.json) - SORT BY TIMESTAMP DESC
+        # Last watched (from the watch log's in-memory index)
         try:
-            watched_file = os.path.join(activity_dir, 'watched.json')
-            if os.path.exists(watched_file):
-                with open(watched_file, 'r') as f:
-                    watched = json.load(f)
-                    if watched:
-                        # Sort by timestamp DESC to get truly most recent
-                        watched_sorted = sorted(watched, key=lambda x: x.get('timestamp', 0), reverse=True)
-                        last_watched = watched_sorted[0]  # Most recent after sorting
-                        user = last_watched.get('user', 'Unknown')
-                        services.append({
-                            'service': 'Jellyfin/Tautulli',
-                            'icon': 'fa-eye',
-                            'color': 'info',
-                            'action': 'Watched',
-                            'details': f"{last_watched['series_title']} S{last_watched['season']}E{last_watched['episode']} by {user}",
-                            'timestamp': datetime.fromtimestamp(last_watched['timestamp']).isoformat(),
-                            'action_icon': 'fa-play'
-                        })
-                        logger.info(f"Added watch: {last_watched['series_title']} by {user} at {last_watched['timestamp']}")
-            else:
-                logger.warning(f"watched.json not found at {watched_file}")
+            last_watched = get_last_watch()
+            if last_watched:
+                user = last_watched.get('user', 'Unknown')
+                services.append({
+                    'service': 'Jellyfin/Tautulli',
+                    'icon': 'fa-eye',
+                    'color': 'info',
+                    'action': 'Watched',
+                    'details': f"{last_watched['series_title']} S{last_watched['season']}E{last_watched['episode']} by {user}",
+                    'timestamp': datetime.fromtimestamp(last_watched['timestamp']).isoformat(),
+                    'action_icon': 'fa-play'
+                })
+                logger.info(f"Added watch: {last_watched['series_title']} by {user} at {last_watched['timestamp']}")
         except Exception as e:
-            logger.error(f"Error reading watched.json: {e}")
+            logger.error(f"Error reading watch activity: {e}")
         
         # Last request (from last_request.json)
         try:
@@ -628,7 +643,7 @@ def activity_feed():
         # Episeerr - Show pending deletions or recent activity
         try:
             import pending_deletions
-            deletion_summary = pending_deletions.get_pending_deletions_summary()
+            deletion_summary = pending_deletions.get_pending_totals()
             
             # Only show if there are pending deletions
             if deletion_summary and deletion_summary.get('total_episodes', 0) > 0:
@@ -0,0 +1,207 @@
+"""
+Stale-while-revalidate snapshots for the dashboard widgets.
+
+/api/dashboard/stats used to make two Sonarr calls plus one
+get_dashboard_stats() per integration on every request. The calendar and
+/api/sonarr-stats made several more, so every open tab and every refresh
+multiplied the load on Sonarr and the media servers.
+
+Each widget (Sonarr library stats, queue, disk, calendar, each
+integration's stats) is now a named snapshot with a producer function and
+a refresh interval:
+
+- get(name) answers from the latest snapshot at once, with its age. A
+  snapshot older than its interval is refreshed on the pool in the
+  background, and the caller still gets the old value. Only a widget that
+  has never been produced is computed inline, and concurrent first callers
+  share that one computation.
+- A failed refresh keeps serving the previous value and records the error.
+- The "dashboard-refresher" thread keeps the snapshots that a dashboard
+  looked at within ACTIVE_WINDOW seconds fresh, on their intervals. The
+  next page load is then already warm, and nothing polls upstream once
+  every dashboard is closed.
+
+Upstream load therefore depends on the intervals, not on how many
+dashboards are open. Intervals default to the ones given at registration.
+They can be overridden per widget with the dashboard_refresh_seconds
+global setting, e.g. {"calendar": 600, "integration:plex": 15}.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import settings_store
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 60
+ACTIVE_WINDOW = 600
+REFRESHER_TICK = 5
+REFRESH_WORKERS = 4
+
+
+class _Snapshot:
+    def __init__(self, name, producer, interval):
+        self.name = name
+        self.producer = producer
+        self.interval = interval
+        self.value = None
+        self.updated_at = None
+        self.error = None
+        self.last_access = 0.0
+        self.invalid = False        # invalidate() called since the last refresh
+        self.refreshing = None      # threading.Event while a refresh runs
+
+
+_lock = threading.Lock()
+_snapshots = {}
+_executor = ThreadPoolExecutor(max_workers=REFRESH_WORKERS, thread_name_prefix='dashboard-refresh')
+_refresher = None
+
+
+def register(name, producer, interval=DEFAULT_INTERVAL):
+    """Declare a widget. Re-registering replaces the producer and keeps the snapshot."""
+    with _lock:
+        snap = _snapshots.get(name)
+        if snap is None:
+            _snapshots[name] = _Snapshot(name, producer, interval)
+        else:
+            snap.producer, snap.interval = producer, interval
+
+
+def registered(name):
+    with _lock:
+        return name in _snapshots
+
+
+def _overrides():
+    """dashboard_refresh_seconds from the global settings. Read before
+    taking _lock - load_settings() copies the document and may run its
+    change listeners."""
+    return settings_store.load_settings().get('dashboard_refresh_seconds') or {}
+
+
+def interval_for(snap, overrides=None):
+    overrides = _overrides() if overrides is None else overrides
+    try:
+        return max(1, float(overrides.get(snap.name, snap.interval)))
+    except (TypeError, ValueError):
+        return snap.interval
+
+
+def _begin_refresh(snap):
+    """Caller holds _lock. (event, started): started is False when a refresh
+    is already running and the caller should wait on event instead."""
+    if snap.refreshing is not None:
+        return snap.refreshing, False
+    snap.refreshing = threading.Event()
+    return snap.refreshing, True
+
+
+def _run_refresh(snap):
+    try:
+        value = snap.producer()
+        error = None
+    except Exception as e:
+        logger.warning(f"Dashboard snapshot '{snap.name}' refresh failed: {e}")
+        value, error = None, str(e)
+    with _lock:
+        if error is None:
+            snap.value = value
+            snap.updated_at = time.time()
+            snap.invalid = False
+        snap.error = error
+        event, snap.refreshing = snap.refreshing, None
+    event.set()
+
+
+def _refresh_async(snap):
+    with _lock:
+        _, started = _begin_refresh(snap)
+    if started:
+        _executor.submit(_run_refresh, snap)
+
+
+def _is_stale(snap, now, overrides):
+    return snap.invalid or now - snap.updated_at >= interval_for(snap, overrides)
+
+
+def _view(snap, now, overrides):
+    age = None if snap.updated_at is None else round(now - snap.updated_at, 1)
+    return {
+        'value': snap.value,
+        'age': age,
+        'stale': age is None or _is_stale(snap, now, overrides),
+        'error': snap.error,
+        'refreshing': snap.refreshing is not None,
+    }
+
+
+def get(name):
+    """{'value', 'age', 'stale', 'error', 'refreshing'} for a widget.
+
+    value is None (with error set) only when the widget has never been
+    produced successfully.
+    """
+    overrides = _overrides()
+    with _lock:
+        snap = _snapshots[name]
+        snap.last_access = time.time()
+        first = snap.updated_at is None
+        if first:
+            event, started = _begin_refresh(snap)
+    if first:
+        if started:
+            _run_refresh(snap)
+        else:
+            event.wait()
+    else:
+        if _is_stale(snap, time.time(), overrides):
+            _refresh_async(snap)
+    _ensure_refresher()
+    with _lock:
+        return _view(snap, time.time(), overrides)
+
+
+def invalidate(name=None):
+    """Mark one widget (or all) stale so the next get() revalidates. Unknown
+    names are ignored."""
+    with _lock:
+        for key, snap in _snapshots.items():
+            if name is None or key == name:
+                snap.invalid = snap.updated_at is not None
+
+
+def status():
+    """Age table for every widget."""
+    overrides = _overrides()
+    now = time.time()
+    with _lock:
+        return {snap.name: {k: v for k, v in _view(snap, now, overrides).items() if k != 'value'}
+                for snap in _snapshots.values()}
+
+
+def _refresher_loop():
+    while True:
+        time.sleep(REFRESHER_TICK)
+        try:
+            overrides = _overrides()
+            now = time.time()
+            with _lock:
+                active = [snap for snap in _snapshots.values()
+                          if snap.updated_at is not None and now - snap.last_access <= ACTIVE_WINDOW]
+            for snap in active:
+                if _is_stale(snap, now, overrides):
+                    _refresh_async(snap)
+        except Exception as e:
+            logger.error(f"Dashboard refresher error: {e}")
+
+
+def _ensure_refresher():
+    global _refresher
+    with _lock:
+        if _refresher is None or not _refresher.is_alive():
+            _refresher = threading.Thread(target=_refresher_loop, name='dashboard-refresher', daemon=True)
+            _refresher.start()
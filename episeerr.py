@@ -1,6 +1,5 @@
 __version__ = "3.8.7"
 from flask import Flask, render_template, request, redirect, url_for, jsonify, session
-import subprocess
 import os
 import atexit
 import re
@@ -24,6 +23,14 @@ import pending_deletions
 from dashboard import dashboard_bp
 from webhooks import sonarr_webhooks_bp, radarr_webhooks_bp
 import media_processor
+import config_store
+import settings_store
+import cleanup_job
+import sonarr_client
+import tag_sync
+import startup_tasks
+import series_artwork
+import dashboard_snapshots
 from settings_db import (
     save_service, get_service, delete_service,
     update_service_test_result, get_all_services,
@@ -314,13 +321,9 @@ def auto_add_quick_link(name, url, icon, open_in_iframe=False, alternate_url=Non
 
 def _is_service_enabled(service_type):
     try:
-        import sqlite3 as _sql
-        from settings_db import DB_PATH as _DB
-        row = _sql.connect(_DB).execute(
-            "SELECT enabled FROM services WHERE service_type = ? AND name = 'default'",
-            (service_type,)
-        ).fetchone()
-        return bool(row[0]) if row is not None else True
+        from settings_db import get_service_row
+        row = get_service_row(service_type, 'default')
+        return bool(row['enabled']) if row is not None else True
     except Exception:
         return True
 
@@ -616,18 +619,8 @@ def toggle_service_enabled(service):
     data = request.get_json(silent=True) or {}
     enabled = bool(data.get('enabled', True))
     try:
-        import sqlite3 as _sql
-        from settings_db import DB_PATH as _DB
-        conn = _sql.connect(_DB)
-        result = conn.execute(
-            "UPDATE services SET enabled = ?, updated_at = CURRENT_TIMESTAMP "
-            "WHERE service_type = ? AND name = 'default'",
-            (1 if enabled else 0, service)
-        )
-        conn.commit()
-        conn.close()
-
-        if result.rowcount == 0:
+        from settings_db import set_service_enabled
+        if not set_service_enabled(service, 'default', enabled):
             # No row yet — likely configured only via env vars and never
             # saved through Setup. Seed a row from that env config so the
             # toggle has something to persist instead of silently 404ing.
@@ -862,17 +855,8 @@ def delete_service_config(service):
         if not existing:
             # get_service filters enabled=1; check the raw row too so a
             # disabled service can still be removed.
-            import sqlite3 as _sql
-            from settings_db import DB_PATH as _DB
-            conn = _sql.connect(_DB)
-            conn.row_factory = _sql.Row
-            row = conn.execute(
-                "SELECT * FROM services WHERE service_type = ? AND name = 'default'",
-                (service,)
-            ).fetchone()
-            conn.close()
-            if row:
-                existing = dict(row)
+            from settings_db import get_service_row
+            existing = get_service_row(service, 'default') or {}
 
         integration = get_integration(service)
         if integration and hasattr(integration, 'on_after_save'):
@@ -1125,9 +1109,6 @@ def invalidate_container_cache():
     _container_cache['ts'] = 0.0
     return jsonify({'status': 'ok'})
 
-# Configuration management
-config_path = os.path.join(app.root_path, 'config', 'config.json')
-
 def get_tmdb_endpoint(endpoint, params=None):
     """Make a request to any TMDB endpoint with the given parameters."""
     base_url = f"https://api.themoviedb.org/3/{endpoint}"
@@ -1205,37 +1186,24 @@ def get_sonarr_stats():
             'recent_stats': None
         }
         
-        # Get disk usage (reuse existing media_processor function)
-        try:
-            from media_processor import get_sonarr_disk_space
-            disk_info = get_sonarr_disk_space()
-            if disk_info:
-                stats['disk_stats'] = {
-                    'used_gb': round(disk_info['total_space_gb'] - disk_info['free_space_gb'], 1),
-                    'free_gb': disk_info['free_space_gb'],
-                    'total_gb': disk_info['total_space_gb'],
-                    'usage_percent': round(((disk_info['total_space_gb'] - disk_info['free_space_gb']) / disk_info['total_space_gb']) * 100, 1)
-                }
-        except Exception as e:
-            app.logger.warning(f"Could not get disk stats: {str(e)}")
-        
-        # Get queue statistics
-        try:
-            response = http.get(f"{sonarr_url}/api/v3/queue", headers=headers, timeout=5)
-            if response.ok:
-                queue_data = response.json()
-                records = queue_data.get('records', [])
-                
-                downloading = len([r for r in records if r.get('status') == 'downloading'])
-                queued = len([r for r in records if r.get('status') in ['queued', 'delay']])
-                
-                stats['queue_stats'] = {
-                    'downloading': downloading,
-                    'queued': queued,
-                    'total': len(records)
-                }
-        except Exception as e:
-            app.logger.warning(f"Could not get queue stats: {str(e)}")
+        # Disk usage and queue come from the dashboard's snapshots, so this
+        # page and the dashboard share one upstream call each
+        disk_info = dashboard_snapshots.get('sonarr_disk')['value']
+        if disk_info:
+            stats['disk_stats'] = {
+                'used_gb': round(disk_info['total_space_gb'] - disk_info['free_space_gb'], 1),
+                'free_gb': disk_info['free_space_gb'],
+                'total_gb': disk_info['total_space_gb'],
+                'usage_percent': round(((disk_info['total_space_gb'] - disk_info['free_space_gb']) / disk_info['total_space_gb']) * 100, 1)
+            }
+
+        queue = dashboard_snapshots.get('sonarr_queue')['value']
+        if queue:
+            stats['queue_stats'] = {
+                'downloading': queue['downloading'],
+                'queued': queue['queued'],
+                'total': queue['total']
+            }
         
         # Get missing episodes count
         try:
@@ -1287,32 +1255,94 @@ def get_sonarr_stats():
             'missing_stats': None,
             'recent_stats': None
         }
+
+dashboard_snapshots.register('sonarr_stats', get_sonarr_stats, interval=60)
+
 # Scheduler
 class OCDarrScheduler:
+    """
+    Deadline-driven cleanup scheduler.
+
+    Instead of waking every 10 minutes to see whether
+    cleanup_interval_hours has elapsed, the scheduler keeps a heap of
+    everything it will have to do and sleeps until the earliest one:
+
+    - the periodic full cleanup and the daily aired-not-downloaded check
+    - the download-queue sweep, every queue_sweep_interval_minutes
+      (default 30, 0 disables)
+    - the missed watch-event check, every reconcile_interval_hours when
+      reconcile_enabled (default 6, 0 = startup only)
+    - the exact moment each managed series (and watched movie) crosses its
+      grace_watched / grace_unwatched / dormant_days threshold
+
+    A crossed deadline triggers a cleanup right away (incremental, so only
+    the due series get evaluated) instead of up to cleanup_interval_hours
+    later.
+
+    The heap is rebuilt whenever config_store reports a write (rule edits,
+    watch events updating activity dates), when global settings are saved,
+    and at least every REPLAN_SECONDS so out-of-process changes are caught.
+    Deadline-triggered runs are spaced at least cleanup_min_gap_minutes
+    (default 30) apart so a burst of deadlines becomes one cleanup.
+    """
+
+    STARTUP_DELAY = 300
+    REPLAN_SECONDS = 3600
+    DEFAULT_MIN_GAP_MINUTES = 30
+    DEFAULT_QUEUE_SWEEP_MINUTES = 30
+    DEFAULT_RECONCILE_HOURS = 6
+
     def __init__(self):
         self.cleanup_thread = None
         self.running = False
         self.last_cleanup = 0
         self.last_aired_check = 0
+        self.last_queue_sweep = 0
+        self.last_reconcile_check = 0
+        self.started_at = time.time()
+        self._heap = []
+        self._heap_lock = Lock()
+        self._wake = threading.Event()
+        self._planned_version = None
+        self._planned_at = 0
+        self.min_gap_minutes = self.DEFAULT_MIN_GAP_MINUTES
+        self.queue_sweep_minutes = self.DEFAULT_QUEUE_SWEEP_MINUTES
+        self.reconcile_hours = 0
+        self._settings_version = None
         self.update_interval_from_settings()
 
     def update_interval_from_settings(self):
-        """Update cleanup interval from global settings."""
+        """Update cleanup interval from global settings (also the
+        settings_store listener, so a saved change replans right away)."""
         try:
-            import media_processor
-            global_settings = media_processor.load_global_settings()
+            global_settings = settings_store.load_settings()
+            self._settings_version = settings_store.get_version()
             self.cleanup_interval_hours = global_settings.get('cleanup_interval_hours', 6)
+            self.min_gap_minutes = global_settings.get('cleanup_min_gap_minutes', self.DEFAULT_MIN_GAP_MINUTES)
+            self.queue_sweep_minutes = global_settings.get('queue_sweep_interval_minutes', self.DEFAULT_QUEUE_SWEEP_MINUTES)
+            self.reconcile_hours = (global_settings.get('reconcile_interval_hours', self.DEFAULT_RECONCILE_HOURS)
+                                    if global_settings.get('reconcile_enabled', False) else 0)
         except:
             self.cleanup_interval_hours = 6  # Fallback
+        self.request_replan()
+
+    def request_replan(self):
+        """Rebuild the deadline heap on the scheduler thread as soon as possible."""
+        self._planned_version = None
+        self._wake.set()
 
     def start_scheduler(self):
         if self.running:
             return
         self.running = True
+        self.started_at = time.time()
+        config_store.add_listener(self.request_replan)
+        settings_store.add_listener(self.update_interval_from_settings)
         self.cleanup_thread = threading.Thread(target=self._scheduler_loop, daemon=True)
         self.cleanup_thread.start()
 
-        # One-shot startup checks - no periodic interval for either.
+        # Startup checks - the missed watch-event check then repeats every
+        # reconcile_interval_hours (see _plan); the delay-tag check is one-shot.
         def _startup_reconcile_check():
             try:
                 import reconcile
@@ -1328,78 +1358,196 @@ class OCDarrScheduler:
                 print(f"Startup reconcile check error: {e}")
         threading.Thread(target=_startup_reconcile_check, daemon=True).start()
 
-        print(f"✓ Global storage gate scheduler started - cleanup every {self.cleanup_interval_hours} hours")
-    
+        print(f"✓ Global storage gate scheduler started - cleanup every {self.cleanup_interval_hours} hours, plus on grace/dormant deadlines")
+
+    def _plan(self):
+        """Rebuild the heap of (due_ts, kind, label)."""
+        import heapq
+        import cleanup_state
+        import movie_processor
+
+        earliest = self.started_at + self.STARTUP_DELAY
+        min_gap = float(self.min_gap_minutes or 0) * 60
+        heap = []
+
+        if self.last_cleanup:
+            heap.append((self.last_cleanup + self.cleanup_interval_hours * 3600, 'cleanup', 'scheduled cleanup'))
+        else:
+            heap.append((earliest, 'cleanup', 'startup cleanup'))
+        heap.append((max(earliest, self.last_aired_check + 86400), 'aired_check', 'aired-not-downloaded check'))
+        try:
+            sweep_seconds = float(self.queue_sweep_minutes or 0) * 60
+        except (TypeError, ValueError):
+            sweep_seconds = self.DEFAULT_QUEUE_SWEEP_MINUTES * 60
+        if sweep_seconds > 0:
+            # The startup tasks already swept the queue once
+            last_sweep = self.last_queue_sweep or self.started_at
+            heap.append((last_sweep + sweep_seconds, 'queue_sweep', 'download queue sweep'))
+        try:
+            reconcile_seconds = float(self.reconcile_hours or 0) * 3600
+        except (TypeError, ValueError):
+            reconcile_seconds = self.DEFAULT_RECONCILE_HOURS * 3600
+        if reconcile_seconds > 0:
+            # The startup check already ran once
+            last_check = self.last_reconcile_check or self.started_at
+            heap.append((last_check + reconcile_seconds, 'reconcile_check', 'missed watch-event check'))
+
+        try:
+            version = config_store.get_version()
+            config = config_store.load_config()
+            movie_events = movie_processor._build_webhook_watch_cache()
+            not_before = max(earliest, self.last_cleanup + min_gap if self.last_cleanup else 0)
+            for due, kind, label in cleanup_state.upcoming_deadlines(config, self.last_cleanup, movie_events):
+                heap.append((max(due, not_before), 'deadline', f"{kind} deadline: {label}"))
+            self._planned_version = version
+        except Exception as e:
+            logger.error(f"Error planning cleanup deadlines: {e}")
+            self._planned_version = None
+
+        heapq.heapify(heap)
+        with self._heap_lock:
+            self._heap = heap
+        self._planned_at = time.time()
+
+    def _needs_replan(self):
+        if settings_store.get_version() != self._settings_version:
+            # Edited by another process - in-process saves already notified us
+            self.update_interval_from_settings()
+        if self._planned_version is None or time.time() - self._planned_at >= self.REPLAN_SECONDS:
+            return True
+        try:
+            return config_store.get_version() != self._planned_version
+        except Exception:
+            return True
+
+    def _pop_due(self, now):
+        """Remove and return every heap entry due at or before now."""
+        import heapq
+        due = []
+        with self._heap_lock:
+            while self._heap and self._heap[0][0] <= now:
+                due.append(heapq.heappop(self._heap))
+        return due
+
     def _scheduler_loop(self):
-        time.sleep(300)  # Wait 5 minutes after startup
         while self.running:
             try:
-                # Update interval from settings each loop
-                self.update_interval_from_settings()
-                
-                current_time = time.time()
-                hours_since_last = (current_time - self.last_cleanup) / 3600
-                
-                if hours_since_last >= self.cleanup_interval_hours:
-                    print("⏰ Starting scheduled global storage gate cleanup...")
+                if self._needs_replan():
+                    self._plan()
+
+                now = time.time()
+                due = self._pop_due(now)
+                if not due:
+                    with self._heap_lock:
+                        next_due = self._heap[0][0] if self._heap else now + self.REPLAN_SECONDS
+                    timeout = min(max(next_due - now, 1), self.REPLAN_SECONDS)
+                    self._wake.wait(timeout)
+                    self._wake.clear()
+                    continue
+
+                kinds = {kind for _, kind, _ in due}
+                if kinds & {'cleanup', 'deadline'}:
+                    reasons = sorted({label for _, kind, label in due if kind in ('cleanup', 'deadline')})
+                    print(f"⏰ Starting cleanup ({len(reasons)} trigger(s): {', '.join(reasons[:3])}"
+                          f"{'...' if len(reasons) > 3 else ''})")
+                    self.last_cleanup = time.time()
                     self._run_cleanup()
-                    self.last_cleanup = current_time
 
-                # Daily aired-but-not-downloaded notification check
-                hours_since_aired = (current_time - self.last_aired_check) / 3600
-                if hours_since_aired >= 24:
+                if 'aired_check' in kinds:
+                    # Daily aired-but-not-downloaded notification check
                     try:
                         check_aired_not_downloaded()
                     except Exception as aired_err:
                         print(f"Aired not downloaded check error: {aired_err}")
-                    self.last_aired_check = current_time
+                    self.last_aired_check = time.time()
 
-                time.sleep(600)  # Check every 10 minutes
+                if 'queue_sweep' in kinds:
+                    try:
+                        episeerr_utils.check_and_cancel_unmonitored_downloads()
+                    except Exception as sweep_err:
+                        print(f"Download queue sweep error: {sweep_err}")
+                    self.last_queue_sweep = time.time()
+
+                if 'reconcile_check' in kinds:
+                    # History sweeps can be slow - don't hold up the heap
+                    def _reconcile_check():
+                        try:
+                            import reconcile
+                            reconcile.check_for_missed_watch_events()
+                        except Exception as reconcile_err:
+                            print(f"Missed watch-event check error: {reconcile_err}")
+                    threading.Thread(target=_reconcile_check, name='reconcile-check', daemon=True).start()
+                    self.last_reconcile_check = time.time()
+
+                # Anything handled above moves the interval / gap / daily anchors
+                self._planned_version = None
             except Exception as e:
                 print(f"Scheduler error: {str(e)}")
-                time.sleep(300)
+                self._wake.wait(300)
+                self._wake.clear()
     
     def _run_cleanup(self):
+        """Run the unified cleanup in-process (cleanup_job) and wait for it.
+        Joins a manual run that is already in progress instead of starting a
+        second one."""
         try:
-            import media_processor
-            # Use subprocess to run the unified cleanup
-            result = subprocess.run(["python3", os.path.join(os.getcwd(), "media_processor.py")], capture_output=True, text=True)
-            
-            # FIXED: Check return code instead of stderr
-            if result.returncode != 0:
-                print(f"Cleanup failed with return code {result.returncode}")
-                if result.stderr:
-                    print(f"Cleanup errors: {result.stderr}")
-            # Remove the automatic stderr logging
-            
-            print("✓ Scheduled cleanup completed (unified 3-function cleanup)")
-            return result
-            
+            job = cleanup_job.run(trigger='scheduled')
+            if job.status == 'failed':
+                print(f"Cleanup failed: {job.error}")
+            else:
+                print(f"✓ Scheduled cleanup {job.status} (unified 3-function cleanup)")
+            return job
+
         except Exception as e:
             print(f"Cleanup failed: {str(e)}")
             return None
 
     def force_cleanup(self):
-        cleanup_thread = threading.Thread(target=self._run_cleanup, daemon=True)
-        cleanup_thread.start()
+        job, started = cleanup_job.start(trigger='manual')
+        if not started:
+            return f"Cleanup already running (job {job.job_id})"
         return "Unified cleanup started"
+
+    def get_upcoming(self, limit=20):
+        """The next `limit` heap entries, soonest first."""
+        import heapq
+        with self._heap_lock:
+            entries = heapq.nsmallest(limit, self._heap)
+        return [
+            {
+                'due': datetime.fromtimestamp(due).strftime("%Y-%m-%d %H:%M:%S"),
+                'due_ts': int(due),
+                'kind': kind,
+                'label': label,
+            }
+            for due, kind, label in entries
+        ]
     
     def get_status(self):
         if not self.running:
             return {"status": "stopped", "next_cleanup": None}
-        
-        if self.last_cleanup == 0:
+
+        upcoming = self.get_upcoming()
+        next_run = next((e for e in upcoming if e['kind'] in ('cleanup', 'deadline')), None)
+        if next_run:
+            next_cleanup = next_run['due']
+        elif self.last_cleanup == 0:
             next_cleanup = "5 minutes after startup"
         else:
             next_time = self.last_cleanup + (self.cleanup_interval_hours * 3600)
             next_cleanup = datetime.fromtimestamp(next_time).strftime("%Y-%m-%d %H:%M:%S")
             
+        with self._heap_lock:
+            queued = len(self._heap)
         return {
             "status": "running",
             "type": "global_storage_gate",
             "interval_hours": self.cleanup_interval_hours,
             "last_cleanup": datetime.fromtimestamp(self.last_cleanup).strftime("%Y-%m-%d %H:%M:%S") if self.last_cleanup else "Never",
-            "next_cleanup": next_cleanup
+            "next_cleanup": next_cleanup,
+            "queued_deadlines": queued,
+            "upcoming": upcoming,
+            "cleanup_job": cleanup_job.get_status()['current'],
         }
 
 # Cleanup Logging
@@ -1463,11 +1611,7 @@ def rules_page():
     sonarr_url = sonarr_preferences['SONARR_URL']
     
     # Map series to their assigned rules
-    rules_mapping = {}
-    for rule_name, details in config['rules'].items():
-        series_dict = details.get('series', {})
-        for series_id in series_dict.keys():
-            rules_mapping[str(series_id)] = rule_name
+    rules_mapping = config_store.rule_assignments()
     
     for series in all_series:
         series['assigned_rule'] = rules_mapping.get(str(series['id']), 'None')
@@ -1544,31 +1688,26 @@ def api_series_data_enhanced():
         sonarr_url = os.environ.get('SONARR_URL')
         sonarr_api_key = os.environ.get('SONARR_API_KEY')
         
-        headers = {'X-Api-Key': sonarr_api_key}
-        response = http.get(f'{sonarr_url}/api/v3/series', headers=headers)
-        
-        if response.status_code != 200:
+        try:
+            snapshot = sonarr_client.get_all_series(url=sonarr_url, api_key=sonarr_api_key)
+        except requests.exceptions.RequestException:
             return jsonify({'success': False, 'error': 'Failed to fetch from Sonarr'}), 500
         
-        series_data = response.json()
-        config_data = load_config()
+        rules_mapping = config_store.rule_assignments()
         
-        # Enhance each series with rule assignment and poster URL
-        for series in series_data:
+        # Enhance each series with rule assignment and poster URL (on a
+        # shallow copy - the snapshot is shared with other requests)
+        series_data = []
+        for series in snapshot:
+            series = dict(series)
             series_id = series.get('id')
             
-            # Find assigned rule
-            assigned_rule = None
-            for rule_name, rule_details in config_data.get('rules', {}).items():
-                if series_id in rule_details.get('series', []):
-                    assigned_rule = rule_name
-                    break
-            
-            series['assigned_rule'] = assigned_rule
+            series['assigned_rule'] = rules_mapping.get(str(series_id))
             
             # Add poster URL - Sonarr provides this in images array
             # but we'll construct the direct URL for easier access
             series['poster_url'] = f"{sonarr_url}/api/v3/mediacover/{series_id}/poster.jpg?apikey={sonarr_api_key}"
+            series_data.append(series)
         
         return jsonify({
             'success': True,
@@ -1633,7 +1772,7 @@ def approve_pending_deletions():
         if not episode_ids:
             return jsonify({'success': False, 'error': 'No episodes specified'}), 400
         
-        result = pending_deletions.approve_deletions(episode_ids, delete_episodes_immediately)
+        result = pending_deletions.approve_deletions(set(episode_ids), delete_episodes_immediately)
         
         return jsonify({
             'success': True,
@@ -1646,6 +1785,14 @@ def approve_pending_deletions():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+@app.route('/api/pending-deletions/approve-status')
+def pending_deletions_approve_status():
+    """Progress of the running (or last) approval, polled by the page while
+    /pending-deletions/approve is still working through the series."""
+    import pending_deletions
+    return jsonify(pending_deletions.get_approval_progress())
+
+
 @app.route('/pending-deletions/reject', methods=['POST'])
 def reject_pending_deletions():
     """Reject deletions and add to rejection cache"""
@@ -1701,7 +1848,7 @@ def clear_pending_deletions():
 def get_pending_deletions_count():
     """API endpoint to get count of pending deletions for notifications"""
     import pending_deletions
-    ep_summary = pending_deletions.get_pending_deletions_summary()
+    ep_summary = pending_deletions.get_pending_totals()
     movie_summary = pending_deletions.get_pending_movies_summary()
     return jsonify({
         'count': ep_summary['total_episodes'] + movie_summary['total_movies'],
@@ -2352,93 +2499,37 @@ def clear_old_logs():
 # SIMPLIFIED CONFIG MANAGEMENT
 # ============================================================================
 
-_config_cache = None
-_config_cache_time = 0
-_CONFIG_CACHE_TTL = 30  # seconds
-
-def _invalidate_config_cache():
-    global _config_cache, _config_cache_time
-    _config_cache = None
-    _config_cache_time = 0
-
 def load_config():
-    """Load configuration with simplified migration."""
-    global _config_cache, _config_cache_time
-    now = time.time()
-    if _config_cache is not None and (now - _config_cache_time) < _CONFIG_CACHE_TTL:
-        return _config_cache
-    try:
-        # REMOVED: Backup on every load (was causing spam)
-        with open(config_path, 'r') as file:
-            config = json.load(file)
-        if 'rules' not in config:
-            config['rules'] = {}
-        
-        # Migration: Add grace_scope to existing rules
-        migrated = False
-        for rule_name, rule_details in config.get('rules', {}).items():
-            if 'grace_scope' not in rule_details:
-                rule_details['grace_scope'] = 'series'  # Default to current behavior
-                migrated = True
-        
-        if migrated:
-            save_config(config)
-            app.logger.info("✓ Migrated rules to include grace_scope field (defaulted to 'series')")
-
-        _config_cache = config
-        _config_cache_time = time.time()
-        return config
-    except FileNotFoundError:
-        default_config = {
-            'rules': {
-                'default': {
-                    'get_type': 'episodes',
-                    'get_count': 1,
-                    'keep_type': 'episodes',
-                    'keep_count': 1,
-                    'action_option': 'search',
-                    'monitor_watched': False,
-                    'grace_watched': None,
-                    'grace_unwatched': None,
-                    'dormant_days': None,
-                    'grace_scope': 'series',
-                    'series': {},
-                    'dry_run': False
-                }
-            },
-            'default_rule': 'default'
-        }
-        os.makedirs(os.path.dirname(config_path), exist_ok=True)
-        save_config(default_config)
-        return default_config
+    """Load configuration (a private copy - publish changes with save_config)."""
+    return config_store.load_config()
 
 
 def save_config(config):
-    """Save configuration to JSON file with automatic backup."""
-    _invalidate_config_cache()
+    """Save configuration - config_store handles the .bak copy and atomic write."""
     try:
-        os.makedirs(os.path.dirname(config_path), exist_ok=True)
-        
-        # Backup BEFORE saving (only when actually writing)
-        if os.path.exists(config_path):
-            backup_path = config_path + '.bak'
-            try:
-                shutil.copy2(config_path, backup_path)
-                app.logger.debug(f"Backed up config.json to {backup_path}")
-            except Exception as e:
-                app.logger.warning(f"Could not backup config.json: {e}")
-        
-        # Write to a temp file then rename so concurrent writes can't corrupt the file
-        tmp_path = config_path + '.tmp'
-        with open(tmp_path, 'w') as file:
-            json.dump(config, file, indent=4)
-        os.replace(tmp_path, config_path)
-        app.logger.debug("Config saved successfully")
+        config_store.save_config(config)
     except Exception as e:
         app.logger.error(f"Save failed: {str(e)}")
         raise
 
 
+@app.route('/api/config/export')
+def export_config():
+    """Download config.json as it stands, journaled edits included."""
+    from flask import Response
+    try:
+        content = json.dumps(config_store.export_config(), indent=4)
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        return Response(
+            content,
+            mimetype='application/json',
+            headers={'Content-Disposition': f'attachment; filename=episeerr_config_{timestamp}.json'}
+        )
+    except Exception as e:
+        app.logger.error(f"Config export failed: {str(e)}")
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+
+
 # Add this new function after load_config():
 
 def backup_global_settings():
@@ -2562,14 +2653,15 @@ def get_sonarr_series():
         }
         sonarr_url = sonarr_preferences['SONARR_URL']
         
-        # Get all series
-        response = http.get(f"{sonarr_url}/api/v3/series", headers=headers)
-        if not response.ok:
-            app.logger.error(f"Failed to fetch series from Sonarr: {response.status_code}")
+        # Get all series - a private copy: the pages annotate and sort it,
+        # and the shared snapshot is read by other threads
+        try:
+            all_series = sonarr_client.get_all_series(url=sonarr_url, api_key=sonarr_preferences['SONARR_API_KEY'],
+                                                      copy=True)
+        except requests.exceptions.HTTPError as e:
+            app.logger.error(f"Failed to fetch series from Sonarr: {e}")
             return []
         
-        all_series = response.json()
-        
         # Get all tags to find 'watched' tag ID
         tags_response = http.get(f"{sonarr_url}/api/v3/tag", headers=headers)
         if tags_response.ok:
@@ -2629,17 +2721,13 @@ def series_management():  # Changed from index to avoid confusion
     except requests.exceptions.ConnectionError:
         all_series = []
         app.logger.warning("Sonarr not reachable - showing empty series list")
-    sonarr_stats = get_sonarr_stats()
+    sonarr_stats = dashboard_snapshots.get('sonarr_stats')['value']
     
     # Get SONARR_URL for template links
     sonarr_preferences = sonarr_utils.load_preferences()
     sonarr_url = sonarr_preferences['SONARR_URL']
     
-    rules_mapping = {}
-    for rule_name, details in config['rules'].items():
-        series_dict = details.get('series', {})
-        for series_id in series_dict.keys():
-            rules_mapping[str(series_id)] = rule_name
+    rules_mapping = config_store.rule_assignments()
     for series in all_series:
         series['assigned_rule'] = rules_mapping.get(str(series['id']), 'None')
     all_series.sort(key=lambda x: x.get('title', '').lower())
@@ -2661,10 +2749,12 @@ def series_management():  # Changed from index to avoid confusion
 def get_sonarr_stats_api():
     """Get Sonarr statistics via API."""
     try:
-        stats = get_sonarr_stats()
+        snap = dashboard_snapshots.get('sonarr_stats')
         return jsonify({
             'status': 'success',
-            'stats': stats
+            'stats': snap['value'],
+            'age': snap['age'],
+            'stale': snap['stale']
         })
     except Exception as e:
         app.logger.error(f"Error in sonarr stats API: {str(e)}")
@@ -2721,10 +2811,7 @@ def radarr_movies():
 
         result = []
         for m in movies:
-            poster = next(
-                (img['remoteUrl'] for img in m.get('images', []) if img.get('coverType') == 'poster'),
-                None
-            )
+            poster = series_artwork.cover_urls(m)['poster']
             # Prefer config.json assignment; fall back to Radarr tags
             assigned_rule = config_movie_rule.get(str(m['id']))
             if assigned_rule is None:
@@ -3228,17 +3315,8 @@ def unified_search():
     # Pre-load watch history — most recent event per series title
     _watches_by_title = {}
     try:
-        import json as _json_lib
-        from activity_storage import WATCHES_FILE
-        if os.path.exists(WATCHES_FILE):
-            with open(WATCHES_FILE) as _wf:
-                for _we in _json_lib.load(_wf):
-                    _wt = (_we.get('series_title') or '').lower()
-                    if not _wt:
-                        continue
-                    ts = _we.get('timestamp', 0)
-                    if _wt not in _watches_by_title or ts > _watches_by_title[_wt].get('timestamp', 0):
-                        _watches_by_title[_wt] = _we
+        from activity_storage import get_latest_watches_by_title
+        _watches_by_title = get_latest_watches_by_title()
     except Exception:
         pass
 
@@ -3254,70 +3332,63 @@ def unified_search():
 
     # Library: Series from Sonarr
     try:
-        config = load_config()
-        rules_mapping = {}
-        for rule_name, details in config.get('rules', {}).items():
-            for sid in details.get('series', {}).keys():
-                rules_mapping[str(sid)] = rule_name
+        rules_mapping = config_store.rule_assignments()
         prefs = sonarr_utils.load_preferences()
         s_url = prefs.get('SONARR_URL', '')
         s_key = prefs.get('SONARR_API_KEY', '')
         if s_url and s_key:
-            resp = http.get(f"{s_url}/api/v3/series",
-                            headers={'X-Api-Key': s_key}, timeout=5)
-            if resp.ok:
-                for s in resp.json():
-                    title = s.get('title', '')
-                    if q not in title.lower():
-                        continue
-                    rule = rules_mapping.get(str(s['id']))
-                    links = []
-                    slug = s.get('titleSlug', '')
-                    if slug:
+            for s in sonarr_client.get_all_series(url=s_url, api_key=s_key):
+                title = s.get('title', '')
+                if q not in title.lower():
+                    continue
+                rule = rules_mapping.get(str(s['id']))
+                links = []
+                slug = s.get('titleSlug', '')
+                if slug:
+                    links.append({
+                        'label': 'Sonarr',
+                        'url': f"{s_url.rstrip('/')}/series/{slug}",
+                        'icon': 'fas fa-satellite-dish',
+                        'action': 'open_tab',
+                    })
+                if rule:
+                    links.append({
+                        'label': f'Rule: {rule}',
+                        'url': f'/rules?highlight={rule}',
+                        'icon': 'fas fa-list',
+                        'action': 'navigate',
+                    })
+                # Single Watched chip — always from the watched.jsonl activity log (most recent).
+                # Clickable → Tautulli when configured; static badge otherwise.
+                # Cross-service grouping skips adding a second chip (dedup below).
+                _lw = _watches_by_title.get(title.lower())
+                if _lw:
+                    if _tautulli_url:
                         links.append({
-                            'label': 'Sonarr',
-                            'url': f"{s_url.rstrip('/')}/series/{slug}",
-                            'icon': 'fas fa-satellite-dish',
+                            'label': 'Watched',
+                            'url': _tautulli_url,
+                            'icon': 'fas fa-eye',
                             'action': 'open_tab',
                         })
-                    if rule:
+                    else:
                         links.append({
-                            'label': f'Rule: {rule}',
-                            'url': f'/rules?highlight={rule}',
-                            'icon': 'fas fa-list',
-                            'action': 'navigate',
+                            'label': f"Watched {time_ago(_lw.get('timestamp', 0))}",
+                            'url': None,
+                            'icon': 'fas fa-eye',
+                            'action': None,
+                            'static': True,
                         })
-                    # Single Watched chip — always from watched.json (most recent).
-                    # Clickable → Tautulli when configured; static badge otherwise.
-                    # Cross-service grouping skips adding a second chip (dedup below).
-                    _lw = _watches_by_title.get(title.lower())
-                    if _lw:
-                        if _tautulli_url:
-                            links.append({
-                                'label': 'Watched',
-                                'url': _tautulli_url,
-                                'icon': 'fas fa-eye',
-                                'action': 'open_tab',
-                            })
-                        else:
-                            links.append({
-                                'label': f"Watched {time_ago(_lw.get('timestamp', 0))}",
-                                'url': None,
-                                'icon': 'fas fa-eye',
-                                'action': None,
-                                'static': True,
-                            })
-                    results.append({
-                        'category': 'Library',
-                        'title': title,
-                        'subtitle': s.get('status', '').title(),
-                        'action': 'navigate',
-                        'url': f"/series?highlight={s['id']}",
-                        'icon': 'fas fa-tv',
-                        'badge': None,
-                        'data': None,
-                        'links': links,
-                    })
+                results.append({
+                    'category': 'Library',
+                    'title': title,
+                    'subtitle': s.get('status', '').title(),
+                    'action': 'navigate',
+                    'url': f"/series?highlight={s['id']}",
+                    'icon': 'fas fa-tv',
+                    'badge': None,
+                    'data': None,
+                    'links': links,
+                })
     except Exception:
         pass
 
@@ -3441,18 +3512,15 @@ def unified_search():
     except Exception:
         pass
 
-    # Recent activity (watches + episode downloads from activity_storage files)
+    # Recent activity (watches + episode downloads from activity_storage)
     try:
-        import json as _json
-        from activity_storage import WATCHES_FILE, SEARCHES_FILE
+        from activity_storage import get_recent_watches, get_recent_searches
         _activity_events = []
-        for _filepath, _badge in [(WATCHES_FILE, 'Watched'), (SEARCHES_FILE, 'Downloaded')]:
-            if os.path.exists(_filepath):
-                with open(_filepath) as _f:
-                    for _e in _json.load(_f):
-                        _title = _e.get('series_title', '')
-                        if _title and q in _title.lower():
-                            _activity_events.append((_e.get('timestamp', 0), _e, _badge))
+        for _events, _badge in [(get_recent_watches(), 'Watched'), (get_recent_searches(), 'Downloaded')]:
+            for _e in _events:
+                _title = _e.get('series_title', '')
+                if _title and q in _title.lower():
+                    _activity_events.append((_e.get('timestamp', 0), _e, _badge))
         _activity_events.sort(key=lambda x: x[0], reverse=True)
         _seen_act = set()
         for _ts, _e, _badge in _activity_events[:6]:
@@ -3875,7 +3943,7 @@ def unified_search():
         for sec in group[1:]:
             cat = sec['category']
             if cat == 'Tautulli':
-                # Skip if a Watched chip was already added in Tier 1 (from watched.json)
+                # Skip if a Watched chip was already added in Tier 1 (from the watched.jsonl activity log)
                 if not any(l.get('label', '').startswith('Watched') for l in primary['links']):
                     primary['links'].append({
                         'label': 'Watched',
@@ -4021,12 +4089,9 @@ def _enrich_tmdb_results(items):
         sonarr_url = prefs.get('SONARR_URL')
         api_key = prefs.get('SONARR_API_KEY')
         if sonarr_url and api_key:
-            headers = {'X-Api-Key': api_key}
-            resp = http.get(f"{sonarr_url}/api/v3/series", headers=headers, timeout=10)
-            if resp.ok:
-                for s in resp.json():
-                    if s.get('tmdbId'):
-                        sonarr_by_tmdb[int(s['tmdbId'])] = s['id']
+            for s in sonarr_client.get_all_series(url=sonarr_url, api_key=api_key):
+                if s.get('tmdbId'):
+                    sonarr_by_tmdb[int(s['tmdbId'])] = s['id']
     except Exception:
         pass
 
@@ -4207,34 +4272,16 @@ def _cleanup_rule_tag_from_sonarr(rule_name):
         return tag_removed
 
     try:
-        headers = episeerr_utils.get_sonarr_headers()
-        series_response = http.get(f"{SONARR_URL}/api/v3/series", headers=headers)
-        if series_response.ok:
-            all_series = series_response.json()
-            removed_from_count = 0
-
-            for series in all_series:
-                tags = series.get('tags', [])
-                if tag_id in tags:
-                    tags.remove(tag_id)
-                    series['tags'] = tags
-                    update_resp = http.put(
-                        f"{SONARR_URL}/api/v3/series/{series['id']}",
-                        headers=headers,
-                        json=series
-                    )
-                    if update_resp.ok:
-                        removed_from_count += 1
-                        tag_removed = True
-                    else:
-                        app.logger.warning(f"Failed to remove tag from series {series['id']}")
-
-            if removed_from_count > 0:
-                app.logger.info(f"Removed deleted rule tag '{rule_name}' from {removed_from_count} series")
-            else:
-                app.logger.debug(f"No series had the tag for deleted rule '{rule_name}'")
+        report = tag_sync.apply_plan(tag_sync.plan_tag_removal(tag_id))
+        removed_from_count = report['series_updated']
+        if report['failed']:
+            app.logger.warning(f"Failed to remove tag from series {report['failed']}")
+
+        if removed_from_count > 0:
+            tag_removed = True
+            app.logger.info(f"Removed deleted rule tag '{rule_name}' from {removed_from_count} series")
         else:
-            app.logger.error("Failed to fetch series list for tag cleanup")
+            app.logger.debug(f"No series had the tag for deleted rule '{rule_name}'")
     except Exception as e:
         app.logger.warning(f"Could not clean up tag for deleted rule '{rule_name}': {str(e)}")
 
@@ -4485,20 +4532,14 @@ def _assign_series_ids_to_rule(config, rule_name, series_ids):
             except Exception as e:
                 app.logger.error(f"always_have processing failed for series {sid}: {e}")
 
-    # Sync tags to Sonarr
-    tag_sync_success = 0
-    tag_sync_failed = 0
-    for series_id in series_ids:
-        try:
-            success = episeerr_utils.sync_rule_tag_to_sonarr(int(series_id), rule_name)
-            if success:
-                tag_sync_success += 1
-            else:
-                tag_sync_failed += 1
-                app.logger.warning(f"Failed to sync tag for series {series_id}")
-        except Exception as e:
-            tag_sync_failed += 1
-            app.logger.error(f"Error syncing tag for series {series_id}: {str(e)}")
+    # Sync tags to Sonarr (batched through the series editor)
+    try:
+        report = tag_sync.sync_rule_tags({int(sid): rule_name for sid in series_ids})
+        tag_sync_failed = len(report.get('failed', [])) + len(report['skipped']) + len(report['not_found'])
+        tag_sync_success = len(series_ids) - tag_sync_failed
+    except Exception as e:
+        app.logger.error(f"Error syncing tags for {len(series_ids)} series: {str(e)}")
+        tag_sync_success, tag_sync_failed = 0, len(series_ids)
 
     return preserved_count, tag_sync_success, tag_sync_failed
 
@@ -4540,20 +4581,13 @@ def assign_rules():
 def api_series_list():
     """JSON: all Sonarr series with poster + assigned rule, for a native client's series browser."""
     try:
-        config = load_config()
         all_series = get_sonarr_series()
 
-        rules_mapping = {}
-        for rule_name, details in config['rules'].items():
-            for series_id in details.get('series', {}).keys():
-                rules_mapping[str(series_id)] = rule_name
+        rules_mapping = config_store.rule_assignments()
 
         result = []
         for series in all_series:
-            poster = next(
-                (img['remoteUrl'] for img in series.get('images', []) if img.get('coverType') == 'poster'),
-                None
-            )
+            poster = series_artwork.cover_urls(series)['poster']
             result.append({
                 'id': series['id'],
                 'title': series.get('title', ''),
@@ -4663,16 +4697,13 @@ def unassign_series():
     tag_removal_success = 0
     tag_removal_failed = 0
     
-    for series_id in series_ids:
-        try:
-            success = episeerr_utils.remove_all_episeerr_tags(int(series_id))
-            if success:
-                tag_removal_success += 1
-            else:
-                tag_removal_failed += 1
-        except Exception as e:
-            tag_removal_failed += 1
-            app.logger.error(f"Error removing tags from series {series_id}: {str(e)}")
+    try:
+        report = tag_sync.sync_rule_tags({int(sid): None for sid in series_ids})
+        tag_removal_success = report.get('series_updated', 0)
+        tag_removal_failed = len(report.get('failed', [])) + len(report['not_found'])
+    except Exception as e:
+        tag_removal_failed = len(series_ids)
+        app.logger.error(f"Error removing tags from {len(series_ids)} series: {str(e)}")
     
     message = f"Unassigned {len(series_ids)} series from all rules"
     if tag_removal_success > 0:
@@ -4696,11 +4727,7 @@ def get_series_with_titles():
         all_series = get_sonarr_series()
         
         # Build assignment mapping
-        assignments = {}
-        for rule_name, details in config['rules'].items():
-            series_dict = details.get('series', {})
-            for series_id in series_dict.keys():
-                assignments[str(series_id)] = rule_name
+        assignments = config_store.rule_assignments()
         
         # Format for dropdown
         series_list = []
@@ -4768,11 +4795,10 @@ def series_stats():
         config = load_config()
         all_series = get_sonarr_series()
         all_series_ids = set(str(s['id']) for s in all_series)
-        rules_mapping = {}
-        for rule_name, details in config['rules'].items():
-            for series_id in details.get('series', {}):
-                if str(series_id) in all_series_ids:  # ignore stale config entries
-                    rules_mapping[str(series_id)] = rule_name
+        rules_mapping = {
+            sid: rule_name for sid, rule_name in config_store.rule_assignments().items()
+            if sid in all_series_ids  # ignore stale config entries
+        }
         stats = {
             'total_series': len(all_series),
             'assigned_series': len(rules_mapping),
@@ -4903,15 +4929,10 @@ def cleanup():
 def api_series_with_status():
     """Get series with enhanced status information for the sortable table."""
     try:
-        config = load_config()
         all_series = get_sonarr_series()
         
         # Build assignment mapping
-        assignments = {}
-        for rule_name, details in config['rules'].items():
-            series_dict = details.get('series', {})
-            for series_id in series_dict.keys():
-                assignments[str(series_id)] = rule_name
+        assignments = config_store.rule_assignments()
         
         enhanced_series = []
         for series in all_series:
@@ -5017,6 +5038,7 @@ def update_global_settings():
         # Hold automation (vacation mode) + missed watch-event detection
         automation_held = data.get('automation_held', False)
         reconcile_enabled = data.get('reconcile_enabled', False)
+        reconcile_interval_hours = data.get('reconcile_interval_hours', 6)
 
         # Validate inputs
         if storage_min_gb is not None:
@@ -5036,13 +5058,14 @@ def update_global_settings():
 
             'automation_held': bool(automation_held),
             'reconcile_enabled': bool(reconcile_enabled),
+            'reconcile_interval_hours': max(0, int(reconcile_interval_hours if reconcile_interval_hours is not None else 6)),
         }
 
+        # Keep settings this form doesn't edit (cleanup_workers,
+        # queue_sweep_interval_minutes, ...)
+        settings = {**media_processor.load_global_settings(), **settings}
+        # The scheduler listens on settings_store and replans by itself
         media_processor.save_global_settings(settings)
-        try:
-            cleanup_scheduler.update_interval_from_settings()
-        except Exception:
-            pass
         
         app.logger.info(f"Global settings updated: {settings}")
         
@@ -5203,6 +5226,46 @@ def force_cleanup():
         print(f"Failed to start manual cleanup: {str(e)}")
         return jsonify({"status": "error", "message": str(e)}), 500
 
+@app.route('/api/cleanup-job')
+def cleanup_job_status():
+    """Progress of the running cleanup (phase, series processed/total,
+    bytes freed, ETA) plus the last few finished runs."""
+    try:
+        return jsonify(cleanup_job.get_status())
+    except Exception as e:
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+@app.route('/api/cleanup-job/cancel', methods=['POST'])
+def cancel_cleanup_job():
+    """Stop the running cleanup after the series currently being processed."""
+    try:
+        job = cleanup_job.cancel()
+        if job is None:
+            return jsonify({"status": "idle", "message": "No cleanup running"})
+        return jsonify({"status": "success", "message": f"Cancelling cleanup job {job.job_id}"})
+    except Exception as e:
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+@app.route('/api/startup-status')
+def startup_status():
+    """Per-step status and timing of the background startup tasks, plus the
+    last finished run (possibly from a previous worker)."""
+    try:
+        return jsonify(startup_tasks.get_status())
+    except Exception as e:
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+@app.route('/api/startup-tasks/run', methods=['POST'])
+def rerun_startup_tasks():
+    """Run the startup tasks again, e.g. once Sonarr has come up."""
+    try:
+        run, started = startup_tasks.start(startup_steps())
+        if not started:
+            return jsonify({"status": "running", "message": f"Startup tasks already running (run {run.run_id})"})
+        return jsonify({"status": "success", "message": f"Started startup tasks (run {run.run_id})"})
+    except Exception as e:
+        return jsonify({"status": "error", "message": str(e)}), 500
+
 @app.route('/api/safety-status')
 def safety_status():
     """Get dry run safety status."""
@@ -5233,16 +5296,9 @@ def safety_status():
 def get_current_assignments():
     """Get current rule assignments for all series."""
     try:
-        config = load_config()
         all_series = get_sonarr_series()
         
-        assignments = {}
-        
-        # Build assignment mapping
-        for rule_name, details in config['rules'].items():
-            series_dict = details.get('series', {})
-            for series_id in series_dict.keys():
-                assignments[str(series_id)] = rule_name
+        assignments = config_store.rule_assignments()
         
         # Add series without assignments
         for series in all_series:
@@ -5412,7 +5468,7 @@ def episeerr_index():
     import pending_deletions
     
     # Get pending deletions summary
-    deletion_summary = pending_deletions.get_pending_deletions_summary()
+    deletion_summary = pending_deletions.get_pending_totals()
     
     return render_template('episeerr_index.html', deletions=deletion_summary)
 
@@ -6132,14 +6188,22 @@ def migrate_tags_endpoint():
 def sync_all_tags_endpoint():
     """API endpoint to manually bulk sync tags for all existing series"""
     try:
-        synced, failed, not_found = sync_all_series_tags()
-        
+        data = request.get_json(silent=True) or {}
+        dry_run = bool(data.get('dry_run')) or request.args.get('dry_run', '').lower() == 'true'
+        synced, failed, not_found, report = sync_all_series_tags(dry_run=dry_run)
+
+        if dry_run:
+            message = f"Dry run: {report['series_changed'] if report else 0} series would be retagged"
+        else:
+            message = f"Bulk sync complete: {synced} synced, {failed} failed, {not_found} not in Sonarr"
         return jsonify({
             "status": "success",
-            "message": f"Bulk sync complete: {synced} synced, {failed} failed, {not_found} not in Sonarr",
+            "message": message,
+            "dry_run": dry_run,
             "synced": synced,
             "failed": failed,
-            "not_found": not_found
+            "not_found": not_found,
+            "plan" if dry_run else "applied": report
         })
     except Exception as e:
         app.logger.error(f"Error in bulk tag sync: {str(e)}")
@@ -6270,53 +6334,173 @@ def migrate_create_rule_tags():
         app.logger.error(f"Migration failed: {str(e)}")
         return 0, 0
     
-def sync_all_series_tags():
-    """Bulk sync: Apply tags to all series currently in config"""
+def sync_all_series_tags(dry_run=False, series_lookup=None):
+    """Bulk sync: Apply tags to all series currently in config.
+
+    Planned against one series snapshot (series_lookup, or a fresh one) and
+    applied in batches through Sonarr's series editor (see tag_sync). With
+    dry_run nothing is written. Returns (synced, failed, not_found, report).
+    """
     try:
         config = load_config()
-        synced = 0
-        failed = 0
-        not_found = 0
-        
-        app.logger.info("=== Starting bulk tag sync for all series ===")
-        
-        for rule_name, rule_details in config['rules'].items():
-            series_dict = rule_details.get('series', {})
-            app.logger.info(f"Processing rule '{rule_name}' with {len(series_dict)} series")
-            
-            for series_id in series_dict.keys():
-                try:
-                    # Check if series exists in Sonarr first
-                    series_data = episeerr_utils.get_series_from_sonarr(int(series_id))
-                    if not series_data:
-                        not_found += 1
-                        app.logger.warning(f"✗ Series {series_id} not found in Sonarr (may have been deleted)")
-                        continue
-                    
-                    success = episeerr_utils.sync_rule_tag_to_sonarr(int(series_id), rule_name)
-                    if success:
-                        synced += 1
-                        app.logger.debug(f"✓ Synced series {series_id} ({series_data['title']}) to '{rule_name}'")
-                    else:
-                        failed += 1
-                        app.logger.warning(f"✗ Failed to sync series {series_id}")
-                except Exception as e:
-                    failed += 1
-                    app.logger.error(f"✗ Error syncing series {series_id}: {str(e)}")
-        
+        assignments = {
+            int(series_id): rule_name
+            for rule_name, rule_details in config['rules'].items()
+            for series_id in rule_details.get('series', {}).keys()
+        }
+
+        app.logger.info(f"=== Starting bulk tag sync for {len(assignments)} series{' (dry run)' if dry_run else ''} ===")
+        report = tag_sync.sync_rule_tags(assignments, series_lookup, dry_run=dry_run)
+
+        not_found = len(report['not_found'])
+        for series_id in report['not_found']:
+            app.logger.warning(f"✗ Series {series_id} not found in Sonarr (may have been deleted)")
+        failed = len(report.get('failed', [])) + len(report['skipped'])
+        synced = len(assignments) - not_found - failed
+
         app.logger.info(f"=== Bulk sync complete: {synced} synced, {failed} failed, {not_found} not found ===")
-        return synced, failed, not_found
-        
+        return synced, failed, not_found, report
+
     except Exception as e:
         app.logger.error(f"Bulk sync failed: {str(e)}")
-        return 0, 0, 0  
+        return 0, 0, 0, None
 
 # ============================================================================
 # FINAL STARTUP (run AFTER everything is defined)
 # ============================================================================
 
+def _startup_series_snapshot(ctx):
+    """Fetch the series list once; later steps read it from sonarr_client.
+    Also warms the artwork cache the activity log reads backdrops from."""
+    series_list = sonarr_client.get_all_series(max_age=0, url=episeerr_utils.SONARR_URL,
+                                               api_key=episeerr_utils.SONARR_API_KEY)
+    series_artwork.update_from_snapshot(series_list)
+    return {'series': len(series_list)}
+
+
+def _startup_series_lookup():
+    # Shared snapshot primed by the 'series_snapshot' step - refetched only if
+    # a tag batch invalidated it in between
+    return sonarr_client.get_series_lookup(url=episeerr_utils.SONARR_URL,
+                                           api_key=episeerr_utils.SONARR_API_KEY)
+
+
+def _startup_cancel_unmonitored_downloads(ctx):
+    return episeerr_utils.check_and_cancel_unmonitored_downloads()
+
+
+def _startup_rule_tags(ctx):
+    """Create/verify all rule tags exist in Sonarr."""
+    created, failed = migrate_create_rule_tags()
+    if created > 0 or failed > 0:
+        app.logger.info(f"  Tag creation: {created} verified, {failed} failed")
+    if failed and not created:
+        raise RuntimeError(f"no rule tags could be created ({failed} failed)")
+    return {'verified': created, 'failed': failed}
+
+
+def _startup_tag_migration(ctx):
+    """One-time bulk sync (migrate existing series to have tags)."""
+    config = load_config()
+    if config.get('tag_migration_complete', False):
+        return {'already_complete': True}
+
+    app.logger.info("  First-time migration - syncing all series tags...")
+    synced, failed, not_found, report = sync_all_series_tags(series_lookup=_startup_series_lookup())
+    if report is None:
+        raise RuntimeError("bulk tag sync failed")
+    app.logger.info(f"  Series tag sync: {synced} synced, {failed} failed, {not_found} not found")
+
+    # Mark migration as complete
+    config = load_config()
+    config['tag_migration_complete'] = True
+    save_config(config)
+    app.logger.info("  ✓ Tag migration marked as complete")
+    return {'synced': synced, 'failed': failed, 'not_found': not_found}
+
+
+def _startup_drift_reconcile(ctx):
+    """Drift detection + orphaned recovery for all series."""
+    config = load_config()
+    series_lookup = _startup_series_lookup()
+    all_series_ids = [
+        int(sid)
+        for rule_details in config['rules'].values()
+        for sid in list(rule_details.get('series', {}).keys())
+    ]
+    # Also check Sonarr series not in config (orphaned tag recovery),
+    # leaving out 'watched'-tagged series like get_sonarr_series() does
+    watched_tags = {
+        tag_id for tag_id, label in episeerr_utils.get_tag_mapping().items()
+        if label.lower() == 'watched'
+    }
+    config_series_ids = set(all_series_ids)
+    orphaned_ids = [
+        series_id for series_id, series in series_lookup.items()
+        if series_id not in config_series_ids and not watched_tags & set(series.get('tags') or [])
+    ]
+
+    # Moves are published per series: startup webhooks may record watches
+    # while this runs, and saving the whole copy back would roll them back.
+    reconciled = 0
+    tag_updates = {}
+    for series_id in all_series_ids + orphaned_ids:
+        try:
+            _, changed = episeerr_utils.reconcile_series_drift(
+                series_id, config, series_data=series_lookup.get(series_id), tag_updates=tag_updates
+            )
+            if changed:
+                config_store.sync_series_placement(config, series_id)
+                reconciled += 1
+        except Exception as e:
+            app.logger.debug(f"Error reconciling series {series_id}: {e}")
+
+    retagged = 0
+    if tag_updates:
+        report = tag_sync.sync_rule_tags(tag_updates, series_lookup)
+        retagged = report['series_updated']
+        app.logger.info(f"  Tag fixes: {retagged} series retagged, {len(report['failed'])} failed")
+
+    app.logger.info(f"✓ Tag reconciliation complete: {reconciled} corrections made")
+    return {'checked': len(all_series_ids) + len(orphaned_ids), 'corrections': reconciled, 'retagged': retagged}
+
+
+def _startup_delay_profile(ctx):
+    """Ensure delay profile has control tags ONLY (select, delay)."""
+    updated = episeerr_utils.update_delay_profile_with_control_tags()
+    if updated:
+        app.logger.info("✓ Delay profile updated with control tags (select, delay)")
+    else:
+        app.logger.warning("Delay profile update skipped or failed (check logs)")
+    return {'updated': bool(updated)}
+
+
+def _startup_movie_rule_tags(ctx):
+    """Create Radarr tags for movie rules."""
+    from movie_processor import ensure_movie_rule_tags
+    movie_rules = load_config().get('movie_rules', {})
+    if not movie_rules:
+        return {'tags': 0}
+    tag_ids = ensure_movie_rule_tags(movie_rules)
+    app.logger.info(f"✓ Movie rule tags ensured in Radarr: {len(tag_ids)} tags")
+    return {'tags': len(tag_ids)}
+
+
+def startup_steps():
+    """The background startup pipeline, in dependency order."""
+    return [
+        startup_tasks.Step('series_snapshot', _startup_series_snapshot),
+        startup_tasks.Step('cancel_unmonitored_downloads', _startup_cancel_unmonitored_downloads),
+        startup_tasks.Step('rule_tags', _startup_rule_tags),
+        startup_tasks.Step('tag_migration', _startup_tag_migration, after=['rule_tags', 'series_snapshot']),
+        startup_tasks.Step('drift_reconcile', _startup_drift_reconcile, after=['tag_migration']),
+        startup_tasks.Step('delay_profile', _startup_delay_profile),
+        startup_tasks.Step('movie_rule_tags', _startup_movie_rule_tags),
+    ]
+
+
 def initialize_episeerr():
-    """Initialize episeerr components."""
+    """Fast, local initialization; Sonarr/Radarr work goes to startup_tasks."""
     app.logger.debug("Entering initialize_episeerr()")
 
     # Migrate any pending request JSON files into SQLite (one-time, idempotent)
@@ -6327,99 +6511,11 @@ def initialize_episeerr():
     except Exception as e:
         app.logger.error(f"Error migrating pending requests: {e}")
 
-    # Existing code
-    try:
-        episeerr_utils.check_and_cancel_unmonitored_downloads()
-    except Exception as e:
-        app.logger.error(f"Error in initial download check: {str(e)}")
-    
-    # NEW: Comprehensive tag reconciliation (create, migrate, drift, orphaned)
-    try:
-        app.logger.info("🏷️  Starting comprehensive tag reconciliation...")
-        
-        config = load_config()
-        
-        # Step 1: Create/verify all rule tags exist in Sonarr
-        created, failed = migrate_create_rule_tags()
-        if created > 0 or failed > 0:
-            app.logger.info(f"  Tag creation: {created} verified, {failed} failed")
-        
-        # Step 2: One-time bulk sync (migrate existing series to have tags)
-        if not config.get('tag_migration_complete', False):
-            app.logger.info("  First-time migration - syncing all series tags...")
-            synced, failed, not_found = sync_all_series_tags()
-            app.logger.info(f"  Series tag sync: {synced} synced, {failed} failed, {not_found} not found")
-            
-            # Mark migration as complete
-            config['tag_migration_complete'] = True
-            save_config(config)
-            app.logger.info("  ✓ Tag migration marked as complete")
-        
-        # Step 3: Drift detection + orphaned recovery for all series
-        all_series_ids = [
-            int(sid)
-            for rule_details in config['rules'].values()
-            for sid in list(rule_details.get('series', {}).keys())
-        ]
-        # Also check Sonarr series not in config (orphaned tag recovery)
-        all_sonarr_series = get_sonarr_series()
-        config_series_ids = {
-            sid
-            for rule_details in config['rules'].values()
-            for sid in rule_details.get('series', {}).keys()
-        }
-        orphaned_ids = [
-            s['id'] for s in all_sonarr_series
-            if str(s['id']) not in config_series_ids
-        ]
-
-        modified = False
-        reconciled = 0
-        for series_id in all_series_ids + orphaned_ids:
-            try:
-                _, changed = episeerr_utils.reconcile_series_drift(series_id, config)
-                if changed:
-                    modified = True
-                    reconciled += 1
-            except Exception as e:
-                app.logger.debug(f"Error reconciling series {series_id}: {e}")
-
-        if modified:
-            save_config(config)
+    # Download check, tag reconciliation (create, migrate, drift, orphaned),
+    # delay profile and Radarr movie tags - in the background, so the app
+    # serves requests while Sonarr is slow or still starting
+    startup_tasks.start(startup_steps())
 
-        app.logger.info(f"✓ Tag reconciliation complete: {reconciled} corrections made")
-            
-    except requests.exceptions.ConnectionError:
-        app.logger.warning("Sonarr not ready - tags will be created when Sonarr becomes available")
-    except Exception as e:
-        app.logger.error(f"Error during tag reconciliation: {str(e)}")
-
-    # NEW: Ensure delay profile has control tags ONLY (select, delay)
-    try:
-        updated = episeerr_utils.update_delay_profile_with_control_tags()
-        if updated:
-            app.logger.info("✓ Delay profile updated with control tags (select, delay)")
-        else:
-            app.logger.warning("Delay profile update skipped or failed (check logs)")
-    except requests.exceptions.ConnectionError:
-        app.logger.warning("Sonarr not ready yet - will retry delay profile sync later")
-    except Exception as e:
-        app.logger.error(f"Error updating delay profile with control tags: {str(e)}")
-
-    # NEW: Create Radarr tags for movie rules
-    try:
-        from movie_processor import ensure_movie_rule_tags
-        config = load_config()
-        movie_rules = config.get('movie_rules', {})
-        if movie_rules:
-            tag_ids = ensure_movie_rule_tags(movie_rules)
-            app.logger.info(f"✓ Movie rule tags ensured in Radarr: {len(tag_ids)} tags")
-    except requests.exceptions.ConnectionError:
-        app.logger.warning("Radarr not ready — movie rule tags will be created when available")
-    except Exception as e:
-        app.logger.warning(f"Could not ensure movie rule tags: {e}")
-    
-    
 
 # Run initialization (after function is defined!)
 initialize_episeerr()
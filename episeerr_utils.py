@@ -1,6 +1,7 @@
 # modified_episeerr.py
 import os
 import json
+import copy
 import time
 from datetime import datetime
 import requests
@@ -12,6 +13,7 @@ import re
 from logging.handlers import RotatingFileHandler
 from dotenv import load_dotenv
 from logging_config import main_logger as logger
+import config_store
 # Load environment variables
 load_dotenv()
 
@@ -581,25 +583,22 @@ def get_series_from_sonarr(series_id):
         
     Returns:
         dict: Series data or None if failed/not found
+
+    Always a fresh fetch through sonarr_client, returned as a private copy:
+    callers edit the dict (tags) and PUT it back.
     """
+    import sonarr_client
     try:
-        headers = get_sonarr_headers()
-        response = http.get(
-            f"{SONARR_URL}/api/v3/series/{series_id}",
-            headers=headers,
-            timeout=10
-        )
-        
-        if response.ok:
-            return response.json()
-        elif response.status_code == 404:
+        series = sonarr_client.get_series(series_id, max_age=0, url=SONARR_URL, api_key=SONARR_API_KEY)
+        if series is None:
             # Series doesn't exist - this is normal when series are deleted
             logger.debug(f"Series {series_id} not found in Sonarr (404)")
             return None
-        else:
-            logger.error(f"Failed to get series {series_id}: {response.status_code}")
-            return None
-            
+        return copy.deepcopy(series)
+
+    except requests.exceptions.HTTPError as e:
+        logger.error(f"Failed to get series {series_id}: {e.response.status_code if e.response is not None else e}")
+        return None
     except requests.exceptions.ConnectionError:
         logger.warning(f"Sonarr not reachable - skipping series {series_id} lookup")
         return None
@@ -629,6 +628,8 @@ def update_series_in_sonarr(series):
         
         if response.ok:
             logger.debug(f"Updated series {series['id']} in Sonarr")
+            import sonarr_client
+            sonarr_client.remember_series(series)
             return True
         else:
             logger.error(f"Failed to update series {series['id']}: {response.status_code}")
@@ -739,7 +740,7 @@ def remove_all_episeerr_tags(series_id):
         return False
 
 
-def validate_series_tag(series_id, expected_rule, series_data=None, config=None):
+def validate_series_tag(series_id, expected_rule, series_data=None, config=None, tag_updates=None):
     """
     Check if series tag matches expected rule in config.
     Handles multiple episeerr_* tags (logs error, auto-fixes to config rule).
@@ -753,6 +754,9 @@ def validate_series_tag(series_id, expected_rule, series_data=None, config=None)
             treating 'default' as a literal rule name if omitted - only
             correct for installs where the default rule actually is named
             "default", so pass config when you have it.
+        tag_updates: Optional {series_id: rule_name} dict. When given, tag
+            fixes are recorded there for one batched tag_sync apply instead
+            of a GET + PUT per series.
 
     Returns:
         tuple: (matches: bool, actual_tag_rule: str or None)
@@ -790,7 +794,7 @@ def validate_series_tag(series_id, expected_rule, series_data=None, config=None)
         elif len(episeerr_tags) > 1:
             logger.error(f"Series {series_id} has multiple episeerr tags: {episeerr_tags}")
             # Auto-fix to expected rule
-            sync_rule_tag_to_sonarr(series_id, expected_rule)
+            _queue_rule_tag(series_id, expected_rule, tag_updates)
             return (False, expected_rule)
         
         # Single rule tag (NORMAL STATE)
@@ -807,7 +811,15 @@ def validate_series_tag(series_id, expected_rule, series_data=None, config=None)
 
 
 
-def reconcile_series_drift(series_id, config, series_data=None):
+def _queue_rule_tag(series_id, rule_name, tag_updates):
+    """Sync a series' rule tag now, or record it for a batched apply."""
+    if tag_updates is None:
+        sync_rule_tag_to_sonarr(series_id, rule_name)
+    else:
+        tag_updates[int(series_id)] = rule_name
+
+
+def reconcile_series_drift(series_id, config, series_data=None, tag_updates=None):
     """
     Check and correct rule/tag alignment for a single series.
 
@@ -824,6 +836,8 @@ def reconcile_series_drift(series_id, config, series_data=None):
         series_id: Sonarr series ID
         config: Episeerr config dict (mutated in-place)
         series_data: Pre-fetched series dict (avoids redundant API call in bulk loops)
+        tag_updates: Optional {series_id: rule_name} dict collecting tag fixes
+            for tag_sync to apply in bulk (see validate_series_tag)
 
     Returns:
         (final_rule: str | None, modified: bool)
@@ -832,14 +846,11 @@ def reconcile_series_drift(series_id, config, series_data=None):
     series_id_str = str(series_id)
 
     # Find which rule config currently says this series belongs to
-    config_rule = None
-    for rule_name, rule_details in config['rules'].items():
-        if series_id_str in rule_details.get('series', {}):
-            config_rule = rule_name
-            break
+    config_rule = config_store.find_rule_in(config, series_id)
 
     if config_rule:
-        matches, actual_tag_rule = validate_series_tag(series_id, config_rule, series_data=series_data, config=config)
+        matches, actual_tag_rule = validate_series_tag(series_id, config_rule, series_data=series_data,
+                                                       config=config, tag_updates=tag_updates)
         if matches:
             return config_rule, False
 
@@ -851,7 +862,7 @@ def reconcile_series_drift(series_id, config, series_data=None):
             if actual_rule:
                 series_data = config['rules'][config_rule]['series'].pop(series_id_str)
                 config['rules'][actual_rule].setdefault('series', {})[series_id_str] = series_data
-                sync_rule_tag_to_sonarr(series_id, actual_rule)
+                _queue_rule_tag(series_id, actual_rule, tag_updates)
                 logger.warning(f"Drift: series {series_id} moved {config_rule} → {actual_rule}")
                 return actual_rule, True
             else:
@@ -859,7 +870,7 @@ def reconcile_series_drift(series_id, config, series_data=None):
                 return config_rule, False
         else:
             # No episeerr rule tag at all → restore from config
-            sync_rule_tag_to_sonarr(series_id, config_rule)
+            _queue_rule_tag(series_id, config_rule, tag_updates)
             logger.warning(f"No tag on series {series_id} → restored episeerr_{config_rule}")
             return config_rule, False
 
@@ -940,7 +951,7 @@ def ensure_series_tracked_under_rule(series_id, rule_name, config):
     if series_id_str in series_dict:
         return
 
-    from episeerr import save_config
+    from config_store import save_config
     series_dict[series_id_str] = {'activity_date': None}
     save_config(config)
     try:
@@ -989,7 +1000,7 @@ def apply_initial_rule_selection(series_id, series_title, rule_name, config, sta
 
             # If process_always_have set any season to held, suppress get_count processing
             # (mirrors the activation gate in process_episodes_for_webhook)
-            from episeerr import load_config as _load_config
+            from config_store import load_config as _load_config
             _fresh = _load_config()
             _series_data = _fresh.get('rules', {}).get(rule_name, {}).get('series', {}).get(series_id_str, {})
             if any(v == 'held' for v in _series_data.get('activation_seasons', {}).values()):
@@ -1633,118 +1644,155 @@ def process_episode_selection_with_season(series_id, season_number, episode_numb
         return False
 
 
+QUEUE_PAGE_SIZE = 250
+QUEUE_DELETE_BATCH = 100
+
+
+def fetch_queue_records(headers=None):
+    """
+    Every Sonarr queue record, with its series and episode embedded.
+
+    Pages through GET /api/v3/queue?includeSeries=true&includeEpisode=true,
+    so one sweep costs ceil(queue / QUEUE_PAGE_SIZE) requests instead of a
+    series and an episode GET per record.
+    """
+    headers = headers or get_sonarr_headers()
+    records = []
+    page = 1
+    while True:
+        response = http.get(
+            f"{SONARR_URL}/api/v3/queue",
+            headers=headers,
+            params={
+                'page': page,
+                'pageSize': QUEUE_PAGE_SIZE,
+                'includeSeries': 'true',
+                'includeEpisode': 'true',
+                'includeUnknownSeriesItems': 'false',
+            },
+            timeout=30,
+        )
+        response.raise_for_status()
+        data = response.json()
+        batch = data.get('records', [])
+        records.extend(batch)
+        if not batch or len(records) >= data.get('totalRecords', 0):
+            return records
+        page += 1
+
+
+def _queue_cancel_reason(item, control_tags, selections):
+    """Why a queue record should be cancelled, or None to keep it."""
+    series = item.get('series') or {}
+    if not control_tags & set(series.get('tags', [])):
+        return None
+
+    episode = item.get('episode') or {}
+    season_number = episode.get('seasonNumber', item.get('seasonNumber'))
+    episode_number = episode.get('episodeNumber')
+
+    selection = selections.get(str(item.get('seriesId')))
+    if selection:
+        selection_season = selection.get('season')
+        if season_number != selection_season:
+            return f"season {season_number} is not the selected season {selection_season}"
+        if episode_number not in selection.get('selected_episodes', set()):
+            return f"S{season_number}E{episode_number} not in selected episodes"
+        return None
+    if not episode.get('monitored', False):
+        return f"S{season_number}E{episode_number} is unmonitored"
+    return None
+
+
+def bulk_cancel_downloads(queue_ids, headers=None):
+    """
+    Remove queue items (and their download-client jobs) through
+    DELETE /api/v3/queue/bulk, QUEUE_DELETE_BATCH ids per call. A batch the
+    bulk endpoint rejects falls back to cancel_download() per item.
+
+    Returns the set of queue ids that were removed.
+    """
+    headers = headers or get_sonarr_headers()
+    queue_ids = list(dict.fromkeys(queue_ids))
+    cancelled = set()
+    for start in range(0, len(queue_ids), QUEUE_DELETE_BATCH):
+        chunk = queue_ids[start:start + QUEUE_DELETE_BATCH]
+        try:
+            response = http.delete(
+                f"{SONARR_URL}/api/v3/queue/bulk",
+                headers=headers,
+                params={'removeFromClient': 'true', 'blocklist': 'false'},
+                json={'ids': chunk},
+                timeout=60,
+            )
+            if response.ok:
+                cancelled.update(chunk)
+                continue
+            logger.warning(f"Bulk queue removal failed ({response.status_code}) for {len(chunk)} items - retrying one by one")
+        except Exception as e:
+            logger.warning(f"Bulk queue removal error for {len(chunk)} items: {e} - retrying one by one")
+        cancelled.update(queue_id for queue_id in chunk if cancel_download(queue_id, headers))
+    return cancelled
+
+
 def check_and_cancel_unmonitored_downloads():
     """
-    Enhanced version with better episode selection awareness
+    Cancel queued downloads Episeerr didn't ask for.
+
+    For series carrying the episeerr default/select control tags, a queued
+    episode is cancelled when a pending selection exists and the episode
+    isn't part of it, or - without a selection - when the episode is
+    unmonitored. Decisions are made in memory from one paged queue fetch
+    with the series and episode embedded, and the cancellations go out as
+    bulk queue deletes. Runs at startup, on new series and periodically
+    from the scheduler (queue_sweep_interval_minutes).
+
+    Returns:
+        dict: {'queue_items', 'checked', 'cancelled', 'failed'}
     """
+    summary = {'queue_items': 0, 'checked': 0, 'cancelled': 0, 'failed': 0}
     headers = get_sonarr_headers()
-    
-    logger.info("Starting unmonitored download cancellation check")
-    logger.info(f"Episodes tag ID: {EPISEERR_DEFAULT_TAG_ID}")
-    
+    control_tags = {tag_id for tag_id in (EPISEERR_DEFAULT_TAG_ID, EPISEERR_SELECT_TAG_ID) if tag_id}
+
     try:
-        # Retrieve current queue
-        queue_response = http.get(f"{SONARR_URL}/api/v3/queue", headers=headers)
-        
-        if not queue_response.ok:
-            logger.error(f"Failed to retrieve queue. Status: {queue_response.status_code}")
-            return
-        
-        queue = queue_response.json().get('records', [])
-        logger.info(f"Total queue items: {len(queue)}")
-        
-        if len(queue) == 0:
-            logger.info("No items in queue to process")
-            return
-            
-        # Track cancelled items
-        cancelled_count = 0
-        
+        queue = fetch_queue_records(headers)
+        summary['queue_items'] = len(queue)
+        if not queue:
+            logger.debug("No items in queue to process")
+            return summary
+
+        selections = dict(pending_selections)
+        to_cancel = {}
         for item in queue:
-            # Detailed logging for each queue item
-            logger.info(f"Examining queue item: {item.get('title', 'Unknown')}")
-            logger.info(f"Series ID: {item.get('seriesId')}, Episode ID: {item.get('episodeId')}")
-            
-            # Check if this is a TV episode
-            if item.get('seriesId') and item.get('episodeId'):
-                # Get series details to check for episeerr tags
-                series_response = http.get(
-                    f"{SONARR_URL}/api/v3/series/{item['seriesId']}", 
-                    headers=headers
-                )
-                
-                if not series_response.ok:
-                    logger.error(f"Failed to get series details for ID {item['seriesId']}")
-                    continue
-                
-                series = series_response.json()
-                
-                # Log series tags
-                logger.info(f"Series tags: {series.get('tags', [])}")
-                
-                # Check if series has episeerr tags
-                has_episeerr_tag = (
-                    EPISEERR_DEFAULT_TAG_ID in series.get('tags', []) or
-                    EPISEERR_SELECT_TAG_ID in series.get('tags', [])
-                )
-                
-                if has_episeerr_tag:
-                    # Get episode details
-                    episode_info = get_episode_info(item['episodeId'], headers)
-                    
-                    if episode_info:
-                        episode_number = episode_info.get('episodeNumber')
-                        season_number = episode_info.get('seasonNumber')
-                        logger.info(f"Episode details: S{season_number}E{episode_number}, Monitored: {episode_info.get('monitored')}")
-                        
-                        # Check pending_selections for this series first
-                        series_id_str = str(item.get('seriesId'))
-                        should_cancel = False
-                        
-                        if series_id_str in pending_selections:
-                            series_info = pending_selections[series_id_str]
-                            selected_episodes = series_info.get('selected_episodes', set())
-                            selection_season = series_info.get('season')
-                            
-                            # If this episode is not in selected episodes for the selected season, cancel it
-                            if season_number == selection_season and episode_number not in selected_episodes:
-                                logger.info(f"Episode S{season_number}E{episode_number} not in selected episodes {selected_episodes}. Cancelling download.")
-                                should_cancel = True
-                            elif season_number != selection_season:
-                                logger.info(f"Episode is from season {season_number}, but selection is for season {selection_season}. Cancelling download.")
-                                should_cancel = True
-                        
-                        # If not in pending_selections, check monitored status
-                        elif not episode_info.get('monitored', False):
-                            logger.info(f"Episode S{season_number}E{episode_number} is unmonitored. Cancelling download.")
-                            should_cancel = True
-                        
-                        if should_cancel:
-                            cancel_success = cancel_download(item['id'], headers)
-                            
-                            if cancel_success:
-                                series_title = series.get('title', 'Unknown Series')
-                                logger.info(
-                                    f"Cancelled download for episeerr series: "
-                                    f"{series_title} - S{season_number}E{episode_number}"
-                                )
-                                cancelled_count += 1
-                            else:
-                                logger.error(f"Failed to cancel download for {series.get('title')} - Episode ID {item['episodeId']}")
-                        else:
-                            logger.info(f"Episode S{season_number}E{episode_number} is monitored/selected - keeping download")
-                    else:
-                        logger.warning(f"Could not get episode info for ID {item['episodeId']}")
-                else:
-                    logger.debug(f"Series {series.get('title')} already processed (no control tags) - skipping download queue check")
-        
-        # Log summary
-        logger.info(f"Cancellation check complete. Cancelled {cancelled_count} unmonitored downloads for episeerr series")
-    
+            if not (item.get('seriesId') and item.get('episodeId')):
+                continue
+            if item.get('episode') is None:
+                # Sonarr versions that don't embed episodes
+                item['episode'] = get_episode_info(item['episodeId'], headers) or {}
+            summary['checked'] += 1
+            reason = _queue_cancel_reason(item, control_tags, selections)
+            if reason:
+                logger.info(f"Cancelling download: {(item.get('series') or {}).get('title', 'Unknown Series')} - {reason}")
+                to_cancel[item['id']] = item
+
+        if to_cancel:
+            cancelled = bulk_cancel_downloads(to_cancel, headers)
+            summary['cancelled'] = len(cancelled)
+            summary['failed'] = len(to_cancel) - len(cancelled)
+            for queue_id in set(to_cancel) - cancelled:
+                logger.error(f"Failed to cancel download {to_cancel[queue_id].get('title', queue_id)}")
+
+        logger.info(
+            f"Cancellation check complete: {summary['queue_items']} queue items, "
+            f"cancelled {summary['cancelled']} unmonitored downloads for episeerr series"
+            + (f", {summary['failed']} failed" if summary['failed'] else "")
+        )
+
     except requests.exceptions.ConnectionError:
         logger.warning("Error in download queue monitoring: Sonarr not reachable")
     except Exception as e:
         logger.error(f"Error in download queue monitoring: {str(e)}", exc_info=True)
+    return summary
 
 def save_request(series_id, title, season, episodes, request_id=None):
     """
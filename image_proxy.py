@@ -0,0 +1,348 @@
+"""
+Caching image proxy for the integrations' /art routes.
+
+The Plex, Jellyfin, Emby and Sonos /art routes exist so the browser can show
+artwork from media servers it can't (or mustn't, over HTTPS) reach itself.
+They used to refetch the upstream image on every request, buffer it whole
+(r.content, despite stream=True) and send no cache headers - a dashboard
+with forty posters re-pulled megabytes from the media server on every
+refresh.
+
+serve() is the shared implementation:
+
+- Responses are cached on disk under data/image_cache, keyed by the
+  normalized upstream URL (scheme/host lowercased, query sorted) plus the
+  requested width. The cache is bounded to MAX_CACHE_BYTES, least recently
+  used first; a hit bumps the file's mtime, so the order survives restarts.
+- Hits go out through send_file with an ETag (a hash of the bytes), so
+  If-None-Match revalidation is a 304, and a long-lived Cache-Control.
+- Misses are streamed to the browser in CHUNK_SIZE pieces while being
+  written to a temp file, which becomes the cache entry only if the
+  download completed.
+- ?w=<width> asks for a thumbnail, rounded up to one of THUMB_WIDTHS. The
+  caller's upstream_resize(url, width) can rewrite the URL to the media
+  server's own scaler; otherwise Pillow is used when it is installed, and
+  the original is served when it isn't.
+"""
+
+import hashlib
+import io
+import json
+import logging
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from flask import Response, send_file
+
+from episeerr_utils import http
+
+try:
+    from PIL import Image
+except ImportError:  # optional - thumbnails fall back to upstream scaling or the original
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = os.path.join(os.getcwd(), 'data', 'image_cache')
+
+MAX_CACHE_BYTES = 200 * 1024 * 1024
+MAX_ITEM_BYTES = 10 * 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+CACHE_MAX_AGE = 7 * 24 * 60 * 60
+THUMB_WIDTHS = (80, 160, 320, 640, 1280)
+
+
+def normalize_url(url):
+    """Lowercase scheme and host, drop the fragment, sort the query."""
+    parts = urlsplit(url.strip())
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, query, ''))
+
+
+def thumb_width(width):
+    """Snap a requested width to THUMB_WIDTHS (None = original size)."""
+    try:
+        width = int(width)
+    except (TypeError, ValueError):
+        return None
+    if width <= 0:
+        return None
+    return next((w for w in THUMB_WIDTHS if w >= width), THUMB_WIDTHS[-1])
+
+
+def set_query_param(url, **params):
+    """url with the given query parameters added or replaced."""
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k not in params]
+    query.extend((k, str(v)) for k, v in params.items())
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+class DiskCache:
+    """{key: size} in LRU order over CACHE_DIR; <key>.img + <key>.json pairs."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.dir = None
+        self.entries = None
+        self.total = 0
+
+    def _loaded(self):
+        """Caller holds self.lock."""
+        if self.entries is None or self.dir != CACHE_DIR:
+            self.dir = CACHE_DIR
+            self.entries = OrderedDict()
+            self.total = 0
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            found = []
+            for name in os.listdir(CACHE_DIR):
+                if not name.endswith('.img'):
+                    continue
+                try:
+                    st = os.stat(os.path.join(CACHE_DIR, name))
+                except OSError:
+                    continue
+                found.append((st.st_mtime, name[:-4], st.st_size))
+            for _, key, size in sorted(found):
+                self.entries[key] = size
+                self.total += size
+        return self.entries
+
+    def paths(self, key):
+        return os.path.join(CACHE_DIR, key + '.img'), os.path.join(CACHE_DIR, key + '.json')
+
+    def lookup(self, key):
+        """(image path, meta) for a cached key, or None."""
+        with self.lock:
+            entries = self._loaded()
+            if key not in entries:
+                return None
+            entries.move_to_end(key)
+        img_path, meta_path = self.paths(key)
+        try:
+            with open(meta_path, 'r') as f:
+                meta = json.load(f)
+            os.utime(img_path)
+            return img_path, meta
+        except (OSError, ValueError):
+            self.discard(key)
+            return None
+
+    def store(self, key, tmp_path, meta):
+        """Move a completed download into the cache and evict down to
+        MAX_CACHE_BYTES."""
+        img_path, meta_path = self.paths(key)
+        size = os.path.getsize(tmp_path)
+        meta_tmp = f"{meta_path}.{uuid.uuid4().hex}.tmp"
+        with open(meta_tmp, 'w') as f:
+            json.dump(meta, f)
+        os.replace(meta_tmp, meta_path)
+        os.replace(tmp_path, img_path)
+        with self.lock:
+            entries = self._loaded()
+            self.total += size - entries.pop(key, 0)
+            entries[key] = size
+            evict = []
+            while self.total > MAX_CACHE_BYTES and len(entries) > 1:
+                old_key, old_size = entries.popitem(last=False)
+                self.total -= old_size
+                evict.append(old_key)
+        for old_key in evict:
+            self._remove_files(old_key)
+
+    def discard(self, key):
+        with self.lock:
+            entries = self._loaded()
+            self.total -= entries.pop(key, 0)
+        self._remove_files(key)
+
+    def _remove_files(self, key):
+        for path in self.paths(key):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.debug(f"Could not remove cached image {path}: {e}")
+
+    def tmp_path(self, key):
+        with self.lock:
+            self._loaded()
+        return os.path.join(CACHE_DIR, f"{key}.{uuid.uuid4().hex}.part")
+
+
+_cache = DiskCache()
+
+
+def _cached_response(img_path, meta):
+    response = send_file(img_path, mimetype=meta.get('content_type') or 'image/jpeg',
+                         etag=meta.get('etag'), conditional=True, max_age=CACHE_MAX_AGE)
+    response.headers['X-Image-Cache'] = 'HIT'
+    return response
+
+
+def _resize_locally(data, width):
+    """Pillow thumbnail of data, or None when Pillow is missing or fails."""
+    if Image is None:
+        return None
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            if img.width <= width:
+                return None
+            img.thumbnail((width, width * 4))
+            out = io.BytesIO()
+            img.convert('RGB').save(out, format='JPEG', quality=85)
+            return out.getvalue()
+    except Exception as e:
+        logger.debug(f"Thumbnail resize failed: {e}")
+        return None
+
+
+def _finish_download(key, tmp_path, complete, meta):
+    """Cache a completed download; drop the temp file of anything else
+    (client went away, upstream broke off, or the image was too big)."""
+    if complete:
+        try:
+            _cache.store(key, tmp_path, meta)
+            return
+        except OSError as e:
+            logger.debug(f"Could not cache image {key}: {e}")
+    try:
+        os.remove(tmp_path)
+    except OSError:
+        pass
+
+
+def serve(url, width=None, upstream_resize=None, headers=None, timeout=8, label='Art'):
+    """Flask response for an upstream image, through the disk cache.
+
+    upstream_resize(url, width) may return a URL that asks the media server
+    for a scaled image; when it returns None and Pillow is available the
+    original is scaled here.
+    """
+    width = thumb_width(width)
+    key = hashlib.sha256(f"{normalize_url(url)}|w={width or 0}".encode()).hexdigest()
+
+    cached = _cache.lookup(key)
+    if cached:
+        return _cached_response(*cached)
+
+    fetch_url = url
+    resize_here = False
+    if width:
+        scaled = upstream_resize(url, width) if upstream_resize else None
+        if scaled:
+            fetch_url = scaled
+        else:
+            resize_here = Image is not None
+
+    try:
+        r = http.get(fetch_url, timeout=timeout, stream=True, headers=headers)
+        r.raise_for_status()
+    except Exception as e:
+        logger.error(f"{label} proxy failed for {fetch_url}: {e}")
+        return Response('Not found', status=404)
+
+    content_type = r.headers.get('Content-Type', 'image/jpeg')
+
+    if resize_here:
+        # Pillow needs the whole image: buffer it, but never past MAX_ITEM_BYTES
+        chunks = r.iter_content(CHUNK_SIZE)
+        buffered = []
+        size = 0
+        try:
+            for chunk in chunks:
+                buffered.append(chunk)
+                size += len(chunk)
+                if size > MAX_ITEM_BYTES:
+                    break
+        except Exception as e:
+            r.close()
+            logger.error(f"{label} proxy failed for {fetch_url}: {e}")
+            return Response('Not found', status=404)
+        if size > MAX_ITEM_BYTES:
+            # Too big to resize or cache - pass the original through as is
+            def passthrough():
+                try:
+                    yield from buffered
+                    yield from chunks
+                finally:
+                    r.close()
+            logger.debug(f"{label} image over {MAX_ITEM_BYTES} bytes, not resizing: {fetch_url}")
+            return Response(passthrough(), status=200, content_type=content_type)
+        r.close()
+
+        data = b''.join(buffered)
+        thumbnail = _resize_locally(data, width)
+        if thumbnail is not None:
+            data, content_type = thumbnail, 'image/jpeg'
+        etag = hashlib.sha1(data).hexdigest()
+        tmp_path = _cache.tmp_path(key)
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        _finish_download(key, tmp_path, True, {'content_type': content_type, 'etag': etag, 'width': width})
+        cached = _cache.lookup(key)
+        if cached:
+            return _cached_response(*cached)
+        # Store failed or already evicted: serve the bytes we have
+        response = Response(data, status=200, content_type=content_type)
+        response.set_etag(etag)
+        response.cache_control.public = True
+        response.cache_control.max_age = CACHE_MAX_AGE
+        response.headers['X-Image-Cache'] = 'MISS'
+        return response
+
+    tmp_path = _cache.tmp_path(key)
+
+    def generate():
+        digest = hashlib.sha1()
+        size = 0
+        complete = False
+        try:
+            with open(tmp_path, 'wb') as f:
+                for chunk in r.iter_content(CHUNK_SIZE):
+                    if not chunk:
+                        continue
+                    size += len(chunk)
+                    if size <= MAX_ITEM_BYTES:
+                        f.write(chunk)
+                        digest.update(chunk)
+                    yield chunk
+            complete = size <= MAX_ITEM_BYTES
+        except Exception as e:
+            logger.error(f"{label} proxy stream failed for {fetch_url}: {e}")
+        finally:
+            r.close()
+            _finish_download(key, tmp_path, complete, {'content_type': content_type, 'etag': digest.hexdigest(),
+                                                       'width': width})
+
+    response = Response(generate(), status=200, content_type=content_type)
+    response.cache_control.public = True
+    response.cache_control.max_age = CACHE_MAX_AGE
+    if r.headers.get('Content-Length') and not r.headers.get('Content-Encoding'):
+        response.headers['Content-Length'] = r.headers['Content-Length']
+    response.headers['X-Image-Cache'] = 'MISS'
+    return response
+
+
+def jellyfin_resize(url, width):
+    """Jellyfin and Emby scale Items/.../Images/... themselves via maxWidth."""
+    if '/Images/' not in url:
+        return None
+    return set_query_param(url, maxWidth=width)
+
+
+def plex_resize(url, width):
+    """Plex scales any library image through /photo/:/transcode."""
+    parts = urlsplit(url)
+    query = dict(parse_qsl(parts.query))
+    token = query.pop('X-Plex-Token', None)
+    if not token or parts.path.startswith('/photo/:/transcode'):
+        return None
+    inner = urlunsplit(('', '', parts.path, urlencode(query), ''))
+    transcode_query = urlencode({'width': width, 'height': width * 4, 'minSize': 1, 'upscale': 0,
+                                 'url': inner, 'X-Plex-Token': token})
+    return urlunsplit((parts.scheme, parts.netloc, '/photo/:/transcode', transcode_query, ''))
@@ -3,18 +3,15 @@ Jellyfin Integration for Episeerr
 Provides: Webhook-triggered polling for watch detection, real-time session monitoring
 """
 
-import os
-import json
 import requests
 from episeerr_utils import http
 import logging
 import threading
-import time
-import subprocess
 from typing import Dict, Any, Optional, List
 from flask import Blueprint, request, jsonify
 from datetime import datetime
 from integrations.base import ServiceIntegration
+from session_poller import SessionPoller
 
 logger = logging.getLogger(__name__)
 
@@ -22,9 +19,9 @@ logger = logging.getLogger(__name__)
 # Session Tracking (Polling State)
 # ==========================================
 
-# Session polling state
-active_jellyfin_sessions = {}
-jellyfin_polling_threads = {}
+# Session polling state: one SessionPoller (one thread) for every tracked
+# session, created on first use
+jellyfin_poller: Optional[SessionPoller] = None
 jellyfin_polling_lock = threading.Lock()
 
 # Processed episodes tracking (shared with Emby)
@@ -114,7 +111,7 @@ class JellyfinIntegration(ServiceIntegration):
                 'label': 'Poll Interval (seconds)',
                 'type': 'number',
                 'default': 900,
-                'help_text': 'For polling mode. Recommended: 900 (15 min)'
+                'help_text': 'For polling mode. Longest gap between progress checks; the trigger moment itself is predicted from playback position. Recommended: 900 (15 min)'
             },
             {
                 'name': 'trigger_percentage',
@@ -292,124 +289,93 @@ class JellyfinIntegration(ServiceIntegration):
         """Check if progress meets trigger threshold"""
         return progress >= float(threshold) 
     
-    def poll_session(self, session_id: str, initial_episode_info: Dict):
-        """Poll a specific Jellyfin session until trigger percentage or session ends"""
+    def get_poller(self) -> SessionPoller:
+        """The shared Jellyfin session poller"""
+        global jellyfin_poller
+        with jellyfin_polling_lock:
+            if jellyfin_poller is None:
+                jellyfin_poller = SessionPoller(
+                    'Jellyfin',
+                    fetch_sessions=self.fetch_sessions,
+                    check_session=self.check_polled_session,
+                    process_session=self.process_polled_session,
+                    get_settings=self.polling_settings,
+                )
+            return jellyfin_poller
+
+    def polling_settings(self):
+        """(trigger percentage, poll interval in seconds) for the poller"""
+        config = self.get_config() or {}
+        return float(config.get('trigger_percentage', 50.0)), int(config.get('poll_interval', 900))
+
+    def fetch_sessions(self) -> Dict[str, Dict]:
+        """All active Jellyfin sessions keyed by session ID - one request per poller tick"""
         config = self.get_config()
         if not config:
-            return
-        
-        poll_interval = int(config.get('poll_interval', 900))
-        trigger_percentage = config.get('trigger_percentage', 50.0)
-        
-        logger.info(f"🔄 Starting Jellyfin polling for session {session_id}")
-        logger.info(f"   📺 {initial_episode_info['series_name']} S{initial_episode_info['season_number']}E{initial_episode_info['episode_number']}")
-        logger.info(f"   🎯 Will trigger at {trigger_percentage}% progress")
-        
-        try:
-            processed = False
-            poll_count = 0
-            
-            while session_id in active_jellyfin_sessions and not processed:
-                poll_count += 1
-                
-                # Get current session state
-                current_session = self.get_session_by_id(session_id)
-                
-                if not current_session:
-                    logger.info(f"📺 Session {session_id} ended - stopping polling (poll #{poll_count})")
-                    break
-                
-                # Extract current episode info
-                current_episode_info = self.extract_episode_info(current_session)
-                
-                if not current_episode_info:
-                    logger.info(f"⏭️ Session {session_id} no longer playing episode - stopping polling")
-                    break
-                
-                # Check if we're still on the same episode
-                if (current_episode_info['series_name'] != initial_episode_info['series_name'] or
-                    current_episode_info['season_number'] != initial_episode_info['season_number'] or
-                    current_episode_info['episode_number'] != initial_episode_info['episode_number']):
-                    logger.info(f"📺 Episode changed in session {session_id} - stopping polling for original episode")
-                    break
-                
-                current_progress = current_episode_info['progress_percent']
-                is_paused = current_episode_info['is_paused']
-                
-                logger.info(f"📊 Poll #{poll_count}: {current_progress:.1f}% {'(PAUSED)' if is_paused else ''}")
-                
-                # Check if we should trigger processing
-                if self.should_trigger(current_progress, trigger_percentage):
-                    logger.info(f"🎯 Trigger threshold reached! Processing at {current_progress:.1f}%")
-                    
-                    success = self.process_episode(current_episode_info)
-                    if success:
-                        processed = True
-                        logger.info(f"✅ Successfully processed - stopping polling for session {session_id}")
-                    else:
-                        logger.warning(f"⚠️ Processing failed - continuing polling")
-                
-                # Wait before next poll (unless we just processed)
-                if not processed:
-                    time.sleep(poll_interval)
-            
-            if not processed and session_id not in active_jellyfin_sessions:
-                logger.info(f"🔄 Polling stopped for session {session_id} - session ended before trigger")
-            
-        except Exception as e:
-            logger.error(f"❌ Error in Jellyfin polling thread for session {session_id}: {str(e)}")
-        
-        finally:
-            # Clean up
-            with jellyfin_polling_lock:
-                if session_id in active_jellyfin_sessions:
-                    del active_jellyfin_sessions[session_id]
-                if session_id in jellyfin_polling_threads:
-                    del jellyfin_polling_threads[session_id]
-            
-            logger.info(f"🧹 Cleaned up polling for session {session_id}")
-    
+            raise RuntimeError('Jellyfin not configured')
+        response = http.get(f"{config['url']}/Sessions", headers={'X-Emby-Token': config['api_key']}, timeout=10)
+        response.raise_for_status()
+        return {session.get('Id'): session for session in response.json()}
+
+    def check_polled_session(self, session_id: str, initial_episode_info: Dict, sessions: Dict[str, Dict]) -> Optional[Dict]:
+        """Current progress of a tracked session, or None once it should stop being polled"""
+        current_session = sessions.get(session_id)
+        if not current_session:
+            logger.info(f"📺 Session {session_id} ended - stopping polling")
+            return None
+
+        current_episode_info = self.extract_episode_info(current_session)
+        if not current_episode_info:
+            logger.info(f"⏭️ Session {session_id} no longer playing episode - stopping polling")
+            return None
+
+        # Check if we're still on the same episode
+        if (current_episode_info['series_name'] != initial_episode_info['series_name'] or
+                current_episode_info['season_number'] != initial_episode_info['season_number'] or
+                current_episode_info['episode_number'] != initial_episode_info['episode_number']):
+            logger.info(f"📺 Episode changed in session {session_id} - stopping polling for original episode")
+            return None
+
+        # Ticks are 100ns; the poller predicts the trigger moment from seconds
+        return {
+            'progress': current_episode_info['progress_percent'],
+            'is_paused': current_episode_info['is_paused'],
+            'position': (current_session.get('PlayState') or {}).get('PositionTicks', 0) / 10_000_000,
+            'duration': (current_session.get('NowPlayingItem') or {}).get('RunTimeTicks', 0) / 10_000_000,
+            'episode_info': current_episode_info,
+        }
+
+    def process_polled_session(self, session_id: str, episode_info: Dict, state: Dict) -> bool:
+        success = self.process_episode(state['episode_info'])
+        if success:
+            logger.info(f"✅ Successfully processed - stopping polling for session {session_id}")
+        return success
+
     def start_polling(self, session_id: str, episode_info: Dict) -> bool:
-        """Start polling for a specific Jellyfin session"""
-        with jellyfin_polling_lock:
-            # Don't start if already polling this session
-            if session_id in active_jellyfin_sessions:
-                logger.info(f"⏭️ Already polling session {session_id} - skipping")
-                return False
-            
-            # Store session info
-            active_jellyfin_sessions[session_id] = episode_info
-            
-            logger.info(f"🎬 Starting Jellyfin polling for: {episode_info['series_name']} S{episode_info['season_number']}E{episode_info['episode_number']}")
-            logger.info(f"   👤 User: {episode_info['user_name']}")
-            logger.info(f"   🔄 Session ID: {session_id}")
-            
-            # Start polling thread
-            thread = threading.Thread(
-                target=self.poll_session,
-                args=(session_id, episode_info),
-                daemon=True,
-                name=f"JellyfinPoll-{session_id[:8]}"
-            )
-            thread.start()
-            jellyfin_polling_threads[session_id] = thread
-            
-            return True
-    
+        """Start tracking a Jellyfin session on the shared poller"""
+        if not self.get_poller().track(session_id, episode_info):
+            logger.info(f"⏭️ Already polling session {session_id} - skipping")
+            return False
+
+        config = self.get_config() or {}
+        logger.info(f"🎬 Starting Jellyfin polling for: {episode_info['series_name']} S{episode_info['season_number']}E{episode_info['episode_number']}")
+        logger.info(f"   👤 User: {episode_info['user_name']}")
+        logger.info(f"   🔄 Session ID: {session_id}")
+        logger.info(f"   🎯 Will trigger at {config.get('trigger_percentage', 50.0)}% progress")
+        return True
+
     def stop_polling(self, session_id: str) -> bool:
         """Stop polling for a specific session"""
-        with jellyfin_polling_lock:
-            if session_id in active_jellyfin_sessions:
-                logger.info(f"🛑 Stopping Jellyfin polling for session {session_id}")
-                del active_jellyfin_sessions[session_id]
-                return True
-            return False
+        if self.get_poller().untrack(session_id):
+            logger.info(f"🛑 Stopping Jellyfin polling for session {session_id}")
+            return True
+        return False
     # ==========================================
     # Episode Processing
     # ==========================================
     
     def process_episode(self, episode_info: Dict) -> bool:
-        """Process episode for upgrade - writes temp file and calls media_processor"""
+        """Process episode for upgrade - queues it on the watch-event worker pool"""
         try:
             series_name = episode_info['series_name']
             season = episode_info['season_number']
@@ -429,7 +395,7 @@ class JellyfinIntegration(ServiceIntegration):
             
             # Tag sync & drift correction
             from episeerr_utils import reconcile_series_drift
-            from episeerr import load_config, save_config
+            from config_store import load_config, save_config
 
             config = load_config()
             final_rule, modified = reconcile_series_drift(series_id, config)
@@ -438,10 +404,6 @@ class JellyfinIntegration(ServiceIntegration):
             if not final_rule:
                 logger.warning(f"⚠️ Series ID {series_id} not assigned to any rule — media_processor may skip it")
 
-            # Write temp file for media_processor
-            temp_dir = os.path.join(os.getcwd(), 'temp')
-            os.makedirs(temp_dir, exist_ok=True)
-
             episode_data = {
                 'server_title': series_name,
                 'server_season_num': int(season),
@@ -453,35 +415,16 @@ class JellyfinIntegration(ServiceIntegration):
                 'source': 'jellyfin',
                 'user': user_name
             }
-            
-            temp_file_path = os.path.join(temp_dir, f'data_from_server_{os.urandom(4).hex()}.json')
-            with open(temp_file_path, 'w') as f:
-                json.dump(episode_data, f)
-
-            # Run media_processor
-            result = subprocess.run(
-                ["python3", os.path.join(os.getcwd(), "media_processor.py"), temp_file_path],
-                capture_output=True,
-                text=True
-            )
 
-            try:
-                os.remove(temp_file_path)
-            except OSError:
-                pass
-
-            if result.returncode != 0:
-                logger.error(f"❌ media_processor failed (rc={result.returncode})")
-                if result.stderr:
-                    logger.error(f"stderr: {result.stderr.strip()}")
-                if result.stdout:
-                    logger.error(f"stdout: {result.stdout.strip()}")
+            # Hand off to the watch-event worker pool
+            from watch_event_worker import submit_watch_event
+            job_id = submit_watch_event(episode_data, source='jellyfin')
+            if not job_id:
+                logger.error(f"❌ Could not queue {series_name} S{season}E{episode} for processing")
                 return False
-            else:
-                logger.info(f"✅ media_processor completed for {series_name} S{season}E{episode}")
-                if result.stdout:
-                    logger.info(f"media_processor output: {result.stdout.strip()}")
-                return True
+
+            logger.info(f"✅ Queued {series_name} S{season}E{episode} for processing (job {job_id})")
+            return True
         
         except Exception as e:
             logger.error(f"Error processing Jellyfin episode: {e}")
@@ -860,23 +803,22 @@ class JellyfinIntegration(ServiceIntegration):
         def polling_status():
             """Get current Jellyfin polling status for debugging"""
             try:
-                with jellyfin_polling_lock:
-                    active_sessions = list(active_jellyfin_sessions.keys())
-                    thread_count = len(jellyfin_polling_threads)
-                    
-                    config = integration.get_config()
-                    trigger_percentage = config.get('trigger_percentage', 50.0) if config else 50.0
-                    poll_interval = int(config.get('poll_interval', 900)) if config else 900
-                    
-                    return jsonify({
-                        'status': 'success',
-                        'polling_status': {
-                            'active_sessions': active_sessions,
-                            'thread_count': thread_count,
-                            'trigger_percentage': trigger_percentage,
-                            'poll_interval_minutes': poll_interval // 60
-                        }
-                    })
+                poller_status = integration.get_poller().status()
+                config = integration.get_config()
+                trigger_percentage = config.get('trigger_percentage', 50.0) if config else 50.0
+                poll_interval = int(config.get('poll_interval', 900)) if config else 900
+
+                return jsonify({
+                    'status': 'success',
+                    'polling_status': {
+                        'active_sessions': [row['session_id'] for row in poller_status['tracked_sessions']],
+                        'tracked_sessions': poller_status['tracked_sessions'],
+                        'thread_count': 1 if poller_status['thread_alive'] else 0,
+                        'last_fetch': poller_status['last_fetch'],
+                        'trigger_percentage': trigger_percentage,
+                        'poll_interval_minutes': poll_interval // 60
+                    }
+                })
             except Exception as e:
                 return jsonify({'status': 'error', 'message': str(e)}), 500
 
@@ -992,22 +934,19 @@ class JellyfinIntegration(ServiceIntegration):
             Server-side proxy for Jellyfin poster/thumbnail art.
             Fetches image from the Jellyfin server (raw HTTP) and streams it back
             to the browser over HTTPS, eliminating mixed content errors.
-            Usage: /api/integration/jellyfin/art?url=<encoded_jellyfin_image_url>
+            Cached on disk by image_proxy; ?w=<px> asks Jellyfin for a thumbnail.
+            Usage: /api/integration/jellyfin/art?url=<encoded_jellyfin_image_url>[&w=160]
             """
             from flask import request as freq, Response
             from urllib.parse import unquote
+            import image_proxy
             raw_url = freq.args.get('url', '').strip()
             if not raw_url:
                 return Response('Missing url parameter', status=400)
             decoded = unquote(raw_url)
-            try:
-                r = http.get(decoded, timeout=8, stream=True)
-                r.raise_for_status()
-                content_type = r.headers.get('Content-Type', 'image/jpeg')
-                return Response(r.content, status=200, content_type=content_type)
-            except Exception as e:
-                logger.error(f"Jellyfin art proxy failed for {decoded}: {e}")
-                return Response('Not found', status=404)
+            return image_proxy.serve(decoded, width=freq.args.get('w'),
+                                     upstream_resize=image_proxy.jellyfin_resize,
+                                     timeout=8, label='Jellyfin art')
 
         return bp
 # Auto-discovery registration
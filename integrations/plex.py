@@ -16,6 +16,7 @@ from typing import Dict, Any, Optional, List, Tuple
 from flask import Blueprint, request, jsonify, current_app
 from datetime import datetime, timedelta
 from integrations.base import ServiceIntegration
+from session_poller import SessionPoller
 
 logger = logging.getLogger(__name__)
 
@@ -36,9 +37,10 @@ _WEBHOOK_STALE_SECONDS = 300  # 5 minutes
 #  Episode-detection polling state  (POLLING mode only)
 # ══════════════════════════════════════════════════════════════════
 
+# One SessionPoller (one thread) for every tracked session, keyed by Plex
+# session key; created on first use
 _plex_poll_lock    = threading.Lock()
-_active_plex_sessions: Dict[str, Dict] = {}    # keyed by Plex session key
-_plex_poll_threads: Dict[str, threading.Thread] = {}
+_plex_poller: Optional[SessionPoller] = None
 
 # Dedup tracking for stop_threshold mode: prevents scrobble safety-net
 # from double-processing an episode already handled by media.stop.
@@ -355,7 +357,7 @@ class PlexIntegration(ServiceIntegration):
                         <input type="number" class="form-control form-control-sm"
                                name="plex-polling-interval" value="{polling_interval}"
                                min="1" max="60" style="max-width:100px;">
-                        <small class="text-muted">How often to check playback progress</small>
+                        <small class="text-muted">Longest gap between progress checks — the threshold moment itself is predicted from playback position</small>
                     </div>
                 </div>
             </div>
@@ -995,12 +997,8 @@ class PlexIntegration(ServiceIntegration):
                         sonarr_id = existing_series.get('id')
                         in_episeerr = False
                         try:
-                            from episeerr import load_config as load_episeerr_config
-                            ep_config = load_episeerr_config()
-                            for rule_name, rule_data in ep_config.get('rules', {}).items():
-                                if str(sonarr_id) in rule_data.get('series', {}):
-                                    in_episeerr = True
-                                    break
+                            import config_store
+                            in_episeerr = config_store.find_rule_for_series(sonarr_id) is not None
                         except Exception:
                             pass
                         
@@ -1564,13 +1562,13 @@ class PlexIntegration(ServiceIntegration):
     def process_episode(self, episode_info: Dict) -> bool:
         """
         Process a Plex episode for Sonarr upgrade logic.
-        Writes a temp file and spawns media_processor.py — same pattern
-        as the Jellyfin/Emby integrations.
+        Queues it on the watch-event worker pool — same pattern as the
+        Jellyfin/Emby integrations. The watchlist is marked watched once
+        the job has actually processed the episode.
         """
-        import subprocess
-        from media_processor import get_series_id, get_episode_tracking_key
-        from episeerr import load_config, save_config
-        import episeerr_utils
+        from media_processor import get_series_id
+        from config_store import load_config, save_config
+        from watch_event_worker import submit_watch_event
 
         series_name = episode_info.get('series_name', '')
         season      = episode_info.get('season_number')
@@ -1587,12 +1585,8 @@ class PlexIntegration(ServiceIntegration):
                 config = load_config()
                 final_rule, modified = reconcile_series_drift(series_id, config)
                 if modified:
-                    from episeerr import save_config
                     save_config(config)
 
-            temp_dir  = os.path.join(os.getcwd(), 'temp')
-            os.makedirs(temp_dir, exist_ok=True)
-
             payload = {
                 'server_title':     series_name,
                 'server_season_num': int(season),
@@ -1603,147 +1597,121 @@ class PlexIntegration(ServiceIntegration):
                 'user':             user,
             }
 
-            temp_path = os.path.join(temp_dir, f'data_from_server_{os.urandom(4).hex()}.json')
-            with open(temp_path, 'w') as fh:
-                import json as _json
-                _json.dump(payload, fh)
-
-            result = subprocess.run(
-                ["python3", os.path.join(os.getcwd(), "media_processor.py"), temp_path],
-                capture_output=True, text=True,
-            )
-
-            try:
-                os.remove(temp_path)
-            except OSError:
-                pass
-
-            if result.returncode != 0:
-                logger.error(f"[Plex] media_processor failed (rc={result.returncode}): {result.stderr}")
+            def _on_complete(job):
+                if not job.result:
+                    logger.error(f"[Plex] media_processor failed for {series_name} S{season}E{episode}: {job.error}")
+                    return
+                logger.info(f"[Plex] Processed {series_name} S{season}E{episode} for {user} at {progress:.1f}%")
+                # Update watchlist sync status to watched
+                if series_id:
+                    self._mark_series_watched(series_id)
+
+            job_id = submit_watch_event(payload, source='plex', on_complete=_on_complete)
+            if not job_id:
+                logger.error(f"[Plex] Could not queue {series_name} S{season}E{episode} for processing")
                 return False
 
-            logger.info(f"[Plex] Processed {series_name} S{season}E{episode} for {user} at {progress:.1f}%")
-
-            # Update watchlist sync status to watched
-            if series_id:
-                try:
-                    import sonarr_utils
-                    prefs = sonarr_utils.load_preferences()
-                    headers = {'X-Api-Key': prefs['SONARR_API_KEY']}
-                    sr = http.get(f"{prefs['SONARR_URL']}/api/v3/series/{series_id}", headers=headers, timeout=10)
-                    if sr.ok:
-                        tmdb_id = str(sr.json().get('tmdbId', ''))
-                        if tmdb_id:
-                            self.mark_item_watched(tmdb_id, 'tv')
-                except Exception as e:
-                    logger.debug(f"[Plex] Could not update watchlist watched status: {e}")
-
+            logger.info(f"[Plex] Queued {series_name} S{season}E{episode} for {user} (job {job_id})")
             return True
 
         except Exception as exc:
             logger.error(f"[Plex] process_episode error: {exc}", exc_info=True)
             return False
 
-    def poll_plex_session(self, session_key: str, episode_info: Dict):
-        """Background thread: poll /status/sessions until threshold or session ends."""
-        cfg              = _get_plex_detection_cfg()
-        url              = cfg['url']
-        api_key          = cfg['api_key']
-        threshold        = cfg['progress_threshold']
-        interval_seconds = cfg['polling_interval'] * 60
-
-        logger.info(
-            f"[Plex] Polling started for session {session_key}: "
-            f"{episode_info.get('series_name')} S{episode_info.get('season_number')}E{episode_info.get('episode_number')} "
-            f"(trigger at {threshold}%)"
-        )
-
+    def _mark_series_watched(self, series_id):
+        """Look up the series' TMDB id in Sonarr and mark its watchlist item watched."""
         try:
-            processed  = False
-            poll_count = 0
-
-            while session_key in _active_plex_sessions and not processed:
-                poll_count += 1
-                current_progress = 0.0
-
-                try:
-                    resp = http.get(
-                        f"{url}/status/sessions",
-                        headers={'X-Plex-Token': api_key},
-                        timeout=10,
-                    )
-                    if resp.ok and resp.text:
-                        import xml.etree.ElementTree as ET
-                        root = ET.fromstring(resp.text)
-                        target_title  = episode_info.get('series_name', '')
-                        target_season = str(episode_info.get('season_number', ''))
-                        target_ep     = str(episode_info.get('episode_number', ''))
-                        matched = False
-                        for video in root.findall('.//Video'):
-                            key_match     = video.get('sessionKey') == str(session_key)
-                            title_match   = (video.get('grandparentTitle', '') == target_title
-                                             and str(video.get('parentIndex', '')) == target_season
-                                             and str(video.get('index', '')) == target_ep)
-                            if key_match or title_match:
-                                view_offset = int(video.get('viewOffset', 0))
-                                duration    = int(video.get('duration', 1))
-                                current_progress = (view_offset / duration * 100) if duration else 0
-                                matched = True
-                                break
-                        if not matched:
-                            # Session no longer active
-                            logger.info(f"[Plex] Session for '{target_title}' S{target_season}E{target_ep} ended — stopping polling (poll #{poll_count})")
-                            break
-                    else:
-                        logger.debug(f"[Plex] Sessions API returned {resp.status_code}")
-
-                except Exception as poll_err:
-                    logger.warning(f"[Plex] Poll error for {session_key}: {poll_err}")
+            import sonarr_utils
+            prefs = sonarr_utils.load_preferences()
+            headers = {'X-Api-Key': prefs['SONARR_API_KEY']}
+            sr = http.get(f"{prefs['SONARR_URL']}/api/v3/series/{series_id}", headers=headers, timeout=10)
+            if sr.ok:
+                tmdb_id = str(sr.json().get('tmdbId', ''))
+                if tmdb_id:
+                    self.mark_item_watched(tmdb_id, 'tv')
+        except Exception as e:
+            logger.debug(f"[Plex] Could not update watchlist watched status: {e}")
 
-                logger.info(f"[Plex] Poll #{poll_count}: {current_progress:.1f}% (threshold {threshold}%)")
+    def get_poller(self) -> SessionPoller:
+        """The shared Plex session poller."""
+        global _plex_poller
+        with _plex_poll_lock:
+            if _plex_poller is None:
+                _plex_poller = SessionPoller(
+                    'Plex',
+                    fetch_sessions=self.fetch_sessions,
+                    check_session=self.check_polled_session,
+                    process_session=self.process_polled_session,
+                    get_settings=self.polling_settings,
+                )
+            return _plex_poller
 
-                if current_progress >= threshold:
-                    logger.info(f"[Plex] Threshold reached — processing episode")
-                    ep_info = {**episode_info, 'progress_percent': current_progress}
-                    success = self.process_episode(ep_info)
-                    if success:
-                        processed = True
+    def polling_settings(self):
+        """(progress threshold %, polling interval in seconds) for the poller."""
+        cfg = _get_plex_detection_cfg()
+        return cfg['progress_threshold'], cfg['polling_interval'] * 60
 
-                if not processed:
-                    time.sleep(interval_seconds)
+    def fetch_sessions(self) -> List[Dict]:
+        """Attributes (plus Player state) of every <Video> in /status/sessions - one request per poller tick."""
+        cfg = _get_plex_detection_cfg()
+        if not cfg['url'] or not cfg['api_key']:
+            raise RuntimeError('Plex not configured')
+        resp = http.get(
+            f"{cfg['url']}/status/sessions",
+            headers={'X-Plex-Token': cfg['api_key']},
+            timeout=10,
+        )
+        resp.raise_for_status()
+        if not resp.text:
+            return []
+        videos = []
+        for video in ET.fromstring(resp.text).findall('.//Video'):
+            attrs  = dict(video.attrib)
+            player = video.find('Player')
+            attrs['state'] = player.get('state', '') if player is not None else ''
+            videos.append(attrs)
+        return videos
+
+    def check_polled_session(self, session_key: str, episode_info: Dict, videos: List[Dict]) -> Optional[Dict]:
+        """Progress of a tracked session in this tick's session list, or None once it ended."""
+        target_title  = episode_info.get('series_name', '')
+        target_season = str(episode_info.get('season_number', ''))
+        target_ep     = str(episode_info.get('episode_number', ''))
+        for video in videos:
+            key_match   = video.get('sessionKey') == str(session_key)
+            title_match = (video.get('grandparentTitle', '') == target_title
+                           and str(video.get('parentIndex', '')) == target_season
+                           and str(video.get('index', '')) == target_ep)
+            if key_match or title_match:
+                view_offset = int(video.get('viewOffset', 0))
+                duration    = int(video.get('duration', 1))
+                return {
+                    'progress': (view_offset / duration * 100) if duration else 0,
+                    'is_paused': video.get('state') == 'paused',
+                    'position': view_offset / 1000,     # ms; the poller predicts the trigger moment
+                    'duration': duration / 1000,
+                }
+        logger.info(f"[Plex] Session for '{target_title}' S{target_season}E{target_ep} ended — stopping polling")
+        return None
 
-        except Exception as exc:
-            logger.error(f"[Plex] poll_plex_session error for {session_key}: {exc}", exc_info=True)
-        finally:
-            with _plex_poll_lock:
-                _active_plex_sessions.pop(session_key, None)
-                _plex_poll_threads.pop(session_key, None)
-            logger.info(f"[Plex] Polling cleaned up for session {session_key}")
+    def process_polled_session(self, session_key: str, episode_info: Dict, state: Dict) -> bool:
+        return self.process_episode({**episode_info, 'progress_percent': state['progress']})
 
     def start_polling(self, session_key: str, episode_info: Dict) -> bool:
-        with _plex_poll_lock:
-            if session_key in _active_plex_sessions:
-                logger.info(f"[Plex] Already polling session {session_key} — skipping")
-                return False
-            _active_plex_sessions[session_key] = episode_info
-
-        thread = threading.Thread(
-            target=self.poll_plex_session,
-            args=(session_key, episode_info),
-            daemon=True,
-            name=f"PlexPoll-{session_key[:8]}",
+        if not self.get_poller().track(session_key, episode_info):
+            logger.info(f"[Plex] Already polling session {session_key} — skipping")
+            return False
+        logger.info(
+            f"[Plex] Polling started for session {session_key}: "
+            f"{episode_info.get('series_name')} S{episode_info.get('season_number')}E{episode_info.get('episode_number')} "
+            f"(trigger at {_get_plex_detection_cfg()['progress_threshold']}%)"
         )
-        thread.start()
-        with _plex_poll_lock:
-            _plex_poll_threads[session_key] = thread
         return True
 
     def stop_polling(self, session_key: str) -> bool:
-        with _plex_poll_lock:
-            if session_key in _active_plex_sessions:
-                logger.info(f"[Plex] Stopping polling for session {session_key}")
-                del _active_plex_sessions[session_key]
-                return True
+        if self.get_poller().untrack(session_key):
+            logger.info(f"[Plex] Stopping polling for session {session_key}")
+            return True
         return False
 
     # ==========================================
@@ -1780,6 +1748,27 @@ class PlexIntegration(ServiceIntegration):
                 import traceback
                 return f"<pre>Error: {str(e)}\n\n{traceback.format_exc()}</pre>", 500, {'Content-Type': 'text/html'}
         
+        @bp.route('/polling-status')
+        def polling_status():
+            """Tracked polling-mode sessions, for debugging"""
+            try:
+                poller_status = integration.get_poller().status()
+                cfg = _get_plex_detection_cfg()
+                return jsonify({
+                    'status': 'success',
+                    'polling_status': {
+                        'active_sessions': [row['session_id'] for row in poller_status['tracked_sessions']],
+                        'tracked_sessions': poller_status['tracked_sessions'],
+                        'thread_count': 1 if poller_status['thread_alive'] else 0,
+                        'last_fetch': poller_status['last_fetch'],
+                        'detection_method': cfg['detection_method'],
+                        'trigger_percentage': cfg['progress_threshold'],
+                        'poll_interval_minutes': cfg['polling_interval'],
+                    }
+                })
+            except Exception as e:
+                return jsonify({'status': 'error', 'message': str(e)}), 500
+
         # ── Plex webhook receiver ─────────────────────────────────────
         @bp.route('/webhook', methods=['POST'])
         def webhook():
@@ -2654,10 +2643,12 @@ class PlexIntegration(ServiceIntegration):
             Server-side proxy for Plex album/thumbnail art.
             Fetches image from the Plex server (raw HTTP) and streams it back
             to the browser over HTTPS, eliminating mixed content errors.
-            Usage: /api/integration/plex/art?url=<encoded_plex_thumb_url>
+            Cached on disk by image_proxy; ?w=<px> asks Plex's transcoder for a thumbnail.
+            Usage: /api/integration/plex/art?url=<encoded_plex_thumb_url>[&w=160]
             """
             from flask import request as freq, Response
             from urllib.parse import unquote, urlparse as _up
+            import image_proxy
             raw_url = freq.args.get('url', '').strip()
             if not raw_url:
                 return Response('Missing url parameter', status=400)
@@ -2666,14 +2657,9 @@ class PlexIntegration(ServiceIntegration):
             parsed = _up(decoded)
             if parsed.port not in (32400, 32469, 443, 80):
                 return Response('Forbidden', status=403)
-            try:
-                r = http.get(decoded, timeout=8, stream=True)
-                r.raise_for_status()
-                content_type = r.headers.get('Content-Type', 'image/jpeg')
-                return Response(r.content, status=200, content_type=content_type)
-            except Exception as e:
-                logger.error(f"Plex art proxy failed for {decoded}: {e}")
-                return Response('Not found', status=404)
+            return image_proxy.serve(decoded, width=freq.args.get('w'),
+                                     upstream_resize=image_proxy.plex_resize,
+                                     timeout=8, label='Plex art')
 
         return bp
 
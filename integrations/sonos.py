@@ -620,9 +620,11 @@ class SonosIntegration(ServiceIntegration):
             Server-side proxy for Sonos album art.
             Handles both local Sonos speaker URLs (port 1400) and external CDN URLs
             returned when playing radio or streaming services.
+            Cached on disk by image_proxy.
             """
             from flask import request as freq, Response
             from urllib.parse import unquote
+            import image_proxy
             raw_url = freq.args.get('url', '').strip()
             if not raw_url:
                 return Response('Missing url parameter', status=400)
@@ -631,15 +633,9 @@ class SonosIntegration(ServiceIntegration):
             blocked = ['169.254.', '127.0.0.1', 'localhost', '0.0.0.0']
             if any(b in decoded for b in blocked):
                 return Response('Forbidden', status=403)
-            try:
-                r = http.get(decoded, timeout=5, stream=True,
-                                 headers={'User-Agent': 'Episeerr/1.0'})
-                r.raise_for_status()
-                content_type = r.headers.get('Content-Type', 'image/jpeg')
-                return Response(r.content, status=200, content_type=content_type)
-            except Exception as e:
-                logger.debug(f"Art proxy failed for {decoded}: {e}")
-                return Response('Not found', status=404)
+            return image_proxy.serve(decoded, width=freq.args.get('w'),
+                                     headers={'User-Agent': 'Episeerr/1.0'},
+                                     timeout=5, label='Sonos art')
 
         return bp
 
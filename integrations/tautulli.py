@@ -12,12 +12,9 @@ Set up in Tautulli:
   URL:      http://<episeerr-host>:5002/api/integration/tautulli/webhook
 """
 
-import os
-import json
 import requests
 from episeerr_utils import http
 import logging
-import subprocess
 from typing import Any, Dict, List, Optional, Tuple
 
 from flask import Blueprint, jsonify, request
@@ -144,17 +141,13 @@ def process_watch_event(data: dict) -> dict:
         if not series_id:
             logger.warning(f"[Tautulli] Cannot find Sonarr ID for '{series_title}'")
         else:
-            from episeerr import load_config, save_config
+            from config_store import load_config, save_config
             from episeerr_utils import reconcile_series_drift
             config = load_config()
             final_rule, modified = reconcile_series_drift(series_id, config)
             if modified:
                 save_config(config)
 
-        # Write temp file + spawn media_processor
-        temp_dir = os.path.join(os.getcwd(), 'temp')
-        os.makedirs(temp_dir, exist_ok=True)
-
         payload = {
             "server_title":    series_title,
             "server_season_num": season_number,
@@ -167,28 +160,15 @@ def process_watch_event(data: dict) -> dict:
             "prefetch_only":   prefetch_only,
         }
 
-        temp_path = os.path.join(temp_dir, f'data_from_server_{os.urandom(4).hex()}.json')
-        with open(temp_path, 'w') as fh:
-            json.dump(payload, fh)
-
-        result = subprocess.run(
-            ["python3", os.path.join(os.getcwd(), "media_processor.py"), temp_path],
-            capture_output=True,
-            text=True,
-        )
+        # Hand off to the watch-event worker pool
+        from watch_event_worker import submit_watch_event
+        job_id = submit_watch_event(payload, source='tautulli')
+        if not job_id:
+            logger.error(f"[Tautulli] Could not queue {series_title} S{season_number}E{episode_number}")
+            return {'status': 'error', 'message': 'watch-event queue full'}
 
-        try:
-            os.remove(temp_path)
-        except OSError:
-            pass
-
-        if result.returncode != 0:
-            logger.error(
-                f"[Tautulli] media_processor failed (rc={result.returncode}): {result.stderr}"
-            )
-        else:
-            action = "Prefetched for" if prefetch_only else "Processed"
-            logger.info(f"[Tautulli] {action} {series_title} S{season_number}E{episode_number}")
+        action = "Queued prefetch for" if prefetch_only else "Queued"
+        logger.info(f"[Tautulli] {action} {series_title} S{season_number}E{episode_number} (job {job_id})")
 
         # Update Plex Watchlist watched status for TV — not on playback start,
         # the episode hasn't been watched yet.
@@ -199,7 +179,7 @@ def process_watch_event(data: dict) -> dict:
             except Exception as e:
                 logger.debug(f"[Tautulli] Could not update watchlist watched status: {e}")
 
-        return {'status': 'success'}
+        return {'status': 'success', 'job_id': job_id}
 
     except Exception as exc:
         logger.error(f"[Tautulli] process_watch_event error: {exc}", exc_info=True)
@@ -5,12 +5,13 @@ import requests
 import logging
 from logging.handlers import RotatingFileHandler
 import json
-import shutil
 import time
 from dotenv import load_dotenv
 from datetime import datetime, timezone
 import threading
 import subprocess
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import pending_deletions
 from episeerr import normalize_url
 from episeerr_utils import reconcile_series_drift, http
@@ -149,54 +150,17 @@ try:
 except Exception as e:
     logger.warning(f"Could not initialize activity storage: {e}")
 
-# Load settings from a JSON configuration file
-def load_config():
-    """Load configuration from JSON file."""
-    config_path = os.getenv('CONFIG_PATH', '/app/config/config.json')
-    
-    # REMOVED: Backup on every load (was causing spam)
-    with open(config_path, 'r') as file:
-        config = json.load(file)
-    
-    # Ensure required keys are present with default values
-    if 'rules' not in config:
-        config['rules'] = {}
-    
-    return config
-
-
-def save_config(config):
-    """Load configuration from JSON file."""
-    config_path = os.getenv('CONFIG_PATH', '/app/config/config.json')
-    
-    # REMOVED: Backup on every load (was causing spam)
-    with open(config_path, 'r') as file:
-        config = json.load(file)
-    
-    # Ensure required keys are present with default values
-    if 'rules' not in config:
-        config['rules'] = {}
-    
-    return config
-
-
-def save_config(config):
-    """Save configuration to JSON file with automatic backup."""
-    config_path = os.getenv('CONFIG_PATH', '/app/config/config.json')
-    os.makedirs(os.path.dirname(config_path), exist_ok=True)
-    
-    # Backup BEFORE saving (only when actually writing)
-    if os.path.exists(config_path):
-        backup_path = config_path + '.bak'
-        try:
-            shutil.copy2(config_path, backup_path)
-            logger.debug(f"Backed up config.json to {backup_path}")
-        except Exception as e:
-            logger.warning(f"Could not backup config.json: {e}")
-    
-    # Save the config
-    with open(config_path, 'w') as file:
-        json.dump(config, file, indent=4)
+# config.json is owned by config_store - same document episeerr.py, webhooks.py
+# and the integrations read and write.
+from config_store import load_config
+import config_store
+import settings_store
+from activity_resolver import ActivityDateResolver, normalize_show_title
+import cleanup_state
+import cleanup_job
+import sonarr_client
+import tag_sync
+import series_index
 
 def move_series_in_config(series_id, from_rule, to_rule):
     """
@@ -212,52 +176,11 @@ def move_series_in_config(series_id, from_rule, to_rule):
         bool: True if successful, False otherwise
     """
     try:
-        config = load_config()
-        
-        # Case-insensitive lookup for from_rule
-        actual_from_rule = None
-        for rn in config['rules'].keys():
-            if rn.lower() == from_rule.lower():
-                actual_from_rule = rn
-                break
-
-        if not actual_from_rule:
-            logger.error(f"Source rule '{from_rule}' not found in config")
-            return False
-
-        # Case-insensitive lookup for to_rule
-        actual_to_rule = None
-        for rn in config['rules'].keys():
-            if rn.lower() == to_rule.lower():
-                actual_to_rule = rn
-                break
-            
+        # Case-insensitive rule lookup, preserves the series' activity data
+        actual_to_rule = config_store.move_series(series_id, from_rule, to_rule)
         if not actual_to_rule:
-            logger.error(f"Target rule '{to_rule}' not found in config")
-            return False
-        
-        # Get series data from source rule
-        source_series = config['rules'][actual_from_rule].get('series', {})
-        series_id_str = str(series_id)
-        
-        if series_id_str not in source_series:
-            logger.warning(f"Series {series_id} not found in rule '{actual_from_rule}'")
             return False
-        
-        # Get the series data (preserve activity info)
-        series_data = source_series[series_id_str]
-        
-        # Remove from source rule
-        del source_series[series_id_str]
-        logger.info(f"Removed series {series_id} from rule '{actual_from_rule}'")
-        
-        # Add to target rule
-        target_series = config['rules'][actual_to_rule].setdefault('series', {})
-        target_series[series_id_str] = series_data
-        logger.info(f"Added series {series_id} to rule '{actual_to_rule}' (preserving activity data)")
-        
-        # Save config
-        save_config(config)
+        logger.info(f"Moved series {series_id} from rule '{from_rule}' to '{actual_to_rule}' (preserving activity data)")
         
         # Sync tag in Sonarr to ensure consistency (remove any duplicates)
         from episeerr_utils import sync_rule_tag_to_sonarr
@@ -292,71 +215,15 @@ def update_activity_date(series_id, season_number=None, episode_number=None, tim
     This becomes the authoritative date that overrides external services.
     """
     try:
-        config = load_config()
         current_time = timestamp or int(time.time())
         
-        # Find the series in rules and update activity_date
-        updated = False
-        for rule_name, rule_details in config['rules'].items():
-            series_dict = rule_details.get('series', {})
-            if str(series_id) in series_dict:
-                # Get grace_scope to determine tracking method
-                grace_scope = rule_details.get('grace_scope', 'series')
-                
-                if grace_scope == 'season':
-                    # PER-SEASON TRACKING
-                    # Ensure series data structure exists
-                    if not isinstance(series_dict[str(series_id)], dict):
-                        series_dict[str(series_id)] = {}
-                    
-                    series_data = series_dict[str(series_id)]
-                    
-                    # Update overall series activity (for Dormant timer)
-                    series_data['activity_date'] = current_time
-                    
-                    # Ensure seasons dict exists
-                    if 'seasons' not in series_data:
-                        series_data['seasons'] = {}
-                    
-                    # Update specific season activity (for Grace timers)
-                    season_key = str(season_number)
-                    if season_key not in series_data['seasons']:
-                        series_data['seasons'][season_key] = {}
-                    
-                    series_data['seasons'][season_key]['activity_date'] = current_time
-                    series_data['seasons'][season_key]['last_episode'] = episode_number
-                    
-                    logger.info(f"📺 Updated PER-SEASON activity for series {series_id} Season {season_number}: S{season_number}E{episode_number} at {datetime.fromtimestamp(current_time)}")
-                else:
-                    # PER-SERIES TRACKING (default/legacy behavior)
-                    series_dict[str(series_id)] = {
-                        'activity_date': current_time,
-                        'last_season': season_number,
-                        'last_episode': episode_number
-                    }
-                    logger.info(f"📺 Updated PER-SERIES activity for series {series_id}: S{season_number}E{episode_number} at {datetime.fromtimestamp(current_time)}")
-                
-                updated = True
-                break
+        # Single journaled write: activity date, last season/episode (per
+        # the rule's grace_scope) and grace_cleaned cleared so the series can
+        # re-enter grace cleanup
+        rule_name = config_store.set_activity(series_id, season_number, episode_number, current_time)
         
-        if updated:
-            save_config(config)
-            logger.info(f"✅ Config saved - series {series_id} activity data updated")
-            
-            # NEW: Clear grace_cleaned flag - allows re-entry to grace cleanup
-            try:
-                config = load_config()  # Reload to ensure we have latest
-                for rule_name, rule_details in config['rules'].items():
-                    series_dict = rule_details.get('series', {})
-                    if str(series_id) in series_dict:
-                        series_data = series_dict[str(series_id)]
-                        if isinstance(series_data, dict):
-                            series_data['grace_cleaned'] = False
-                            save_config(config)
-                            logger.info(f"🔄 Watch detected - cleared grace_cleaned flag for series {series_id}")
-                        break
-            except Exception as e:
-                logger.debug(f"Could not clear grace_cleaned flag: {e}")
+        if rule_name:
+            logger.info(f"📺 Updated activity for series {series_id} (rule '{rule_name}'): S{season_number}E{episode_number} at {datetime.fromtimestamp(current_time)}")
             
             # NEW: Log watch event
             try:
@@ -393,26 +260,23 @@ def get_activity_date_with_hierarchy(series_id, series_title=None, return_comple
     """
     logger.info(f"🔍 Getting activity date for series {series_id} ({series_title})")
     
-    # Step 1: Check config.json (PRIMARY SOURCE)
-    config = load_config()
-    for rule_name, rule_details in config['rules'].items():
-        series_dict = rule_details.get('series', {})
-        series_data = series_dict.get(str(series_id))
-        if isinstance(series_data, dict):
-            activity_date = series_data.get('activity_date')
-            if activity_date:
-                if return_complete:
-                    last_season = series_data.get('last_season')
-                    last_episode = series_data.get('last_episode')
-                    if last_season and last_episode:
-                        logger.info(f"✅ Using complete config data for series {series_id}: S{last_season}E{last_episode} at {datetime.fromtimestamp(activity_date)}")
-                        return activity_date, last_season, last_episode
-                    else:
-                        logger.info(f"⚠️ Config has activity_date but missing season/episode data")
-                        # Continue to external sources for complete data
+    # Step 1: Check config.json (PRIMARY SOURCE) - indexed lookup, no scan
+    _, series_data = config_store.get_series_entry(series_id)
+    if isinstance(series_data, dict):
+        activity_date = series_data.get('activity_date')
+        if activity_date:
+            if return_complete:
+                last_season = series_data.get('last_season')
+                last_episode = series_data.get('last_episode')
+                if last_season and last_episode:
+                    logger.info(f"✅ Using complete config data for series {series_id}: S{last_season}E{last_episode} at {datetime.fromtimestamp(activity_date)}")
+                    return activity_date, last_season, last_episode
                 else:
-                    logger.info(f"✅ Using config activity date for series {series_id}: {datetime.fromtimestamp(activity_date)}")
-                    return activity_date
+                    logger.info(f"⚠️ Config has activity_date but missing season/episode data")
+                    # Continue to external sources for complete data
+            else:
+                logger.info(f"✅ Using config activity date for series {series_id}: {datetime.fromtimestamp(activity_date)}")
+                return activity_date
     
     logger.info(f"⚠️  No config activity date for series {series_id}")
     
@@ -472,6 +336,35 @@ def get_episode_tracking_key(series_name, season, episode, user_name):
     return f"{series_name}:S{season}E{episode}:{user_name}"
 
 
+def parse_server_activity(data):
+    """Pull the viewing details out of a webhook payload dict.
+
+    Shared by get_server_activity() (temp-file/subprocess path) and the
+    in-process watch_event_worker, which hands the payload over directly.
+    """
+    # Try server-prefix fields first (new format)
+    series_title = data.get('server_title')
+    season_number = data.get('server_season_num')
+    episode_number = data.get('server_ep_num')
+    thetvdb_id = data.get('thetvdb_id')
+    themoviedb_id = data.get('themoviedb_id')
+
+    # If not found, try plex-prefix fields (backward compatibility)
+    if not all([series_title, season_number, episode_number]):
+        series_title = data.get('plex_title')
+        season_number = data.get('plex_season_num')
+        episode_number = data.get('plex_ep_num')
+
+    # Playback-start events set this: stage the next episode, but leave
+    # every completion-triggered step to the later watched event.
+    prefetch_only = bool(data.get('prefetch_only', False))
+
+    if all([series_title, season_number, episode_number]):
+        return (series_title, int(season_number), int(episode_number),
+                thetvdb_id, themoviedb_id, prefetch_only)
+
+    return None, None, None, None, None, False
+
 def get_server_activity(filepath=None):
     """Read current viewing details from server webhook stored data."""
     try:
@@ -482,30 +375,11 @@ def get_server_activity(filepath=None):
 
         with open(filepath, 'r') as file:
             data = json.load(file)
-        
-        # Try server-prefix fields first (new format)
-        series_title = data.get('server_title')
-        season_number = data.get('server_season_num')
-        episode_number = data.get('server_ep_num')
-        thetvdb_id = data.get('thetvdb_id')
-        themoviedb_id = data.get('themoviedb_id')
-        
-        # If not found, try plex-prefix fields (backward compatibility)
-        if not all([series_title, season_number, episode_number]):
-            series_title = data.get('plex_title')
-            season_number = data.get('plex_season_num')
-            episode_number = data.get('plex_ep_num')
-        
-        # Playback-start events set this: stage the next episode, but leave
-        # every completion-triggered step to the later watched event.
-        prefetch_only = bool(data.get('prefetch_only', False))
-
-        if all([series_title, season_number, episode_number]):
-            return (series_title, int(season_number), int(episode_number),
-                    thetvdb_id, themoviedb_id, prefetch_only)
 
-        logger.error(f"Required data fields not found in {filepath}")
-        return None, None, None, None, None, False
+        activity = parse_server_activity(data)
+        if activity[0] is None:
+            logger.error(f"Required data fields not found in {filepath}")
+        return activity
 
     except Exception as e:
         logger.error(f"Failed to read or parse data from server webhook: {str(e)}")
@@ -527,86 +401,62 @@ def better_partial_match(webhook_title, sonarr_title):
     return webhook_base == sonarr_base and len(webhook_base) > 3
 
 def get_series_id(series_name, thetvdb_id=None, themoviedb_id=None):
-    """Fetch series ID by name from Sonarr with improved matching."""
-    url = f"{SONARR_URL}/api/v3/series"
-    headers = {'X-Api-Key': SONARR_API_KEY}
+    """Fetch series ID by name from Sonarr with improved matching.
+
+    Resolved through series_index - TVDB id, TMDB id, exact title, title
+    without year, then normalized alternate titles (covers localized titles,
+    e.g. Plex "Es - Welcome to Derry") - over the shared sonarr_client
+    snapshot. A miss is retried once against a fresh list in case the
+    series was only just added.
+    """
     try:
-        response = http.get(url, headers=headers)
-        if not response.ok:
-            logger.error(f"Failed to fetch series from Sonarr: {response.status_code}")
-            return None
-        
-        series_list = response.json()
-        
-        # 1. TVDB ID matching (most reliable)
-        if thetvdb_id:
-            try:
-                tvdb_id_int = int(thetvdb_id)
-                for series in series_list:
-                    if series.get('tvdbId') == tvdb_id_int:
-                        logger.info(f"Found TVDB ID match: {series['title']} (TVDB: {thetvdb_id})")
-                        return series['id']
-            except (ValueError, TypeError):
-                pass
-        
-        # 2. TMDB ID matching
-        if themoviedb_id:
-            try:
-                tmdb_id_int = int(themoviedb_id)
-                for series in series_list:
-                    if series.get('tmdbId') == tmdb_id_int:
-                        logger.info(f"Found TMDB ID match: {series['title']} (TMDB: {themoviedb_id})")
-                        return series['id']
-            except (ValueError, TypeError):
-                pass
-        
-        # 3. Exact title match
-        for series in series_list:
-            if series['title'].lower() == series_name.lower():
-                logger.info(f"Found exact match: {series['title']}")
-                return series['id']
-        
-        # 4. Match without year suffixes
-        webhook_title_clean = re.sub(r'\s*\(\d{4}\)$', '', series_name).strip()
-        for series in series_list:
-            sonarr_title_clean = re.sub(r'\s*\(\d{4}\)$', '', series['title']).strip()
-            if sonarr_title_clean.lower() == webhook_title_clean.lower():
-                logger.info(f"Found match ignoring year: '{series['title']}' matches '{series_name}'")
-                return series['id']
-        
-        
-        
-        # 5. Alternate title match (covers localized titles, e.g. Plex "Es - Welcome to Derry")
-        def _norm(s):
-            s = s.lower()
-            s = re.sub(r'[^\w\s]', '', s)
-            s = re.sub(r'\s+', ' ', s).strip()
-            return s
-
-        incoming_norm = _norm(series_name)
-        for series in series_list:
-            for alt in series.get('alternateTitles', []):
-                alt_title = alt.get('title', '')
-                if _norm(alt_title) == incoming_norm:
-                    logger.info(f"Found alternate title match: '{alt_title}' in series '{series['title']}'")
-                    return series['id']
-
-        # 6. Log close matches for debugging
-        close_matches = []
-        for series in series_list:
-            if series_name.lower() in series['title'].lower():
-                close_matches.append(series['title'])
-
-        if close_matches:
-            missing_logger.info(f"Series not found in Sonarr: '{series_name}'. Possible matches: {close_matches}")
-        else:
-            missing_logger.info(f"Series not found in Sonarr: '{series_name}'. No close matches.")
+        series_id, matched_by, index = series_index.resolve(
+            series_name, thetvdb_id, themoviedb_id, url=SONARR_URL, api_key=SONARR_API_KEY
+        )
+        if series_id is not None:
+            logger.info(f"Found {matched_by} match for '{series_name}': series {series_id}")
+            return series_id
+
+        _log_missing_series(series_name, index)
         return None
         
     except Exception as e:
         logger.error(f"Error in series lookup: {str(e)}")
         return None
 
+
+def _log_missing_series(series_name, index):
+    # Log close matches for debugging
+    close_matches = index.close_matches(series_name)
+    if close_matches:
+        missing_logger.info(f"Series not found in Sonarr: '{series_name}'. Possible matches: {close_matches}")
+    else:
+        missing_logger.info(f"Series not found in Sonarr: '{series_name}'. No close matches.")
+
+
+def get_series_ids(series_names):
+    """Resolve many titles at once: {title: series_id or None}.
+
+    Same matching as get_series_id(), but every title is looked up in one
+    index and the misses share a single retry against a fresh snapshot -
+    for history sweeps (reconcile.py) that resolve hundreds of rows.
+
+    Unlike get_series_id(), a Sonarr failure raises instead of coming back
+    as all-None: reconcile.py must not treat an outage as "not in Sonarr".
+    """
+    names = list(dict.fromkeys(n for n in series_names if n))
+    index = series_index.get_index(url=SONARR_URL, api_key=SONARR_API_KEY)
+    resolved = {name: index.resolve(name)[0] for name in names}
+    missing = [name for name, series_id in resolved.items() if series_id is None]
+    if missing:
+        index = series_index.get_index(max_age=series_index.MISS_REFRESH_SECONDS,
+                                       url=SONARR_URL, api_key=SONARR_API_KEY)
+        for name in missing:
+            resolved[name] = index.resolve(name)[0]
+            if resolved[name] is None:
+                _log_missing_series(name, index)
+    return resolved
+
 def get_episode_details(series_id, season_number):
     """Fetch details of episodes for a specific series and season from Sonarr."""
     url = f"{SONARR_URL}/api/v3/episode?seriesId={series_id}&seasonNumber={season_number}"
@@ -832,15 +682,19 @@ def fetch_next_episodes_dropdown(series_id, season_number, episode_number, get_t
         logger.error(f"Error in dropdown fetch_next_episodes: {str(e)}")
         return []
 
-def fetch_all_episodes(series_id):
-    """Fetch all episodes for a series from Sonarr."""
-    url = f"{SONARR_URL}/api/v3/episode?seriesId={series_id}"
-    headers = {'X-Api-Key': SONARR_API_KEY}
-    response = http.get(url, headers=headers)
-    if response.ok:
-        return response.json()
-    logger.error("Failed to fetch all episodes.")
-    return []
+def fetch_all_episodes(series_id, max_age=0):
+    """Fetch all episodes for a series from Sonarr.
+
+    Goes through sonarr_client, which keeps the list for other readers.
+    max_age=0 (the default) always asks Sonarr - callers that go on to
+    monitor or delete based on the result need current data.
+    """
+    try:
+        return sonarr_client.get_episodes(series_id, max_age=max_age, url=SONARR_URL,
+                                          api_key=SONARR_API_KEY, copy=True)
+    except Exception as e:
+        logger.error(f"Failed to fetch all episodes: {e}")
+        return []
 
 def get_tautulli_last_watched(series_title, return_complete=False):
     """
@@ -857,12 +711,8 @@ def get_tautulli_last_watched(series_title, return_complete=False):
             logger.warning(f"Tautulli not configured")
             return None
         
-        def normalize_title(title):
-            title = title.lower()
-            title = re.sub(r'\s*\(\d{4}\)', '', title)  # Remove year
-            title = re.sub(r'[^\w\s]', ' ', title)      # Remove special chars
-            return ' '.join(title.split())
-        
+        normalize_title = normalize_show_title
+
         normalized_series_title = normalize_title(series_title)
         
         # Create smart title variations
@@ -1248,11 +1098,9 @@ def process_episodes_for_webhook(series_id, season_number, episode_number, rule,
         skip_rule_processing = False
 
         if parsed_ah and parsed_ah['has_plus']:
-            config = load_config()
-            rule_name = _find_rule_name_for_series(series_id, config)
+            rule_name, series_data = config_store.get_series_entry(series_id)
             if rule_name:
-                sid = str(series_id)
-                series_data = config['rules'][rule_name]['series'].get(sid, {})
+                series_data = series_data if isinstance(series_data, dict) else {}
                 act_seasons = series_data.get('activation_seasons', {})
                 season_state = act_seasons.get(str(season_number))
 
@@ -1261,8 +1109,8 @@ def process_episodes_for_webhook(series_id, season_number, episode_number, rule,
                     if activation_ep and episode_number == activation_ep:
                         # Release this season — rule runs normally from here
                         act_seasons[str(season_number)] = 'active'
-                        config['rules'][rule_name]['series'][sid]['activation_seasons'] = act_seasons
-                        save_config(config)
+                        series_data['activation_seasons'] = act_seasons
+                        config_store.set_series_entry(rule_name, series_id, series_data)
                         logger.info(
                             f"Activation released: series {series_id} "
                             f"S{season_number}E{episode_number}"
@@ -1332,8 +1180,7 @@ def process_episodes_for_webhook(series_id, season_number, episode_number, rule,
                         if ep.get('episodeFileId')
                     ]
                     if episodes_with_files:
-                        keep_rule_config = load_config()
-                        keep_rule_name = _find_rule_name_for_series(series_id, keep_rule_config)
+                        keep_rule_name = _find_rule_name_for_series(series_id)
                         delete_episodes_immediately(
                             episodes_with_files,
                             series_id,
@@ -1396,8 +1243,7 @@ def process_episodes_for_webhook(series_id, season_number, episode_number, rule,
                                 if ep.get('episodeFileId')
                             ]
                             if releasable_with_files:
-                                finale_config = load_config()
-                                finale_rule_name = _find_rule_name_for_series(series_id, finale_config)
+                                finale_rule_name = _find_rule_name_for_series(series_id)
                                 delete_episodes_immediately(
                                     releasable_with_files, series_id, title,
                                     reason=f"Season finale, no next season (released from keep)",
@@ -1507,13 +1353,11 @@ def _advance_sequential_if_finale(series_id, season_number, episode_number, rule
         )
 
         # Set next season to held state
-        config = load_config()
-        rule_name = _find_rule_name_for_series(series_id, config)
+        rule_name, series_data = config_store.get_series_entry(series_id)
         if rule_name:
-            sid = str(series_id)
-            series_data = config['rules'][rule_name]['series'].setdefault(sid, {})
+            series_data = series_data if isinstance(series_data, dict) else {}
             series_data.setdefault('activation_seasons', {})[str(next_season)] = 'held'
-            save_config(config)
+            config_store.set_series_entry(rule_name, series_id, series_data)
             logger.info(
                 f"Sequential advance: set S{next_season} to held for series {series_id}"
             )
@@ -1591,81 +1435,12 @@ def _unmonitor_if_series_ended(series_id, season_number, series_title):
 # ============================================================================
 
 def load_global_settings():
-    """Load global settings including storage gate."""
-    try:
-        settings_path = os.path.join(os.getcwd(), 'config', 'global_settings.json')
-        
-        if os.path.exists(settings_path):
-            with open(settings_path, 'r') as f:
-                settings = json.load(f)
-            
-            # ADD THIS MIGRATION BLOCK:
-            # MIGRATION: Add dry_run_mode if missing (default to True for safety)
-            if 'dry_run_mode' not in settings:
-                settings['dry_run_mode'] = True
-                save_global_settings(settings)
-                logger.info("✓ Migrated global_settings.json - added dry_run_mode: true")
-
-            # MIGRATION: hold automation + missed watch-event reconciliation (default: off)
-            if 'automation_held' not in settings:
-                settings.setdefault('automation_held', False)
-                settings.setdefault('reconcile_enabled', False)
-                save_global_settings(settings)
-                logger.info("✓ Migrated global_settings.json - added automation_held/reconcile settings")
-
-            return settings
-        else:
-            # Default settings (already has dry_run_mode: True - good!)
-            default_settings = {
-                'global_storage_min_gb': None,
-                'cleanup_interval_hours': 6,
-                'dry_run_mode': True,
-                'auto_assign_new_series': False,
-
-                'notifications_enabled': False,
-                'discord_webhook_url': '',
-                'episeerr_url': 'http://localhost:5002',
-
-                'automation_held': False,
-                'reconcile_enabled': False
-            }
-            save_global_settings(default_settings)
-            return default_settings
-    except Exception as e:
-        logger.error(f"Error loading global settings: {str(e)}")
-        return {
-            'global_storage_min_gb': None,
-            'cleanup_interval_hours': 6,
-            'dry_run_mode': True,
-            'auto_assign_new_series': False,
-            'notifications_enabled': False,
-            'discord_webhook_url': '',
-            'episeerr_url': 'http://localhost:5002',
-            'automation_held': False,
-            'reconcile_enabled': False
-        }
+    """Load global settings including storage gate (in-memory, see settings_store)."""
+    return settings_store.load_settings()
 
 def save_global_settings(settings):
     """Save global settings to file with automatic backup."""
-    try:
-        settings_path = os.path.join(os.getcwd(), 'config', 'global_settings.json')
-        os.makedirs(os.path.dirname(settings_path), exist_ok=True)
-        
-        # Backup BEFORE saving (only when actually writing)
-        if os.path.exists(settings_path):
-            backup_path = settings_path + '.bak'
-            try:
-                shutil.copy2(settings_path, backup_path)
-                logger.debug(f"Backed up global_settings.json to {backup_path}")
-            except Exception as e:
-                logger.warning(f"Could not backup global_settings.json: {e}")
-        
-        # Save the settings
-        with open(settings_path, 'w') as f:
-            json.dump(settings, f, indent=4)
-        logger.info("Global settings saved successfully")
-    except Exception as e:
-        logger.error(f"Error saving global settings: {str(e)}")
+    settings_store.save_settings(settings)
 
 def check_global_storage_gate():
     """Check if global storage gate allows cleanup to proceed."""
@@ -1829,13 +1604,15 @@ def validate_always_have_expression(expression):
     return True, None
 
 
-def _find_rule_name_for_series(series_id, config):
-    """Return the rule name that owns this series_id, or None."""
-    sid = str(series_id)
-    for rule_name, rule_data in config.get('rules', {}).items():
-        if sid in rule_data.get('series', {}):
-            return rule_name
-    return None
+def _find_rule_name_for_series(series_id, config=None):
+    """Return the rule name that owns this series_id, or None.
+
+    Without config this is a lookup in config_store's series index. A
+    caller-held config (edited but not saved yet) is checked directly.
+    """
+    if config is None:
+        return config_store.find_rule_for_series(series_id)
+    return config_store.find_rule_in(config, series_id)
 
 
 def is_held_activation_episode(series_name, season_number, episode_number):
@@ -1845,23 +1622,20 @@ def is_held_activation_episode(series_name, season_number, episode_number):
     Called by integrations on playback start to fire rule execution immediately
     without waiting for the watch-completion threshold.
     """
-    from episeerr import load_config
     series_id = get_series_id(series_name)
     if not series_id:
         return False, None
-    config = load_config()
-    rule_name = _find_rule_name_for_series(series_id, config)
+    rule_name, series_data = config_store.get_series_entry(series_id)
     if not rule_name:
         return False, None
-    rule = config['rules'][rule_name]
+    rule = config_store.get_rule(rule_name)
     always_have = rule.get('always_have', '')
     if not always_have:
         return False, None
     parsed_ah = parse_always_have(always_have)
     if not parsed_ah or not parsed_ah['has_plus']:
         return False, None
-    sid = str(series_id)
-    series_data = rule.get('series', {}).get(sid, {})
+    series_data = series_data if isinstance(series_data, dict) else {}
     act_seasons = series_data.get('activation_seasons', {})
     if act_seasons.get(str(season_number)) != 'held':
         return False, None
@@ -2078,11 +1852,9 @@ def process_always_have(series_id, expression, starting_season=None):
 
         # Initialize per-season held state for + modifier
         if has_plus and grabbed_seasons:
-            config = load_config()
-            rule_name = _find_rule_name_for_series(series_id, config)
+            rule_name, series_data = config_store.get_series_entry(series_id)
             if rule_name:
-                sid = str(series_id)
-                series_data = config['rules'][rule_name]['series'].setdefault(sid, {})
+                series_data = series_data if isinstance(series_data, dict) else {}
                 # Don't apply held state if the series already has watch history
                 already_watched = series_data.get('activity_date') is not None
                 if already_watched:
@@ -2098,7 +1870,7 @@ def process_always_have(series_id, expression, starting_season=None):
                             act_seasons[str(s)] = 'held'
                             newly_held.append(s)
                     if newly_held:
-                        save_config(config)
+                        config_store.set_series_entry(rule_name, series_id, series_data)
                         logger.info(
                             f"process_always_have: set held state for series {series_id} "
                             f"seasons {sorted(newly_held)}"
@@ -2210,6 +1982,45 @@ def _get_episode_file_sizes(series_id):
         return {}
 
 
+# Episode files per DELETE /api/v3/episodefile/bulk call
+EPISODE_FILE_DELETE_BATCH = 100
+
+
+def _delete_episode_files(episode_file_ids, headers, log=logger):
+    """
+    Delete episode files through DELETE /api/v3/episodefile/bulk,
+    EPISODE_FILE_DELETE_BATCH ids per call. A batch the bulk endpoint rejects
+    falls back to one DELETE per file.
+
+    Returns (deleted, failed) lists of episode file ids.
+    """
+    deleted, failed = [], []
+    for start in range(0, len(episode_file_ids), EPISODE_FILE_DELETE_BATCH):
+        chunk = episode_file_ids[start:start + EPISODE_FILE_DELETE_BATCH]
+        try:
+            response = http.delete(f"{SONARR_URL}/api/v3/episodefile/bulk", headers=headers,
+                                   json={'episodeFileIds': chunk}, timeout=60)
+            if response.ok:
+                deleted.extend(chunk)
+                log.info(f"✅ Deleted episode file IDs: {chunk}")
+                continue
+            log.warning(f"Bulk episode file delete failed ({response.status_code}) for {len(chunk)} files - retrying one by one")
+        except Exception as e:
+            log.warning(f"Bulk episode file delete error for {len(chunk)} files: {e} - retrying one by one")
+
+        for episode_file_id in chunk:
+            try:
+                url = f"{SONARR_URL}/api/v3/episodeFile/{episode_file_id}"
+                response = http.delete(url, headers=headers)
+                response.raise_for_status()
+                deleted.append(episode_file_id)
+                log.info(f"✅ Deleted episode file ID: {episode_file_id}")
+            except Exception as err:
+                failed.append(episode_file_id)
+                log.error(f"❌ Failed to delete episode file {episode_file_id}: {err}")
+    return deleted, failed
+
+
 def delete_episodes_immediately(episodes, series_id, series_title, reason="Keep Rule", rule_dry_run=False, rule_name=None, force=False):
     """
     Direct deletion for Keep rule - real-time webhook cleanup.
@@ -2243,31 +2054,34 @@ def delete_episodes_immediately(episodes, series_id, series_title, reason="Keep
         else:
             logger.info(f"🔍 DRY RUN (rule '{rule_name}'): Queueing {len(episodes)} episodes from {series_title}")
 
-        from pending_deletions import queue_deletion
+        from pending_deletions import queue_deletions
 
         file_sizes = _get_episode_file_sizes(series_id)
 
+        items = []
         for ep in episodes:
             episode_file_id = ep.get('episodeFileId')
-            try:
-                season_num = ep.get('seasonNumber')
-                episode_num = ep.get('episodeNumber')
-                queue_deletion(
-                    series_id=series_id,
-                    series_title=series_title,
-                    season_number=season_num,
-                    episode_number=episode_num,
-                    episode_id=ep.get('id'),
-                    episode_title=ep.get('title') or f"S{season_num}E{episode_num}",
-                    episode_file_id=episode_file_id,
-                    reason=reason,
-                    date_source="Webhook",
-                    date_value=datetime.now(timezone.utc).strftime('%Y-%m-%d'),
-                    rule_name=rule_name or "Unknown",
-                    file_size=file_sizes.get(episode_file_id, 0)
-                )
-            except Exception as e:
-                logger.error(f"Error queueing episode file {episode_file_id}: {str(e)}")
+            season_num = ep.get('seasonNumber')
+            episode_num = ep.get('episodeNumber')
+            items.append(dict(
+                series_id=series_id,
+                series_title=series_title,
+                season_number=season_num,
+                episode_number=episode_num,
+                episode_id=ep.get('id'),
+                episode_title=ep.get('title') or f"S{season_num}E{episode_num}",
+                episode_file_id=episode_file_id,
+                reason=reason,
+                date_source="Webhook",
+                date_value=datetime.now(timezone.utc).strftime('%Y-%m-%d'),
+                rule_name=rule_name or "Unknown",
+                file_size=file_sizes.get(episode_file_id, 0)
+            ))
+        try:
+            # One lock acquisition and one debounced write for the batch
+            queue_deletions(items)
+        except Exception as e:
+            logger.error(f"Error queueing {len(items)} episodes from {series_title}: {str(e)}")
 
         logger.info(f"✅ Queued {len(episodes)} episodes for approval (Keep Rule dry run)")
         return
@@ -2277,20 +2091,11 @@ def delete_episodes_immediately(episodes, series_id, series_title, reason="Keep
     logger.info(f"🗑️ KEEP RULE: Deleting {len(episode_file_ids)} episodes from {series_title} - {reason}")
 
     headers = {'X-Api-Key': SONARR_API_KEY}
-    successful_deletes = 0
-    failed_deletes = []
-
-    for episode_file_id in episode_file_ids:
-        try:
-            url = f"{SONARR_URL}/api/v3/episodeFile/{episode_file_id}"
-            response = http.delete(url, headers=headers)
-            response.raise_for_status()
-            successful_deletes += 1
-            logger.info(f"✅ Deleted episode file ID: {episode_file_id}")
-        except Exception as err:
-            failed_deletes.append(episode_file_id)
-            logger.error(f"❌ Failed to delete episode file {episode_file_id}: {err}")
+    deleted, failed_deletes = _delete_episode_files(episode_file_ids, headers)
+    successful_deletes = len(deleted)
 
+    if successful_deletes:
+        sonarr_client.invalidate_episodes(series_id)
     logger.info(f"📊 Keep rule deletion: {successful_deletes} successful, {len(failed_deletes)} failed")
     if failed_deletes:
         logger.error(f"❌ Failed deletes: {failed_deletes}")
@@ -2339,31 +2144,34 @@ def delete_episodes_in_sonarr_with_logging(
             cleanup_logger.info(f"🔍 DRY RUN (rule '{rule_name}'): Queueing {len(episodes)} episodes")
 
         # Import here to avoid circular imports
-        from pending_deletions import queue_deletion
+        from pending_deletions import queue_deletions
 
         file_sizes = _get_episode_file_sizes(series_id)
 
+        items = []
         for ep in episodes:
             episode_file_id = ep.get('episodeFileId')
-            try:
-                season_num = ep.get('seasonNumber')
-                episode_num = ep.get('episodeNumber')
-                queue_deletion(
-                    series_id=series_id,
-                    series_title=series_title,
-                    season_number=season_num,
-                    episode_number=episode_num,
-                    episode_id=ep.get('id'),
-                    episode_title=ep.get('title') or f"S{season_num}E{episode_num}",
-                    episode_file_id=episode_file_id,
-                    reason=reason or "Cleanup",
-                    date_source=date_source or "Unknown",
-                    date_value=date_value or "N/A",
-                    rule_name=rule_name or "Unknown",
-                    file_size=file_sizes.get(episode_file_id, 0)
-                )
-            except Exception as e:
-                cleanup_logger.error(f"Error queueing episode file {episode_file_id}: {str(e)}")
+            season_num = ep.get('seasonNumber')
+            episode_num = ep.get('episodeNumber')
+            items.append(dict(
+                series_id=series_id,
+                series_title=series_title,
+                season_number=season_num,
+                episode_number=episode_num,
+                episode_id=ep.get('id'),
+                episode_title=ep.get('title') or f"S{season_num}E{episode_num}",
+                episode_file_id=episode_file_id,
+                reason=reason or "Cleanup",
+                date_source=date_source or "Unknown",
+                date_value=date_value or "N/A",
+                rule_name=rule_name or "Unknown",
+                file_size=file_sizes.get(episode_file_id, 0)
+            ))
+        try:
+            # One lock acquisition and one debounced write for the batch
+            queue_deletions(items)
+        except Exception as e:
+            cleanup_logger.error(f"Error queueing {len(items)} episodes from {series_title}: {str(e)}")
 
         cleanup_logger.info(f"✅ Queued {len(episodes)} episodes for approval")
         return
@@ -2372,21 +2180,16 @@ def delete_episodes_in_sonarr_with_logging(
     episode_file_ids = [ep['episodeFileId'] for ep in episodes if ep.get('episodeFileId')]
     cleanup_logger.info(f"🗑️  DELETING: {len(episode_file_ids)} episode files from {series_title}")
 
-    headers = {'X-Api-Key': SONARR_API_KEY}
-    successful_deletes = 0
-    failed_deletes = []
+    # Sizes only feed the cleanup job's bytes-freed progress
+    file_sizes = _get_episode_file_sizes(series_id) if cleanup_job.active() else {}
 
-    for episode_file_id in episode_file_ids:
-        try:
-            url = f"{SONARR_URL}/api/v3/episodeFile/{episode_file_id}"
-            response = http.delete(url, headers=headers)
-            response.raise_for_status()
-            successful_deletes += 1
-            cleanup_logger.info(f"✅ Deleted episode file ID: {episode_file_id}")
-        except Exception as err:
-            failed_deletes.append(episode_file_id)
-            cleanup_logger.error(f"❌ Failed to delete episode file {episode_file_id}: {err}")
+    headers = {'X-Api-Key': SONARR_API_KEY}
+    deleted, failed_deletes = _delete_episode_files(episode_file_ids, headers, log=cleanup_logger)
+    successful_deletes = len(deleted)
+    cleanup_job.add_bytes_freed(sum(file_sizes.get(episode_file_id, 0) for episode_file_id in deleted))
 
+    if successful_deletes:
+        sonarr_client.invalidate_episodes(series_id)
     cleanup_logger.info(f"📊 Deletion summary: {successful_deletes} successful, {len(failed_deletes)} failed")
     if failed_deletes:
         cleanup_logger.error(f"❌ Failed deletes: {failed_deletes}")
@@ -2401,14 +2204,149 @@ def _fetch_sonarr_series_lookup():
     """Fetch the full Sonarr series list once. Shared by run_unified_cleanup
     and the three cleanup phases so a single cleanup cycle doesn't issue a
     separate GET /api/v3/series per phase. Returns (all_series, series_lookup).
+
+    Always fresh (the fingerprints in cleanup_state depend on current file
+    statistics) and a private copy, so nothing the cycle does to a series
+    dict leaks into the shared snapshot; the fetch still refreshes it.
     """
-    headers = {'X-Api-Key': SONARR_API_KEY}
-    response = http.get(f"{SONARR_URL}/api/v3/series", headers=headers)
-    all_series = response.json() if response.ok else []
+    try:
+        all_series = sonarr_client.get_all_series(max_age=0, url=SONARR_URL, api_key=SONARR_API_KEY, copy=True)
+    except Exception as e:
+        cleanup_logger.error(f"Failed to fetch series from Sonarr: {e}")
+        all_series = []
     return all_series, {s['id']: s for s in all_series}
 
 
-def _scan_grace_candidates(config, series_lookup, current_time, day_field, global_dry_run):
+DEFAULT_CLEANUP_WORKERS = 4
+
+
+def _cleanup_workers():
+    """Size of the per-series cleanup pool (global setting cleanup_workers)."""
+    try:
+        return max(1, int(load_global_settings().get('cleanup_workers', DEFAULT_CLEANUP_WORKERS)))
+    except (TypeError, ValueError):
+        return DEFAULT_CLEANUP_WORKERS
+
+
+_EXHAUSTED = object()
+
+
+def _map_in_order(fn, items, workers):
+    """
+    Yield (item, fn(item)) in input order while running fn on up to `workers`
+    threads. Only a small window past the consumer is ever submitted, so a
+    caller that breaks out early (storage target reached) doesn't pay for
+    fetches it will never use - queued work is cancelled on exit.
+    """
+    items = iter(items)
+    window = workers * 2
+    in_flight = deque()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='cleanup') as pool:
+        def fill():
+            while len(in_flight) < window:
+                item = next(items, _EXHAUSTED)
+                if item is _EXHAUSTED:
+                    return
+                in_flight.append((item, pool.submit(fn, item)))
+
+        fill()
+        try:
+            while in_flight:
+                item, future = in_flight.popleft()
+                fill()
+                yield item, future.result()
+        finally:
+            for _, future in in_flight:
+                future.cancel()
+
+
+def _run_cleanup_candidates(candidates, plan_fn, apply_fn, storage_min_gb, phase_name, cleanup_pass=None):
+    """
+    Run one cleanup phase's per-series work on the cleanup pool.
+
+    plan_fn(candidate) does the read-only Sonarr fetch/evaluate and returns a
+    plan dict (plan['episodes'] is what apply would delete) or None to skip.
+    apply_fn(candidate, plan) does the deletes / config writes and returns a
+    count. A series' plan and apply always run in that order on one thread,
+    so its mutations stay ordered; different series run concurrently.
+
+    Without a storage gate, whole series run on the pool. With one, plans are
+    prefetched in priority order but applies stay sequential here and free
+    space is re-checked after each non-dry-run deletion, before the next
+    non-dry-run apply, so the tier still stops as soon as the target is
+    reached. Series that error or are never
+    reached - including everything left when the cleanup job is cancelled -
+    are deferred on cleanup_pass so the next cycle re-evaluates them.
+    """
+    workers = _cleanup_workers()
+    cleanup_job.start_items(len(candidates))
+
+    def defer(candidate):
+        if cleanup_pass is not None:
+            cleanup_pass.defer(candidate['series_id'])
+
+    def plan_safely(candidate):
+        try:
+            return plan_fn(candidate)
+        except Exception as e:
+            cleanup_logger.error(f"Error evaluating series {candidate.get('series_id')} for {phase_name}: {str(e)}")
+            defer(candidate)
+            return None
+
+    def apply_safely(candidate, plan):
+        if plan is None:
+            return 0
+        try:
+            return apply_fn(candidate, plan) or 0
+        except Exception as e:
+            cleanup_logger.error(f"Error applying {phase_name} to series {candidate.get('series_id')}: {str(e)}")
+            defer(candidate)
+            return 0
+
+    def run_series(candidate):
+        if cleanup_job.cancel_requested():
+            defer(candidate)
+            return 0
+        return apply_safely(candidate, plan_safely(candidate))
+
+    total = 0
+    if not storage_min_gb:
+        for _, count in _map_in_order(run_series, candidates, workers):
+            total += count
+            cleanup_job.advance()
+        return total
+
+    # Free space only grows through deletions, so a check that found the
+    # target unmet stays valid until something has been deleted. Every
+    # non-dry-run apply - including ones that only write config, like the
+    # grace_cleaned bookmark flag - still runs behind a passed check.
+    gate_checked = False
+    for index, (candidate, plan) in enumerate(_map_in_order(plan_safely, candidates, workers)):
+        if cleanup_job.cancel_requested():
+            cleanup_logger.info(f"⏹️ Cleanup cancelled - stopping {phase_name}")
+            for skipped in candidates[index:]:
+                defer(skipped)
+            break
+        cleanup_job.advance()
+        if plan is None:
+            continue
+        if not candidate['is_dry_run'] and not gate_checked:
+            current_disk = get_sonarr_disk_space()
+            if current_disk and current_disk['free_space_gb'] >= storage_min_gb:
+                cleanup_logger.info(f"🎯 Storage target reached - stopping {phase_name}")
+                for skipped in candidates[index:]:
+                    defer(skipped)
+                break
+            gate_checked = current_disk is not None
+        count = apply_safely(candidate, plan)
+        if count and not candidate['is_dry_run']:
+            gate_checked = False
+        total += count
+    return total
+
+
+def _scan_grace_candidates(config, series_lookup, current_time, day_field, global_dry_run, resolver=None,
+                           cleanup_pass=None):
     """
     Shared Phase 1 for grace_watched/grace_unwatched cleanup: find every
     series whose rule has `day_field` ('grace_watched' or 'grace_unwatched')
@@ -2416,7 +2354,12 @@ def _scan_grace_candidates(config, series_lookup, current_time, day_field, globa
     flagged grace_cleaned (see the grace_cleaned coupling note in
     run_grace_watched_cleanup). Returns an unsorted list of candidate dicts;
     callers sort by days_since_activity before Phase 2 processing.
+    Activity dates come from `resolver` (an ActivityDateResolver) so the scan
+    never does per-series Tautulli/Sonarr lookups. With a cleanup_pass, series
+    it has not marked dirty are skipped outright.
     """
+    if resolver is None:
+        resolver = ActivityDateResolver(series_lookup)
     candidates = []
     for rule_name, rule in config['rules'].items():
         day_threshold = rule.get(day_field)
@@ -2436,6 +2379,8 @@ def _scan_grace_candidates(config, series_lookup, current_time, day_field, globa
         for series_id_str, series_data in series_dict.items():
             try:
                 series_id = int(series_id_str)
+                if cleanup_pass is not None and not cleanup_pass.wants(series_id):
+                    continue
                 series_info = series_lookup.get(series_id)
                 if not series_info:
                     continue
@@ -2454,7 +2399,7 @@ def _scan_grace_candidates(config, series_lookup, current_time, day_field, globa
                     cleanup_logger.debug(f"⏭️ {series_title}: Already cleaned, skipping")
                     continue
 
-                result = get_activity_date_with_hierarchy(series_id, series_title, return_complete=True)
+                result = resolver.resolve(series_id, series_title, return_complete=True)
                 if isinstance(result, tuple) and len(result) == 3:
                     activity_date, last_season, last_episode = result
                 else:
@@ -2490,7 +2435,78 @@ def _scan_grace_candidates(config, series_lookup, current_time, day_field, globa
     return candidates
 
 
-def run_grace_watched_cleanup(series_lookup=None):
+def _plan_grace_watched(candidate):
+    """Fetch a grace_watched candidate's episodes and pick what to delete:
+    every watched episode with a file except the last one (the reference
+    point), minus anchors."""
+    series_id = candidate['series_id']
+    last_season = candidate['last_season']
+    last_episode = candidate['last_episode']
+
+    watched_episodes = []
+    for episode in fetch_all_episodes(series_id):
+        if not episode.get('hasFile'):
+            continue
+        season_num = episode.get('seasonNumber', 0)
+        episode_num = episode.get('episodeNumber', 0)
+
+        if (season_num < last_season or
+                (season_num == last_season and episode_num <= last_episode)):
+            watched_episodes.append(episode)
+
+    watched_episodes.sort(key=lambda ep: (ep['seasonNumber'], ep['episodeNumber']))
+
+    episodes_with_files = []
+    if len(watched_episodes) > 1:
+        # Keep last watched, delete rest - minus anchor episodes (S01E01)
+        delete_episodes = [ep for ep in watched_episodes[:-1] if not is_anchor_episode(ep, series_id)]
+        episodes_with_files = [ep for ep in delete_episodes if ep.get('episodeFileId')]
+
+    return {
+        'watched_count': len(watched_episodes),
+        'keep_episode': watched_episodes[-1] if watched_episodes else None,
+        'episodes': episodes_with_files,
+    }
+
+
+def _apply_grace_watched(candidate, plan):
+    series_title = candidate['series_title']
+    grace_watched_days = candidate['day_threshold']
+    episodes_with_files = plan['episodes']
+
+    cleanup_logger.info(f"🟡 {series_title}: Inactive {candidate['days_since_activity']:.1f}d > {grace_watched_days}d")
+    cleanup_logger.info(f"   📺 Last watched: S{candidate['last_season']}E{candidate['last_episode']}")
+
+    if plan['watched_count'] > 1:
+        if episodes_with_files:
+            keep_episode = plan['keep_episode']
+            cleanup_logger.info(f"   📊 Deleting {len(episodes_with_files)} old watched episodes")
+            cleanup_logger.info(f"   🔖 Keeping S{keep_episode['seasonNumber']}E{keep_episode['episodeNumber']} as reference")
+
+            activity_date_str = datetime.fromtimestamp(candidate['activity_date']).strftime('%Y-%m-%d')
+
+            delete_episodes_in_sonarr_with_logging(
+                episodes_with_files,
+                candidate['series_id'],
+                candidate['is_dry_run'],
+                series_title,
+                reason=f"Grace Watched ({grace_watched_days}d) - Keep Last Watched",
+                date_source="Last Activity",
+                date_value=activity_date_str,
+                rule_name=candidate['rule_name']
+            )
+            return len(episodes_with_files)
+    elif plan['watched_count'] == 1:
+        cleanup_logger.info("   🔖 Only 1 watched episode - keeping as reference")
+    else:
+        cleanup_logger.info("   ⏭️ No watched episodes to delete")
+
+    # Mark as cleaned (unwatched cleanup will verify bookmark exists)
+    # Don't mark here - let unwatched cleanup decide
+    return 0
+
+
+def run_grace_watched_cleanup(series_lookup=None, resolver=None, cleanup_pass=None):
     """
     Grace Watched Cleanup - Keep last watched episode as reference point.
 
@@ -2521,105 +2537,132 @@ def run_grace_watched_cleanup(series_lookup=None):
 
         storage_min_gb = global_settings.get('global_storage_min_gb')
 
-        total_deleted = 0
         if series_lookup is None:
             _, series_lookup = _fetch_sonarr_series_lookup()
         current_time = int(time.time())
 
         # ── Phase 1: find every series past its grace_watched threshold ────
-        candidates = _scan_grace_candidates(config, series_lookup, current_time, 'grace_watched', global_dry_run)
+        candidates = _scan_grace_candidates(config, series_lookup, current_time, 'grace_watched', global_dry_run, resolver,
+                                            cleanup_pass)
 
-        # ── Phase 2: process oldest-inactivity-first, honoring the storage
-        # gate incrementally so this tier only deletes as much as it needs ──
+        # ── Phase 2: process oldest-inactivity-first on the cleanup pool,
+        # honoring the storage gate incrementally so this tier only deletes
+        # as much as it needs ──
         candidates.sort(key=lambda c: c['days_since_activity'], reverse=True)
 
-        for candidate in candidates:
-            if storage_min_gb and not candidate['is_dry_run']:
-                current_disk = get_sonarr_disk_space()
-                if current_disk and current_disk['free_space_gb'] >= storage_min_gb:
-                    cleanup_logger.info("🎯 Storage target reached - stopping grace watched cleanup")
-                    break
-
-            series_id = candidate['series_id']
-            series_title = candidate['series_title']
-            rule_name = candidate['rule_name']
-            grace_watched_days = candidate['day_threshold']
-            is_dry_run = candidate['is_dry_run']
-            activity_date = candidate['activity_date']
-            last_season = candidate['last_season']
-            last_episode = candidate['last_episode']
-            days_since_activity = candidate['days_since_activity']
-
-            cleanup_logger.info(f"🟡 {series_title}: Inactive {days_since_activity:.1f}d > {grace_watched_days}d")
-            cleanup_logger.info(f"   📺 Last watched: S{last_season}E{last_episode}")
-
-            # Get all episodes
-            all_episodes = fetch_all_episodes(series_id)
-
-            # Find watched episodes
-            watched_episodes = []
-            for episode in all_episodes:
-                if not episode.get('hasFile'):
-                    continue
-                season_num = episode.get('seasonNumber', 0)
-                episode_num = episode.get('episodeNumber', 0)
-
-                if (season_num < last_season or
-                        (season_num == last_season and episode_num <= last_episode)):
-                    watched_episodes.append(episode)
-
-            # Sort by season/episode
-            watched_episodes.sort(key=lambda ep: (ep['seasonNumber'], ep['episodeNumber']))
-
-            if len(watched_episodes) > 1:
-                # Keep last watched, delete rest
-                keep_episode = watched_episodes[-1]
-                delete_episodes = watched_episodes[:-1]
-
-                # Filter out anchor episodes (S01E01)
-                delete_episodes = [ep for ep in delete_episodes if not is_anchor_episode(ep, series_id)]
-
-                episodes_with_files = [ep for ep in delete_episodes if ep.get('episodeFileId')]
-
-                if episodes_with_files:
-                    cleanup_logger.info(f"   📊 Deleting {len(episodes_with_files)} old watched episodes")
-                    cleanup_logger.info(f"   🔖 Keeping S{keep_episode['seasonNumber']}E{keep_episode['episodeNumber']} as reference")
-
-                    from datetime import datetime
-                    activity_date_str = datetime.fromtimestamp(activity_date).strftime('%Y-%m-%d')
-
-                    delete_episodes_in_sonarr_with_logging(
-                        episodes_with_files,
-                        series_id,
-                        is_dry_run,
-                        series_title,
-                        reason=f"Grace Watched ({grace_watched_days}d) - Keep Last Watched",
-                        date_source="Last Activity",
-                        date_value=activity_date_str,
-                        rule_name=rule_name
-                    )
-                    total_deleted += len(episodes_with_files)
-            elif len(watched_episodes) == 1:
-                cleanup_logger.info("   🔖 Only 1 watched episode - keeping as reference")
-            else:
-                cleanup_logger.info("   ⏭️ No watched episodes to delete")
-
-            # Mark as cleaned (unwatched cleanup will verify bookmark exists)
-            # Don't mark here - let unwatched cleanup decide
+        total_deleted = _run_cleanup_candidates(
+            candidates, _plan_grace_watched, _apply_grace_watched,
+            storage_min_gb, 'grace watched cleanup', cleanup_pass,
+        )
 
         cleanup_logger.info(f"🟡 Grace watched cleanup: Deleted {total_deleted} episodes")
         return total_deleted
 
     except Exception as e:
         cleanup_logger.error(f"Error in grace_watched cleanup: {str(e)}")
+        if cleanup_pass is not None:
+            cleanup_pass.abort("grace watched cleanup failed")
         return 0
 
 
+def _plan_grace_unwatched(candidate):
+    """Fetch a grace_unwatched candidate's episodes and pick what to delete:
+    every unwatched episode with a file after the first one (the bookmark),
+    minus anchors."""
+    series_id = candidate['series_id']
+    last_season = candidate['last_season']
+    last_episode = candidate['last_episode']
+
+    unwatched_episodes = []
+    for episode in fetch_all_episodes(series_id):
+        if not episode.get('hasFile'):
+            continue
+        season_num = episode.get('seasonNumber', 0)
+        episode_num = episode.get('episodeNumber', 0)
+
+        if (season_num > last_season or
+                (season_num == last_season and episode_num > last_episode)):
+            unwatched_episodes.append(episode)
+
+    unwatched_episodes.sort(key=lambda ep: (ep['seasonNumber'], ep['episodeNumber']))
+
+    episodes_with_files = []
+    if len(unwatched_episodes) > 1:
+        # Keep first unwatched, delete rest - minus anchor episodes (S01E01)
+        delete_episodes = [ep for ep in unwatched_episodes[1:] if not is_anchor_episode(ep, series_id)]
+        episodes_with_files = [ep for ep in delete_episodes if ep.get('episodeFileId')]
+
+    return {
+        'unwatched_count': len(unwatched_episodes),
+        'bookmark_episode': unwatched_episodes[0] if unwatched_episodes else None,
+        'episodes': episodes_with_files,
+    }
+
+
+def _mark_grace_cleaned(series_id):
+    """Flag a series grace_cleaned through config_store - a per-series write,
+    safe to call from the cleanup pool."""
+    rule_name, entry = config_store.get_series_entry(series_id)
+    if rule_name is None:
+        return False
+    entry['grace_cleaned'] = True
+    config_store.set_series_entry(rule_name, series_id, entry)
+    return True
+
+
+def _apply_grace_unwatched(candidate, plan):
+    series_id = candidate['series_id']
+    series_title = candidate['series_title']
+    grace_unwatched_days = candidate['day_threshold']
+    episodes_with_files = plan['episodes']
+    deleted = 0
+
+    cleanup_logger.info(f"⏰ {series_title}: Inactive {candidate['days_since_activity']:.1f}d > {grace_unwatched_days}d")
+    cleanup_logger.info(f"   📺 Last watched: S{candidate['last_season']}E{candidate['last_episode']}")
+
+    if plan['unwatched_count'] > 1:
+        if episodes_with_files:
+            bookmark_episode = plan['bookmark_episode']
+            cleanup_logger.info(f"   📊 Deleting {len(episodes_with_files)} extra unwatched episodes")
+            cleanup_logger.info(f"   🔖 Keeping S{bookmark_episode['seasonNumber']}E{bookmark_episode['episodeNumber']} as bookmark")
+
+            activity_date_str = datetime.fromtimestamp(candidate['activity_date']).strftime('%Y-%m-%d')
+
+            delete_episodes_in_sonarr_with_logging(
+                episodes_with_files,
+                series_id,
+                candidate['is_dry_run'],
+                series_title,
+                reason=f"Grace Unwatched ({grace_unwatched_days}d) - Keep First Unwatched",
+                date_source="Last Activity",
+                date_value=activity_date_str,
+                rule_name=candidate['rule_name']
+            )
+            deleted = len(episodes_with_files)
+
+        # Mark as cleaned - has bookmark
+        if isinstance(candidate['series_data'], dict) and _mark_grace_cleaned(series_id):
+            cleanup_logger.info("   ✅ Bookmark established - marked as cleaned")
+
+    elif plan['unwatched_count'] == 1:
+        cleanup_logger.info("   🔖 Has 1 unwatched episode as bookmark")
+        # Mark as cleaned - already has bookmark
+        if isinstance(candidate['series_data'], dict) and _mark_grace_cleaned(series_id):
+            cleanup_logger.info("   ✅ Bookmark exists - marked as cleaned")
+
+    else:
+        cleanup_logger.info("   ⏭️ No unwatched episodes - waiting for next episode")
+        cleanup_logger.info("   🔄 Will keep checking until grab webhook")
+        # DON'T mark as cleaned - keep checking
+
+    return deleted
+
+
 # ==============================================================================
 # REPLACE run_grace_unwatched_cleanup() WITH THIS
 # ==============================================================================
 
-def run_grace_unwatched_cleanup(series_lookup=None):
+def run_grace_unwatched_cleanup(series_lookup=None, resolver=None, cleanup_pass=None):
     """
     Grace Unwatched Cleanup - Keep first unwatched as bookmark.
 
@@ -2650,117 +2693,71 @@ def run_grace_unwatched_cleanup(series_lookup=None):
 
         storage_min_gb = global_settings.get('global_storage_min_gb')
 
-        total_deleted = 0
         if series_lookup is None:
             _, series_lookup = _fetch_sonarr_series_lookup()
         current_time = int(time.time())
 
         # ── Phase 1: find every series past its grace_unwatched threshold ──
-        candidates = _scan_grace_candidates(config, series_lookup, current_time, 'grace_unwatched', global_dry_run)
+        candidates = _scan_grace_candidates(config, series_lookup, current_time, 'grace_unwatched', global_dry_run, resolver,
+                                            cleanup_pass)
 
-        # ── Phase 2: process oldest-inactivity-first, honoring the storage
-        # gate incrementally so this tier only deletes as much as it needs ──
+        # ── Phase 2: process oldest-inactivity-first on the cleanup pool,
+        # honoring the storage gate incrementally so this tier only deletes
+        # as much as it needs ──
         candidates.sort(key=lambda c: c['days_since_activity'], reverse=True)
 
-        for candidate in candidates:
-            if storage_min_gb and not candidate['is_dry_run']:
-                current_disk = get_sonarr_disk_space()
-                if current_disk and current_disk['free_space_gb'] >= storage_min_gb:
-                    cleanup_logger.info("🎯 Storage target reached - stopping grace unwatched cleanup")
-                    break
-
-            series_id = candidate['series_id']
-            series_title = candidate['series_title']
-            series_data = candidate['series_data']
-            rule_name = candidate['rule_name']
-            grace_unwatched_days = candidate['day_threshold']
-            is_dry_run = candidate['is_dry_run']
-            activity_date = candidate['activity_date']
-            last_season = candidate['last_season']
-            last_episode = candidate['last_episode']
-            days_since_activity = candidate['days_since_activity']
-
-            cleanup_logger.info(f"⏰ {series_title}: Inactive {days_since_activity:.1f}d > {grace_unwatched_days}d")
-            cleanup_logger.info(f"   📺 Last watched: S{last_season}E{last_episode}")
-
-            # Get all episodes
-            all_episodes = fetch_all_episodes(series_id)
-
-            # Find unwatched episodes (AFTER last watched)
-            unwatched_episodes = []
-            for episode in all_episodes:
-                if not episode.get('hasFile'):
-                    continue
-                season_num = episode.get('seasonNumber', 0)
-                episode_num = episode.get('episodeNumber', 0)
-
-                if (season_num > last_season or
-                        (season_num == last_season and episode_num > last_episode)):
-                    unwatched_episodes.append(episode)
-
-            # Sort by season/episode
-            unwatched_episodes.sort(key=lambda ep: (ep['seasonNumber'], ep['episodeNumber']))
-
-            if len(unwatched_episodes) > 1:
-                # Keep first unwatched, delete rest
-                bookmark_episode = unwatched_episodes[0]
-                delete_episodes = unwatched_episodes[1:]
-
-                # Filter out anchor episodes (S01E01)
-                delete_episodes = [ep for ep in delete_episodes if not is_anchor_episode(ep, series_id)]
-
-                episodes_with_files = [ep for ep in delete_episodes if ep.get('episodeFileId')]
-
-                if episodes_with_files:
-                    cleanup_logger.info(f"   📊 Deleting {len(episodes_with_files)} extra unwatched episodes")
-                    cleanup_logger.info(f"   🔖 Keeping S{bookmark_episode['seasonNumber']}E{bookmark_episode['episodeNumber']} as bookmark")
-
-                    from datetime import datetime
-                    activity_date_str = datetime.fromtimestamp(activity_date).strftime('%Y-%m-%d')
-
-                    delete_episodes_in_sonarr_with_logging(
-                        episodes_with_files,
-                        series_id,
-                        is_dry_run,
-                        series_title,
-                        reason=f"Grace Unwatched ({grace_unwatched_days}d) - Keep First Unwatched",
-                        date_source="Last Activity",
-                        date_value=activity_date_str,
-                        rule_name=rule_name
-                    )
-                    total_deleted += len(episodes_with_files)
-
-                # Mark as cleaned - has bookmark
-                if isinstance(series_data, dict):
-                    series_data['grace_cleaned'] = True
-                    save_config(config)
-                    cleanup_logger.info("   ✅ Bookmark established - marked as cleaned")
-
-            elif len(unwatched_episodes) == 1:
-                cleanup_logger.info("   🔖 Has 1 unwatched episode as bookmark")
-                # Mark as cleaned - already has bookmark
-                if isinstance(series_data, dict):
-                    series_data['grace_cleaned'] = True
-                    save_config(config)
-                    cleanup_logger.info("   ✅ Bookmark exists - marked as cleaned")
-
-            else:
-                cleanup_logger.info("   ⏭️ No unwatched episodes - waiting for next episode")
-                cleanup_logger.info("   🔄 Will keep checking until grab webhook")
-                # DON'T mark as cleaned - keep checking
+        total_deleted = _run_cleanup_candidates(
+            candidates, _plan_grace_unwatched, _apply_grace_unwatched,
+            storage_min_gb, 'grace unwatched cleanup', cleanup_pass,
+        )
 
         cleanup_logger.info(f"⏰ Grace unwatched cleanup: Deleted {total_deleted} episodes")
         return total_deleted
 
     except Exception as e:
         cleanup_logger.error(f"Error in grace_unwatched cleanup: {str(e)}")
+        if cleanup_pass is not None:
+            cleanup_pass.abort("grace unwatched cleanup failed")
         return 0
     
 
+def _plan_dormant(candidate):
+    """Every episode file of a dormant series except anchors, or None."""
+    series_id = candidate['series_id']
+    all_episodes = fetch_all_episodes(series_id)
+    # Dormant cleanup bypasses always_have but still respects keep_pilot
+    deletable_episodes = [ep for ep in all_episodes if ep.get('hasFile') and ep.get('episodeFileId') and not is_anchor_episode(ep, series_id, check_always_have=False)]
+    return {'episodes': deletable_episodes} if deletable_episodes else None
+
+
+def _apply_dormant(candidate, plan):
+    cleanup_logger.info(f"🔴 {candidate['title']}: Dormant for {candidate['days_since_activity']:.1f} days")
+
+    # Format the last activity date
+    if candidate.get('last_activity'):
+        activity_date = datetime.fromtimestamp(candidate['last_activity']).strftime('%Y-%m-%d')
+        date_source = "Tautulli"
+    else:
+        activity_date = "Unknown"
+        date_source = "No Activity Data"
+
+    delete_episodes_in_sonarr_with_logging(
+        plan['episodes'],
+        candidate['series_id'],
+        candidate['is_dry_run'],
+        candidate['title'],
+        reason=f"Dormant Series ({candidate['days_since_activity']:.1f} days inactive)",
+        date_source=date_source,
+        date_value=activity_date,
+        rule_name=candidate.get('rule_name', 'dormant')
+    )
+    return 1
+
+
 # UPDATED DORMANT CLEANUP WITH MASTER SAFETY SWITCH
 # Matches the same safety logic as grace watched/unwatched
 
-def run_dormant_cleanup(series_lookup=None):
+def run_dormant_cleanup(series_lookup=None, resolver=None, cleanup_pass=None):
     """
     Process dormant cleanup with optional storage gate and MASTER SAFETY SWITCH.
     
@@ -2793,6 +2790,8 @@ def run_dormant_cleanup(series_lookup=None):
             gate_open, _, gate_reason = check_global_storage_gate()
             if not gate_open:
                 cleanup_logger.info(f"🔒 Storage gate CLOSED: {gate_reason}")
+                if cleanup_pass is not None:
+                    cleanup_pass.abort("dormant cleanup skipped - storage gate closed")
                 return 0
             cleanup_logger.info(f"🔓 Storage gate OPEN: {gate_reason}")
         else:
@@ -2802,6 +2801,8 @@ def run_dormant_cleanup(series_lookup=None):
         candidates = []
         if series_lookup is None:
             _, series_lookup = _fetch_sonarr_series_lookup()
+        if resolver is None:
+            resolver = ActivityDateResolver(series_lookup)
         current_time = int(time.time())
         
         for rule_name, rule in config['rules'].items():
@@ -2825,6 +2826,8 @@ def run_dormant_cleanup(series_lookup=None):
             for series_id_str, series_data in series_dict.items():
                 try:
                     series_id = int(series_id_str)
+                    if cleanup_pass is not None and not cleanup_pass.wants(series_id):
+                        continue
                     series_info = series_lookup.get(series_id)
                     if not series_info:
                         continue
@@ -2838,71 +2841,40 @@ def run_dormant_cleanup(series_lookup=None):
                     
                     # Fallback to hierarchy if no config activity
                     if not activity_date:
-                        activity_date = get_activity_date_with_hierarchy(series_id, series_info['title'])
+                        activity_date = resolver.resolve(series_id, series_info['title'])
                     
                     if not activity_date:
                         continue
                     
                     days_since_activity = (current_time - activity_date) / (24 * 60 * 60)
                     if days_since_activity > dormant_days:
-                        all_episodes = fetch_all_episodes(series_id)
-                        # Dormant cleanup bypasses always_have but still respects keep_pilot
-                        deletable_episodes = [ep for ep in all_episodes if ep.get('hasFile') and ep.get('episodeFileId') and not is_anchor_episode(ep, series_id, check_always_have=False)]
-
-                        if deletable_episodes:
-                            candidates.append({
-                                'series_id': series_id,
-                                'title': series_info['title'],
-                                'days_since_activity': days_since_activity,
-                                'episodes': deletable_episodes,
-                                'is_dry_run': is_dry_run,
-                                'last_activity': activity_date,
-                                'rule_name': rule_name
-                            })
+                        candidates.append({
+                            'series_id': series_id,
+                            'title': series_info['title'],
+                            'days_since_activity': days_since_activity,
+                            'is_dry_run': is_dry_run,
+                            'last_activity': activity_date,
+                            'rule_name': rule_name
+                        })
                             
                 except (ValueError, TypeError):
                     continue
         
-        # Process candidates
-        processed_count = 0
+        # Process candidates - episode fetches fan out on the cleanup pool,
+        # most-dormant first, storage gate re-checked before each deletion
         candidates.sort(key=lambda x: x['days_since_activity'], reverse=True)
-        
-        for candidate in candidates:
-            # Check storage gate again if configured
-            if storage_min_gb and not candidate['is_dry_run']:
-                current_disk = get_sonarr_disk_space()
-                if current_disk and current_disk['free_space_gb'] >= storage_min_gb:
-                    cleanup_logger.info(f"🎯 Storage target reached")
-                    break
-            
-            cleanup_logger.info(f"🔴 {candidate['title']}: Dormant for {candidate['days_since_activity']:.1f} days")
-            from datetime import datetime
-            
-            # Format the last activity date
-            if candidate.get('last_activity'):
-                activity_date = datetime.fromtimestamp(candidate['last_activity']).strftime('%Y-%m-%d')
-                date_source = "Tautulli"
-            else:
-                activity_date = "Unknown"
-                date_source = "No Activity Data"
-            
-            delete_episodes_in_sonarr_with_logging(
-                candidate['episodes'],
-                candidate['series_id'],
-                candidate['is_dry_run'],
-                candidate['title'],
-                reason=f"Dormant Series ({candidate['days_since_activity']:.1f} days inactive)",
-                date_source=date_source,
-                date_value=activity_date,
-                rule_name=candidate.get('rule_name', 'dormant')
-            )
-            processed_count += 1
+        processed_count = _run_cleanup_candidates(
+            candidates, _plan_dormant, _apply_dormant,
+            storage_min_gb, 'dormant cleanup', cleanup_pass,
+        )
         
         cleanup_logger.info(f"🔴 Dormant cleanup: Processed {processed_count} series")
         return processed_count
         
     except Exception as e:
         cleanup_logger.error(f"Error in dormant cleanup: {str(e)}")
+        if cleanup_pass is not None:
+            cleanup_pass.abort("dormant cleanup failed")
         return 0
 
 
@@ -2931,7 +2903,7 @@ def get_sonarr_disk_space():
         logger.error(f"Error getting disk space: {str(e)}")
         return None
 
-def reconcile_future_seasons():
+def reconcile_future_seasons(cleanup_pass=None):
     """
     For every series managed by an Episeerr rule, identify Sonarr-auto-monitored
     seasons whose episodes are entirely in the future (or have no air date yet) and
@@ -2952,171 +2924,201 @@ def reconcile_future_seasons():
 
     Seasons with any past air date or any downloaded file are left untouched —
     the user may have made intentional manual changes there.
+
+    Series are reconciled concurrently on the cleanup pool (cleanup_workers);
+    held states are written per series through config_store as they're set,
+    not as one save of the whole config at the end. With a cleanup_pass only
+    the series it marked dirty are fetched.
     """
     from collections import defaultdict
 
     config = load_config()
     headers = {'X-Api-Key': SONARR_API_KEY}
     now = datetime.now(timezone.utc)
-    config_changed = False
     reconciled_seasons = 0
 
-    for rule_name, rule_data in config.get('rules', {}).items():
-        always_have = rule_data.get('always_have', '')
-        parsed_ah = parse_always_have(always_have) if always_have else None
-        is_sequential = parsed_ah['is_sequential'] if parsed_ah else False
+    def _reconcile_series(job):
+        """One series: fetch episodes, fix its future seasons. Runs on the
+        cleanup pool; every PUT for a series stays on one thread, in season
+        order. Held states go through config_store, per series."""
+        series_id_str, series_data, always_have, parsed_ah, is_sequential = job
+        series_id = int(series_id_str)
+        activation_seasons = series_data.get('activation_seasons', {})
+        reconciled = 0
 
-        for series_id_str, series_data in list(rule_data.get('series', {}).items()):
-            series_id = int(series_id_str)
-            activation_seasons = series_data.get('activation_seasons', {})
+        if cleanup_job.cancel_requested():
+            if cleanup_pass is not None:
+                cleanup_pass.defer(series_id)
+            return 0
 
-            try:
-                resp = http.get(
-                    f"{SONARR_URL}/api/v3/episode?seriesId={series_id}",
-                    headers=headers
+        try:
+            resp = http.get(
+                f"{SONARR_URL}/api/v3/episode?seriesId={series_id}",
+                headers=headers
+            )
+            if not resp.ok:
+                cleanup_logger.warning(
+                    f"Future season reconcile: cannot fetch episodes for series {series_id}"
                 )
-                if not resp.ok:
-                    cleanup_logger.warning(
-                        f"Future season reconcile: cannot fetch episodes for series {series_id}"
-                    )
-                    continue
+                if cleanup_pass is not None:
+                    cleanup_pass.defer(series_id)
+                return 0
 
-                all_episodes = resp.json()
+            all_episodes = resp.json()
 
-                # Lazy-fetch series title only if we're going to log something
-                _title_cache = {}
+            # Lazy-fetch series title only if we're going to log something
+            _title_cache = {}
 
-                def _series_title():
-                    if series_id not in _title_cache:
-                        try:
-                            sr = http.get(
-                                f"{SONARR_URL}/api/v3/series/{series_id}", headers=headers
-                            )
-                            _title_cache[series_id] = sr.json().get('title', f"series:{series_id}") if sr.ok else f"series:{series_id}"
-                        except Exception:
-                            _title_cache[series_id] = f"series:{series_id}"
-                    return _title_cache[series_id]
+            def _series_title():
+                if series_id not in _title_cache:
+                    try:
+                        sr = http.get(
+                            f"{SONARR_URL}/api/v3/series/{series_id}", headers=headers
+                        )
+                        _title_cache[series_id] = sr.json().get('title', f"series:{series_id}") if sr.ok else f"series:{series_id}"
+                    except Exception:
+                        _title_cache[series_id] = f"series:{series_id}"
+                return _title_cache[series_id]
 
-                # Group non-special episodes by season
-                seasons_map = defaultdict(list)
-                for ep in all_episodes:
-                    sn = ep.get('seasonNumber', 0)
-                    if sn > 0:
-                        seasons_map[sn].append(ep)
+            # Group non-special episodes by season
+            seasons_map = defaultdict(list)
+            for ep in all_episodes:
+                sn = ep.get('seasonNumber', 0)
+                if sn > 0:
+                    seasons_map[sn].append(ep)
 
-                for season_num, eps in sorted(seasons_map.items()):
-                    season_str = str(season_num)
+            for season_num, eps in sorted(seasons_map.items()):
+                season_str = str(season_num)
 
-                    # Already tracked by activation system — leave alone
-                    if season_str in activation_seasons:
-                        continue
+                # Already tracked by activation system — leave alone
+                if season_str in activation_seasons:
+                    continue
 
-                    # Classify season: future only if every episode is in the future
-                    # and none have a downloaded file
-                    is_future = True
-                    for ep in eps:
-                        if ep.get('hasFile', False):
-                            is_future = False
-                            break
-                        air_str = ep.get('airDateUtc', '')
-                        if air_str:
-                            try:
-                                air_dt = datetime.fromisoformat(
-                                    air_str.replace('Z', '+00:00')
-                                )
-                                if air_dt < now:
-                                    is_future = False
-                                    break
-                            except Exception:
-                                pass  # Unparseable date — treat as "no date" (future)
+                # Classify season: future only if every episode is in the future
+                # and none have a downloaded file
+                is_future = True
+                for ep in eps:
+                    if ep.get('hasFile', False):
+                        is_future = False
+                        break
+                    air_str = ep.get('airDateUtc', '')
+                    if air_str:
+                        try:
+                            air_dt = datetime.fromisoformat(
+                                air_str.replace('Z', '+00:00')
+                            )
+                            if air_dt < now:
+                                is_future = False
+                                break
+                        except Exception:
+                            pass  # Unparseable date — treat as "no date" (future)
 
-                    if not is_future:
-                        continue
+                if not is_future:
+                    continue
 
-                    # Only act if Sonarr auto-monitored some episodes in this season
-                    monitored_ids = [ep['id'] for ep in eps if ep.get('monitored', False)]
-                    if not monitored_ids:
-                        continue  # Already fully unmonitored — nothing to fix
+                # Only act if Sonarr auto-monitored some episodes in this season
+                monitored_ids = [ep['id'] for ep in eps if ep.get('monitored', False)]
+                if not monitored_ids:
+                    continue  # Already fully unmonitored — nothing to fix
 
-                    # Step 1: unmonitor everything in this future season
-                    unmon_resp = http.put(
-                        f"{SONARR_URL}/api/v3/episode/monitor",
-                        headers=headers,
-                        json={"episodeIds": monitored_ids, "monitored": False}
+                # Step 1: unmonitor everything in this future season
+                unmon_resp = http.put(
+                    f"{SONARR_URL}/api/v3/episode/monitor",
+                    headers=headers,
+                    json={"episodeIds": monitored_ids, "monitored": False}
+                )
+                if not unmon_resp.ok:
+                    cleanup_logger.error(
+                        f"Future season reconcile: failed to unmonitor "
+                        f"'{_series_title()}' S{season_num}: {unmon_resp.text}"
                     )
-                    if not unmon_resp.ok:
-                        cleanup_logger.error(
-                            f"Future season reconcile: failed to unmonitor "
-                            f"'{_series_title()}' S{season_num}: {unmon_resp.text}"
+                    continue
+
+                cleanup_logger.info(
+                    f"📅 Future season reconciled: '{_series_title()}' S{season_num} — "
+                    f"unmonitored {len(monitored_ids)} Sonarr-auto-monitored episodes"
+                )
+                reconciled += 1
+
+                # Step 2: re-apply always_have expression to this season
+                # Sequential mode (e1+) is handled by the on-finale advance logic;
+                # skip it here to avoid grabbing ahead of schedule.
+                if parsed_ah and always_have and not is_sequential:
+                    base = parsed_ah['base']
+                    has_plus = parsed_ah['has_plus']
+
+                    to_remonitor = [
+                        ep['id'] for ep in eps
+                        if is_protected_by_expression(
+                            season_num, ep.get('episodeNumber', 0), base
                         )
-                        continue
+                    ]
 
+                    if to_remonitor:
+                        mon_resp = http.put(
+                            f"{SONARR_URL}/api/v3/episode/monitor",
+                            headers=headers,
+                            json={"episodeIds": to_remonitor, "monitored": True}
+                        )
+                        if mon_resp.ok:
+                            cleanup_logger.info(
+                                f"  🔒 Always Have re-applied: '{_series_title()}' S{season_num} — "
+                                f"monitored {len(to_remonitor)} episodes ('{always_have}')"
+                            )
+                            # Step 3: set held state for + modifier. Written
+                            # per series against the current entry, so a watch
+                            # recorded since the pass started isn't lost.
+                            if has_plus:
+                                rule_name, live_data = config_store.get_series_entry(series_id)
+                                live_data = live_data if isinstance(live_data, dict) else {}
+                                already_watched = live_data.get('activity_date') is not None
+                                if already_watched:
+                                    cleanup_logger.info(
+                                        f"  ↪ Series has watch history — treating S{season_num} as active"
+                                    )
+                                elif rule_name:
+                                    live_data.setdefault('activation_seasons', {})[season_str] = 'held'
+                                    config_store.set_series_entry(rule_name, series_id, live_data)
+                                    cleanup_logger.info(
+                                        f"  🔒 Held state set: '{_series_title()}' S{season_num}"
+                                    )
+                        else:
+                            cleanup_logger.error(
+                                f"  ✗ Failed to re-apply always_have for "
+                                f"'{_series_title()}' S{season_num}: {mon_resp.text}"
+                            )
+                    # else: expression present but no match in this season (e.g. s1e1+ for S2)
+                elif is_sequential and always_have:
                     cleanup_logger.info(
-                        f"📅 Future season reconciled: '{_series_title()}' S{season_num} — "
-                        f"unmonitored {len(monitored_ids)} Sonarr-auto-monitored episodes"
+                        f"  ↪ Sequential mode ('{always_have}'): S{season_num} left fully "
+                        f"unmonitored — sequential advance will handle it on finale"
                     )
-                    reconciled_seasons += 1
-
-                    # Step 2: re-apply always_have expression to this season
-                    # Sequential mode (e1+) is handled by the on-finale advance logic;
-                    # skip it here to avoid grabbing ahead of schedule.
-                    if parsed_ah and always_have and not is_sequential:
-                        base = parsed_ah['base']
-                        has_plus = parsed_ah['has_plus']
-
-                        to_remonitor = [
-                            ep['id'] for ep in eps
-                            if is_protected_by_expression(
-                                season_num, ep.get('episodeNumber', 0), base
-                            )
-                        ]
 
-                        if to_remonitor:
-                            mon_resp = http.put(
-                                f"{SONARR_URL}/api/v3/episode/monitor",
-                                headers=headers,
-                                json={"episodeIds": to_remonitor, "monitored": True}
-                            )
-                            if mon_resp.ok:
-                                cleanup_logger.info(
-                                    f"  🔒 Always Have re-applied: '{_series_title()}' S{season_num} — "
-                                    f"monitored {len(to_remonitor)} episodes ('{always_have}')"
-                                )
-                                # Step 3: set held state for + modifier
-                                if has_plus:
-                                    already_watched = series_data.get('activity_date') is not None
-                                    if already_watched:
-                                        cleanup_logger.info(
-                                            f"  ↪ Series has watch history — treating S{season_num} as active"
-                                        )
-                                    else:
-                                        if 'activation_seasons' not in series_data:
-                                            series_data['activation_seasons'] = {}
-                                        series_data['activation_seasons'][season_str] = 'held'
-                                        config_changed = True
-                                        cleanup_logger.info(
-                                            f"  🔒 Held state set: '{_series_title()}' S{season_num}"
-                                        )
-                            else:
-                                cleanup_logger.error(
-                                    f"  ✗ Failed to re-apply always_have for "
-                                    f"'{_series_title()}' S{season_num}: {mon_resp.text}"
-                                )
-                        # else: expression present but no match in this season (e.g. s1e1+ for S2)
-                    elif is_sequential and always_have:
-                        cleanup_logger.info(
-                            f"  ↪ Sequential mode ('{always_have}'): S{season_num} left fully "
-                            f"unmonitored — sequential advance will handle it on finale"
-                        )
+        except Exception as e:
+            cleanup_logger.error(
+                f"Future season reconcile error for series {series_id}: {e}",
+                exc_info=True
+            )
+            if cleanup_pass is not None:
+                cleanup_pass.defer(series_id)
 
-            except Exception as e:
-                cleanup_logger.error(
-                    f"Future season reconcile error for series {series_id}: {e}",
-                    exc_info=True
-                )
+        return reconciled
+
+    jobs = []
+    for rule_name, rule_data in config.get('rules', {}).items():
+        always_have = rule_data.get('always_have', '')
+        parsed_ah = parse_always_have(always_have) if always_have else None
+        is_sequential = parsed_ah['is_sequential'] if parsed_ah else False
+
+        for series_id_str, series_data in list(rule_data.get('series', {}).items()):
+            if cleanup_pass is not None and not cleanup_pass.wants(series_id_str):
+                continue
+            jobs.append((series_id_str, series_data, always_have, parsed_ah, is_sequential))
 
-    if config_changed:
-        save_config(config)
+    cleanup_job.start_items(len(jobs))
+    for _, count in _map_in_order(_reconcile_series, jobs, _cleanup_workers()):
+        reconciled_seasons += count
+        cleanup_job.advance()
 
     cleanup_logger.info(
         f"📅 Future season reconciliation complete: {reconciled_seasons} season(s) processed"
@@ -3165,10 +3167,19 @@ def run_unified_cleanup():
         # Fetch the Sonarr series list once and reuse it across every phase
         # below instead of each phase issuing its own GET /api/v3/series.
         all_series, series_lookup = _fetch_sonarr_series_lookup()
+        # One activity-date resolver for all three phases: Tautulli/Sonarr
+        # history is pulled at most once per cycle, not once per series.
+        resolver = ActivityDateResolver(series_lookup)
+
+        # Only series whose fingerprint changed or whose grace/dormant
+        # deadline has passed since the last cycle get evaluated below.
+        cleanup_pass = cleanup_state.begin_pass(load_config(), series_lookup, global_settings)
+        cleanup_logger.info(f"🧮 Cleanup scope: {cleanup_pass.summary()}")
 
         # ==================== PHASE 0 - TAG RECONCILIATION ====================
         cleanup_logger.info("=" * 80)
         cleanup_logger.info("🏷️  Phase 0: Tag reconciliation (drift + orphaned)")
+        cleanup_job.set_phase('tag_reconciliation')
         try:
             from episeerr_utils import reconcile_series_drift
             config = load_config()
@@ -3189,18 +3200,33 @@ def run_unified_cleanup():
             ]
 
             reconciled = 0
+            # Tag fixes are collected and applied in bulk through the series
+            # editor below rather than as a GET + PUT per series. Config
+            # moves go out per series - this copy is older than any watch
+            # recorded while the loop runs.
+            tag_updates = {}
+            cleanup_job.start_items(len(known_ids) + len(orphaned_ids))
             for series_id in known_ids + orphaned_ids:
+                if cleanup_job.cancel_requested():
+                    break
+                cleanup_job.advance()
                 try:
-                    _, changed = reconcile_series_drift(series_id, config, series_data=series_lookup.get(series_id))
+                    _, changed = reconcile_series_drift(series_id, config, series_data=series_lookup.get(series_id),
+                                                        tag_updates=tag_updates)
                     if changed:
+                        config_store.sync_series_placement(config, series_id)
                         reconciled += 1
                 except Exception as e:
                     cleanup_logger.error(f"   ✗ Error reconciling series {series_id}: {e}")
 
+            if tag_updates:
+                report = tag_sync.sync_rule_tags(tag_updates, series_lookup)
+                cleanup_logger.info(f"🏷️  Tag fixes: {report['series_updated']} series retagged in "
+                                    f"{len(report['batches'])} batch(es), {len(report['failed'])} failed")
+
             if reconciled > 0:
-                save_config(config)
                 cleanup_logger.info(f"🏷️  Tag reconciliation: {reconciled} corrections made")
-            else:
+            elif not tag_updates:
                 cleanup_logger.info("🏷️  Tag reconciliation: All tags in sync")
                 
         except Exception as e:
@@ -3210,17 +3236,32 @@ def run_unified_cleanup():
         # ==================== PHASE 0.5 - FUTURE SEASON RECONCILIATION ====================
         cleanup_logger.info("=" * 80)
         cleanup_logger.info("📅 Phase 0.5: Future season reconciliation")
+        cleanup_job.set_phase('future_seasons')
         try:
-            reconcile_future_seasons()
+            reconcile_future_seasons(cleanup_pass=cleanup_pass)
         except Exception as e:
             cleanup_logger.error(f"❌ Error in future season reconciliation: {str(e)}")
+            cleanup_pass.abort("future season reconciliation failed")
         # ==================== END PHASE 0.5 ====================
 
         total_processed = 0
 
+        def cancelled():
+            # Checked between phases; the phases themselves stop between series
+            if cleanup_job.cancel_requested():
+                cleanup_logger.info(f"⏹️ Cleanup cancelled after {total_processed} operations")
+                cleanup_pass.abort("cleanup cancelled")
+                return True
+            return False
+
+        if cancelled():
+            return total_processed
+
         # PRIORITY 1: DORMANT (oldest, most aggressive)
         cleanup_logger.info("🔴 Phase 1: Dormant cleanup (delete ALL episodes from abandoned series)")
-        dormant_count = run_dormant_cleanup(series_lookup=series_lookup)
+        cleanup_job.set_phase('dormant')
+        dormant_count = run_dormant_cleanup(series_lookup=series_lookup, resolver=resolver,
+                                            cleanup_pass=cleanup_pass)
         total_processed += dormant_count
         cleanup_logger.info(f"🔴 Dormant result: {dormant_count} operations")
         
@@ -3231,10 +3272,14 @@ def run_unified_cleanup():
                 cleanup_logger.info(f"🎯 TARGET REACHED after dormant: {current_disk['free_space_gb']:.1f}GB >= {storage_min_gb}GB")
                 cleanup_logger.info("✅ Stopping cleanup - goal achieved")
                 return total_processed
+        if cancelled():
+            return total_processed
         
         # PRIORITY 2: GRACE WATCHED (delete watched episodes from inactive series)
         cleanup_logger.info("🟡 Phase 2: Grace watched cleanup (delete watched episodes from inactive series)")
-        watched_count = run_grace_watched_cleanup(series_lookup=series_lookup)
+        cleanup_job.set_phase('grace_watched')
+        watched_count = run_grace_watched_cleanup(series_lookup=series_lookup, resolver=resolver,
+                                                  cleanup_pass=cleanup_pass)
         total_processed += watched_count
         cleanup_logger.info(f"🟡 Grace watched result: {watched_count} operations")
         
@@ -3245,15 +3290,22 @@ def run_unified_cleanup():
                 cleanup_logger.info(f"🎯 TARGET REACHED after grace watched: {current_disk['free_space_gb']:.1f}GB >= {storage_min_gb}GB")
                 cleanup_logger.info("✅ Stopping cleanup - goal achieved")
                 return total_processed
+        if cancelled():
+            return total_processed
         
         # PRIORITY 3: GRACE UNWATCHED (delete unwatched episodes past deadline)
         cleanup_logger.info("⏰ Phase 3: Grace unwatched cleanup (delete unwatched episodes past deadline)")
-        unwatched_count = run_grace_unwatched_cleanup(series_lookup=series_lookup)
+        cleanup_job.set_phase('grace_unwatched')
+        unwatched_count = run_grace_unwatched_cleanup(series_lookup=series_lookup, resolver=resolver,
+                                                    cleanup_pass=cleanup_pass)
         total_processed += unwatched_count
         cleanup_logger.info(f"⏰ Grace unwatched result: {unwatched_count} operations")
+        if cancelled():
+            return total_processed
         
         # PRIORITY 4: MOVIE CLEANUP
         cleanup_logger.info("🎬 Phase 4: Movie cleanup (Radarr movie rules)")
+        cleanup_job.set_phase('movies')
         try:
             from movie_processor import run_movie_cleanup
             movie_count = run_movie_cleanup()
@@ -3264,6 +3316,7 @@ def run_unified_cleanup():
         cleanup_logger.info(f"🎬 Movie cleanup result: {movie_count} operations")
 
         # Final status
+        cleanup_job.set_phase('finishing')
         final_disk = get_sonarr_disk_space()
         cleanup_logger.info("=" * 80)
         cleanup_logger.info("✅ UNIFIED CLEANUP COMPLETED")
@@ -3272,6 +3325,7 @@ def run_unified_cleanup():
         cleanup_logger.info(f"   🟡 Grace watched: {watched_count}")
         cleanup_logger.info(f"   ⏰ Grace unwatched: {unwatched_count}")
         cleanup_logger.info(f"   🎬 Movie: {movie_count}")
+        resolver.log_summary()
         
         if final_disk:
             cleanup_logger.info(f"💾 Final free space: {final_disk['free_space_gb']:.1f}GB")
@@ -3280,6 +3334,17 @@ def run_unified_cleanup():
                 cleanup_logger.info(f"🚪 Storage gate: {gate_status}")
         
         cleanup_logger.info("=" * 80)
+
+        def deadlines_for(series_id):
+            rule_name, _ = config_store.get_series_entry(series_id)
+            title = series_lookup[series_id]['title']
+            return cleanup_state.rule_deadlines(
+                config_store.get_rule(rule_name) if rule_name else None,
+                resolver.resolve(series_id, title),
+                resolver.resolve(series_id, title, return_complete=True)[0],
+            )
+
+        cleanup_state.finish_pass(cleanup_pass, deadlines_for)
         return total_processed
         
     except Exception as e:
@@ -3328,24 +3393,72 @@ def main():
     if series_name and is_recent_webhook:
         # Webhook mode - process the episode that was just watched
         # (or just started, when the integration flagged it prefetch-only)
-        series_id = get_series_id(series_name, thetvdb_id, themoviedb_id)
-        if series_id:
-            config = load_config()
-            config_rule, modified = reconcile_series_drift(series_id, config)
-            if modified:
-                save_config(config)
-
-            if config_rule:
-                rule = config['rules'][config_rule]
-                process_episodes_for_webhook(series_id, season_number, episode_number, rule, series_name,
-                                             prefetch_only=prefetch_only)
-            else:
-                update_activity_date(series_id, season_number, episode_number)
-            return True
+        return process_webhook_event(series_name, season_number, episode_number,
+                                     thetvdb_id, themoviedb_id, prefetch_only)
     else:
         # Cleanup mode - run unified cleanup (manual or scheduled)
         run_unified_cleanup()
         return False
 
+def run_cleanup_in_process():
+    """In-process equivalent of `python3 media_processor.py` with no payload.
+
+    Used by cleanup_job, which runs it on its own thread inside the web
+    process. Applies main()'s held-automation gate; returns None when held,
+    otherwise run_unified_cleanup()'s operation count.
+    """
+    if load_global_settings().get('automation_held', False):
+        logger.info("⏸️ Automation held - skipping cleanup")
+        return None
+    return run_unified_cleanup()
+
+def process_webhook_event(series_name, season_number, episode_number, thetvdb_id=None,
+                          themoviedb_id=None, prefetch_only=False, series_id=None):
+    """Run one watched (or playback-start) episode through its series' rule.
+
+    Callers are responsible for the automation_held gate - main() checks it
+    once up front, process_webhook_payload() checks it per event. series_id
+    skips the Sonarr title lookup when the integration already resolved it.
+    Returns True if the series was found and processed.
+    """
+    if not series_id:
+        series_id = get_series_id(series_name, thetvdb_id, themoviedb_id)
+    if not series_id:
+        return False
+
+    config = load_config()
+    config_rule, modified = reconcile_series_drift(series_id, config)
+    if modified:
+        config_store.sync_series_placement(config, series_id)
+
+    if config_rule:
+        rule = config['rules'][config_rule]
+        process_episodes_for_webhook(series_id, season_number, episode_number, rule, series_name,
+                                     prefetch_only=prefetch_only)
+    else:
+        update_activity_date(series_id, season_number, episode_number)
+    return True
+
+def process_webhook_payload(data):
+    """In-process equivalent of `python3 media_processor.py <temp file>`.
+
+    Takes the same payload dict the integrations used to write to temp/,
+    applies the same held-automation gate as main(), and returns True only
+    if the episode was actually processed.
+    """
+    if load_global_settings().get('automation_held', False):
+        logger.info("⏸️ Automation held - skipping webhook processing")
+        return False
+
+    series_name, season_number, episode_number, thetvdb_id, themoviedb_id, prefetch_only = \
+        parse_server_activity(data)
+    if not series_name:
+        logger.error("Required data fields not found in webhook payload")
+        return False
+
+    return process_webhook_event(series_name, season_number, episode_number,
+                                 thetvdb_id, themoviedb_id, prefetch_only,
+                                 series_id=data.get('sonarr_series_id'))
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,7 +1,27 @@
 """
-Pending Deletions Management System - v3.0.0
+Pending Deletions Management System - v3.2.0
 Handles queuing, approval, and rejection of episode and movie deletions.
 
+Changes in v3.2.0:
+- The store indexes every episode_id to its (series, season) and keeps
+  per-series episode counts and sizes up to date as episodes are queued
+  and removed, so approve/reject/drill-downs touch only the selected
+  episodes and the counters never walk the whole queue.
+- approve_deletions() takes a set and runs the per-series batches on a
+  small pool (APPROVE_WORKERS), reporting progress through
+  get_approval_progress().
+
+Changes in v3.1.0:
+- The queue lives in memory (_PendingStore) behind pending_lock instead of
+  being re-read and rewritten for every queued episode. Changes are written
+  back atomically (temp file + rename), debounced by DEBOUNCE_SECONDS for
+  queueing and immediately for approve/reject/clear, and the file is
+  re-read when another process has changed it.
+- Series and episode ids are indexed, so queueing and approval membership
+  checks are O(1) per episode.
+- add_many() / queue_deletions() queue a whole cleanup batch under one lock
+  acquisition and one rejection-cache read.
+
 Changes in v3.0.0:
 - Added movie pending deletions (queue_movie_deletion, approve_movie_deletions, etc.)
 - File format migrated from bare list to {"episodes": [...], "movies": [...]}
@@ -10,9 +30,14 @@ Changes in v2.9.0:
 - Added queue_deletion() wrapper for simpler API
 - Batched deletions by series for efficiency (one delete command per series instead of per episode)
 """
+import atexit
+import copy
 import os
 import json
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from threading import Lock
 from collections import defaultdict
@@ -33,6 +58,29 @@ movie_rejection_lock = Lock()
 # Rejection cache duration (days)
 REJECTION_CACHE_DAYS = 30
 
+# Queueing writes are coalesced for this long
+DEBOUNCE_SECONDS = 2.0
+
+# Series deleted in parallel when a selection is approved
+APPROVE_WORKERS = 4
+
+
+def _stat_sig(path):
+    try:
+        st = os.stat(path)
+        return (st.st_mtime_ns, st.st_size)
+    except OSError:
+        return None
+
+
+def _write_json_atomic(path, data, indent=2):
+    """Write to a temp file and rename over path - readers never see a torn file."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, indent=indent)
+    os.replace(tmp_path, path)
+
 
 def _load_raw():
     """Load raw file content, migrate list→dict format if needed."""
@@ -43,6 +91,8 @@ def _load_raw():
             # Migrate old bare-list format
             if isinstance(raw, list):
                 return {"episodes": raw, "movies": []}
+            raw.setdefault("episodes", [])
+            raw.setdefault("movies", [])
             return raw
     except Exception as e:
         logger.error(f"Error loading pending deletions: {e}")
@@ -51,22 +101,116 @@ def _load_raw():
 
 def _save_raw(data):
     try:
-        with open(PENDING_DELETIONS_FILE, 'w') as f:
-            json.dump(data, f, indent=2)
+        _write_json_atomic(PENDING_DELETIONS_FILE, data)
     except Exception as e:
         logger.error(f"Error saving pending deletions: {e}")
 
 
+class _PendingStore:
+    """In-memory copy of pending_deletions.json plus its indexes.
+
+    Every method expects the caller to hold pending_lock. The document is
+    loaded on first use and re-loaded when the file changed underneath us
+    (another process) while we had nothing unsaved.
+    """
+
+    def __init__(self):
+        self.path = None
+        self.data = None
+        self.sig = None
+        self.dirty = False
+        self.timer = None
+        self.series_by_id = {}     # series_id -> series entry in data["episodes"]
+        self.locations = {}        # episode_id -> (series_id, season_key)
+        self.series_stats = {}     # series_id -> {'episodes': n, 'size_mb': x}
+
+    def doc(self):
+        if (self.data is None or self.path != PENDING_DELETIONS_FILE
+                or (not self.dirty and _stat_sig(PENDING_DELETIONS_FILE) != self.sig)):
+            self.path = PENDING_DELETIONS_FILE
+            self.data = _load_raw()
+            self.sig = _stat_sig(PENDING_DELETIONS_FILE)
+            self.dirty = False
+            self.reindex()
+        return self.data
+
+    def reindex(self):
+        self.series_by_id = {s['series_id']: s for s in self.data["episodes"]}
+        self.locations = {}
+        self.series_stats = {}
+        for series in self.data["episodes"]:
+            stats = self.series_stats[series['series_id']] = {'episodes': 0, 'size_mb': 0}
+            for season_key, season_data in series['seasons'].items():
+                for ep in season_data['episodes']:
+                    self.locations[ep['episode_id']] = (series['series_id'], season_key)
+                    stats['episodes'] += 1
+                    stats['size_mb'] += ep.get('file_size_mb', 0)
+
+    def totals(self):
+        total_episodes = sum(stats['episodes'] for stats in self.series_stats.values())
+        total_size_mb = sum(stats['size_mb'] for stats in self.series_stats.values())
+        return {
+            'total_series': len(self.series_stats),
+            'total_episodes': total_episodes,
+            'total_size_mb': total_size_mb,
+            'total_size_gb': round(total_size_mb / 1024, 2),
+        }
+
+    def changed(self, immediate=False):
+        """Record a change; write now, or within DEBOUNCE_SECONDS."""
+        self.dirty = True
+        if immediate:
+            self.flush()
+        elif self.timer is None:
+            self.timer = threading.Timer(DEBOUNCE_SECONDS, _flush_pending)
+            self.timer.daemon = True
+            self.timer.start()
+
+    def flush(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        if not self.dirty or self.data is None:
+            return
+        _save_raw(self.data)
+        self.sig = _stat_sig(self.path)
+        self.dirty = False
+
+
+_store = _PendingStore()
+
+
+def _flush_pending():
+    with pending_lock:
+        _store.timer = None
+        _store.flush()
+
+
+def flush():
+    """Write any debounced changes now."""
+    _flush_pending()
+
+
+atexit.register(flush)
+
+
 def load_pending_deletions():
-    """Load episode pending deletions list (backwards-compatible)."""
-    return _load_raw().get("episodes", [])
+    """Load episode pending deletions list (backwards-compatible).
+
+    Returns a copy - change the queue through this module's functions."""
+    with pending_lock:
+        return copy.deepcopy(_store.doc()["episodes"])
 
 
 def save_pending_deletions(pending_list):
     """Save episode pending deletions list (preserves movies section)."""
-    data = _load_raw()
-    data["episodes"] = pending_list
-    _save_raw(data)
+    with pending_lock:
+        _store.doc()["episodes"] = copy.deepcopy(pending_list)
+        _store.reindex()
+        _store.changed(immediate=True)
+
+
+_rejection_cache = {'sig': None, 'path': None, 'cache': {}}
 
 
 def load_rejection_cache():
@@ -86,12 +230,22 @@ def load_rejection_cache():
 def save_rejection_cache(cache):
     """Save rejection cache to file"""
     try:
-        with open(REJECTION_CACHE_FILE, 'w') as f:
-            json.dump(cache, f, indent=2)
+        _write_json_atomic(REJECTION_CACHE_FILE, cache)
+        _rejection_cache.update(sig=_stat_sig(REJECTION_CACHE_FILE), path=REJECTION_CACHE_FILE,
+                                cache=dict(cache))
     except Exception as e:
         logger.error(f"Error saving rejection cache: {e}")
 
 
+def _cached_rejections():
+    """Rejection cache, re-read only when the file changed. Caller holds
+    rejection_lock."""
+    sig = _stat_sig(REJECTION_CACHE_FILE)
+    if sig != _rejection_cache['sig'] or _rejection_cache['path'] != REJECTION_CACHE_FILE:
+        _rejection_cache.update(sig=sig, path=REJECTION_CACHE_FILE, cache=load_rejection_cache())
+    return _rejection_cache['cache']
+
+
 def cleanup_expired_rejections(cache):
     """Remove expired rejections from cache"""
     today = datetime.now().strftime('%Y-%m-%d')
@@ -104,8 +258,25 @@ def cleanup_expired_rejections(cache):
 def is_episode_rejected(episode_id):
     """Check if an episode is in the rejection cache"""
     with rejection_lock:
-        cache = load_rejection_cache()
-        return str(episode_id) in cache
+        expiry = _cached_rejections().get(str(episode_id))
+        return expiry is not None and expiry >= datetime.now().strftime('%Y-%m-%d')
+
+
+def _episode_for_queue(series_id, series_title, season_number, episode_number, episode_id,
+                       episode_file_id, episode_title, file_size):
+    # Build minimal episode object
+    return {
+        'id': episode_id,
+        'seriesId': series_id,
+        'seasonNumber': season_number,
+        'episodeNumber': episode_number,
+        'title': episode_title,
+        'series': {'title': series_title},
+        'episodeFile': {
+            'id': episode_file_id,
+            'size': file_size
+        }
+    }
 
 
 def queue_deletion(series_id, series_title, season_number, episode_number, episode_id, 
@@ -128,22 +299,34 @@ def queue_deletion(series_id, series_title, season_number, episode_number, episo
         date_value: The actual date used for decision
         rule_name: Name of the rule that triggered this
     """
-    # Build minimal episode object
-    episode = {
-        'id': episode_id,
-        'seriesId': series_id,
-        'seasonNumber': season_number,
-        'episodeNumber': episode_number,
-        'title': episode_title,
-        'series': {'title': series_title},
-        'episodeFile': {
-            'id': episode_file_id,
-            'size': file_size
-        }
-    }
-    
-    # Use existing add function
-    add_to_pending_deletions(episode, reason, date_source, date_value, rule_name)
+    queue_deletions([dict(
+        series_id=series_id, series_title=series_title, season_number=season_number,
+        episode_number=episode_number, episode_id=episode_id, episode_file_id=episode_file_id,
+        episode_title=episode_title, file_size=file_size, reason=reason,
+        date_source=date_source, date_value=date_value, rule_name=rule_name,
+    )])
+
+
+def queue_deletions(items):
+    """
+    Queue many deletions at once - items are dicts of queue_deletion()
+    keyword arguments. Returns the number of episodes added.
+    """
+    entries = []
+    for item in items:
+        item = dict(item)
+        reason = item.pop('reason')
+        date_source = item.pop('date_source')
+        date_value = item.pop('date_value')
+        rule_name = item.pop('rule_name')
+        entries.append({
+            'episode': _episode_for_queue(**item),
+            'reason': reason,
+            'date_source': date_source,
+            'date_value': date_value,
+            'rule_name': rule_name,
+        })
+    return add_many(entries)
 
 
 def add_to_pending_deletions(episode, reason, date_source, date_value, rule_name):
@@ -157,84 +340,214 @@ def add_to_pending_deletions(episode, reason, date_source, date_value, rule_name
         date_value: The actual date used for decision
         rule_name: Name of the rule that triggered this
     """
+    add_many([{'episode': episode, 'reason': reason, 'date_source': date_source,
+               'date_value': date_value, 'rule_name': rule_name}])
+
+
+def add_many(entries):
+    """
+    Add episodes to the pending deletions queue in one go.
+
+    Args:
+        entries: iterable of dicts with add_to_pending_deletions() arguments
+            (episode, reason, date_source, date_value, rule_name)
+
+    Returns:
+        int: number of episodes added (rejected and already-queued ones are skipped)
+    """
+    entries = list(entries)
+    if not entries:
+        return 0
+
     # Skip if in rejection cache
-    if is_episode_rejected(episode['id']):
-        logger.debug(f"Skipping episode {episode['id']} - in rejection cache")
-        return
-    
+    today = datetime.now().strftime('%Y-%m-%d')
+    with rejection_lock:
+        rejections = _cached_rejections()
+        rejected = {str(e['episode']['id']) for e in entries
+                    if rejections.get(str(e['episode']['id']), '') >= today}
+
+    added = 0
     with pending_lock:
-        pending_list = load_pending_deletions()
-        
-        series_id = episode['seriesId']
-        season_num = episode['seasonNumber']
-        episode_id = episode['id']
-        
-        # Find or create series entry
-        series_entry = next((s for s in pending_list if s['series_id'] == series_id), None)
-        if not series_entry:
-            series_entry = {
-                'series_id': series_id,
-                'series_title': episode['series']['title'],
-                'seasons': {}
-            }
-            pending_list.append(series_entry)
-        
-        # Find or create season entry
-        season_key = str(season_num)
-        if season_key not in series_entry['seasons']:
-            series_entry['seasons'][season_key] = {
-                'season_number': season_num,
-                'episodes': []
-            }
-        
-        # Check if episode already exists
-        existing_episode = next(
-            (ep for ep in series_entry['seasons'][season_key]['episodes'] if ep['episode_id'] == episode_id),
-            None
-        )
-        
-        if existing_episode:
-            logger.debug(f"Episode {episode_id} already in pending deletions")
-            return
-        
-        # Add episode
-        series_entry['seasons'][season_key]['episodes'].append({
-            'episode_id': episode_id,
-            'episode_number': episode['episodeNumber'],
-            'title': episode.get('title', 'Unknown'),
-            'reason': reason,
-            'rule_name': rule_name,
-            'date_source': date_source,
-            'date_value': date_value,
-            'file_size_mb': round(episode.get('episodeFile', {}).get('size', 0) / (1024 * 1024), 2),
-            'queued_at': datetime.now().isoformat(),
-            'episode_data': episode  # Store full episode for actual deletion
-        })
-        
-        save_pending_deletions(pending_list)
-        logger.info(f"Added to pending deletions: {episode['series']['title']} S{season_num:02d}E{episode['episodeNumber']:02d} - {reason}")
+        pending_list = _store.doc()["episodes"]
+
+        for entry in entries:
+            episode = entry['episode']
+            series_id = episode['seriesId']
+            season_num = episode['seasonNumber']
+            episode_id = episode['id']
+
+            if str(episode_id) in rejected:
+                logger.debug(f"Skipping episode {episode_id} - in rejection cache")
+                continue
+
+            # Check if episode already exists
+            if episode_id in _store.locations:
+                logger.debug(f"Episode {episode_id} already in pending deletions")
+                continue
+
+            # Find or create series entry
+            series_entry = _store.series_by_id.get(series_id)
+            if not series_entry:
+                series_entry = {
+                    'series_id': series_id,
+                    'series_title': episode['series']['title'],
+                    'seasons': {}
+                }
+                pending_list.append(series_entry)
+                _store.series_by_id[series_id] = series_entry
+                _store.series_stats[series_id] = {'episodes': 0, 'size_mb': 0}
+
+            # Find or create season entry
+            season_key = str(season_num)
+            if season_key not in series_entry['seasons']:
+                series_entry['seasons'][season_key] = {
+                    'season_number': season_num,
+                    'episodes': []
+                }
+
+            # Add episode
+            file_size_mb = round(episode.get('episodeFile', {}).get('size', 0) / (1024 * 1024), 2)
+            series_entry['seasons'][season_key]['episodes'].append({
+                'episode_id': episode_id,
+                'episode_number': episode['episodeNumber'],
+                'title': episode.get('title', 'Unknown'),
+                'reason': entry['reason'],
+                'rule_name': entry['rule_name'],
+                'date_source': entry['date_source'],
+                'date_value': entry['date_value'],
+                'file_size_mb': file_size_mb,
+                'queued_at': datetime.now().isoformat(),
+                'episode_data': episode  # Store full episode for actual deletion
+            })
+            _store.locations[episode_id] = (series_id, season_key)
+            stats = _store.series_stats[series_id]
+            stats['episodes'] += 1
+            stats['size_mb'] += file_size_mb
+            added += 1
+            logger.info(f"Added to pending deletions: {episode['series']['title']} S{season_num:02d}E{episode['episodeNumber']:02d} - {entry['reason']}")
+
+        if added:
+            _store.changed()
+    return added
+
+
+def get_pending_totals():
+    """Episode/series counts and sizes, without copying the queue."""
+    with pending_lock:
+        _store.doc()
+        return _store.totals()
 
 
 def get_pending_deletions_summary():
     """Get summary of pending deletions for display"""
     with pending_lock:
-        pending_list = load_pending_deletions()
-        
-        total_episodes = 0
-        total_size_mb = 0
-        
-        for series in pending_list:
-            for season_data in series['seasons'].values():
-                total_episodes += len(season_data['episodes'])
-                total_size_mb += sum(ep['file_size_mb'] for ep in season_data['episodes'])
-        
-        return {
-            'total_series': len(pending_list),
-            'total_episodes': total_episodes,
-            'total_size_mb': total_size_mb,
-            'total_size_gb': round(total_size_mb / 1024, 2),
-            'pending_list': pending_list
-        }
+        _store.doc()
+        summary = _store.totals()
+        summary['pending_list'] = copy.deepcopy(_store.data["episodes"])
+        summary['series_totals'] = copy.deepcopy(_store.series_stats)
+    return summary
+
+
+def _remove_episodes(episode_ids):
+    """Drop episode_ids (a set) from the queue, pruning empty seasons/series.
+    Only the seasons holding those episodes are touched. Caller holds
+    pending_lock."""
+    data = _store.doc()
+    by_season = defaultdict(set)
+    for episode_id in episode_ids:
+        location = _store.locations.pop(episode_id, None)
+        if location:
+            by_season[location].add(episode_id)
+    if not by_season:
+        return
+
+    emptied = set()
+    for (series_id, season_key), removed in by_season.items():
+        series = _store.series_by_id[series_id]
+        season_data = series['seasons'][season_key]
+        stats = _store.series_stats[series_id]
+        kept = []
+        for ep in season_data['episodes']:
+            if ep['episode_id'] in removed:
+                stats['episodes'] -= 1
+                stats['size_mb'] -= ep.get('file_size_mb', 0)
+            else:
+                kept.append(ep)
+        season_data['episodes'] = kept
+        # Remove empty seasons
+        if not kept:
+            del series['seasons'][season_key]
+            if not series['seasons']:
+                emptied.add(series_id)
+
+    # Remove empty series
+    if emptied:
+        data["episodes"] = [s for s in data["episodes"] if s['series_id'] not in emptied]
+        for series_id in emptied:
+            del _store.series_by_id[series_id]
+            del _store.series_stats[series_id]
+    _store.changed(immediate=True)
+
+
+_approval = {'running': False}
+_approval_lock = Lock()
+
+
+def get_approval_progress():
+    """Progress of the current (or last) approve_deletions() call."""
+    with _approval_lock:
+        return dict(_approval)
+
+
+def _set_approval(**fields):
+    with _approval_lock:
+        _approval.update(fields)
+
+
+def _delete_series_batch(series_title, episodes, sonarr_delete_func):
+    """Delete one series' approved episodes; returns (deleted, errors)."""
+    errors = []
+    # Build the episode dicts delete_episodes_immediately() expects
+    # (id, episodeFileId, seasonNumber, episodeNumber, title), and
+    # grab the series_id off any one of them — they're all the same
+    # series since we grouped by series above.
+    series_id = None
+    episode_list = []
+    for episode in episodes:
+        episode_data = episode['episode_data']
+        episode_file_id = episode_data.get('episodeFile', {}).get('id')
+        if not episode_file_id:
+            errors.append(f"No file ID for episode {episode['episode_id']}")
+            continue
+        if series_id is None:
+            series_id = episode_data.get('seriesId')
+        episode_list.append({
+            'id': episode_data.get('id'),
+            'episodeFileId': episode_file_id,
+            'seasonNumber': episode_data.get('seasonNumber'),
+            'episodeNumber': episode_data.get('episodeNumber'),
+            'title': episode_data.get('title'),
+        })
+
+    if not episode_list:
+        return 0, errors
+
+    # ONE DELETE CALL FOR ALL EPISODES IN THIS SERIES.
+    # force=True bypasses BOTH global and rule-level dry-run:
+    # approving from the pending queue is the explicit human
+    # confirmation to delete now. (rule_dry_run=False alone isn't
+    # enough — global dry_run_mode defaults to True and would
+    # still route this back into the queueing path.)
+    logger.info(f"Deleting {len(episode_list)} episodes from {series_title} in batch")
+    sonarr_delete_func(episode_list, series_id, series_title,
+                        reason="Approved from pending deletions",
+                        rule_dry_run=False, force=True)
+
+    # Log individual episodes
+    for episode in episodes:
+        episode_data = episode['episode_data']
+        logger.info(f"✓ Deleted: {series_title} S{episode_data['seasonNumber']:02d}E{episode_data['episodeNumber']:02d}")
+    return len(episode_list), errors
 
 
 def approve_deletions(episode_ids, sonarr_delete_func):
@@ -242,98 +555,70 @@ def approve_deletions(episode_ids, sonarr_delete_func):
     NEW v2.9.0: Approve and execute deletions with BATCHED DELETIONS BY SERIES
     
     Args:
-        episode_ids: List of episode IDs to delete
+        episode_ids: IDs of the episodes to delete (any iterable; used as a set)
         sonarr_delete_func: Function to call to actually delete episodes
     
     Returns:
         dict with success count and any errors
     """
-    # Only hold pending_lock while touching the on-disk queue itself. The delete
+    episode_ids = set(episode_ids)
+
+    # Only hold pending_lock while touching the queue itself. The delete
     # calls below can recurse back into add_to_pending_deletions() (e.g. if a
     # deletion turns out to still be dry-run for some other reason) which also
     # takes pending_lock — that lock is a plain, non-reentrant Lock, so calling
     # sonarr_delete_func() while still holding it would deadlock the request
     # thread (and, with it, every other thread waiting on the same lock).
     with pending_lock:
-        pending_list = load_pending_deletions()
+        _store.doc()
+        # Group the selection by series through the episode index
+        by_location = defaultdict(set)
+        for episode_id in episode_ids:
+            location = _store.locations.get(episode_id)
+            if location:
+                by_location[location].add(episode_id)
 
-        # Group episodes by series for batched deletion
         episodes_by_series = defaultdict(list)
-        for series in pending_list:
-            series_title = series['series_title']
-            for season_data in list(series['seasons'].values()):
-                for episode in list(season_data['episodes']):
-                    if episode['episode_id'] in episode_ids:
-                        episodes_by_series[series_title].append(episode)
+        for (series_id, season_key), selected in by_location.items():
+            series = _store.series_by_id[series_id]
+            episodes_by_series[(series_id, series['series_title'])].extend(
+                copy.deepcopy(ep) for ep in series['seasons'][season_key]['episodes']
+                if ep['episode_id'] in selected
+            )
 
     deleted_count = 0
     errors = []
+    _set_approval(running=True, total_series=len(episodes_by_series), done_series=0,
+                  total_episodes=sum(len(eps) for eps in episodes_by_series.values()),
+                  deleted_count=0, errors=0, started_at=time.time(), finished_at=None)
 
-    # Delete episodes in batches per series (MORE EFFICIENT!)
-    for series_title, episodes in episodes_by_series.items():
-        try:
-            # Build the episode dicts delete_episodes_immediately() expects
-            # (id, episodeFileId, seasonNumber, episodeNumber, title), and
-            # grab the series_id off any one of them — they're all the same
-            # series since we grouped by series_title above.
-            series_id = None
-            episode_list = []
-            for episode in episodes:
-                episode_data = episode['episode_data']
-                episode_file_id = episode_data.get('episodeFile', {}).get('id')
-                if not episode_file_id:
-                    errors.append(f"No file ID for episode {episode['episode_id']}")
-                    continue
-                if series_id is None:
-                    series_id = episode_data.get('seriesId')
-                episode_list.append({
-                    'id': episode_data.get('id'),
-                    'episodeFileId': episode_file_id,
-                    'seasonNumber': episode_data.get('seasonNumber'),
-                    'episodeNumber': episode_data.get('episodeNumber'),
-                    'title': episode_data.get('title'),
-                })
-
-            if episode_list:
-                # ONE DELETE CALL FOR ALL EPISODES IN THIS SERIES.
-                # force=True bypasses BOTH global and rule-level dry-run:
-                # approving from the pending queue is the explicit human
-                # confirmation to delete now. (rule_dry_run=False alone isn't
-                # enough — global dry_run_mode defaults to True and would
-                # still route this back into the queueing path.)
-                logger.info(f"Deleting {len(episode_list)} episodes from {series_title} in batch")
-                sonarr_delete_func(episode_list, series_id, series_title,
-                                    reason="Approved from pending deletions",
-                                    rule_dry_run=False, force=True)
-                deleted_count += len(episode_list)
-
-                # Log individual episodes
-                for episode in episodes:
-                    episode_data = episode['episode_data']
-                    logger.info(f"✓ Deleted: {series_title} S{episode_data['seasonNumber']:02d}E{episode_data['episodeNumber']:02d}")
-
-        except Exception as e:
-            error_msg = f"Failed to delete episodes from {series_title}: {str(e)}"
-            errors.append(error_msg)
-            logger.error(error_msg)
+    # Series are independent batches; run a few at a time
+    try:
+        with ThreadPoolExecutor(max_workers=APPROVE_WORKERS, thread_name_prefix='approve-deletions') as pool:
+            futures = {
+                pool.submit(_delete_series_batch, series_title, episodes, sonarr_delete_func): series_title
+                for (_, series_title), episodes in episodes_by_series.items()
+            }
+            for future in as_completed(futures):
+                series_title = futures[future]
+                try:
+                    deleted, batch_errors = future.result()
+                    deleted_count += deleted
+                    errors.extend(batch_errors)
+                except Exception as e:
+                    error_msg = f"Failed to delete episodes from {series_title}: {str(e)}"
+                    errors.append(error_msg)
+                    logger.error(error_msg)
+                with _approval_lock:
+                    _approval['done_series'] += 1
+                    _approval['deleted_count'] = deleted_count
+                    _approval['errors'] = len(errors)
+    finally:
+        _set_approval(running=False, finished_at=time.time())
 
     # Remove deleted episodes from pending list
     with pending_lock:
-        pending_list = load_pending_deletions()
-        for series in pending_list:
-            for season_key, season_data in list(series['seasons'].items()):
-                season_data['episodes'] = [
-                    ep for ep in season_data['episodes']
-                    if ep['episode_id'] not in episode_ids
-                ]
-                # Remove empty seasons
-                if not season_data['episodes']:
-                    del series['seasons'][season_key]
-
-        # Remove empty series
-        pending_list = [s for s in pending_list if s['seasons']]
-
-        save_pending_deletions(pending_list)
+        _remove_episodes(episode_ids)
 
     return {
         'deleted_count': deleted_count,
@@ -351,13 +636,13 @@ def reject_deletions(episode_ids):
     Returns:
         int: Number of episodes rejected
     """
+    episode_ids = set(episode_ids)
     with pending_lock:
-        pending_list = load_pending_deletions()
         rejected_count = 0
         
         # Add to rejection cache
         with rejection_lock:
-            cache = load_rejection_cache()
+            cache = dict(_cached_rejections())
             expiry_date = (datetime.now() + timedelta(days=REJECTION_CACHE_DAYS)).strftime('%Y-%m-%d')
             
             for episode_id in episode_ids:
@@ -367,21 +652,7 @@ def reject_deletions(episode_ids):
             save_rejection_cache(cache)
         
         # Remove from pending list
-        for series in pending_list:
-            for season_data in list(series['seasons'].values()):
-                season_data['episodes'] = [
-                    ep for ep in season_data['episodes'] 
-                    if ep['episode_id'] not in episode_ids
-                ]
-                # Remove empty seasons
-                for season_key in list(series['seasons'].keys()):
-                    if not series['seasons'][season_key]['episodes']:
-                        del series['seasons'][season_key]
-        
-        # Remove empty series
-        pending_list = [s for s in pending_list if s['seasons']]
-        
-        save_pending_deletions(pending_list)
+        _remove_episodes(episode_ids)
         logger.info(f"Rejected {rejected_count} episodes - added to {REJECTION_CACHE_DAYS} day rejection cache")
         
         return rejected_count
@@ -390,15 +661,17 @@ def reject_deletions(episode_ids):
 def clear_all_pending_deletions():
     """Clear all pending deletions"""
     with pending_lock:
-        save_pending_deletions([])
+        _store.doc()["episodes"] = []
+        _store.reindex()
+        _store.changed(immediate=True)
         logger.info("Cleared all pending deletions")
 
 
 def get_episode_ids_for_series(series_id):
     """Get all episode IDs for a series"""
     with pending_lock:
-        pending_list = load_pending_deletions()
-        series = next((s for s in pending_list if s['series_id'] == series_id), None)
+        _store.doc()
+        series = _store.series_by_id.get(series_id)
         
         if not series:
             return []
@@ -413,8 +686,8 @@ def get_episode_ids_for_series(series_id):
 def get_episode_ids_for_season(series_id, season_num):
     """Get all episode IDs for a season"""
     with pending_lock:
-        pending_list = load_pending_deletions()
-        series = next((s for s in pending_list if s['series_id'] == series_id), None)
+        _store.doc()
+        series = _store.series_by_id.get(series_id)
         
         if not series:
             return []
@@ -445,8 +718,7 @@ def _load_movie_rejection_cache():
 
 def _save_movie_rejection_cache(cache):
     try:
-        with open(MOVIE_REJECTION_CACHE_FILE, 'w') as f:
-            json.dump(cache, f, indent=2)
+        _write_json_atomic(MOVIE_REJECTION_CACHE_FILE, cache)
     except Exception as e:
         logger.error(f"Error saving movie rejection cache: {e}")
 
@@ -465,8 +737,7 @@ def queue_movie_deletion(movie_id, movie_title, movie_file_id, file_size,
         return
 
     with pending_lock:
-        data = _load_raw()
-        movies = data.get("movies", [])
+        movies = _store.doc()["movies"]
 
         if any(m['movie_id'] == movie_id for m in movies):
             logger.debug(f"Movie {movie_id} already in pending deletions")
@@ -485,14 +756,14 @@ def queue_movie_deletion(movie_id, movie_title, movie_file_id, file_size,
             'queued_at': datetime.now().isoformat(),
         })
 
-        data["movies"] = movies
-        _save_raw(data)
+        _store.changed()
         logger.info(f"Queued movie for deletion: '{movie_title}' — {reason}")
 
 
 def load_pending_movies():
     """Return the movies pending-deletion list."""
-    return _load_raw().get("movies", [])
+    with pending_lock:
+        return copy.deepcopy(_store.doc()["movies"])
 
 
 def get_pending_movies_summary():
@@ -518,36 +789,35 @@ def approve_movie_deletions(movie_ids):
     headers = {'X-Api-Key': api_key}
     deleted_count = 0
     errors = []
+    movie_ids = set(movie_ids)
+
+    with pending_lock:
+        to_delete = [dict(m) for m in _store.doc()["movies"] if m['movie_id'] in movie_ids]
+
+    for movie in to_delete:
+        try:
+            delete_option = movie.get('delete_option', 'file_only')
+            if delete_option == 'remove_from_radarr':
+                url = f"{radarr_url}/api/v3/movie/{movie['movie_id']}?deleteFiles=true"
+                resp = http.delete(url, headers=headers, timeout=15)
+            else:
+                url = f"{radarr_url}/api/v3/moviefile/{movie['movie_file_id']}"
+                resp = http.delete(url, headers=headers, timeout=15)
+
+            if resp.ok:
+                deleted_count += 1
+                logger.info(f"✅ Deleted movie '{movie['movie_title']}' ({delete_option})")
+            else:
+                errors.append(f"Failed to delete '{movie['movie_title']}': {resp.status_code}")
+                logger.error(f"Failed to delete movie {movie['movie_id']}: {resp.text[:200]}")
+        except Exception as e:
+            errors.append(f"Error deleting '{movie['movie_title']}': {str(e)}")
+            logger.error(f"Error deleting movie {movie['movie_id']}: {e}")
 
     with pending_lock:
-        data = _load_raw()
-        movies = data.get("movies", [])
-
-        to_delete = [m for m in movies if m['movie_id'] in movie_ids]
-        remaining = [m for m in movies if m['movie_id'] not in movie_ids]
-
-        for movie in to_delete:
-            try:
-                delete_option = movie.get('delete_option', 'file_only')
-                if delete_option == 'remove_from_radarr':
-                    url = f"{radarr_url}/api/v3/movie/{movie['movie_id']}?deleteFiles=true"
-                    resp = http.delete(url, headers=headers, timeout=15)
-                else:
-                    url = f"{radarr_url}/api/v3/moviefile/{movie['movie_file_id']}"
-                    resp = http.delete(url, headers=headers, timeout=15)
-
-                if resp.ok:
-                    deleted_count += 1
-                    logger.info(f"✅ Deleted movie '{movie['movie_title']}' ({delete_option})")
-                else:
-                    errors.append(f"Failed to delete '{movie['movie_title']}': {resp.status_code}")
-                    logger.error(f"Failed to delete movie {movie['movie_id']}: {resp.text[:200]}")
-            except Exception as e:
-                errors.append(f"Error deleting '{movie['movie_title']}': {str(e)}")
-                logger.error(f"Error deleting movie {movie['movie_id']}: {e}")
-
-        data["movies"] = remaining
-        _save_raw(data)
+        data = _store.doc()
+        data["movies"] = [m for m in data["movies"] if m['movie_id'] not in movie_ids]
+        _store.changed(immediate=True)
 
     return {'deleted_count': deleted_count, 'errors': errors}
 
@@ -561,10 +831,11 @@ def reject_movie_deletions(movie_ids):
             cache[str(mid)] = expiry
         _save_movie_rejection_cache(cache)
 
+    movie_ids = set(movie_ids)
     with pending_lock:
-        data = _load_raw()
-        data["movies"] = [m for m in data.get("movies", []) if m['movie_id'] not in movie_ids]
-        _save_raw(data)
+        data = _store.doc()
+        data["movies"] = [m for m in data["movies"] if m['movie_id'] not in movie_ids]
+        _store.changed(immediate=True)
 
     logger.info(f"Rejected {len(movie_ids)} movie(s) from pending deletions")
     return len(movie_ids)
@@ -572,7 +843,6 @@ def reject_movie_deletions(movie_ids):
 
 def clear_all_pending_movies():
     with pending_lock:
-        data = _load_raw()
-        data["movies"] = []
-        _save_raw(data)
+        _store.doc()["movies"] = []
+        _store.changed(immediate=True)
         logger.info("Cleared all pending movie deletions")
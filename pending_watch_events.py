@@ -5,7 +5,8 @@ never acts on automatically (see reconcile.py for why). Same
 queue-for-human-approval shape as pending_deletions.py, for a different
 action: replay a watch event instead of delete a file.
 
-File format: {"items": [...], "last_checked": <unix ts or None>}
+File format: {"items": [...], "last_checked": <unix ts or None>,
+"watermarks": {"<source>": <unix ts of the newest history row seen>}}
 """
 import os
 import json
@@ -28,10 +29,11 @@ def _load_raw():
                 data = json.load(f)
             data.setdefault('items', [])
             data.setdefault('last_checked', None)
+            data.setdefault('watermarks', {})
             return data
     except Exception as e:
         logger.error(f"Error loading pending watch events: {e}")
-    return {'items': [], 'last_checked': None}
+    return {'items': [], 'last_checked': None, 'watermarks': {}}
 
 
 def _save_raw(data):
@@ -53,12 +55,21 @@ def get_last_checked():
         return _load_raw()['last_checked']
 
 
-def mark_checked(timestamp=None):
-    """Record when reconcile.check_for_missed_watch_events() last ran, for
-    UI display only - not used for gating what gets detected next time."""
+def get_watermarks():
+    """{source: ts} - newest history row each source has already been swept to."""
+    with _lock:
+        return dict(_load_raw()['watermarks'])
+
+
+def mark_checked(timestamp=None, watermarks=None):
+    """Record when reconcile.check_for_missed_watch_events() last ran (for
+    UI display) and, per source that was swept successfully, the newest
+    history timestamp seen - the next sweep only looks past it."""
     with _lock:
         data = _load_raw()
         data['last_checked'] = timestamp or int(time.time())
+        for source, ts in (watermarks or {}).items():
+            data['watermarks'][source] = max(ts, data['watermarks'].get(source) or 0)
         _save_raw(data)
 
 
@@ -4,9 +4,9 @@ Missed watch-event detection.
 Webhooks are fire-and-forget: if Episeerr is down, restarting, or a webhook
 silently fails to fire, that watch event is lost and the affected series'
 rolling episode window just stalls until the next watch. This module runs
-once at startup and checks Plex/Jellyfin/Emby/Tautulli's own watch history
-for anything newer than what Episeerr's config has on record for that
-series.
+at startup and then every reconcile_interval_hours (default 6, 0 = startup
+only) and checks Plex/Jellyfin/Emby/Tautulli's own watch history for
+anything newer than what Episeerr's config has on record for that series.
 
 Deliberately does NOT auto-replay what it finds. Every source here has some
 gap between its own definition of "watched" and Episeerr's configured
@@ -15,17 +15,22 @@ resets once Played" dead end and the open Plex question) — silently
 replaying an inferred event risks doing the wrong thing with no one aware
 it happened. Instead, anything newer becomes a pending item in
 pending_watch_events.py for a human to Process (run it through the exact
-same path a live webhook would have) or Clear (ignore it). One run per
-startup, no periodic interval - de-duplication lives in
-pending_watch_events.add_or_update_pending(), keyed per series, not in a
-sweep watermark.
+same path a live webhook would have) or Clear (ignore it).
+
+Each check is one batched pass: every source is swept only past its
+persisted high-water mark (pending_watch_events.get_watermarks()), the rows
+are collapsed to the furthest-along event per (series, user), each distinct
+title is resolved once against one series snapshot, and the survivors are
+compared with a series -> config entry map built once. De-duplication of
+what is already queued still lives in
+pending_watch_events.add_or_update_pending(), keyed per series.
 
 Gated behind reconcile_enabled (default off) and skipped entirely while
 automation_held is set.
 """
 
 import logging
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
 from episeerr_utils import http
 
@@ -144,12 +149,15 @@ def _sweep_tautulli(since_ts=0):
     if not tautulli_url or not api_key:
         return []
 
-    resp = http.get(
-        f"{tautulli_url}/api/v2",
-        params={'apikey': api_key, 'cmd': 'get_history', 'media_type': 'episode',
-                'length': 500, 'start': 0},
-        timeout=30,
-    )
+    params = {'apikey': api_key, 'cmd': 'get_history', 'media_type': 'episode',
+              'length': 500, 'start': 0}
+    if since_ts:
+        # Day granularity, compared against the Tautulli server's local date.
+        # Start a day early so no timezone can push plays past the
+        # watermark out of the window - rows are still filtered by ts below.
+        params['after'] = (datetime.fromtimestamp(since_ts, tz=timezone.utc)
+                           - timedelta(days=1)).strftime('%Y-%m-%d')
+    resp = http.get(f"{tautulli_url}/api/v2", params=params, timeout=30)
     resp.raise_for_status()
     data = resp.json()
     if data.get('response', {}).get('result') != 'success':
@@ -172,12 +180,28 @@ def _sweep_tautulli(since_ts=0):
 
 _SWEEPERS = (
     ('plex', _sweep_plex),
-    ('jellyfin', lambda: _sweep_emby_api('jellyfin')),
-    ('emby', lambda: _sweep_emby_api('emby')),
+    ('jellyfin', lambda since_ts=0: _sweep_emby_api('jellyfin', since_ts)),
+    ('emby', lambda since_ts=0: _sweep_emby_api('emby', since_ts)),
     ('tautulli', _sweep_tautulli),
 )
 
 
+def _collapse_events(events):
+    """Keep one event per (series, user): the furthest-along (season,
+    episode), newest timestamp on a tie. Anything behind it can't produce a
+    pending item the furthest one doesn't already cover. Events are
+    (ts, series, season, episode, user, ...) - extra fields ride along.
+    series should be the resolved series_id, so a show reported under two
+    titles (Plex vs Tautulli naming) still collapses to one event."""
+    latest = {}
+    for event in events:
+        ts, series, season, episode, user = event[:5]
+        current = latest.get((series, user))
+        if current is None or (season, episode, ts) > (current[2], current[3], current[0]):
+            latest[(series, user)] = event
+    return list(latest.values())
+
+
 def replay_watch_event(source, series, season, episode, user):
     """Run one watch event through the source's normal processing path -
     the same thing a live webhook would have done. Used by the pending
@@ -209,41 +233,50 @@ def replay_watch_event(source, series, season, episode, user):
     })
 
 
-def _is_newer_than_recorded(series_id, season, episode, config):
+def _tracked_series(config):
+    """{str(series_id): (rule, entry)} - the first rule tracking each series."""
+    tracked = {}
+    for rule in config.get('rules', {}).values():
+        for sid, data in rule.get('series', {}).items():
+            tracked.setdefault(str(sid), (rule, data))
+    return tracked
+
+
+def _is_newer_than_recorded(series_id, season, episode, config, tracked=None):
     """True if (season, episode) is newer than what config has recorded for
     this series. Handles both grace_scope 'series' (flat last_season/
     last_episode) and 'season' (per-season last_episode) tracking. False if
     the series isn't tracked by any rule at all - out of scope here, that's
     the Sonarr-tag orphan-recovery job (episeerr_utils.reconcile_series_drift),
-    not this one."""
-    sid = str(series_id)
-    for rule in config.get('rules', {}).values():
-        series_dict = rule.get('series', {})
-        if sid not in series_dict:
-            continue
-        data = series_dict[sid]
-        if not isinstance(data, dict):
-            return True  # no usable record at all
-        if rule.get('grace_scope') == 'season':
-            season_data = (data.get('seasons') or {}).get(str(season))
-            last_episode = season_data.get('last_episode') if season_data else None
-            return last_episode is None or episode > last_episode
-        last_season = data.get('last_season')
-        last_episode = data.get('last_episode')
-        if last_season is None or last_episode is None:
-            return True
-        return (season, episode) > (last_season, last_episode)
-    return False
+    not this one. Pass tracked (from _tracked_series) when checking many."""
+    if tracked is None:
+        tracked = _tracked_series(config)
+    found = tracked.get(str(series_id))
+    if found is None:
+        return False
+    rule, data = found
+    if not isinstance(data, dict):
+        return True  # no usable record at all
+    if rule.get('grace_scope') == 'season':
+        season_data = (data.get('seasons') or {}).get(str(season))
+        last_episode = season_data.get('last_episode') if season_data else None
+        return last_episode is None or episode > last_episode
+    last_season = data.get('last_season')
+    last_episode = data.get('last_episode')
+    if last_season is None or last_episode is None:
+        return True
+    return (season, episode) > (last_season, last_episode)
 
 
 def check_for_missed_watch_events():
-    """One-shot check across all configured sources, called once at startup.
-    Queues anything newer than Episeerr's own records as a pending item;
-    never replays automatically. Returns a summary dict; never raises."""
-    from media_processor import load_global_settings, get_series_id, load_config
+    """Check across all configured sources, called at startup and by the
+    scheduler. Queues anything newer than Episeerr's own records as a
+    pending item; never replays automatically. Returns a summary dict;
+    never raises."""
+    from media_processor import load_global_settings, get_series_ids, load_config
     import pending_watch_events
 
-    summary = {'ran': False, 'found': 0, 'errors': []}
+    summary = {'ran': False, 'found': 0, 'errors': [], 'swept': {}}
     try:
         settings = load_global_settings()
         if not settings.get('reconcile_enabled', False):
@@ -252,31 +285,49 @@ def check_for_missed_watch_events():
             logger.info("[reconcile] Skipping check - automation is held")
             return summary
 
-        config = load_config()
-        found = 0
+        watermarks = pending_watch_events.get_watermarks()
+        new_watermarks = {}
+        events = []
         for label, sweep_fn in _SWEEPERS:
+            since_ts = watermarks.get(label) or 0
             try:
-                events = sweep_fn()
+                swept = sweep_fn(since_ts=since_ts)
             except Exception as exc:
                 logger.warning(f"[reconcile] {label} check failed: {exc}")
                 summary['errors'].append(f"{label}: {exc}")
                 continue
+            summary['swept'][label] = len(swept)
+            new_watermarks[label] = max([since_ts] + [ev[0] for ev in swept])
+            events.extend(tuple(ev) + (label,) for ev in swept)
 
-            for ts, series, season, episode, user in events:
-                series_id = get_series_id(series)
-                if not series_id:
-                    continue
-                if not _is_newer_than_recorded(series_id, season, episode, config):
-                    continue
-                pending_watch_events.add_or_update_pending(
-                    series_id=series_id, series_title=series, season=season,
-                    episode=episode, source=label, user=user, watched_at=ts,
-                )
-                found += 1
+        # A Sonarr outage raises here rather than resolving every title to
+        # None - the watermarks must not move past rows nobody could check.
+        try:
+            series_ids = get_series_ids({ev[1] for ev in events}) if events else {}
+        except Exception as exc:
+            logger.warning(f"[reconcile] Series lookup failed, keeping watermarks: {exc}")
+            summary['errors'].append(f"sonarr: {exc}")
+            return summary
+        latest = _collapse_events([
+            (ts, series_ids[title], season, episode, user, title, source)
+            for ts, title, season, episode, user, source in events
+            if series_ids.get(title)
+        ])
+        config = load_config()
+        tracked = _tracked_series(config)
+        found = 0
+        for ts, series_id, season, episode, user, series, source in latest:
+            if not _is_newer_than_recorded(series_id, season, episode, config, tracked):
+                continue
+            pending_watch_events.add_or_update_pending(
+                series_id=series_id, series_title=series, season=season,
+                episode=episode, source=source, user=user, watched_at=ts,
+            )
+            found += 1
 
         if found:
             logger.info(f"[reconcile] Found {found} watch event(s) newer than Episeerr's records")
-        pending_watch_events.mark_checked()
+        pending_watch_events.mark_checked(watermarks=new_watermarks)
         summary.update(ran=True, found=found)
         return summary
     except Exception as exc:
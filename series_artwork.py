@@ -0,0 +1,234 @@
+"""
+Series artwork cache.
+
+Every search and watch event used to make its own GET /api/v3/series/{id}
+(outside the shared http session) just to pick a backdrop URL, on the
+webhook thread, and the dashboard and series routes each walked Sonarr's
+images arrays themselves.
+
+This module keeps one map of series id -> artwork URLs (poster, banner,
+fanart and the backdrop the activity cards use). It is filled from
+sonarr_client's bulk series snapshot - re-folded when that snapshot changed
+or when entries went stale - persisted to data/series_artwork.json so a
+restart starts warm, and bounded: entries older than ARTWORK_TTL count as
+stale and at most MAX_ENTRIES series are kept, least recently used evicted
+first. The file is only rewritten when an entry's URLs changed or entries
+were added or dropped, not on every snapshot refresh.
+
+get_artwork() / get_backdrop() answer hits from memory. A miss fetches
+that one series through sonarr_client (so a series' first activity event
+still gets its backdrop); a stale entry is returned as is and schedules one
+background sync on an "artwork-sync" thread. get_banner_map() is for
+callers that are about to render the whole library anyway and may sync
+inline.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import sonarr_client
+
+logger = logging.getLogger(__name__)
+
+ARTWORK_FILE = os.path.join(os.getcwd(), 'data', 'series_artwork.json')
+
+ARTWORK_TTL = 24 * 60 * 60
+MAX_ENTRIES = 5000
+
+BACKDROP_TYPES = ('fanart', 'banner')
+URL_FIELDS = ('poster', 'banner', 'fanart', 'backdrop')
+
+
+def cover_urls(item):
+    """{poster, banner, fanart, backdrop} remote URLs from a Sonarr series
+    (or Radarr movie) dict's images array. backdrop is the first fanart or
+    banner image, as the activity log has always picked it."""
+    urls = {'poster': None, 'banner': None, 'fanart': None, 'backdrop': None}
+    for image in (item or {}).get('images') or []:
+        cover_type = image.get('coverType')
+        url = image.get('remoteUrl')
+        if not url:
+            continue
+        if cover_type in urls and urls[cover_type] is None:
+            urls[cover_type] = url
+        if cover_type in BACKDROP_TYPES and urls['backdrop'] is None:
+            urls['backdrop'] = url
+    return urls
+
+
+class ArtworkCache:
+    """LRU map of series id -> artwork entry; persisted in LRU order."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries = None          # OrderedDict, loaded on first use
+        self.path = None
+        self.synced_version = None
+        self.sync_thread = None
+
+    def _loaded(self):
+        """Caller holds self.lock."""
+        if self.entries is None or self.path != ARTWORK_FILE:
+            self.path = ARTWORK_FILE
+            self.entries = OrderedDict()
+            self.synced_version = None
+            try:
+                if os.path.exists(ARTWORK_FILE):
+                    with open(ARTWORK_FILE, 'r') as f:
+                        for series_id, entry in json.load(f).get('series', []):
+                            self.entries[int(series_id)] = entry
+            except Exception as e:
+                logger.error(f"Error loading series artwork cache: {e}")
+        return self.entries
+
+    def _save(self):
+        """Caller holds self.lock."""
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump({'series': list(self.entries.items())}, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.error(f"Error saving series artwork cache: {e}")
+
+    def update(self, series_list, version=None, complete=True):
+        """Fold a series list into the cache. complete means it is the whole
+        library (the bulk snapshot), so stale entries missing from it - series
+        deleted in Sonarr - are dropped."""
+        now = int(time.time())
+        with self.lock:
+            entries = self._loaded()
+            changed = False
+            seen = set()
+            for series in series_list:
+                entry = cover_urls(series)
+                old = entries.get(series['id'])
+                if old is None or any(old.get(k) != entry[k] for k in URL_FIELDS):
+                    changed = True
+                entry['updated_at'] = now
+                entries[series['id']] = entry
+                entries.move_to_end(series['id'])
+                seen.add(series['id'])
+            if complete:
+                for series_id in [sid for sid, e in entries.items()
+                                  if sid not in seen and now - e.get('updated_at', 0) > ARTWORK_TTL]:
+                    del entries[series_id]
+                    changed = True
+            while len(entries) > MAX_ENTRIES:
+                entries.popitem(last=False)
+                changed = True
+            if version is not None:
+                self.synced_version = version
+            if changed:
+                self._save()
+
+    def _has_stale(self):
+        """Caller holds self.lock."""
+        cutoff = time.time() - ARTWORK_TTL
+        return any(e.get('updated_at', 0) < cutoff for e in self.entries.values())
+
+    def get(self, series_id):
+        """(entry or None, fresh)."""
+        with self.lock:
+            entries = self._loaded()
+            entry = entries.get(series_id)
+            if entry is None:
+                return None, False
+            entries.move_to_end(series_id)
+            return dict(entry), time.time() - entry.get('updated_at', 0) <= ARTWORK_TTL
+
+    def sync(self, max_age=None):
+        """Refresh from sonarr_client's snapshot unless it's the one we
+        already folded in and nothing is stale. Raises like
+        sonarr_client.get_all_series()."""
+        series_list = sonarr_client.get_all_series(max_age=max_age)
+        version = sonarr_client.snapshot_version()
+        with self.lock:
+            self._loaded()
+            if version == self.synced_version and not self._has_stale():
+                return
+        self.update(series_list, version)
+        logger.debug(f"Series artwork synced from snapshot v{version}: {len(series_list)} series")
+
+    def sync_in_background(self):
+        with self.lock:
+            if self.sync_thread is not None and self.sync_thread.is_alive():
+                return
+            self.sync_thread = threading.Thread(target=self._background_sync, name='artwork-sync', daemon=True)
+            self.sync_thread.start()
+
+    def _background_sync(self):
+        try:
+            self.sync()
+        except Exception as e:
+            logger.debug(f"Series artwork sync failed: {e}")
+
+
+_cache = ArtworkCache()
+
+
+def get_artwork(series_id):
+    """Artwork entry for a series, or None. A miss fetches the series (one
+    sonarr_client call); a stale entry is served while a background sync
+    runs."""
+    try:
+        series_id = int(series_id)
+    except (TypeError, ValueError):
+        return None
+    entry, fresh = _cache.get(series_id)
+    if entry is None:
+        try:
+            series = sonarr_client.get_series(series_id)
+        except Exception as e:
+            logger.debug(f"Artwork fetch for series {series_id} failed: {e}")
+            series = None
+        if series:
+            _cache.update([series], complete=False)
+            entry, fresh = _cache.get(series_id)
+    if not fresh:
+        _cache.sync_in_background()
+    return entry
+
+
+def get_backdrop(series_id):
+    entry = get_artwork(series_id)
+    return entry.get('backdrop') if entry else None
+
+
+def get_poster(series_id):
+    entry = get_artwork(series_id)
+    return entry.get('poster') if entry else None
+
+
+def update_from_snapshot(series_list):
+    """Fold a freshly fetched snapshot in (startup warms the cache this way)."""
+    _cache.update(series_list, sonarr_client.snapshot_version())
+
+
+def get_banner_map(url=None, api_key=None):
+    """{series_id: banner_url} for the whole library. Syncs inline from the
+    snapshot (a cache hit unless it expired); falls back to cached entries
+    if Sonarr is unreachable."""
+    try:
+        series_list = sonarr_client.get_all_series(url=url, api_key=api_key)
+        version = sonarr_client.snapshot_version()
+        with _cache.lock:
+            _cache._loaded()
+            synced = _cache.synced_version == version
+        if not synced:
+            _cache.update(series_list, version)
+        ids = [series['id'] for series in series_list]
+    except Exception as e:
+        logger.debug(f"Banner map served from cache: {e}")
+        ids = None
+    with _cache.lock:
+        entries = _cache._loaded()
+        if ids is None:
+            ids = list(entries)
+        return {series_id: entries[series_id].get('banner')
+                for series_id in ids if series_id in entries and entries[series_id].get('banner')}
@@ -0,0 +1,134 @@
+"""
+Title -> Sonarr series resolution index.
+
+media_processor.get_series_id() used to make up to six linear passes over
+the whole series list per watch event - TVDB id, TMDB id, exact title,
+year-stripped title, normalized alternate titles, then a substring scan for
+the "possible matches" log line - re-running the re.sub normalization on
+every series each time. reconcile.check_for_missed_watch_events() does that
+for every history row it sweeps.
+
+SeriesIndex builds those passes once as dicts over one sonarr_client
+snapshot, so a lookup is a handful of hash probes in the same priority
+order as before (first series in Sonarr's order wins a tie). get_index()
+rebuilds it only when sonarr_client hands out a different snapshot - a
+refetch, invalidation or remember_series() - so webhooks and history
+sweeps share one index between refreshes.
+"""
+
+import logging
+import re
+import threading
+
+import sonarr_client
+
+logger = logging.getLogger(__name__)
+
+_YEAR_SUFFIX = re.compile(r'\s*\(\d{4}\)$')
+_PUNCTUATION = re.compile(r'[^\w\s]')
+_WHITESPACE = re.compile(r'\s+')
+
+# Snapshot age accepted when retrying a miss - the series may have just been
+# added; a burst of misses still costs at most one refetch per window
+MISS_REFRESH_SECONDS = 5
+
+
+def strip_year(title):
+    return _YEAR_SUFFIX.sub('', title or '').strip().lower()
+
+
+def normalize_title(title):
+    """Lowercase, punctuation dropped, whitespace collapsed."""
+    title = _PUNCTUATION.sub('', (title or '').lower())
+    return _WHITESPACE.sub(' ', title).strip()
+
+
+def _int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class SeriesIndex:
+    """Immutable lookup tables over one series list."""
+
+    def __init__(self, series_list, version=None):
+        self.version = version
+        self.source = series_list
+        self.by_tvdb = {}
+        self.by_tmdb = {}
+        self.by_title = {}
+        self.by_title_no_year = {}
+        self.by_alt_title = {}
+        self.titles = []            # (lowercased title, title) for close-match hints
+        for series in series_list:
+            series_id = series['id']
+            title = series.get('title', '')
+            if series.get('tvdbId'):
+                self.by_tvdb.setdefault(series['tvdbId'], series_id)
+            if series.get('tmdbId'):
+                self.by_tmdb.setdefault(series['tmdbId'], series_id)
+            self.by_title.setdefault(title.lower(), series_id)
+            self.by_title_no_year.setdefault(strip_year(title), series_id)
+            for alt in series.get('alternateTitles') or []:
+                self.by_alt_title.setdefault(normalize_title(alt.get('title', '')), series_id)
+            self.titles.append((title.lower(), title))
+
+    def __len__(self):
+        return len(self.titles)
+
+    def resolve(self, series_name, tvdb_id=None, tmdb_id=None):
+        """(series_id, matched_by) or (None, None)."""
+        tvdb_id, tmdb_id = _int(tvdb_id), _int(tmdb_id)
+        if tvdb_id and tvdb_id in self.by_tvdb:
+            return self.by_tvdb[tvdb_id], 'tvdb'
+        if tmdb_id and tmdb_id in self.by_tmdb:
+            return self.by_tmdb[tmdb_id], 'tmdb'
+        if not series_name:
+            return None, None
+        for table, key, how in (
+            (self.by_title, series_name.lower(), 'title'),
+            (self.by_title_no_year, strip_year(series_name), 'title_without_year'),
+            (self.by_alt_title, normalize_title(series_name), 'alternate_title'),
+        ):
+            if key in table:
+                return table[key], how
+        return None, None
+
+    def close_matches(self, series_name, limit=10):
+        """Titles containing series_name - only used to explain a miss."""
+        needle = (series_name or '').lower()
+        if not needle:
+            return []
+        return [title for lowered, title in self.titles if needle in lowered][:limit]
+
+
+_index = None
+_lock = threading.Lock()
+
+
+def get_index(max_age=None, url=None, api_key=None):
+    """The index over the current sonarr_client snapshot, rebuilt only when
+    the snapshot changed. Raises like sonarr_client.get_all_series()."""
+    global _index
+    series_list = sonarr_client.get_all_series(max_age=max_age, url=url, api_key=api_key)
+    index = _index
+    if index is not None and index.source is series_list:
+        return index
+    with _lock:
+        if _index is None or _index.source is not series_list:
+            _index = SeriesIndex(series_list, sonarr_client.snapshot_version())
+            logger.debug(f"Series index rebuilt: {len(_index)} series (snapshot v{_index.version})")
+        return _index
+
+
+def resolve(series_name, tvdb_id=None, tmdb_id=None, url=None, api_key=None, refresh_on_miss=True):
+    """(series_id, matched_by, index). A miss is retried once against a
+    snapshot no older than MISS_REFRESH_SECONDS."""
+    index = get_index(url=url, api_key=api_key)
+    series_id, how = index.resolve(series_name, tvdb_id, tmdb_id)
+    if series_id is None and refresh_on_miss:
+        index = get_index(max_age=MISS_REFRESH_SECONDS, url=url, api_key=api_key)
+        series_id, how = index.resolve(series_name, tvdb_id, tmdb_id)
+    return series_id, how, index
@@ -0,0 +1,282 @@
+"""
+Multiplexed playback-session poller.
+
+In polling mode the Plex, Jellyfin and Emby integrations used to start one
+daemon thread per playback session. Each thread fetched the server's full
+session list on its own and then slept for the poll interval, so a dozen
+streams meant a dozen threads downloading the same list on a dozen timers.
+
+A SessionPoller is the single poller for one media server. Integrations
+track() a session when playback starts and untrack() it on stop. The
+poller thread wakes when the earliest tracked session is due and fetches
+the session list once. It then hands that same snapshot to every tracked
+session. A session that reaches the trigger threshold is processed and
+dropped, and so is one that has ended.
+
+Each session is scheduled predictively. Its position, its duration and
+the playback rate observed between two polls give the wall-clock moment
+it will cross the trigger threshold, and the next check is set for just
+after that moment. The configured poll interval becomes only the safety
+re-check for seeks and pauses between polls. A paused session has no
+estimate, and neither does one that reports no position. Both fall back
+to next_interval, which polls sooner as the session gets closer to the
+threshold. The thread count stays at one per server however many viewers
+there are.
+
+The integration supplies four callables:
+
+    fetch_sessions()                 -> snapshot (raises on failure)
+    check_session(key, info, snap)   -> {'progress': float, 'is_paused': bool,
+                                         'position': s, 'duration': s}
+                                        or None once the session is gone
+                                        (position/duration are optional)
+    process_session(key, info, state) -> True when handled
+    get_settings()                   -> (trigger threshold %, max interval s)
+"""
+
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+MIN_INTERVAL = 30           # floor for the position-less fallback schedule
+NEAR_THRESHOLD_PCT = 10.0   # fallback: within this many points of the trigger, poll faster
+PREDICTED_MIN_INTERVAL = 5  # floor for a predicted check
+TRIGGER_MARGIN = 3          # seconds past the predicted crossing, for servers' coarse position reports
+MIN_RATE, MAX_RATE = 0.25, 4.0   # observed rates outside this were seeks, not playback
+ERROR_BACKOFF = 60
+
+
+def next_interval(progress, threshold, max_interval):
+    """Seconds until a session at progress% should be checked again.
+
+    Far from the threshold this is the configured interval. Within
+    NEAR_THRESHOLD_PCT it shrinks in proportion to the distance left, but
+    never below MIN_INTERVAL.
+    """
+    max_interval = max(MIN_INTERVAL, max_interval)
+    remaining = threshold - progress
+    if remaining >= NEAR_THRESHOLD_PCT:
+        return max_interval
+    return max(MIN_INTERVAL, max_interval * max(remaining, 0.0) / NEAR_THRESHOLD_PCT)
+
+
+def observed_rate(previous_rate, prev_position, prev_time, prev_paused, position, now, is_paused):
+    """Playback rate (media seconds per wall second) between two polls.
+
+    Keeps previous_rate when either poll was paused or when the jump looks
+    like a seek rather than playback.
+    """
+    if prev_position is None or prev_time is None or prev_paused or is_paused or now <= prev_time:
+        return previous_rate
+    rate = (position - prev_position) / (now - prev_time)
+    if not MIN_RATE <= rate <= MAX_RATE:
+        return previous_rate
+    return rate
+
+
+def predict_crossing(position, duration, threshold, rate, is_paused):
+    """Wall-clock seconds until position reaches threshold% of duration.
+
+    Returns None when there is nothing to predict from (paused, or no
+    position or duration). Returns 0 when the session is already past the
+    threshold.
+    """
+    if is_paused or position is None or not duration or rate <= 0:
+        return None
+    return max(0.0, (duration * threshold / 100.0 - position) / rate)
+
+
+def schedule_interval(eta, progress, threshold, max_interval):
+    """Seconds until the next check. That is just after the predicted
+    crossing, bounded by the configured interval as a safety re-check."""
+    if eta is None:
+        return next_interval(progress, threshold, max_interval)
+    return min(max(PREDICTED_MIN_INTERVAL, max_interval), max(PREDICTED_MIN_INTERVAL, eta + TRIGGER_MARGIN))
+
+
+class SessionPoller:
+    """One polling thread for all tracked sessions of one media server."""
+
+    def __init__(self, label, fetch_sessions, check_session, process_session, get_settings):
+        self.label = label
+        self.fetch_sessions = fetch_sessions
+        self.check_session = check_session
+        self.process_session = process_session
+        self.get_settings = get_settings
+        self.cond = threading.Condition()
+        self.sessions = {}
+        self.thread = None
+        self.last_fetch = None
+
+    # ------------------------------------------------------------------
+    # Tracking
+    # ------------------------------------------------------------------
+
+    def track(self, key, info):
+        """Start tracking a session; False if it is already tracked."""
+        with self.cond:
+            if key in self.sessions:
+                return False
+            self.sessions[key] = {
+                'info': info,
+                'started_at': time.time(),
+                'next_check': 0.0,       # first check on the next tick
+                'polls': 0,
+                'progress': info.get('progress_percent', 0.0),
+                'is_paused': info.get('is_paused', False),
+                'position': None,
+                'rate': 1.0,
+                'eta': None,
+                'last_polled': None,
+                'error': None,
+            }
+            self._ensure_thread()
+            self.cond.notify_all()
+        return True
+
+    def untrack(self, key):
+        with self.cond:
+            if self.sessions.pop(key, None) is None:
+                return False
+            self.cond.notify_all()
+        return True
+
+    def is_tracking(self, key):
+        with self.cond:
+            return key in self.sessions
+
+    def status(self):
+        """Tracked-session table for the polling-status routes."""
+        now = time.time()
+        with self.cond:
+            rows = []
+            for key, s in self.sessions.items():
+                info = s['info']
+                rows.append({
+                    'session_id': key,
+                    'series_name': info.get('series_name'),
+                    'season_number': info.get('season_number'),
+                    'episode_number': info.get('episode_number'),
+                    'user_name': info.get('user_name'),
+                    'progress_percent': round(s['progress'], 1),
+                    'is_paused': s['is_paused'],
+                    'polls': s['polls'],
+                    'playback_rate': round(s['rate'], 2),
+                    'predicted_crossing_in': None if s['eta'] is None else max(0, int(s['eta'] - (now - s['last_polled']))),
+                    'tracked_seconds': int(now - s['started_at']),
+                    'last_polled': s['last_polled'],
+                    'next_check_in': max(0, int(s['next_check'] - now)),
+                    'error': s['error'],
+                })
+            return {
+                'tracked_sessions': rows,
+                'thread_alive': bool(self.thread and self.thread.is_alive()),
+                'last_fetch': self.last_fetch,
+            }
+
+    # ------------------------------------------------------------------
+    # Polling
+    # ------------------------------------------------------------------
+
+    def _ensure_thread(self):
+        """Caller holds self.cond."""
+        if self.thread is None or not self.thread.is_alive():
+            self.thread = threading.Thread(target=self._run, daemon=True, name=f"{self.label}SessionPoller")
+            self.thread.start()
+
+    def _seconds_until_due(self):
+        """Caller holds self.cond. None when nothing is tracked."""
+        if not self.sessions:
+            return None
+        return max(0.0, min(s['next_check'] for s in self.sessions.values()) - time.time())
+
+    def _run(self):
+        while True:
+            with self.cond:
+                wait = self._seconds_until_due()
+                while wait is None or wait > 0:
+                    self.cond.wait(wait)
+                    wait = self._seconds_until_due()
+            try:
+                self.tick()
+            except Exception as e:
+                logger.error(f"[{self.label}] Session poller tick failed: {e}", exc_info=True)
+                with self.cond:
+                    retry_at = time.time() + ERROR_BACKOFF
+                    for s in self.sessions.values():
+                        s['next_check'] = max(s['next_check'], retry_at)
+
+    def tick(self, now=None):
+        """Fetch the session list once and fan it out to every tracked
+        session. Returns the number of sessions still tracked."""
+        now = time.time() if now is None else now
+        with self.cond:
+            if not any(s['next_check'] <= now for s in self.sessions.values()):
+                return len(self.sessions)
+            tracked = {key: s['info'] for key, s in self.sessions.items()}
+
+        threshold, max_interval = self.get_settings()
+        try:
+            snapshot = self.fetch_sessions()
+            self.last_fetch = now
+        except Exception as e:
+            logger.warning(f"[{self.label}] Session list fetch failed: {e}")
+            with self.cond:
+                for s in self.sessions.values():
+                    if s['next_check'] <= now:
+                        s['next_check'] = now + max(MIN_INTERVAL, min(ERROR_BACKOFF, max_interval))
+                        s['error'] = str(e)
+                return len(self.sessions)
+
+        for key, info in tracked.items():
+            try:
+                state = self.check_session(key, info, snapshot)
+            except Exception as e:
+                logger.error(f"[{self.label}] Error checking session {key}: {e}")
+                state = None
+            if state is None:
+                self.untrack(key)
+                continue
+
+            progress = float(state.get('progress', 0.0))
+            is_paused = bool(state.get('is_paused', False))
+            position = state.get('position')
+            with self.cond:
+                s = self.sessions.get(key)
+                if s is None:       # stopped while we were fetching
+                    continue
+                if position is not None:
+                    s['rate'] = observed_rate(s['rate'], s['position'], s['last_polled'], s['is_paused'],
+                                              position, now, is_paused)
+                s['eta'] = predict_crossing(position, state.get('duration'), threshold, s['rate'], is_paused)
+                s['polls'] += 1
+                s['progress'] = progress
+                s['is_paused'] = is_paused
+                s['position'] = position
+                s['last_polled'] = now
+                s['error'] = None
+                polls = s['polls']
+                eta = s['eta']
+            logger.info(f"[{self.label}] {info.get('series_name')} S{info.get('season_number')}E{info.get('episode_number')} "
+                        f"poll #{polls}: {progress:.1f}% {'(PAUSED)' if state.get('is_paused') else ''}")
+
+            delay = schedule_interval(eta, progress, threshold, max_interval)
+            if progress >= threshold:
+                logger.info(f"[{self.label}] Trigger threshold reached for session {key} at {progress:.1f}%")
+                if self.process_session(key, info, state):
+                    self.untrack(key)
+                    continue
+                # Past the threshold the ETA is 0; retry on the configured
+                # interval, not every PREDICTED_MIN_INTERVAL
+                delay = max(MIN_INTERVAL, max_interval)
+                logger.warning(f"[{self.label}] Processing failed for session {key} - will retry in {int(delay)}s")
+
+            with self.cond:
+                s = self.sessions.get(key)
+                if s is not None:
+                    s['next_check'] = now + delay
+
+        with self.cond:
+            return len(self.sessions)
@@ -1,19 +1,116 @@
 """
 Settings Database - Store service configurations
 Replaces env vars with database storage for easier management
+
+Every accessor runs on a per-thread connection (WAL mode, so readers never
+wait on a writer). The connection is opened once and reused, so sqlite3's
+per-connection statement cache keeps the hot lookups prepared. Decoded
+service rows and settings are also kept in an in-process read cache, so
+repeated get_service()/get_setting() calls - the config getters, per-poll
+detection config, per-integration dashboard stats - are a dict lookup.
+
+The cache is invalidated by a version counter:
+- save_service, delete_service, set_setting and the other writers bump it.
+- Writes from another process (media_processor run as a subprocess, or
+  sqlite3 on the command line) are noticed through the database/WAL file
+  signature, checked at most every EXTERNAL_CHECK_SECONDS.
 """
 
+import copy
 import sqlite3
 import json
 import os
+import threading
+import time
 from datetime import datetime
 from typing import Optional, Dict, Any, List
 
 DB_PATH = os.getenv('SETTINGS_DB_PATH', '/app/data/settings.db')
 
+EXTERNAL_CHECK_SECONDS = 2.0
+
+_local = threading.local()
+_cache_lock = threading.Lock()
+_cache: Dict[tuple, Any] = {}
+_version = 0
+_db_sig = None
+_last_external_check = 0.0
+_MISSING = object()
+_NO_ROW = object()
+
+
+def _connect() -> sqlite3.Connection:
+    """This thread's connection to DB_PATH, opened on first use."""
+    conn = getattr(_local, 'conn', None)
+    if conn is None or _local.path != DB_PATH:
+        if conn is not None:
+            conn.close()
+        conn = sqlite3.connect(DB_PATH, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+        except sqlite3.OperationalError:
+            pass  # e.g. read-only filesystem - the default journal still works
+        _local.conn, _local.path = conn, DB_PATH
+    return conn
+
+
+def _db_signature():
+    sig = []
+    for path in (DB_PATH, DB_PATH + '-wal'):
+        try:
+            st = os.stat(path)
+            sig.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            sig.append(None)
+    return tuple(sig)
+
+
+def _bump_version():
+    """Invalidate every cached read (call after any write)."""
+    global _version
+    with _cache_lock:
+        _version += 1
+        _cache.clear()
+
+
+def settings_version() -> int:
+    """Counter bumped whenever settings or services change."""
+    _check_external_changes()
+    return _version
+
+
+def _check_external_changes():
+    global _db_sig, _last_external_check
+    now = time.monotonic()
+    if now - _last_external_check < EXTERNAL_CHECK_SECONDS:
+        return
+    _last_external_check = now
+    sig = _db_signature()
+    if _db_sig is not None and sig != _db_sig:
+        _bump_version()
+    _db_sig = sig
+
+
+def _cached(key: tuple, load):
+    """load() through the read cache; callers get their own copy."""
+    _check_external_changes()
+    with _cache_lock:
+        value = _cache.get(key, _MISSING)
+        version = _version
+    if value is _MISSING:
+        value = load()
+        with _cache_lock:
+            # Don't cache a row read before a concurrent write landed
+            if version == _version:
+                _cache[key] = value
+    return value if value is _NO_ROW else copy.deepcopy(value)
+
+
 def init_settings_db():
     """Initialize settings database with all tables"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = _connect()
     cursor = conn.cursor()
     
     # Services table - stores connection info for all external services
@@ -108,7 +205,7 @@ def init_settings_db():
     ''')
 
     conn.commit()
-    conn.close()
+    _bump_version()
 
 
 def migrate_pending_requests_from_files(requests_dir: str) -> int:
@@ -142,34 +239,30 @@ def migrate_pending_requests_from_files(requests_dir: str) -> int:
 def add_pending_request(data: Dict[str, Any], request_id: str = None) -> str:
     """Insert a pending request. Returns the request id."""
     rid = request_id or data.get('id') or data.get('request_id') or str(data.get('tmdb_id', ''))
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute(
-        '''INSERT OR REPLACE INTO pending_requests (id, series_id, title, tmdb_id, tvdb_id, data, created_at)
-           VALUES (?, ?, ?, ?, ?, ?, ?)''',
-        (
-            rid,
-            data.get('series_id'),
-            data.get('title'),
-            str(data.get('tmdb_id', '') or ''),
-            str(data.get('tvdb_id', '') or ''),
-            json.dumps(data),
-            data.get('created_at') or int(__import__('time').time()),
+    conn = _connect()
+    with conn:
+        conn.execute(
+            '''INSERT OR REPLACE INTO pending_requests (id, series_id, title, tmdb_id, tvdb_id, data, created_at)
+               VALUES (?, ?, ?, ?, ?, ?, ?)''',
+            (
+                rid,
+                data.get('series_id'),
+                data.get('title'),
+                str(data.get('tmdb_id', '') or ''),
+                str(data.get('tvdb_id', '') or ''),
+                json.dumps(data),
+                data.get('created_at') or int(time.time()),
+            )
         )
-    )
-    conn.commit()
-    conn.close()
     return rid
 
 
 def get_pending_request(request_id: str) -> Optional[Dict[str, Any]]:
     """Fetch a single pending request by id."""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    conn = _connect()
     cursor = conn.cursor()
     cursor.execute('SELECT data FROM pending_requests WHERE id = ?', (request_id,))
     row = cursor.fetchone()
-    conn.close()
     if row:
         d = json.loads(row['data'])
         d['id'] = request_id
@@ -179,12 +272,10 @@ def get_pending_request(request_id: str) -> Optional[Dict[str, Any]]:
 
 def get_all_pending_requests() -> List[Dict[str, Any]]:
     """Return all pending requests ordered newest first."""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    conn = _connect()
     cursor = conn.cursor()
     cursor.execute('SELECT id, data FROM pending_requests ORDER BY created_at DESC')
     rows = cursor.fetchall()
-    conn.close()
     results = []
     for row in rows:
         d = json.loads(row['data'])
@@ -195,12 +286,10 @@ def get_all_pending_requests() -> List[Dict[str, Any]]:
 
 def find_pending_request_by_series(series_id) -> Optional[Dict[str, Any]]:
     """Find the first pending request for a given Sonarr series_id."""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    conn = _connect()
     cursor = conn.cursor()
     cursor.execute('SELECT id, data FROM pending_requests WHERE series_id = ? LIMIT 1', (int(series_id),))
     row = cursor.fetchone()
-    conn.close()
     if row:
         d = json.loads(row['data'])
         d['id'] = row['id']
@@ -210,12 +299,10 @@ def find_pending_request_by_series(series_id) -> Optional[Dict[str, Any]]:
 
 def find_pending_request_by_tmdb(tmdb_id) -> Optional[Dict[str, Any]]:
     """Find the first pending request for a given TMDB id."""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    conn = _connect()
     cursor = conn.cursor()
     cursor.execute('SELECT id, data FROM pending_requests WHERE tmdb_id = ? LIMIT 1', (str(tmdb_id),))
     row = cursor.fetchone()
-    conn.close()
     if row:
         d = json.loads(row['data'])
         d['id'] = row['id']
@@ -225,146 +312,129 @@ def find_pending_request_by_tmdb(tmdb_id) -> Optional[Dict[str, Any]]:
 
 def delete_pending_request(request_id: str) -> bool:
     """Delete a pending request. Returns True if a row was deleted."""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute('DELETE FROM pending_requests WHERE id = ?', (request_id,))
-    deleted = cursor.rowcount > 0
-    conn.commit()
-    conn.close()
-    return deleted
+    conn = _connect()
+    with conn:
+        cursor = conn.execute('DELETE FROM pending_requests WHERE id = ?', (request_id,))
+    return cursor.rowcount > 0
+
 
+def _decode_service(row) -> Dict[str, Any]:
+    service = dict(row)
+    if service['config']:
+        service['config'] = json.loads(service['config'])
+    return service
+
+def _load_service_row(service_type: str, name: str):
+    row = _connect().execute(
+        'SELECT * FROM services WHERE service_type = ? AND name = ?',
+        (service_type, name)
+    ).fetchone()
+    return _decode_service(row) if row else None
 
 def get_service(service_type: str, name: str = 'default') -> Optional[Dict[str, Any]]:
     """Get a service configuration by type and name"""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    
-    cursor.execute(
-        'SELECT * FROM services WHERE service_type = ? AND name = ? AND enabled = 1',
-        (service_type, name)
-    )
-    
-    row = cursor.fetchone()
-    conn.close()
-    
-    if row:
-        service = dict(row)
-        if service['config']:
-            service['config'] = json.loads(service['config'])
+    service = get_service_row(service_type, name)
+    if service and service['enabled'] == 1:
         return service
     return None
 
+def get_service_row(service_type: str, name: str = 'default') -> Optional[Dict[str, Any]]:
+    """Get a service row by type and name, disabled or not"""
+    return _cached(('service', service_type, name), lambda: _load_service_row(service_type, name))
+
 def get_all_services() -> List[Dict[str, Any]]:
     """Get all service configurations"""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    
-    cursor.execute('SELECT * FROM services ORDER BY service_type, name')
-    
-    rows = cursor.fetchall()
-    conn.close()
-    
-    services = []
-    for row in rows:
-        service = dict(row)
-        if service['config']:
-            service['config'] = json.loads(service['config'])
-        services.append(service)
-    
-    return services
+    def load():
+        rows = _connect().execute('SELECT * FROM services ORDER BY service_type, name').fetchall()
+        return [_decode_service(row) for row in rows]
+    return _cached(('services',), load)
 
 def save_service(service_type: str, name: str, url: str, api_key: str = None, 
                  config: Dict = None, enabled: bool = True) -> int:
     """Save or update a service configuration"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
     config_json = json.dumps(config) if config else None
     
-    cursor.execute('''
-        INSERT INTO services (service_type, name, url, api_key, config, enabled, updated_at)
-        VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-        ON CONFLICT(service_type, name) 
-        DO UPDATE SET 
-            url = excluded.url,
-            api_key = excluded.api_key,
-            config = excluded.config,
-            enabled = excluded.enabled,
-            updated_at = CURRENT_TIMESTAMP
-    ''', (service_type, name, url, api_key, config_json, enabled))
+    conn = _connect()
+    with conn:
+        cursor = conn.execute('''
+            INSERT INTO services (service_type, name, url, api_key, config, enabled, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(service_type, name) 
+            DO UPDATE SET 
+                url = excluded.url,
+                api_key = excluded.api_key,
+                config = excluded.config,
+                enabled = excluded.enabled,
+                updated_at = CURRENT_TIMESTAMP
+        ''', (service_type, name, url, api_key, config_json, enabled))
+    _bump_version()
     
-    service_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
-    
-    return service_id
+    return cursor.lastrowid
+
+def set_service_enabled(service_type: str, name: str, enabled: bool) -> bool:
+    """Enable or disable an existing service row; False if there is none"""
+    conn = _connect()
+    with conn:
+        cursor = conn.execute('''
+            UPDATE services SET enabled = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE service_type = ? AND name = ?
+        ''', (1 if enabled else 0, service_type, name))
+    _bump_version()
+    return cursor.rowcount > 0
 
 def update_service_test_result(service_type: str, name: str, status: str):
     """Update the last test result for a service"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        UPDATE services 
-        SET last_test = CURRENT_TIMESTAMP, last_test_status = ?
-        WHERE service_type = ? AND name = ?
-    ''', (status, service_type, name))
-    
-    conn.commit()
-    conn.close()
+    conn = _connect()
+    with conn:
+        conn.execute('''
+            UPDATE services 
+            SET last_test = CURRENT_TIMESTAMP, last_test_status = ?
+            WHERE service_type = ? AND name = ?
+        ''', (status, service_type, name))
+    _bump_version()
 
 def delete_service(service_type: str, name: str):
     """Delete a service configuration"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute('DELETE FROM services WHERE service_type = ? AND name = ?', 
-                   (service_type, name))
-    
-    conn.commit()
-    conn.close()
+    conn = _connect()
+    with conn:
+        conn.execute('DELETE FROM services WHERE service_type = ? AND name = ?', 
+                     (service_type, name))
+    _bump_version()
 
 def get_setting(key: str, default: Any = None) -> Any:
     """Get a setting value"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute('SELECT value FROM settings WHERE key = ?', (key,))
-    row = cursor.fetchone()
-    conn.close()
-    
-    if row:
+    def load():
+        row = _connect().execute('SELECT value FROM settings WHERE key = ?', (key,)).fetchone()
+        if not row:
+            return _NO_ROW
         # Try to parse as JSON for complex types
         try:
             return json.loads(row[0])
         except:
             return row[0]
-    return default
+
+    value = _cached(('setting', key), load)
+    return default if value is _NO_ROW else value
 
 def set_setting(key: str, value: Any, category: str = 'general', description: str = None):
     """Set a setting value"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
     # Convert to JSON if not a string
     if not isinstance(value, str):
         value = json.dumps(value)
     
-    cursor.execute('''
-        INSERT INTO settings (key, value, category, description, updated_at)
-        VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
-        ON CONFLICT(key)
-        DO UPDATE SET 
-            value = excluded.value,
-            category = excluded.category,
-            description = COALESCE(excluded.description, description),
-            updated_at = CURRENT_TIMESTAMP
-    ''', (key, value, category, description))
-    
-    conn.commit()
-    conn.close()
+    conn = _connect()
+    with conn:
+        conn.execute('''
+            INSERT INTO settings (key, value, category, description, updated_at)
+            VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(key)
+            DO UPDATE SET 
+                value = excluded.value,
+                category = excluded.category,
+                description = COALESCE(excluded.description, description),
+                updated_at = CURRENT_TIMESTAMP
+        ''', (key, value, category, description))
+    _bump_version()
 
 def is_service_disabled(service_type: str, name: str = 'default') -> bool:
     """True if a services row exists for this service and is explicitly disabled.
@@ -373,16 +443,8 @@ def is_service_disabled(service_type: str, name: str = 'default') -> bool:
     fall back to env vars below. This means the operator turned it off via
     the Setup page toggle, and env vars should NOT override that.
     """
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute(
-        'SELECT enabled FROM services WHERE service_type = ? AND name = ?',
-        (service_type, name)
-    )
-    row = cursor.fetchone()
-    conn.close()
-    return row is not None and not row[0]
-
+    row = get_service_row(service_type, name)
+    return row is not None and not row['enabled']
 
 # Configuration getters with env fallback
 def get_sonarr_config() -> Dict[str, str]:
@@ -589,8 +651,7 @@ def get_emby_config() -> Optional[Dict[str, Any]]:
 # Quick Links Functions
 def get_all_quick_links():
     """Get all quick links"""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    conn = _connect()
     cursor = conn.cursor()
 
     cursor.execute('''
@@ -613,46 +674,34 @@ def get_all_quick_links():
             'created_at': row['created_at']
         })
 
-    conn.close()
     return links
 
 def add_quick_link(name, url, icon='fas fa-link', open_in_iframe=False, alternate_url=None, custom=False):
     """Add a new quick link"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    conn = _connect()
+    with conn:
+        cursor = conn.execute('''
+            INSERT INTO quick_links (name, url, icon, open_in_iframe, alternate_url, custom)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', (name, url, icon, 1 if open_in_iframe else 0, alternate_url or None, 1 if custom else 0))
 
-    cursor.execute('''
-        INSERT INTO quick_links (name, url, icon, open_in_iframe, alternate_url, custom)
-        VALUES (?, ?, ?, ?, ?, ?)
-    ''', (name, url, icon, 1 if open_in_iframe else 0, alternate_url or None, 1 if custom else 0))
-
-    link_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
-
-    return link_id
+    return cursor.lastrowid
 
 def delete_quick_link(link_id):
     """Delete a quick link"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute('DELETE FROM quick_links WHERE id = ?', (link_id,))
-    
-    conn.commit()
-    conn.close()
+    conn = _connect()
+    with conn:
+        conn.execute('DELETE FROM quick_links WHERE id = ?', (link_id,))
     
     return True
 
 def get_quick_link_by_id(link_id):
     """Get a single quick link by ID"""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    conn = _connect()
     cursor = conn.cursor()
     
     cursor.execute('SELECT * FROM quick_links WHERE id = ?', (link_id,))
     row = cursor.fetchone()
-    conn.close()
     
     if row:
         return dict(row)
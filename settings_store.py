@@ -0,0 +1,193 @@
+"""
+Settings Store - the single owner of config/global_settings.json.
+
+media_processor.load_global_settings() used to open and parse the file on
+every call. Every scheduler replan, every automation_held gate on a
+webhook, every cleanup phase and every aired-not-downloaded check paid for
+it, and the first read after an upgrade wrote the migration back from
+whatever thread happened to be reading.
+
+The document now lives in memory. load_settings() hands out a copy after
+one stat of the file: an edit by another process (the cleanup subprocess,
+or a hand edit) changes its (mtime, size) signature and is reloaded and
+migrated once. save_settings() writes the file (.bak + tmp + os.replace)
+and updates the in-memory copy in one step.
+
+Either kind of change bumps get_version() and calls the add_listener()
+callbacks. The scheduler re-reads its intervals that way instead of
+checking the file.
+"""
+
+import json
+import logging
+import os
+import shutil
+import threading
+
+logger = logging.getLogger(__name__)
+
+SETTINGS_PATH = os.path.join(os.getcwd(), 'config', 'global_settings.json')
+
+DEFAULT_SETTINGS = {
+    'global_storage_min_gb': None,
+    'cleanup_interval_hours': 6,
+    'dry_run_mode': True,
+    'auto_assign_new_series': False,
+
+    'notifications_enabled': False,
+    'discord_webhook_url': '',
+    'episeerr_url': 'http://localhost:5002',
+
+    'automation_held': False,
+    'reconcile_enabled': False
+}
+
+_lock = threading.RLock()
+_doc = None
+_path = None
+_sig = None
+_version = 0
+_listeners = []
+
+
+def _clone(obj):
+    """Copy of a JSON-shaped value."""
+    if isinstance(obj, dict):
+        return {k: _clone(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_clone(v) for v in obj]
+    return obj
+
+
+def _stat_sig(path):
+    try:
+        st = os.stat(path)
+        return (st.st_mtime_ns, st.st_size)
+    except OSError:
+        return None
+
+
+def _migrate(settings):
+    """Bring an on-disk document up to date. Returns True if it changed."""
+    migrated = False
+    # MIGRATION: Add dry_run_mode if missing (default to True for safety)
+    if 'dry_run_mode' not in settings:
+        settings['dry_run_mode'] = True
+        logger.info("✓ Migrated global_settings.json - added dry_run_mode: true")
+        migrated = True
+
+    # MIGRATION: hold automation + missed watch-event reconciliation (default: off)
+    if 'automation_held' not in settings:
+        settings.setdefault('automation_held', False)
+        settings.setdefault('reconcile_enabled', False)
+        logger.info("✓ Migrated global_settings.json - added automation_held/reconcile settings")
+        migrated = True
+    return migrated
+
+
+def _write(settings):
+    """global_settings.json <- settings, with the usual .bak copy. Lock held."""
+    global _sig
+    os.makedirs(os.path.dirname(SETTINGS_PATH), exist_ok=True)
+
+    # Backup BEFORE saving (only when actually writing)
+    if os.path.exists(SETTINGS_PATH):
+        try:
+            shutil.copy2(SETTINGS_PATH, SETTINGS_PATH + '.bak')
+            logger.debug(f"Backed up global_settings.json to {SETTINGS_PATH}.bak")
+        except Exception as e:
+            logger.warning(f"Could not backup global_settings.json: {e}")
+
+    tmp_path = SETTINGS_PATH + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(settings, f, indent=4)
+    os.replace(tmp_path, SETTINGS_PATH)
+    _sig = _stat_sig(SETTINGS_PATH)
+
+
+def _refresh():
+    """Make _doc current with disk. Lock held. True if an already loaded
+    document changed (the first load is not a change)."""
+    global _doc, _path, _sig, _version
+    sig = _stat_sig(SETTINGS_PATH)
+    if _doc is not None and _path == SETTINGS_PATH and sig == _sig:
+        return False
+
+    first_load = _doc is None
+    _path = SETTINGS_PATH
+    if sig is None:
+        # Default settings (already has dry_run_mode: True - good!)
+        _doc = _clone(DEFAULT_SETTINGS)
+        try:
+            _write(_doc)
+        except Exception as e:
+            logger.error(f"Error saving global settings: {e}")
+    else:
+        try:
+            with open(SETTINGS_PATH, 'r') as f:
+                doc = json.load(f)
+            _sig = sig
+            if _migrate(doc):
+                _write(doc)
+            _doc = doc
+        except Exception as e:
+            # Keep the last good copy (or the defaults) until the file changes again
+            logger.error(f"Error loading global settings: {e}")
+            _sig = sig
+            if _doc is None:
+                _doc = _clone(DEFAULT_SETTINGS)
+    _version += 1
+    return not first_load
+
+
+def _notify():
+    for callback in list(_listeners):
+        try:
+            callback()
+        except Exception as e:
+            logger.error(f"Global settings listener failed: {e}")
+
+
+def load_settings():
+    """A private copy of the global settings."""
+    with _lock:
+        changed = _refresh()
+        settings = _clone(_doc)
+    if changed:
+        _notify()
+    return settings
+
+
+def save_settings(settings):
+    """Replace the global settings and write the file immediately."""
+    global _doc, _path, _version
+    with _lock:
+        try:
+            _write(settings)
+        except Exception as e:
+            logger.error(f"Error saving global settings: {e}")
+            return False
+        _doc = _clone(settings)
+        _path = SETTINGS_PATH
+        _version += 1
+    logger.info("Global settings saved successfully")
+    _notify()
+    return True
+
+
+def get_version():
+    """Monotonic change counter (also picks up edits from other processes)."""
+    with _lock:
+        changed = _refresh()
+        version = _version
+    if changed:
+        _notify()
+    return version
+
+
+def add_listener(callback):
+    """Call callback() after the settings change - a save in this process,
+    or another process's edit noticed on the next read. Runs on that
+    thread after the lock is released; keep it cheap."""
+    if callback not in _listeners:
+        _listeners.append(callback)
@@ -0,0 +1,306 @@
+"""
+Shared Sonarr read client.
+
+Every watch event used to download the whole /api/v3/series list just to
+match one title, and the cleanup cycle, the dashboard stats widget, the
+series pages and the library search each issued their own copy of the same
+request - on a large library that is a couple of megabytes per call. This
+module keeps one in-memory snapshot of the series list per Sonarr instance
+and hands it to every reader:
+
+- get_all_series() / get_series_lookup() serve the snapshot while it is
+  younger than max_age (default SERIES_TTL seconds) and refetch otherwise.
+  Each refetch bumps snapshot_version() so derived indexes know to rebuild.
+- get_series() / get_episodes() do the same for one series and for one
+  series' episode list.
+- Concurrent identical requests are coalesced: a caller that finds the same
+  request already in flight - started recently enough for its max_age -
+  waits for that response instead of sending its own.
+- invalidate() / invalidate_episodes() drop cached data; /sonarr-webhook
+  calls them on SeriesAdd / SeriesDelete and episode file events, and
+  remember_series() folds our own series PUTs back in.
+
+Cached objects are shared between callers - treat them as read-only, or ask
+for copy=True. Read-modify-write paths (tag updates and the like) should
+keep passing max_age=0 so they never PUT back a stale series.
+"""
+
+import copy as copy_module
+import logging
+import threading
+import time
+
+from episeerr_utils import http
+
+logger = logging.getLogger(__name__)
+
+SERIES_TTL = 60
+EPISODE_TTL = 60
+MAX_CACHED_EPISODE_LISTS = 500
+
+
+def _connection(url=None, api_key=None):
+    if url is None or api_key is None:
+        from settings_db import get_sonarr_config
+        config = get_sonarr_config()
+        url = url if url is not None else config.get('url')
+        api_key = api_key if api_key is not None else config.get('api_key')
+    return (url.strip().rstrip('/') if url else url), api_key
+
+
+class _Call:
+    def __init__(self):
+        self.started_at = time.time()
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SonarrCache:
+    """Snapshot + per-series caches for one process. One instance per module."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self._series = {}       # (url, key) -> (fetched_at, list, {id: series})
+        self._single = {}       # (url, key, id) -> (fetched_at, series)
+        self._episodes = {}     # (url, key, id) -> (fetched_at, list)
+        self._version = 0
+        self._generation = 0    # bumped by invalidation; stale fetches don't store
+        self.stats = {'hits': 0, 'fetches': 0, 'coalesced': 0}
+
+    def _coalesced(self, key, max_age, fetch):
+        """Run fetch() unless the same request is already in flight and was
+        started within max_age seconds, in which case share its result."""
+        with self._lock:
+            call = self._inflight.get(key)
+            if call is not None and time.time() - call.started_at <= max_age:
+                leader = False
+                self.stats['coalesced'] += 1
+            else:
+                call = _Call()
+                self._inflight[key] = call
+                leader = True
+                self.stats['fetches'] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fetch()
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                if self._inflight.get(key) is call:
+                    del self._inflight[key]
+            call.done.set()
+
+    def _get_json(self, url, api_key, path, timeout):
+        response = http.get(f"{url}{path}", headers={'X-Api-Key': api_key}, timeout=timeout)
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return response.json()
+
+    # --- series list ------------------------------------------------------
+
+    def series_snapshot(self, max_age=None, url=None, api_key=None):
+        """(list, {id: series}) for the whole library."""
+        url, api_key = _connection(url, api_key)
+        max_age = SERIES_TTL if max_age is None else max_age
+        conn = (url, api_key)
+        cached = self._series.get(conn)
+        if cached and time.time() - cached[0] <= max_age:
+            self.stats['hits'] += 1
+            return cached[1], cached[2]
+
+        def fetch():
+            fetched_at, generation = time.time(), self._generation
+            series_list = self._get_json(url, api_key, '/api/v3/series', timeout=30) or []
+            lookup = {s['id']: s for s in series_list}
+            with self._lock:
+                if generation == self._generation:
+                    self._series[conn] = (fetched_at, series_list, lookup)
+                    self._version += 1
+            logger.debug(f"Sonarr series snapshot refreshed: {len(series_list)} series")
+            return series_list, lookup
+
+        return self._coalesced(('series',) + conn, max_age, fetch)
+
+    def series(self, series_id, max_age=None, url=None, api_key=None):
+        url, api_key = _connection(url, api_key)
+        max_age = SERIES_TTL if max_age is None else max_age
+        series_id = int(series_id)
+        now = time.time()
+        cached = self._series.get((url, api_key))
+        if cached and now - cached[0] <= max_age and series_id in cached[2]:
+            self.stats['hits'] += 1
+            return cached[2][series_id]
+        single = self._single.get((url, api_key, series_id))
+        if single and now - single[0] <= max_age:
+            self.stats['hits'] += 1
+            return single[1]
+
+        def fetch():
+            fetched_at, generation = time.time(), self._generation
+            data = self._get_json(url, api_key, f"/api/v3/series/{series_id}", timeout=10)
+            with self._lock:
+                if generation != self._generation:
+                    pass
+                elif data is None:
+                    self._single.pop((url, api_key, series_id), None)
+                else:
+                    self._single[(url, api_key, series_id)] = (fetched_at, data)
+            return data
+
+        return self._coalesced(('one', url, api_key, series_id), max_age, fetch)
+
+    # --- episodes ---------------------------------------------------------
+
+    def episodes(self, series_id, max_age=None, url=None, api_key=None):
+        url, api_key = _connection(url, api_key)
+        max_age = EPISODE_TTL if max_age is None else max_age
+        key = (url, api_key, int(series_id))
+        cached = self._episodes.get(key)
+        if cached and time.time() - cached[0] <= max_age:
+            self.stats['hits'] += 1
+            return cached[1]
+
+        def fetch():
+            fetched_at, generation = time.time(), self._generation
+            data = self._get_json(url, api_key, f"/api/v3/episode?seriesId={int(series_id)}", timeout=30) or []
+            with self._lock:
+                if generation == self._generation:
+                    self._episodes[key] = (fetched_at, data)
+                    if len(self._episodes) > MAX_CACHED_EPISODE_LISTS:
+                        oldest = min(self._episodes, key=lambda k: self._episodes[k][0])
+                        del self._episodes[oldest]
+            return data
+
+        return self._coalesced(('episodes',) + key, max_age, fetch)
+
+    # --- invalidation -----------------------------------------------------
+
+    def _forget_inflight(self, kinds, series_id=None):
+        # New callers must not join a request that started before the change
+        for key in [k for k in self._inflight
+                    if k[0] in kinds and (series_id is None or k[0] == 'series' or k[-1] == series_id)]:
+            del self._inflight[key]
+
+    def invalidate(self, series_id=None):
+        """Drop the series snapshot; with series_id also that series' cached
+        record and episode list."""
+        with self._lock:
+            self._generation += 1
+            self._series.clear()
+            if series_id is None:
+                self._forget_inflight(('series',))
+            else:
+                series_id = int(series_id)
+                self._forget_inflight(('series', 'one', 'episodes'), series_id)
+                for key in [k for k in self._single if k[2] == int(series_id)]:
+                    del self._single[key]
+                for key in [k for k in self._episodes if k[2] == int(series_id)]:
+                    del self._episodes[key]
+
+    def remember(self, series, url=None, api_key=None):
+        """Fold a series we just PUT back into the cached copies so readers
+        don't see the pre-update version until the next refresh."""
+        url, api_key = _connection(url, api_key)
+        series_id = int(series['id'])
+        series = copy_module.deepcopy(series)
+        with self._lock:
+            if (url, api_key, series_id) in self._single:
+                self._single[(url, api_key, series_id)] = (time.time(), series)
+            cached = self._series.get((url, api_key))
+            if cached and series_id in cached[2]:
+                # Copy-on-write: readers may be iterating the old list
+                series_list = [series if s['id'] == series_id else s for s in cached[1]]
+                lookup = dict(cached[2])
+                lookup[series_id] = series
+                self._series[(url, api_key)] = (cached[0], series_list, lookup)
+                self._version += 1
+
+    def invalidate_episodes(self, series_id):
+        series_id = int(series_id)
+        with self._lock:
+            self._generation += 1
+            self._forget_inflight(('one', 'episodes'), series_id)
+            for key in [k for k in self._episodes if k[2] == int(series_id)]:
+                del self._episodes[key]
+            for key in [k for k in self._single if k[2] == int(series_id)]:
+                del self._single[key]
+
+    def version(self):
+        return self._version
+
+    def status(self):
+        now = time.time()
+        with self._lock:
+            snapshots = [
+                {'url': conn[0], 'series': len(entry[1]), 'age_seconds': round(now - entry[0], 1)}
+                for conn, entry in self._series.items()
+            ]
+            return {
+                'version': self._version,
+                'snapshots': snapshots,
+                'cached_series': len(self._single),
+                'cached_episode_lists': len(self._episodes),
+                'in_flight': len(self._inflight),
+                **self.stats,
+            }
+
+
+_cache = SonarrCache()
+
+
+def get_all_series(max_age=None, url=None, api_key=None, copy=False):
+    """Every Sonarr series. Raises on connection/HTTP errors like a direct
+    http.get(...).raise_for_status() would."""
+    series_list, _ = _cache.series_snapshot(max_age, url, api_key)
+    return copy_module.deepcopy(series_list) if copy else series_list
+
+
+def get_series_lookup(max_age=None, url=None, api_key=None, copy=False):
+    """{series_id: series} over the same snapshot as get_all_series()."""
+    _, lookup = _cache.series_snapshot(max_age, url, api_key)
+    return copy_module.deepcopy(lookup) if copy else lookup
+
+
+def get_series(series_id, max_age=None, url=None, api_key=None):
+    """One series, or None if Sonarr doesn't know it (404)."""
+    return _cache.series(series_id, max_age, url, api_key)
+
+
+def get_episodes(series_id, max_age=None, url=None, api_key=None, copy=False):
+    """Every episode of one series."""
+    episodes = _cache.episodes(series_id, max_age, url, api_key)
+    return copy_module.deepcopy(episodes) if copy else episodes
+
+
+def remember_series(series, url=None, api_key=None):
+    """Update the cache with a series dict that was just written to Sonarr."""
+    _cache.remember(series, url, api_key)
+
+
+def invalidate(series_id=None):
+    _cache.invalidate(series_id)
+
+
+def invalidate_episodes(series_id):
+    _cache.invalidate_episodes(series_id)
+
+
+def snapshot_version():
+    """Bumped every time a new series snapshot is fetched."""
+    return _cache.version()
+
+
+def get_status():
+    return _cache.status()
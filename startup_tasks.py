@@ -0,0 +1,244 @@
+"""
+Background startup pipeline.
+
+initialize_episeerr() used to do all of its Sonarr/Radarr housekeeping at
+import time - cancelling unmonitored downloads, creating rule tags, the
+one-time tag migration, drift reconciliation for every series, the delay
+profile and the Radarr movie tags - so gunicorn could not answer a single
+request (including the container healthcheck) until all of it was done.
+
+Now only the local, fast work stays on the import path. Everything that
+talks to Sonarr or Radarr is registered here as a named step with the steps
+it depends on, and start() works through them on a "startup-tasks" thread:
+steps whose dependencies are done run concurrently on a small pool, a step
+whose dependency failed is skipped, and each step records its status,
+timing and a short result. get_status() serves that table on
+/api/startup-status.
+
+Every step must be safe to repeat - a gunicorn worker restart simply runs
+the pipeline again. An flock on data/startup_tasks.lock keeps two processes
+from running it at the same time (the second one reports "skipped"), and the
+last finished run is persisted to data/startup_state.json so a freshly
+started worker can still show what its predecessor did.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+try:
+    import fcntl
+except ImportError:  # Windows dev checkout - no cross-process guard
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+STATE_FILE = os.path.join(os.getcwd(), 'data', 'startup_state.json')
+LOCK_FILE = os.path.join(os.getcwd(), 'data', 'startup_tasks.lock')
+
+MAX_WORKERS = 4
+
+
+class Step:
+    """One startup step. func(ctx) returns a short, JSON-able result."""
+
+    def __init__(self, name, func, after=()):
+        self.name = name
+        self.func = func
+        self.after = tuple(after)
+        self.status = 'pending'
+        self.result = None
+        self.error = None
+        self.started_at = None
+        self.finished_at = None
+
+    def to_dict(self):
+        duration = None
+        if self.started_at:
+            duration = round((self.finished_at or time.time()) - self.started_at, 2)
+        return {
+            'name': self.name,
+            'after': list(self.after),
+            'status': self.status,
+            'result': self.result,
+            'error': self.error,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'duration_seconds': duration,
+        }
+
+
+class StartupRun:
+    """status: running -> done | failed (some step failed) | skipped."""
+
+    def __init__(self, steps):
+        self.run_id = uuid.uuid4().hex[:12]
+        self.pid = os.getpid()
+        self.steps = steps
+        self.status = 'running'
+        self.reason = None
+        self.started_at = time.time()
+        self.finished_at = None
+        self.done_event = threading.Event()
+
+    def to_dict(self):
+        end = self.finished_at or time.time()
+        return {
+            'run_id': self.run_id,
+            'pid': self.pid,
+            'status': self.status,
+            'reason': self.reason,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'elapsed_seconds': round(end - self.started_at, 2),
+            'steps': [step.to_dict() for step in self.steps],
+        }
+
+
+_current = None
+_lock = threading.Lock()
+
+
+def _load_previous():
+    try:
+        if os.path.exists(STATE_FILE):
+            with open(STATE_FILE, 'r') as f:
+                return json.load(f)
+    except Exception as e:
+        logger.error(f"Error loading startup state: {e}")
+    return None
+
+
+def _save(run):
+    try:
+        os.makedirs(os.path.dirname(STATE_FILE), exist_ok=True)
+        tmp_path = STATE_FILE + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(run.to_dict(), f, default=str)
+        os.replace(tmp_path, STATE_FILE)
+    except Exception as e:
+        logger.error(f"Error saving startup state: {e}")
+
+
+def _acquire_process_lock():
+    """Non-blocking flock; returns the open handle, or None if another
+    process is already running the pipeline."""
+    if fcntl is None:
+        return open(os.devnull, 'a')
+    os.makedirs(os.path.dirname(LOCK_FILE), exist_ok=True)
+    fh = open(LOCK_FILE, 'a')
+    try:
+        fcntl.flock(fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return fh
+    except OSError:
+        fh.close()
+        return None
+
+
+def _run_step(step, ctx):
+    step.status = 'running'
+    step.started_at = time.time()
+    try:
+        step.result = step.func(ctx)
+        step.status = 'done'
+    except Exception as e:
+        step.status = 'failed'
+        step.error = str(e)
+        logger.error(f"Startup step '{step.name}' failed: {e}", exc_info=True)
+    finally:
+        step.finished_at = time.time()
+    logger.info(f"Startup step '{step.name}': {step.status} in {step.finished_at - step.started_at:.2f}s")
+
+
+def _execute(run):
+    """Run every step once its dependencies are done, MAX_WORKERS at a time."""
+    steps = {step.name: step for step in run.steps}
+    ctx = {}
+    running = {}
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix='startup-step') as pool:
+        while True:
+            changed = True
+            while changed:   # repeat so skips cascade down the dependency chain
+                changed = False
+                for step in run.steps:
+                    if step.status != 'pending':
+                        continue
+                    deps = [steps[name] for name in step.after if name in steps]
+                    if any(dep.status in ('failed', 'skipped') for dep in deps):
+                        step.status = 'skipped'
+                        step.error = 'dependency failed: ' + ', '.join(
+                            dep.name for dep in deps if dep.status in ('failed', 'skipped'))
+                        changed = True
+                    elif all(dep.status == 'done' for dep in deps):
+                        step.status = 'queued'
+                        running[pool.submit(_run_step, step, ctx)] = step
+            if not running:
+                break
+            finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in finished:
+                running.pop(future)
+
+    # Anything still pending is part of a dependency cycle
+    for step in run.steps:
+        if step.status == 'pending':
+            step.status = 'skipped'
+            step.error = 'dependency cycle'
+
+
+def _run(run):
+    lock_handle = _acquire_process_lock()
+    try:
+        if lock_handle is None:
+            run.status = 'skipped'
+            run.reason = 'startup tasks already running in another process'
+            for step in run.steps:
+                step.status = 'skipped'
+        else:
+            _execute(run)
+            run.status = 'failed' if any(s.status == 'failed' for s in run.steps) else 'done'
+    except Exception as e:
+        run.status = 'failed'
+        run.reason = str(e)
+        logger.error(f"Startup pipeline failed: {e}", exc_info=True)
+    finally:
+        run.finished_at = time.time()
+        if lock_handle is not None:
+            _save(run)
+            lock_handle.close()
+        run.done_event.set()
+
+    logger.info(f"Startup tasks {run.run_id}: {run.status} in {run.finished_at - run.started_at:.2f}s")
+
+
+def start(steps):
+    """Run steps on the startup-tasks thread unless a run is in progress.
+
+    Returns (run, started) - started is False when the returned run was
+    already in progress.
+    """
+    global _current
+    with _lock:
+        if _current is not None and _current.finished_at is None:
+            return _current, False
+        run = StartupRun(list(steps))
+        _current = run
+    threading.Thread(target=_run, args=(run,), name='startup-tasks', daemon=True).start()
+    logger.info(f"Started startup tasks {run.run_id}: {', '.join(s.name for s in run.steps)}")
+    return run, True
+
+
+def get_status():
+    with _lock:
+        current = _current.to_dict() if _current else None
+    previous = _load_previous()
+    if current and previous and previous.get('run_id') == current['run_id']:
+        previous = None
+    return {
+        'ready': bool(current) and current['status'] != 'running',
+        'current': current,
+        'previous': previous,
+    }
@@ -0,0 +1,195 @@
+"""
+Batched Sonarr rule-tag reconciliation.
+
+episeerr_utils.sync_rule_tag_to_sonarr() and remove_all_episeerr_tags() fix
+one series at a time - a GET /series/{id} plus a PUT of the whole series
+object. Bulk callers (sync_all_series_tags, startup and cleanup drift
+reconciliation, rule deletion, multi-series assign/unassign) looped over
+them, so retagging 800 series meant 1,600 round trips.
+
+Here the desired tag set of every affected series is computed up front
+from one series snapshot, diffed against its current tags, and the
+differences are grouped by (tags to add, tags to remove). Each group becomes
+one or two PUT /api/v3/series/editor calls (applyTags remove, then add)
+covering every series in it. plan_*() only computes - TagSyncPlan.to_dict()
+is the dry-run report - and apply_plan() returns the diff that was applied.
+
+Desired tags follow the single-series functions exactly: assigning a rule
+drops every episeerr_* tag except episeerr_select and adds episeerr_<rule>;
+unassigning (rule None) drops every episeerr_* tag.
+"""
+
+import logging
+from collections import defaultdict
+
+import episeerr_utils
+import sonarr_client
+from episeerr_utils import http
+
+logger = logging.getLogger(__name__)
+
+EDITOR_BATCH_SIZE = 250
+
+
+class TagChange:
+    def __init__(self, series_id, title, add, remove):
+        self.series_id = series_id
+        self.title = title
+        self.add = frozenset(add)
+        self.remove = frozenset(remove)
+
+
+class TagSyncPlan:
+    """Per-series tag diffs, plus the series a plan couldn't find in Sonarr."""
+
+    def __init__(self, changes, tag_mapping, not_found=(), in_sync=0, skipped=()):
+        self.changes = changes
+        self.tag_mapping = tag_mapping
+        self.not_found = list(not_found)
+        self.in_sync = in_sync
+        self.skipped = list(skipped)   # rule tag couldn't be resolved/created
+
+    def groups(self):
+        """{(add, remove): [series_id, ...]} in a stable order."""
+        grouped = defaultdict(list)
+        for change in self.changes:
+            grouped[(change.add, change.remove)].append(change.series_id)
+        return dict(sorted(grouped.items(), key=lambda kv: (sorted(kv[0][0]), sorted(kv[0][1]))))
+
+    def _labels(self, tag_ids):
+        return sorted(self.tag_mapping.get(tag_id, str(tag_id)) for tag_id in tag_ids)
+
+    def to_dict(self):
+        return {
+            'series_changed': len(self.changes),
+            'series_in_sync': self.in_sync,
+            'not_found': self.not_found,
+            'skipped': self.skipped,
+            'batches': [
+                {'add': self._labels(add), 'remove': self._labels(remove), 'series_count': len(ids)}
+                for (add, remove), ids in self.groups().items()
+            ],
+            'changes': [
+                {
+                    'series_id': change.series_id,
+                    'title': change.title,
+                    'add': self._labels(change.add),
+                    'remove': self._labels(change.remove),
+                }
+                for change in self.changes
+            ],
+        }
+
+
+def plan_changes(series_ids, desired_for, series_lookup, tag_mapping):
+    """Diff desired_for(series) against each series' current tags."""
+    changes, not_found, in_sync = [], [], 0
+    for series_id in series_ids:
+        series = series_lookup.get(int(series_id))
+        if not series:
+            not_found.append(int(series_id))
+            continue
+        current = set(series.get('tags') or [])
+        desired = desired_for(series, current)
+        add, remove = desired - current, current - desired
+        if add or remove:
+            changes.append(TagChange(series['id'], series.get('title', ''), add, remove))
+        else:
+            in_sync += 1
+    return TagSyncPlan(changes, tag_mapping, not_found, in_sync)
+
+
+def _fresh_lookup(series_lookup):
+    # Diffs need current tags - callers without a same-cycle snapshot get a fresh one
+    if series_lookup is not None:
+        return series_lookup
+    return sonarr_client.get_series_lookup(max_age=0, url=episeerr_utils.SONARR_URL,
+                                           api_key=episeerr_utils.SONARR_API_KEY)
+
+
+def plan_rule_assignments(assignments, series_lookup=None):
+    """Plan {series_id: rule_name or None} - None strips every episeerr_* tag."""
+    series_lookup = _fresh_lookup(series_lookup)
+    assignments = {int(sid): rule for sid, rule in assignments.items()}
+
+    rule_tag_ids = {}
+    for rule_name in {r for r in assignments.values() if r}:
+        tag_id = episeerr_utils.get_or_create_rule_tag_id(rule_name)
+        if not tag_id:
+            logger.error(f"Failed to get/create tag for rule '{rule_name}' - its series are skipped")
+        rule_tag_ids[rule_name] = tag_id
+    tag_mapping = episeerr_utils.get_tag_mapping()
+    rule_tags = {tag_id for tag_id, label in tag_mapping.items() if label.lower().startswith('episeerr_')}
+    select_tags = {tag_id for tag_id, label in tag_mapping.items() if label.lower() == 'episeerr_select'}
+
+    def desired_for(series, current):
+        rule_name = assignments[series['id']]
+        if rule_name is None:
+            return current - rule_tags
+        return (current - (rule_tags - select_tags)) | {rule_tag_ids[rule_name]}
+
+    series_ids = [sid for sid, rule in assignments.items() if rule is None or rule_tag_ids.get(rule)]
+    plan = plan_changes(series_ids, desired_for, series_lookup, tag_mapping)
+    plan.skipped = [sid for sid, rule in assignments.items() if rule is not None and not rule_tag_ids.get(rule)]
+    return plan
+
+
+def plan_tag_removal(tag_id, series_lookup=None):
+    """Plan removing one tag from every series that carries it."""
+    series_lookup = _fresh_lookup(series_lookup)
+    tagged = [sid for sid, series in series_lookup.items() if tag_id in (series.get('tags') or [])]
+    return plan_changes(tagged, lambda series, current: current - {tag_id},
+                        series_lookup, episeerr_utils.get_tag_mapping())
+
+
+def _editor(series_ids, tag_ids, apply_tags):
+    response = http.put(
+        f"{episeerr_utils.SONARR_URL}/api/v3/series/editor",
+        headers=episeerr_utils.get_sonarr_headers(),
+        json={'seriesIds': list(series_ids), 'tags': sorted(tag_ids), 'applyTags': apply_tags},
+        timeout=60,
+    )
+    if not response.ok:
+        logger.error(f"Sonarr series editor ({apply_tags} {sorted(tag_ids)}) failed for "
+                     f"{len(series_ids)} series: {response.status_code} {response.text[:200]}")
+    return response.ok
+
+
+def apply_plan(plan):
+    """Apply a plan through the series editor. Per batch, removals go first
+    and the add is skipped if they failed, so a series never ends up with
+    two rule tags. Returns the applied diff."""
+    applied, failed = [], []
+    for (add, remove), series_ids in plan.groups().items():
+        for start in range(0, len(series_ids), EDITOR_BATCH_SIZE):
+            chunk = series_ids[start:start + EDITOR_BATCH_SIZE]
+            ok = True
+            try:
+                if remove:
+                    ok = _editor(chunk, remove, 'remove')
+                if ok and add:
+                    ok = _editor(chunk, add, 'add')
+            except Exception as e:
+                logger.error(f"Sonarr series editor error for {len(chunk)} series: {e}")
+                ok = False
+            (applied if ok else failed).extend(chunk)
+
+    if plan.changes:
+        sonarr_client.invalidate()
+        logger.info(f"Tag sync: {len(applied)} series updated, {len(failed)} failed, "
+                    f"{plan.in_sync} already in sync, {len(plan.not_found)} not in Sonarr")
+
+    report = plan.to_dict()
+    applied_ids = set(applied)
+    report['changes'] = [c for c in report['changes'] if c['series_id'] in applied_ids]
+    report['series_updated'] = len(applied)
+    report['failed'] = failed
+    return report
+
+
+def sync_rule_tags(assignments, series_lookup=None, dry_run=False):
+    """Plan and (unless dry_run) apply {series_id: rule_name or None}."""
+    if not assignments:
+        return TagSyncPlan([], {}).to_dict()
+    plan = plan_rule_assignments(assignments, series_lookup)
+    return plan.to_dict() if dry_run else apply_plan(plan)
@@ -22,7 +22,17 @@ def _stub_module(name, **attrs):
 
 
 def _load_media_processor():
-    """Import media_processor with its external deps stubbed out."""
+    """Import media_processor with its external deps stubbed out.
+
+    The stubs (and this copy of media_processor) only live in sys.modules
+    for the import, so test modules collected alongside this one still get
+    the real modules.
+    """
+    with mock.patch.dict(sys.modules):
+        return _import_media_processor()
+
+
+def _import_media_processor():
     _stub_module('dotenv', load_dotenv=lambda *a, **k: None)
     _stub_module('requests',
                  get=mock.MagicMock(), put=mock.MagicMock(),
@@ -0,0 +1,184 @@
+"""
+Tests for activity_resolver.py - the per-cleanup-cycle replacement for
+calling get_activity_date_with_hierarchy() once per series. Config answers
+first; Tautulli and Sonarr history are each fetched once, paged, and every
+later series is answered from memory.
+
+media_processor.py is not imported - the resolver only reaches it lazily for
+settings and the per-series Sonarr fallback, so tests install a fake
+'media_processor' module in sys.modules.
+
+Self-contained stdlib unittest, run with:
+    python3 -m unittest tests.test_activity_resolver -v
+"""
+
+import json
+import os
+import sys
+import tempfile
+import types
+import unittest
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_IMPORT_TMPDIR = tempfile.mkdtemp(prefix='episeerr_activity_import_')
+os.environ.setdefault('LOG_DIR', _IMPORT_TMPDIR)
+os.environ.setdefault('SETTINGS_DB_PATH', os.path.join(_IMPORT_TMPDIR, 'settings.db'))
+
+import activity_resolver
+import config_store
+
+CONFIG = {
+    'default_rule': 'default',
+    'rules': {'default': {'series': {
+        '1': {'activity_date': 500, 'last_season': 2, 'last_episode': 3},
+        '2': {'activity_date': 400},
+        '3': {},
+        '4': {},
+    }}},
+}
+
+SERIES_LOOKUP = {
+    1: {'id': 1, 'title': 'Configured'},
+    2: {'id': 2, 'title': 'Doctor Who (2005)'},
+    3: {'id': 3, 'title': 'Severance'},
+    4: {'id': 4, 'title': 'Unwatched Show'},
+}
+
+
+def _response(payload):
+    response = MagicMock()
+    response.ok = True
+    response.json.return_value = payload
+    return response
+
+
+def _tautulli_page(rows, total):
+    return _response({'response': {'result': 'success', 'data': {'data': rows, 'recordsFiltered': total}}})
+
+
+def _fake_media_processor(latest_file=None):
+    module = types.ModuleType('media_processor')
+    module.SONARR_URL = 'http://sonarr'
+    module.SONARR_API_KEY = 'x'
+    module.get_tautulli_settings = lambda: ('http://tautulli', 'key')
+    module.parse_date_fixed = lambda value, context: int(value) if value else None
+    module.get_sonarr_latest_file_date = MagicMock(return_value=latest_file)
+    return module
+
+
+class ActivityDateResolverTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp(prefix='episeerr_activity_')
+        path = os.path.join(self.tmpdir, 'config.json')
+        with open(path, 'w') as fh:
+            json.dump(CONFIG, fh)
+        self.patches = [
+            patch.object(config_store, 'CONFIG_PATH', path),
+            patch.object(config_store, 'JOURNAL_PATH', path + '.journal'),
+            patch.object(config_store, 'LOCK_PATH', path + '.lock'),
+            patch.object(activity_resolver, 'TAUTULLI_HISTORY_PAGE_SIZE', 2),
+        ]
+        for p in self.patches:
+            p.start()
+        config_store._doc = None
+        config_store._snapshot_sig = None
+
+    def tearDown(self):
+        for p in self.patches:
+            p.stop()
+        config_store._doc = None
+        config_store._snapshot_sig = None
+
+    def _run(self, mp, responses, calls):
+        def fake_get(url, **kwargs):
+            calls.append((url, kwargs.get('params', {})))
+            return responses.pop(0)
+
+        resolver = activity_resolver.ActivityDateResolver(SERIES_LOOKUP)
+        with patch.dict(sys.modules, {'media_processor': mp}), \
+             patch.object(activity_resolver.http, 'get', side_effect=fake_get):
+            results = {
+                'complete': {sid: resolver.resolve(sid, s['title'], return_complete=True)
+                             for sid, s in SERIES_LOOKUP.items()},
+                'date': {sid: resolver.resolve(sid, s['title']) for sid, s in SERIES_LOOKUP.items()},
+            }
+        return resolver, results
+
+    def test_history_is_fetched_once_and_answers_every_series(self):
+        responses = [
+            _tautulli_page([
+                {'date': 900, 'grandparent_rating_key': 77, 'grandparent_title': 'Severance',
+                 'parent_media_index': 2, 'media_index': 8},
+                {'date': 800, 'grandparent_rating_key': 55, 'grandparent_title': 'Doctor Who',
+                 'parent_media_index': 13, 'media_index': 4},
+            ], total=4),
+            _tautulli_page([
+                {'date': 700, 'grandparent_rating_key': 77, 'grandparent_title': 'Severance',
+                 'parent_media_index': 2, 'media_index': 7},
+                {'date': 600, 'grandparent_rating_key': 66, 'grandparent_title': 'Other',
+                 'parent_media_index': 1, 'media_index': 1},
+            ], total=4),
+            _response({'records': [
+                {'seriesId': 4, 'date': '350', 'episode': {'seasonNumber': 1, 'episodeNumber': 7, 'hasFile': False}},
+                {'seriesId': 4, 'date': '300', 'episode': {'seasonNumber': 1, 'episodeNumber': 6, 'hasFile': True}},
+                {'seriesId': 4, 'date': '200', 'episode': {'seasonNumber': 1, 'episodeNumber': 5, 'hasFile': True}},
+            ], 'totalRecords': 3}),
+        ]
+        calls = []
+        mp = _fake_media_processor()
+        resolver, results = self._run(mp, responses, calls)
+
+        self.assertEqual(results['complete'], {
+            1: (500, 2, 3),          # config wins
+            2: (800, 13, 4),         # year-stripped title match
+            3: (900, 2, 8),          # newest row per grandparent_rating_key
+            4: (300, 1, 6),          # newest Sonarr import whose file is still on disk
+        })
+        self.assertEqual(results['date'], {1: 500, 2: 400, 3: 900, 4: 300})
+        self.assertEqual([c[1].get('start') for c in calls if 'tautulli' in c[0]], [0, 2])
+        self.assertEqual(len([c for c in calls if 'sonarr' in c[0]]), 1)
+        mp.get_sonarr_latest_file_date.assert_not_called()
+        self.assertEqual(resolver.stats['none'], 0)
+
+    def test_paging_stops_once_every_missing_series_is_seen(self):
+        with open(config_store.CONFIG_PATH, 'w') as fh:
+            json.dump({'rules': {'default': {'series': {'3': {}}}}}, fh)
+        config_store._doc = None
+        config_store._snapshot_sig = None
+
+        responses = [_tautulli_page([
+            {'date': 900, 'grandparent_rating_key': 77, 'grandparent_title': 'Severance',
+             'parent_media_index': 2, 'media_index': 8},
+            {'date': 800, 'grandparent_rating_key': 66, 'grandparent_title': 'Other'},
+        ], total=1000)]
+        calls = []
+        resolver = activity_resolver.ActivityDateResolver(SERIES_LOOKUP)
+        with patch.dict(sys.modules, {'media_processor': _fake_media_processor()}), \
+             patch.object(activity_resolver.http, 'get',
+                          side_effect=lambda url, **kw: calls.append(url) or responses.pop(0)):
+            self.assertEqual(resolver.resolve(3, 'Severance', return_complete=True), (900, 2, 8))
+        self.assertEqual(len(calls), 1)
+
+    def test_series_missing_from_import_history_falls_back_per_series(self):
+        responses = [
+            _tautulli_page([], total=0),
+            _response({'records': [], 'totalRecords': 0}),
+        ]
+        mp = _fake_media_processor(latest_file=(250, 3, 1, 99))
+        resolver, results = self._run(mp, responses, [])
+        self.assertEqual(results['complete'][4], (250, 3, 1))
+        self.assertEqual(results['date'][4], 250)
+        # 2, 3 and 4 all miss history; each is looked up once and then cached
+        self.assertEqual(mp.get_sonarr_latest_file_date.call_count, 3)
+
+    def test_normalize_show_title(self):
+        self.assertEqual(activity_resolver.normalize_show_title('Doctor Who (2005)'), 'doctor who')
+        self.assertEqual(activity_resolver.normalize_show_title("Marvel's Agents: S.H.I.E.L.D."),
+                         'marvel s agents s h i e l d')
+        self.assertEqual(activity_resolver.normalize_show_title(None), '')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+"""
+Tests for activity_storage.py - the append-only watch/search logs and their
+in-memory ring and latest-event indexes.
+
+The log files point into a temp directory and the Sonarr backdrop lookup is
+patched out.
+
+Self-contained stdlib unittest, run with:
+    python3 -m unittest tests.test_activity_storage -v
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_IMPORT_TMPDIR = tempfile.mkdtemp(prefix='episeerr_activity_import_')
+os.environ.setdefault('LOG_DIR', _IMPORT_TMPDIR)
+os.environ.setdefault('SETTINGS_DB_PATH', os.path.join(_IMPORT_TMPDIR, 'settings.db'))
+
+import activity_storage
+
+
+class ActivityStorageTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp(prefix='episeerr_activity_')
+        self.addCleanup(shutil.rmtree, self.tmpdir, ignore_errors=True)
+        self.watches_file = os.path.join(self.tmpdir, 'watched.jsonl')
+        self.legacy_file = os.path.join(self.tmpdir, 'watched.json')
+        patches = [
+            patch.object(activity_storage, 'WATCHES_FILE', self.watches_file),
+            patch.object(activity_storage, 'LEGACY_WATCHES_FILE', self.legacy_file),
+            patch.object(activity_storage, 'SEARCHES_FILE', os.path.join(self.tmpdir, 'searches.jsonl')),
+            patch.object(activity_storage, 'LEGACY_SEARCHES_FILE', os.path.join(self.tmpdir, 'searches.json')),
+            patch.object(activity_storage, 'watches', activity_storage.ActivityLog('WATCHES_FILE', 'LEGACY_WATCHES_FILE')),
+            patch.object(activity_storage, 'searches', activity_storage.ActivityLog('SEARCHES_FILE', 'LEGACY_SEARCHES_FILE')),
+            patch.object(activity_storage, 'get_series_backdrop', return_value=None),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def _lines(self):
+        with open(self.watches_file) as f:
+            return [json.loads(line) for line in f]
+
+    def test_events_are_appended_and_indexed(self):
+        activity_storage.save_watch_event(1, 'Severance', 1, 1, 'alice')
+        activity_storage.save_watch_event(2, 'Andor', 2, 3, 'bob')
+        activity_storage.save_watch_event(1, 'Severance', 1, 2, 'bob')
+
+        self.assertEqual([e['episode'] for e in self._lines()], [1, 3, 2])
+        self.assertEqual(activity_storage.get_last_watch()['user'], 'bob')
+        self.assertEqual([e['series_id'] for e in activity_storage.get_recent_watches(2)], [1, 2])
+        self.assertEqual(activity_storage.get_latest_watches_by_title()['severance']['episode'], 2)
+        by_user = activity_storage.get_latest_watches_by_series_user()
+        self.assertEqual(by_user[(1, 'alice')]['episode'], 1)
+        self.assertIsNone(activity_storage.get_last_search())
+
+        # Callers get copies - mutating them leaves the ring and indexes alone
+        activity_storage.get_recent_watches()[0]['episode'] = 99
+        activity_storage.get_last_watch()['user'] = 'mallory'
+        activity_storage.get_latest_watches_by_title()['severance']['episode'] = 99
+        self.assertEqual(activity_storage.get_recent_watches(1)[0]['episode'], 2)
+        self.assertEqual(activity_storage.get_last_watch()['user'], 'bob')
+        self.assertEqual(activity_storage.get_latest_watches_by_title()['severance']['episode'], 2)
+
+    def test_legacy_array_is_migrated_and_expired_events_dropped(self):
+        now = int(time.time())
+        old = now - (activity_storage.RETENTION_DAYS + 1) * 86400
+        with open(self.legacy_file, 'w') as f:
+            json.dump([{'series_id': 5, 'series_title': 'Old', 'season': 1, 'episode': 1, 'timestamp': old},
+                       {'series_id': 6, 'series_title': 'New', 'season': 1, 'episode': 1, 'timestamp': now}], f)
+
+        self.assertEqual(activity_storage.get_last_watch()['series_id'], 6)
+        self.assertEqual(len(activity_storage.get_recent_watches()), 1)
+        self.assertTrue(os.path.exists(self.legacy_file + '.migrated'))
+
+        # Compaction rewrites the log without the expired line
+        with patch.object(activity_storage, 'COMPACT_EVERY', 1):
+            activity_storage.save_watch_event(7, 'Newer', 1, 1, 'alice')
+        self.assertEqual([e['series_id'] for e in self._lines()], [6, 7])
+
+    def test_external_change_is_reloaded(self):
+        activity_storage.save_watch_event(1, 'Severance', 1, 1, 'alice')
+        with open(self.watches_file, 'a') as f:
+            f.write(json.dumps({'series_id': 9, 'series_title': 'Shogun', 'season': 1,
+                                'episode': 4, 'timestamp': int(time.time()) + 5}) + '\n')
+        self.assertEqual(activity_storage.get_last_watch()['series_id'], 9)
+
+
+if __name__ == '__main__':
+    unittest.main()
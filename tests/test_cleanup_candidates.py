@@ -0,0 +1,131 @@
+"""
+Tests for the cleanup phase runner in media_processor
+(_map_in_order / _run_cleanup_candidates): input-order results, early-stop
+cancellation and the storage gate.
+
+plan/apply are plain callables and get_sonarr_disk_space is patched - no
+Sonarr needed.
+
+Self-contained stdlib unittest, run with:
+    python3 -m unittest tests.test_cleanup_candidates -v
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_IMPORT_TMPDIR = tempfile.mkdtemp(prefix='episeerr_cleanup_candidates_import_')
+os.environ.setdefault('LOG_DIR', _IMPORT_TMPDIR)
+os.environ.setdefault('SETTINGS_DB_PATH', os.path.join(_IMPORT_TMPDIR, 'settings.db'))
+for _name in ('LOG_PATH', 'MISSING_LOG_PATH', 'CLEANUP_LOG_PATH'):
+    os.environ.setdefault(_name, os.path.join(_IMPORT_TMPDIR, f'{_name.lower()}.log'))
+
+import media_processor
+
+
+class _Pass:
+    def __init__(self):
+        self.deferred = []
+
+    def defer(self, series_id):
+        self.deferred.append(series_id)
+
+
+def _candidate(series_id, dry_run=False):
+    return {'series_id': series_id, 'is_dry_run': dry_run}
+
+
+def _disk(free_gb):
+    return {'free_space_gb': free_gb, 'total_space_gb': 1000}
+
+
+class CleanupCandidatesTestCase(unittest.TestCase):
+    def setUp(self):
+        patcher = patch.object(media_processor, '_cleanup_workers', return_value=3)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_results_come_back_in_input_order(self):
+        def slow_first(n):
+            time.sleep(0.05 if n == 0 else 0.0)
+            return n * 10
+
+        self.assertEqual(list(media_processor._map_in_order(slow_first, range(8), 3)),
+                         [(n, n * 10) for n in range(8)])
+
+        applied = []
+        total = media_processor._run_cleanup_candidates(
+            [_candidate(n) for n in range(6)],
+            plan_fn=lambda c: {'episodes': [c['series_id']]} if c['series_id'] % 2 else None,
+            apply_fn=lambda c, plan: applied.append(c['series_id']) or 1,
+            storage_min_gb=None, phase_name='test')
+        self.assertEqual(total, 3)
+        self.assertEqual(sorted(applied), [1, 3, 5])
+
+    def test_early_stop_cancels_queued_work(self):
+        started = []
+        gate = threading.Event()
+
+        def fetch(n):
+            started.append(n)
+            gate.wait(2)
+            return n
+
+        results = media_processor._map_in_order(fetch, range(100), 1)
+        gate.set()
+        self.assertEqual(next(results), (0, 0))
+        results.close()     # storage target reached: the consumer stops here
+        # Only the small look-ahead window was ever submitted
+        self.assertLessEqual(max(started), 2)
+
+        # A cancelled cleanup job defers everything it didn't reach
+        cleanup_pass = _Pass()
+        applied = []
+        with patch.object(media_processor.cleanup_job, 'cancel_requested', side_effect=lambda: len(applied) >= 2), \
+             patch.object(media_processor, 'get_sonarr_disk_space', return_value=_disk(1)):
+            media_processor._run_cleanup_candidates(
+                [_candidate(n) for n in range(5)],
+                plan_fn=lambda c: {'episodes': [c['series_id']]},
+                apply_fn=lambda c, plan: applied.append(c['series_id']) or 1,
+                storage_min_gb=50, phase_name='test', cleanup_pass=cleanup_pass)
+        self.assertEqual(applied, [0, 1])
+        self.assertEqual(cleanup_pass.deferred, [2, 3, 4])
+
+    def test_storage_gate_covers_config_only_applies(self):
+        # Below target: one check covers the config-only plan and the first
+        # deletion; the deletion forces a re-check, which finds the target met
+        disk = [_disk(10), _disk(60)]
+        applied = []
+        cleanup_pass = _Pass()
+        plans = {1: {'episodes': []}, 2: {'episodes': [21, 22]}, 3: {'episodes': []}, 4: {'episodes': [41]}}
+        with patch.object(media_processor, 'get_sonarr_disk_space', side_effect=lambda: disk.pop(0)):
+            total = media_processor._run_cleanup_candidates(
+                [_candidate(n) for n in plans],
+                plan_fn=lambda c: plans[c['series_id']],
+                apply_fn=lambda c, plan: applied.append(c['series_id']) or len(plan['episodes']),
+                storage_min_gb=50, phase_name='test', cleanup_pass=cleanup_pass)
+        self.assertEqual(total, 2)
+        self.assertEqual(applied, [1, 2])
+        self.assertEqual(cleanup_pass.deferred, [3, 4])
+        self.assertEqual(disk, [])
+
+        # Target already met: a plan with nothing to delete (the grace
+        # bookmark case) is not applied - so nothing gets marked grace_cleaned
+        applied.clear()
+        with patch.object(media_processor, 'get_sonarr_disk_space', return_value=_disk(60)):
+            media_processor._run_cleanup_candidates(
+                [_candidate(3)],
+                plan_fn=lambda c: plans[c['series_id']],
+                apply_fn=lambda c, plan: applied.append(c['series_id']) or 0,
+                storage_min_gb=50, phase_name='test')
+        self.assertEqual(applied, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
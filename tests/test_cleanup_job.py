@@ -0,0 +1,115 @@
+"""
+Tests for cleanup_job.py - the in-process, cancellable replacement for the
+scheduler's `python3 media_processor.py` subprocess.
+
+media_processor.py is not imported - cleanup_job only reaches it lazily for
+run_cleanup_in_process(), so tests install a fake 'media_processor' module in
+sys.modules that drives the progress hooks the real phases call.
+
+Self-contained stdlib unittest, run with:
+    python3 -m unittest tests.test_cleanup_job -v
+"""
+
+import os
+import sys
+import threading
+import types
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cleanup_job
+
+
+def _fake_media_processor(run):
+    module = types.ModuleType('media_processor')
+    module.run_cleanup_in_process = run
+    return module
+
+
+class CleanupJobTestCase(unittest.TestCase):
+    def setUp(self):
+        cleanup_job._current = None
+        cleanup_job._history.clear()
+
+    def tearDown(self):
+        job = cleanup_job._current
+        if job is not None:
+            job.cancel_event.set()
+            job.done_event.wait(5)
+
+    def test_progress_and_bytes_freed(self):
+        seen = {}
+
+        def run():
+            cleanup_job.set_phase('dormant')
+            cleanup_job.start_items(4)
+            cleanup_job.advance()
+            cleanup_job.add_bytes_freed(1024 ** 3)
+            seen['mid'] = cleanup_job.get_status()['current']
+            cleanup_job.advance(3)
+            cleanup_job.set_phase('grace_watched')
+            return 7
+
+        with patch.dict(sys.modules, {'media_processor': _fake_media_processor(run)}):
+            job = cleanup_job.run(trigger='scheduled')
+
+        self.assertEqual(job.status, 'done')
+        self.assertEqual(job.result, 7)
+        self.assertEqual(seen['mid']['phase'], 'dormant')
+        self.assertEqual((seen['mid']['series_processed'], seen['mid']['series_total']), (1, 4))
+        self.assertIsNotNone(seen['mid']['eta_seconds'])
+        status = cleanup_job.get_status()
+        self.assertFalse(status['running'])
+        last = status['recent_jobs'][0]
+        self.assertEqual(last['phases_completed'], ['dormant', 'grace_watched'])
+        self.assertEqual(last['gb_freed'], 1.0)
+
+    def test_single_job_and_cancel(self):
+        entered = threading.Event()
+
+        def run():
+            cleanup_job.set_phase('grace_unwatched')
+            entered.set()
+            while not cleanup_job.cancel_requested():
+                threading.Event().wait(0.01)
+            return 3
+
+        with patch.dict(sys.modules, {'media_processor': _fake_media_processor(run)}):
+            job, started = cleanup_job.start(trigger='manual')
+            self.assertTrue(started)
+            self.assertTrue(entered.wait(5))
+            again, started_again = cleanup_job.start(trigger='manual')
+            self.assertIs(again, job)
+            self.assertFalse(started_again)
+
+            self.assertIs(cleanup_job.cancel(), job)
+            self.assertTrue(job.done_event.wait(5))
+
+        self.assertEqual(job.status, 'cancelled')
+        self.assertIsNone(cleanup_job.cancel())
+
+    def test_hooks_are_noops_without_a_job(self):
+        cleanup_job.set_phase('dormant')
+        cleanup_job.start_items(2)
+        cleanup_job.advance()
+        cleanup_job.add_bytes_freed(10)
+        self.assertFalse(cleanup_job.cancel_requested())
+        self.assertFalse(cleanup_job.active())
+        self.assertIsNone(cleanup_job.get_status()['current'])
+
+    def test_held_automation_and_failure(self):
+        with patch.dict(sys.modules, {'media_processor': _fake_media_processor(lambda: None)}):
+            self.assertEqual(cleanup_job.run().status, 'skipped')
+
+        def boom():
+            raise RuntimeError('sonarr down')
+
+        with patch.dict(sys.modules, {'media_processor': _fake_media_processor(boom)}):
+            job = cleanup_job.run()
+        self.assertEqual((job.status, job.error), ('failed', 'sonarr down'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+"""
+Tests for cleanup_state.py - incremental cleanup. A series is only
+re-evaluated when its fingerprint changes, when a grace/dormant deadline has
+passed since it was last evaluated, or on the periodic full rescan; deferred
+series and aborted passes never get recorded as evaluated.
+
+Self-contained stdlib unittest, run with:
+    python3 -m unittest tests.test_cleanup_state -v
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cleanup_state
+
+DAY = 86400
+NOW = 1_000_000_000
+
+RULE = {'grace_watched': 10, 'dormant_days': 30, 'series': {}}
+CONFIG = {'rules': {'default': dict(RULE, series={
+    '1': {'activity_date': NOW - 5 * DAY},
+    '2': {'activity_date': NOW - 50 * DAY},
+})}}
+LOOKUP = {
+    1: {'id': 1, 'title': 'One', 'tags': [3], 'statistics': {'episodeFileCount': 4, 'sizeOnDisk': 100}},
+    2: {'id': 2, 'title': 'Two', 'tags': [], 'statistics': {'episodeFileCount': 1, 'sizeOnDisk': 10}},
+}
+
+
+def _deadlines(series_id):
+    activity = CONFIG['rules']['default']['series'][str(series_id)]['activity_date']
+    return cleanup_state.rule_deadlines(RULE, activity)
+
+
+class CleanupStateTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp(prefix='episeerr_cleanup_state_')
+        self.patch = patch.object(cleanup_state, 'STATE_FILE', os.path.join(self.tmpdir, 'state.json'))
+        self.patch.start()
+
+    def tearDown(self):
+        self.patch.stop()
+
+    def _full_pass(self, now=NOW):
+        cleanup_pass = cleanup_state.begin_pass(CONFIG, LOOKUP, {}, now=now)
+        self.assertTrue(cleanup_pass.full)
+        cleanup_state.finish_pass(cleanup_pass, _deadlines, now=now)
+
+    def test_first_cycle_is_a_full_pass(self):
+        cleanup_pass = cleanup_state.begin_pass(CONFIG, LOOKUP, {}, now=NOW)
+        self.assertIsNone(cleanup_pass.dirty)
+        self.assertTrue(cleanup_pass.wants(1) and cleanup_pass.wants('2'))
+
+    def test_unchanged_series_are_skipped(self):
+        self._full_pass()
+        cleanup_pass = cleanup_state.begin_pass(CONFIG, LOOKUP, {}, now=NOW + 3600)
+        self.assertEqual(cleanup_pass.dirty, set())
+        self.assertFalse(cleanup_pass.wants(1))
+
+    def test_fingerprint_change_marks_series_dirty(self):
+        self._full_pass()
+        lookup = {**LOOKUP, 2: dict(LOOKUP[2], statistics={'episodeFileCount': 0, 'sizeOnDisk': 0})}
+        self.assertEqual(cleanup_state.begin_pass(CONFIG, lookup, {}, now=NOW + 60).dirty, {2})
+
+        lookup = {**LOOKUP, 1: dict(LOOKUP[1], tags=[3, 4])}
+        self.assertEqual(cleanup_state.begin_pass(CONFIG, lookup, {}, now=NOW + 60).dirty, {1})
+
+    def test_crossed_deadline_marks_series_dirty(self):
+        self._full_pass()
+        # Series 1 crosses grace_watched (activity + 10d) five days from now
+        self.assertEqual(cleanup_state.next_deadline(), NOW + 5 * DAY)
+        self.assertEqual(cleanup_state.begin_pass(CONFIG, LOOKUP, {}, now=NOW + 4 * DAY).dirty, set())
+        self.assertEqual(cleanup_state.begin_pass(CONFIG, LOOKUP, {}, now=NOW + 5 * DAY).dirty, {1})
+
+    def test_deferred_series_stay_dirty(self):
+        self._full_pass()
+        lookup = {sid: dict(s, tags=[9]) for sid, s in LOOKUP.items()}
+        cleanup_pass = cleanup_state.begin_pass(CONFIG, lookup, {}, now=NOW + 60)
+        self.assertEqual(cleanup_pass.dirty, {1, 2})
+        cleanup_pass.defer(2)
+        cleanup_state.finish_pass(cleanup_pass, _deadlines, now=NOW + 60)
+        self.assertEqual(cleanup_state.begin_pass(CONFIG, lookup, {}, now=NOW + 120).dirty, {2})
+
+    def test_aborted_pass_records_nothing(self):
+        cleanup_pass = cleanup_state.begin_pass(CONFIG, LOOKUP, {}, now=NOW)
+        cleanup_pass.abort("storage gate closed")
+        cleanup_state.finish_pass(cleanup_pass, _deadlines, now=NOW)
+        self.assertFalse(os.path.exists(cleanup_state.STATE_FILE))
+
+    def test_full_rescan_interval_and_disable(self):
+        self._full_pass()
+        later = NOW + cleanup_state.DEFAULT_FULL_RESCAN_HOURS * 3600
+        self.assertTrue(cleanup_state.begin_pass(CONFIG, LOOKUP, {}, now=later).full)
+        self.assertTrue(cleanup_state.begin_pass(CONFIG, LOOKUP, {'cleanup_full_rescan_hours': 0}, now=NOW + 60).full)
+
+    def test_rule_change_marks_its_series_dirty(self):
+        self._full_pass()
+        config = {'rules': {'default': dict(CONFIG['rules']['default'], dry_run=True)}}
+        self.assertEqual(cleanup_state.begin_pass(config, LOOKUP, {}, now=NOW + 60).dirty, {1, 2})
+
+    def test_upcoming_deadlines_for_series_and_movies(self):
+        config = dict(CONFIG, movie_rules={'Films': {'grace_watched': 7}, 'Kids': {'grace_watched': 14}})
+        upcoming = cleanup_state.upcoming_deadlines(config, NOW, movie_events={'603': NOW - DAY})
+        self.assertEqual(sorted(due for due, kind, _ in upcoming if kind == 'series'),
+                         [NOW + 5 * DAY, NOW + 25 * DAY])
+        self.assertEqual(sorted(due for due, kind, _ in upcoming if kind == 'movie'),
+                         [NOW + 6 * DAY, NOW + 13 * DAY])
+
+    def test_upcoming_deadlines_include_recorded_next_deadline(self):
+        config = {'rules': {'default': dict(RULE, series={'3': {}})}}
+        lookup = {3: {'id': 3, 'title': 'Three'}}
+        cleanup_pass = cleanup_state.begin_pass(config, lookup, {}, now=NOW)
+        cleanup_state.finish_pass(cleanup_pass, lambda sid: [NOW + 2 * DAY], now=NOW)
+        self.assertEqual(cleanup_state.upcoming_deadlines(config, NOW),
+                         [(NOW + 2 * DAY, 'series', 'series 3 (default)')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,188 @@
+"""
+Tests for config_store.py - the journaled, indexed owner of config.json.
+
+Per-series writes must land in the journal, not rewrite config.json, and
+must survive a cold reload (journal replay). Whole-document saves and
+compaction fold the journal back so config.json keeps its existing shape.
+
+Self-contained stdlib unittest, run with:
+    python3 -m unittest tests.test_config_store -v
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config_store
+
+CONFIG = {
+    'default_rule': 'default',
+    'rules': {
+        'default': {'grace_scope': 'series', 'series': {'1': {'activity_date': 100}}},
+        'Seasonal': {'grace_scope': 'season', 'series': {'2': {}}},
+    },
+}
+
+
+class ConfigStoreTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp(prefix='episeerr_config_store_')
+        path = os.path.join(self.tmpdir, 'config.json')
+        with open(path, 'w') as fh:
+            json.dump(CONFIG, fh)
+        self.patches = [
+            patch.object(config_store, 'CONFIG_PATH', path),
+            patch.object(config_store, 'JOURNAL_PATH', path + '.journal'),
+            patch.object(config_store, 'LOCK_PATH', path + '.lock'),
+        ]
+        for p in self.patches:
+            p.start()
+        self._cold()
+
+    def tearDown(self):
+        for p in self.patches:
+            p.stop()
+        self._cold()
+
+    def _cold(self):
+        """Forget in-memory state, as a fresh process would."""
+        config_store._doc = None
+        config_store._snapshot_sig = None
+
+    def _on_disk(self):
+        with open(config_store.CONFIG_PATH) as fh:
+            return json.load(fh)
+
+    def test_index_lookups(self):
+        self.assertEqual(config_store.find_rule_for_series(2), 'Seasonal')
+        self.assertEqual(config_store.get_series_entry('1'), ('default', {'activity_date': 100}))
+        self.assertEqual(config_store.get_series_entry(99), (None, None))
+
+    def test_series_index_cached_per_version(self):
+        first = config_store.series_index()
+        self.assertEqual(first['2'], ('Seasonal', {}))
+        self.assertIs(config_store.series_index(), first)
+        config_store.set_activity(2, 1, 1, 10)
+        second = config_store.series_index()
+        self.assertIsNot(second, first)
+        self.assertEqual(second['2'][1]['activity_date'], 10)
+        self.assertEqual(config_store.rule_assignments(), {'1': 'default', '2': 'Seasonal'})
+
+    def test_find_rule_in_honors_unsaved_edits(self):
+        config = config_store.load_config()
+        self.assertEqual(config_store.find_rule_in(config, 1), 'default')
+        config['rules']['Seasonal']['series']['1'] = config['rules']['default']['series'].pop('1')
+        self.assertEqual(config_store.find_rule_in(config, 1), 'Seasonal')
+        self.assertIsNone(config_store.find_rule_in(config, 99))
+
+    def test_load_config_returns_private_copy(self):
+        config = config_store.load_config()
+        config['rules']['default']['series']['1']['activity_date'] = 0
+        self.assertEqual(config_store.get_series_entry(1)[1]['activity_date'], 100)
+
+    def test_set_activity_journals_without_rewriting_config_json(self):
+        before = self._on_disk()
+        self.assertEqual(config_store.set_activity(1, 2, 3, 500), 'default')
+        self.assertEqual(self._on_disk(), before)
+        self.assertEqual(config_store.get_series_entry(1)[1], {
+            'activity_date': 500, 'last_season': 2, 'last_episode': 3, 'grace_cleaned': False,
+        })
+
+        self._cold()
+        self.assertEqual(config_store.get_series_entry(1)[1]['activity_date'], 500)
+
+    def test_set_activity_per_season_scope(self):
+        config_store.set_activity(2, 4, 7, 900)
+        entry = config_store.get_series_entry(2)[1]
+        self.assertEqual(entry['activity_date'], 900)
+        self.assertEqual(entry['seasons']['4'], {'activity_date': 900, 'last_episode': 7})
+        self.assertIs(entry['grace_cleaned'], False)
+
+    def test_set_activity_untracked_series(self):
+        self.assertIsNone(config_store.set_activity(99, 1, 1, 1))
+
+    def test_move_series_is_case_insensitive_and_keeps_activity(self):
+        self.assertEqual(config_store.move_series(1, 'DEFAULT', 'seasonal'), 'Seasonal')
+        self.assertEqual(config_store.get_series_entry(1), ('Seasonal', {'activity_date': 100}))
+        self.assertIsNone(config_store.move_series(1, 'default', 'Seasonal'))
+
+        self._cold()
+        self.assertEqual(config_store.find_rule_for_series(1), 'Seasonal')
+
+    def test_compaction_folds_journal_into_config_json(self):
+        with patch.object(config_store, 'COMPACT_AFTER', 3):
+            for ts in (1, 2, 3):
+                config_store.set_activity(1, 1, ts, ts)
+        self.assertEqual(os.path.getsize(config_store.JOURNAL_PATH), 0)
+        self.assertEqual(self._on_disk()['rules']['default']['series']['1']['activity_date'], 3)
+
+    def test_save_config_replaces_document_and_index(self):
+        config = config_store.load_config()
+        config['rules']['default']['series']['3'] = {}
+        config_store.save_config(config)
+        self.assertEqual(config_store.find_rule_for_series(3), 'default')
+        self.assertIn('3', self._on_disk()['rules']['default']['series'])
+
+    def test_sync_series_placement_keeps_activity_from_a_stale_copy(self):
+        # A drift pass takes its copy, a watch lands, then the pass publishes
+        stale = config_store.load_config()
+        stale['rules']['Seasonal']['series']['1'] = stale['rules']['default']['series'].pop('1')
+        stale['rules']['default']['series']['5'] = {'activity_date': 3}
+        del stale['rules']['Seasonal']['series']['2']
+        config_store.set_activity(1, 1, 5, 999)
+        config_store.set_activity(2, 1, 5, 999)
+
+        self.assertEqual(config_store.sync_series_placement(stale, 1), 'Seasonal')
+        self.assertEqual(config_store.sync_series_placement(stale, 5), 'default')
+        self.assertEqual(config_store.sync_series_placement(stale, 2), 'Seasonal')
+        self.assertEqual(config_store.get_series_entry(1)[1]['activity_date'], 999)
+        self.assertEqual(config_store.get_series_entry(5), ('default', {'activity_date': 3}))
+        # Missing from the copy is not a removal
+        self.assertEqual(config_store.get_series_entry(2)[1]['seasons']['1']['last_episode'], 5)
+
+        self._cold()
+        self.assertEqual(config_store.find_rule_for_series(1), 'Seasonal')
+
+    def test_picks_up_journal_lines_from_another_process(self):
+        config_store.find_rule_for_series(1)  # warm
+        with open(config_store.JOURNAL_PATH, 'a') as fh:
+            fh.write(json.dumps({'op': 'set_series', 'rule': 'Seasonal',
+                                 'series_id': '7', 'entry': {'activity_date': 1}}) + '\n')
+            fh.write('{"op": "remove_ser')  # partial line - not applied yet
+        self.assertEqual(config_store.find_rule_for_series(7), 'Seasonal')
+
+    def test_export_matches_existing_shape(self):
+        config_store.set_activity(1, 1, 1, 42)
+        exported = config_store.export_config()
+        self.assertEqual(exported, self._on_disk())
+        self.assertEqual(exported['default_rule'], 'default')
+        self.assertEqual(exported['rules']['default']['series']['1']['activity_date'], 42)
+
+    def test_listeners_fire_on_changes_only(self):
+        calls = []
+        listener = lambda: calls.append(config_store.get_version())
+        config_store.add_listener(listener)
+        try:
+            config_store.set_activity(1, 1, 1, 7)
+            config_store.set_activity(99, 1, 1, 7)              # untracked - no write
+            config_store.set_series_entry('missing', 1, {})     # unknown rule - no write
+            config_store.save_config(config_store.load_config())
+        finally:
+            config_store._listeners.remove(listener)
+        self.assertEqual(len(calls), 2)
+        self.assertLess(calls[0], calls[1])
+
+    def test_missing_file_gets_default_config(self):
+        os.remove(config_store.CONFIG_PATH)
+        self._cold()
+        self.assertIn('default', config_store.load_config()['rules'])
+        self.assertTrue(os.path.exists(config_store.CONFIG_PATH))
+
+
+if __name__ == '__main__':
+    unittest.main()
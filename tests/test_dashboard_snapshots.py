@@ -0,0 +1,132 @@
+"""
+Tests for dashboard_snapshots.py - the stale-while-revalidate cache behind
+the dashboard widgets.
+
+The widget registry is replaced per test, settings_store is pointed at a
+temp directory, and the refresher thread is not started.
+
+Self-contained stdlib unittest, run with:
+    python3 -m unittest tests.test_dashboard_snapshots -v
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import dashboard_snapshots
+import settings_store
+
+
+class DashboardSnapshotsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp(prefix='episeerr_dashboard_snapshots_')
+        self.addCleanup(shutil.rmtree, self.tmpdir, ignore_errors=True)
+        patches = [
+            patch.object(settings_store, 'SETTINGS_PATH', os.path.join(self.tmpdir, 'global_settings.json')),
+            patch.object(settings_store, '_doc', None),
+            patch.object(dashboard_snapshots, '_snapshots', {}),
+            patch.object(dashboard_snapshots, '_ensure_refresher', lambda: None),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def _wait_idle(self, name):
+        for _ in range(200):
+            if dashboard_snapshots._snapshots[name].refreshing is None:
+                return
+            time.sleep(0.01)
+        self.fail(f'{name} refresh did not finish')
+
+    def test_first_load_is_shared_then_served_stale_while_revalidating(self):
+        calls = []
+        release = threading.Event()
+
+        def produce():
+            calls.append(1)
+            release.wait(2)
+            return {'n': len(calls)}
+
+        dashboard_snapshots.register('queue', produce, interval=30)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(dashboard_snapshots.get('queue')))
+                   for _ in range(3)]
+        for t in threads:
+            t.start()
+        time.sleep(0.05)
+        release.set()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual([r['value'] for r in results], [{'n': 1}] * 3)
+        self.assertFalse(results[0]['stale'])
+
+        # Past the interval: the old value comes back at once, the refresh runs behind it
+        dashboard_snapshots._snapshots['queue'].updated_at -= 31
+        stale = dashboard_snapshots.get('queue')
+        self.assertEqual(stale['value'], {'n': 1})
+        self.assertTrue(stale['stale'])
+        self.assertGreaterEqual(stale['age'], 31)
+        self._wait_idle('queue')
+        fresh = dashboard_snapshots.get('queue')
+        self.assertEqual(fresh['value'], {'n': 2})
+        self.assertLess(fresh['age'], 5)
+
+    def test_failed_refresh_keeps_last_value(self):
+        outcomes = [{'free_space_gb': 10}, RuntimeError('sonarr down')]
+
+        def produce():
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        dashboard_snapshots.register('disk', produce, interval=300)
+        self.assertEqual(dashboard_snapshots.get('disk')['value'], {'free_space_gb': 10})
+
+        dashboard_snapshots.invalidate('disk')
+        dashboard_snapshots.invalidate('not-registered')
+        self.assertTrue(dashboard_snapshots.get('disk')['stale'])
+        self._wait_idle('disk')
+        snap = dashboard_snapshots.get('disk')
+        self.assertEqual(snap['value'], {'free_space_gb': 10})
+        self.assertEqual(snap['error'], 'sonarr down')
+        self.assertEqual(dashboard_snapshots.status()['disk']['error'], 'sonarr down')
+
+        dashboard_snapshots.register('never', lambda: 1 / 0)
+        never = dashboard_snapshots.get('never')
+        self.assertIsNone(never['value'])
+        self.assertIsNone(never['age'])
+        self.assertIn('division', never['error'])
+
+    def test_interval_override_from_global_settings(self):
+        dashboard_snapshots.register('calendar', lambda: [], interval=60)
+        snap = dashboard_snapshots._snapshots['calendar']
+        self.assertEqual(dashboard_snapshots.interval_for(snap), 60)
+        settings_store.save_settings({'dashboard_refresh_seconds': {'calendar': 600}})
+        self.assertEqual(dashboard_snapshots.interval_for(snap), 600)
+        settings_store.save_settings({'dashboard_refresh_seconds': {'calendar': 'soon'}})
+        self.assertEqual(dashboard_snapshots.interval_for(snap), 60)
+
+        # The overrides are read before the registry lock is taken
+        real_load = settings_store.load_settings
+
+        def load_settings():
+            self.assertFalse(dashboard_snapshots._lock.locked())
+            return real_load()
+
+        with patch.object(settings_store, 'load_settings', side_effect=load_settings) as load:
+            dashboard_snapshots.get('calendar')
+            dashboard_snapshots.status()
+        self.assertEqual(load.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+"""
+Tests for image_proxy.py - the disk-cached image proxy behind the
+integrations' /art routes.
+
+http.get is patched to a fake streaming response and CACHE_DIR points into a
+temp directory; a bare Flask app provides the request context.
+
+Self-contained stdlib unittest, run with:
+    python3 -m unittest tests.test_image_proxy -v
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from flask import Flask, request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_IMPORT_TMPDIR = tempfile.mkdtemp(prefix='episeerr_image_proxy_import_')
+os.environ.setdefault('LOG_DIR', _IMPORT_TMPDIR)
+os.environ.setdefault('SETTINGS_DB_PATH', os.path.join(_IMPORT_TMPDIR, 'settings.db'))
+
+import image_proxy
+
+IMAGE = b'\x89PNG' + bytes(range(256)) * 8
+
+
+def _upstream(body=IMAGE, status=200):
+    response = MagicMock()
+    response.raise_for_status.side_effect = None if status < 400 else Exception(f'HTTP {status}')
+    response.headers = {'Content-Type': 'image/png', 'Content-Length': str(len(body))}
+    response.iter_content.side_effect = lambda size: (body[i:i + size] for i in range(0, len(body), size))
+    response.content = body
+    return response
+
+
+class ImageProxyTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp(prefix='episeerr_image_cache_')
+        self.addCleanup(shutil.rmtree, self.tmpdir, ignore_errors=True)
+        self.fetched = []
+
+        def fake_get(url, **kwargs):
+            self.fetched.append(url)
+            return _upstream()
+
+        patches = [
+            patch.object(image_proxy, 'CACHE_DIR', self.tmpdir),
+            patch.object(image_proxy, '_cache', image_proxy.DiskCache()),
+            patch.object(image_proxy, 'CHUNK_SIZE', 500),
+            patch.object(image_proxy.http, 'get', side_effect=fake_get),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+        app = Flask(__name__)
+
+        @app.route('/art')
+        def art():
+            return image_proxy.serve(request.args['url'], width=request.args.get('w'),
+                                     upstream_resize=image_proxy.jellyfin_resize)
+
+        self.client = app.test_client()
+
+    def test_miss_streams_then_hits_with_etag(self):
+        url = 'HTTP://Jellyfin:8096/Items/1/Images/Primary?tag=b&api_key=k'
+        first = self.client.get('/art', query_string={'url': url})
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.headers['X-Image-Cache'], 'MISS')
+        self.assertEqual(first.data, IMAGE)
+        self.assertIn('max-age', first.headers['Cache-Control'])
+
+        # Same image under a differently ordered / cased URL is a hit
+        same = 'http://jellyfin:8096/Items/1/Images/Primary?api_key=k&tag=b'
+        second = self.client.get('/art', query_string={'url': same})
+        self.assertEqual(second.headers['X-Image-Cache'], 'HIT')
+        self.assertEqual(second.data, IMAGE)
+        etag = second.headers['ETag']
+
+        third = self.client.get('/art', query_string={'url': same}, headers={'If-None-Match': etag})
+        self.assertEqual(third.status_code, 304)
+        self.assertEqual(len(self.fetched), 1)
+
+    def test_thumbnail_width_goes_to_upstream_scaler(self):
+        url = 'http://jellyfin:8096/Items/1/Images/Primary?maxWidth=999'
+        self.client.get('/art', query_string={'url': url, 'w': '150'})
+        self.assertIn('maxWidth=160', self.fetched[0])
+        self.assertNotIn('maxWidth=999', self.fetched[0])
+        self.assertEqual(image_proxy.plex_resize('http://plex:32400/library/metadata/5/thumb/1?X-Plex-Token=t', 320),
+                         'http://plex:32400/photo/:/transcode?width=320&height=1280&minSize=1&upscale=0'
+                         '&url=%2Flibrary%2Fmetadata%2F5%2Fthumb%2F1&X-Plex-Token=t')
+
+    def test_lru_eviction_and_failed_fetch(self):
+        with patch.object(image_proxy, 'MAX_CACHE_BYTES', len(IMAGE) * 2):
+            for n in range(3):
+                self.client.get('/art', query_string={'url': f'http://sonos:1400/art/{n}.png'}).data
+        cached = [name for name in os.listdir(self.tmpdir) if name.endswith('.img')]
+        self.assertEqual(len(cached), 2)
+        self.assertEqual(image_proxy._cache.total, len(IMAGE) * 2)
+
+        with patch.object(image_proxy.http, 'get', return_value=_upstream(status=404)):
+            self.assertEqual(self.client.get('/art', query_string={'url': 'http://sonos:1400/missing.png'}).status_code, 404)
+        self.assertFalse([name for name in os.listdir(self.tmpdir) if name.endswith('.part')])
+
+    def test_local_resize_caps_the_buffer_and_survives_a_failed_store(self):
+        url = 'http://sonos:1400/art/cover.png'
+        with patch.object(image_proxy, 'Image', object()), \
+             patch.object(image_proxy, '_resize_locally', return_value=b'thumb') as resize:
+            # Over MAX_ITEM_BYTES: passed through unresized and uncached
+            with patch.object(image_proxy, 'MAX_ITEM_BYTES', 1000):
+                big = self.client.get('/art', query_string={'url': url, 'w': '100'})
+                self.assertEqual(big.data, IMAGE)
+            resize.assert_not_called()
+            self.assertFalse([name for name in os.listdir(self.tmpdir) if name.endswith('.img')])
+
+            # Store failed: the thumbnail is still served
+            with patch.object(image_proxy._cache, 'store', side_effect=OSError('disk full')):
+                small = self.client.get('/art', query_string={'url': url, 'w': '100'})
+            self.assertEqual(small.status_code, 200)
+            self.assertEqual(small.data, b'thumb')
+            self.assertEqual(small.headers['Content-Type'], 'image/jpeg')
+            self.assertTrue(small.headers['ETag'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+"""
+Tests for pending_deletions.py - the in-memory pending-deletions queue and
+its atomic, debounced write-back to pending_deletions.json.
+
+The queue and rejection files point into a temp directory.
+
+Self-contained stdlib unittest, run with:
+    python3 -m unittest tests.test_pending_deletions -v
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pending_deletions as pd
+
+
+def _item(episode_id, series_id=10, season=1, episode=None, size=1024 * 1024):
+    return dict(series_id=series_id, series_title=f'Series {series_id}', season_number=season,
+                episode_number=episode or episode_id, episode_id=episode_id,
+                episode_file_id=episode_id * 100, episode_title=f'Ep {episode_id}',
+                file_size=size, reason='Grace Period', date_source='Sonarr Air Date',
+                date_value='2026-01-01', rule_name='default')
+
+
+class PendingDeletionsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp(prefix='episeerr_pending_deletions_')
+        self.path = os.path.join(self.tmpdir, 'pending_deletions.json')
+        patches = [
+            patch.object(pd, 'PENDING_DELETIONS_FILE', self.path),
+            patch.object(pd, 'REJECTION_CACHE_FILE', os.path.join(self.tmpdir, 'rejections.json')),
+            patch.object(pd, '_store', pd._PendingStore()),
+            patch.object(pd, '_rejection_cache', {'sig': None, 'path': None, 'cache': {}}),
+            patch.object(pd, 'DEBOUNCE_SECONDS', 60),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        self.addCleanup(shutil.rmtree, self.tmpdir, ignore_errors=True)
+        self.addCleanup(lambda: pd._store.timer and pd._store.timer.cancel())
+
+    def _on_disk(self):
+        with open(self.path) as f:
+            return json.load(f)
+
+    def test_batch_is_deduplicated_and_written_once_debounced(self):
+        added = pd.queue_deletions([_item(1), _item(2), _item(1), _item(3, season=2), _item(4, series_id=20)])
+        self.assertEqual(added, 4)
+        self.assertEqual(pd.queue_deletions([_item(2)]), 0)
+
+        # Nothing written until the debounce fires (or someone flushes)
+        self.assertFalse(os.path.exists(self.path))
+        self.assertIsNotNone(pd._store.timer)
+        pd.flush()
+        self.assertIsNone(pd._store.timer)
+
+        data = self._on_disk()
+        self.assertEqual(data['movies'], [])
+        self.assertEqual([s['series_id'] for s in data['episodes']], [10, 20])
+        self.assertEqual(sorted(data['episodes'][0]['seasons']), ['1', '2'])
+        self.assertEqual(pd.get_episode_ids_for_series(10), [1, 2, 3])
+        self.assertEqual(pd.get_episode_ids_for_season(10, 2), [3])
+        self.assertEqual(pd.get_pending_deletions_summary()['total_episodes'], 4)
+        self.assertFalse(os.path.exists(self.path + '.tmp'))
+
+    def test_approve_and_reject_write_immediately(self):
+        pd.queue_deletions([_item(1), _item(2), _item(3, series_id=20)])
+        delete = MagicMock()
+
+        result = pd.approve_deletions([1, 3], delete)
+        self.assertEqual(result, {'deleted_count': 2, 'errors': []})
+        self.assertEqual(delete.call_count, 2)
+        self.assertEqual([s['series_id'] for s in self._on_disk()['episodes']], [10])
+
+        self.assertEqual(pd.reject_deletions([2]), 1)
+        self.assertEqual(self._on_disk()['episodes'], [])
+        self.assertTrue(pd.is_episode_rejected(2))
+        # A rejected episode is not queued again
+        self.assertEqual(pd.queue_deletions([_item(2)]), 0)
+
+    def test_index_and_totals_follow_queue_and_removal(self):
+        pd.queue_deletions([_item(1), _item(2, season=2), _item(3, series_id=20, size=3 * 1024 * 1024)])
+        self.assertEqual(pd._store.locations[2], (10, '2'))
+        self.assertEqual(pd.get_pending_totals(),
+                         {'total_series': 2, 'total_episodes': 3, 'total_size_mb': 5.0, 'total_size_gb': 0.0})
+
+        pd.reject_deletions({2, 99})
+        self.assertNotIn(2, pd._store.locations)
+        self.assertEqual(pd.get_episode_ids_for_season(10, 2), [])
+        summary = pd.get_pending_deletions_summary()
+        self.assertEqual(summary['series_totals'][10], {'episodes': 1, 'size_mb': 1.0})
+        self.assertEqual(summary['total_episodes'], 2)
+
+        pd.reject_deletions([3])
+        self.assertEqual(pd.get_pending_totals()['total_series'], 1)
+        self.assertEqual(pd.get_episode_ids_for_series(20), [])
+
+    def test_series_batches_run_concurrently_with_progress(self):
+        pd.queue_deletions([_item(i, series_id=i) for i in range(1, 4)] + [_item(4, series_id=1)])
+        barrier = threading.Barrier(3, timeout=5)
+        batches = {}
+
+        def delete(episode_list, series_id, series_title, **kwargs):
+            barrier.wait()          # deadlocks unless the series run at once
+            self.assertTrue(kwargs['force'])
+            batches[series_id] = sorted(ep['id'] for ep in episode_list)
+
+        result = pd.approve_deletions({1, 2, 3, 4}, delete)
+
+        self.assertEqual(result['deleted_count'], 4)
+        self.assertEqual(batches, {1: [1, 4], 2: [2], 3: [3]})
+        progress = pd.get_approval_progress()
+        self.assertFalse(progress['running'])
+        self.assertEqual((progress['done_series'], progress['total_series'], progress['deleted_count']), (3, 3, 4))
+        self.assertEqual(pd.get_pending_totals()['total_episodes'], 0)
+
+    def test_external_change_is_picked_up(self):
+        pd.queue_deletions([_item(1)])
+        pd.flush()
+        self.assertEqual(len(pd.load_pending_deletions()), 1)
+
+        # Returned lists are copies
+        pd.load_pending_deletions().clear()
+        self.assertEqual(pd.get_episode_ids_for_series(10), [1])
+
+        # Another process rewrote the file (old bare-list format)
+        with open(self.path, 'w') as f:
+            json.dump([], f, indent=4)
+        self.assertEqual(pd.load_pending_deletions(), [])
+        self.assertEqual(pd.queue_deletions([_item(1)]), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
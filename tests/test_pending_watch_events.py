@@ -95,6 +95,13 @@ class PendingWatchEventsTestCase(unittest.TestCase):
         pwe.mark_checked()
         self.assertGreaterEqual(pwe.get_last_checked(), before)
 
+    def test_watermarks_only_move_forward(self):
+        self.assertEqual(pwe.get_watermarks(), {})
+        pwe.mark_checked(100, watermarks={'plex': 2000, 'emby': 50})
+        pwe.mark_checked(200, watermarks={'plex': 1000})
+        self.assertEqual(pwe.get_watermarks(), {'plex': 2000, 'emby': 50})
+        self.assertEqual(pwe.get_last_checked(), 200)
+
     def test_get_pending_summary_shape(self):
         pwe.add_or_update_pending(series_id=10, series_title='Show', season=1,
                                    episode=2, source='plex', user='alice', watched_at=1000)
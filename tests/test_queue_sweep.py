@@ -0,0 +1,107 @@
+"""
+Tests for the download-queue sweep in episeerr_utils
+(check_and_cancel_unmonitored_downloads): one paged queue fetch with series
+and episodes embedded, in-memory decisions, bulk queue deletes.
+
+http.get / http.delete are patched - no Sonarr needed.
+
+Self-contained stdlib unittest, run with:
+    python3 -m unittest tests.test_queue_sweep -v
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_IMPORT_TMPDIR = tempfile.mkdtemp(prefix='episeerr_queue_sweep_import_')
+os.environ.setdefault('LOG_DIR', _IMPORT_TMPDIR)
+os.environ.setdefault('SETTINGS_DB_PATH', os.path.join(_IMPORT_TMPDIR, 'settings.db'))
+
+import episeerr_utils
+
+DEFAULT_TAG, SELECT_TAG = 7, 8
+
+
+def _record(queue_id, series_id, tags, season, episode, monitored):
+    return {
+        'id': queue_id,
+        'seriesId': series_id,
+        'episodeId': queue_id * 10,
+        'title': f'release-{queue_id}',
+        'series': {'id': series_id, 'title': f'Series {series_id}', 'tags': tags},
+        'episode': {'seasonNumber': season, 'episodeNumber': episode, 'monitored': monitored},
+    }
+
+
+def _response(payload=None, status=200):
+    response = MagicMock()
+    response.status_code = status
+    response.ok = status < 400
+    response.json.return_value = payload
+    return response
+
+
+class QueueSweepTestCase(unittest.TestCase):
+    def setUp(self):
+        self.gets = []
+        self.deletes = []
+        self.bulk_status = 200
+        self.queue = [
+            _record(1, 100, [DEFAULT_TAG], 1, 1, monitored=False),   # unmonitored -> cancel
+            _record(2, 100, [DEFAULT_TAG], 1, 2, monitored=True),    # keep
+            _record(3, 200, [], 1, 1, monitored=False),              # not an episeerr series
+            _record(4, 300, [SELECT_TAG], 1, 3, monitored=True),     # not selected -> cancel
+            _record(5, 300, [SELECT_TAG], 1, 4, monitored=True),     # selected -> keep
+        ]
+        patches = [
+            patch.object(episeerr_utils, 'SONARR_URL', 'http://sonarr'),
+            patch.object(episeerr_utils, 'EPISEERR_DEFAULT_TAG_ID', DEFAULT_TAG),
+            patch.object(episeerr_utils, 'EPISEERR_SELECT_TAG_ID', SELECT_TAG),
+            patch.object(episeerr_utils, 'QUEUE_PAGE_SIZE', 2),
+            patch.object(episeerr_utils, 'pending_selections', {'300': {'season': 1, 'selected_episodes': {4}}}),
+            patch.object(episeerr_utils, 'get_sonarr_headers', return_value={}),
+            patch.object(episeerr_utils.http, 'get', side_effect=self._get),
+            patch.object(episeerr_utils.http, 'delete', side_effect=self._delete),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def _get(self, url, params=None, **kwargs):
+        self.gets.append((url, params))
+        page, size = params['page'], params['pageSize']
+        return _response({'totalRecords': len(self.queue),
+                          'records': self.queue[(page - 1) * size:page * size]})
+
+    def _delete(self, url, json=None, params=None, **kwargs):
+        self.deletes.append((url, json))
+        return _response(status=self.bulk_status if url.endswith('/bulk') else 200)
+
+    def test_one_paged_fetch_and_one_bulk_delete(self):
+        summary = episeerr_utils.check_and_cancel_unmonitored_downloads()
+
+        self.assertEqual(summary, {'queue_items': 5, 'checked': 5, 'cancelled': 2, 'failed': 0})
+        self.assertEqual([params['page'] for _, params in self.gets], [1, 2, 3])
+        self.assertTrue(all(params['includeSeries'] == 'true' and params['includeEpisode'] == 'true'
+                            for _, params in self.gets))
+        self.assertEqual(self.deletes, [('http://sonarr/api/v3/queue/bulk', {'ids': [1, 4]})])
+
+    def test_rejected_bulk_delete_falls_back_per_item(self):
+        self.bulk_status = 404
+        with patch.object(episeerr_utils, 'cancel_download', side_effect=lambda qid, headers: qid == 1):
+            summary = episeerr_utils.check_and_cancel_unmonitored_downloads()
+        self.assertEqual((summary['cancelled'], summary['failed']), (1, 1))
+
+    def test_empty_queue(self):
+        self.queue = []
+        summary = episeerr_utils.check_and_cancel_unmonitored_downloads()
+        self.assertEqual(summary['queue_items'], 0)
+        self.assertEqual(self.deletes, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
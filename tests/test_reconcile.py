@@ -36,6 +36,7 @@ def _fake_media_processor(settings, get_series_id=None, config=None):
     module = types.ModuleType('media_processor')
     module.load_global_settings = lambda: settings
     module.get_series_id = get_series_id or (lambda title: None)
+    module.get_series_ids = lambda titles: {t: module.get_series_id(t) for t in titles}
     module.load_config = lambda: config or {'rules': {}}
     return module
 
@@ -73,6 +74,7 @@ class CheckForMissedWatchEventsTestCase(unittest.TestCase):
     def setUp(self):
         self._orig_media_processor = sys.modules.get('media_processor')
         self._orig_pending = sys.modules.get('pending_watch_events')
+        self.watermarks = {}
 
     def tearDown(self):
         for name, orig in (('media_processor', self._orig_media_processor),
@@ -86,7 +88,8 @@ class CheckForMissedWatchEventsTestCase(unittest.TestCase):
         calls = []
         module = types.ModuleType('pending_watch_events')
         module.add_or_update_pending = lambda **kwargs: calls.append(kwargs)
-        module.mark_checked = lambda: calls.append({'marked_checked': True})
+        module.mark_checked = lambda **kwargs: calls.append({'marked_checked': True})
+        module.get_watermarks = lambda: dict(self.watermarks)
         sys.modules['pending_watch_events'] = module
         return calls
 
@@ -115,7 +118,7 @@ class CheckForMissedWatchEventsTestCase(unittest.TestCase):
         calls = self._install_fake_pending_module()
 
         with patch.object(reconcile, '_SWEEPERS', (
-            ('plex', lambda: [(2000, 'Show', 1, 2, 'alice')]),
+            ('plex', lambda since_ts=0: [(2000, 'Show', 1, 2, 'alice')]),
         )):
             summary = reconcile.check_for_missed_watch_events()
 
@@ -137,7 +140,7 @@ class CheckForMissedWatchEventsTestCase(unittest.TestCase):
         calls = self._install_fake_pending_module()
 
         with patch.object(reconcile, '_SWEEPERS', (
-            ('plex', lambda: [(2000, 'Show', 1, 1, 'alice')]),
+            ('plex', lambda since_ts=0: [(2000, 'Show', 1, 1, 'alice')]),
         )):
             summary = reconcile.check_for_missed_watch_events()
 
@@ -151,7 +154,7 @@ class CheckForMissedWatchEventsTestCase(unittest.TestCase):
         calls = self._install_fake_pending_module()
 
         with patch.object(reconcile, '_SWEEPERS', (
-            ('plex', lambda: [(2000, 'Unmanaged Show', 1, 1, 'alice')]),
+            ('plex', lambda since_ts=0: [(2000, 'Unmanaged Show', 1, 1, 'alice')]),
         )):
             summary = reconcile.check_for_missed_watch_events()
 
@@ -165,17 +168,37 @@ class CheckForMissedWatchEventsTestCase(unittest.TestCase):
         )
         calls = self._install_fake_pending_module()
 
-        def broken(*a):
+        def broken(*a, **k):
             raise RuntimeError('history API down')
 
         with patch.object(reconcile, '_SWEEPERS', (
             ('plex', broken),
-            ('jellyfin', lambda: [(2000, 'Show', 1, 2, 'bob')]),
+            ('jellyfin', lambda since_ts=0: [(2000, 'Show', 1, 2, 'bob')]),
         )):
             summary = reconcile.check_for_missed_watch_events()
 
         self.assertEqual(summary['found'], 1)
         self.assertTrue(summary['errors'])
+        self.assertEqual([c['user'] for c in calls if 'series_id' in c], ['bob'])
+
+    def test_sonarr_lookup_failure_keeps_watermarks(self):
+        def sonarr_down(title):
+            raise ConnectionError('sonarr unreachable')
+
+        sys.modules['media_processor'] = _fake_media_processor(
+            {'reconcile_enabled': True}, get_series_id=sonarr_down,
+        )
+        calls = self._install_fake_pending_module()
+
+        with patch.object(reconcile, '_SWEEPERS', (
+            ('plex', lambda since_ts=0: [(2000, 'Show', 1, 2, 'alice')]),
+        )):
+            summary = reconcile.check_for_missed_watch_events()
+
+        self.assertFalse(summary['ran'])
+        self.assertIn('sonarr: sonarr unreachable', summary['errors'])
+        # Neither queued nor marked checked - the next run sweeps the same rows
+        self.assertEqual(calls, [])
 
     def test_always_marks_checked_even_when_nothing_found(self):
         sys.modules['media_processor'] = _fake_media_processor(
@@ -188,6 +211,69 @@ class CheckForMissedWatchEventsTestCase(unittest.TestCase):
 
         self.assertIn({'marked_checked': True}, calls)
 
+    def test_rows_collapse_per_series_and_user_and_titles_resolve_once(self):
+        config = {'rules': {'Standard': {'series': {'42': {'last_season': 1, 'last_episode': 1}}}}}
+        resolved = []
+        sys.modules['media_processor'] = _fake_media_processor(
+            {'reconcile_enabled': True}, config=config,
+            get_series_id=lambda title: resolved.append(title) or 42,
+        )
+        calls = self._install_fake_pending_module()
+
+        with patch.object(reconcile, '_SWEEPERS', (
+            ('plex', lambda since_ts=0: [(3000, 'Show', 1, 3, 'alice'), (2000, 'Show', 1, 4, 'alice'),
+                                         (1000, 'Show', 1, 2, 'alice')]),
+            ('tautulli', lambda since_ts=0: [(2500, 'Show', 1, 4, 'alice')]),
+        )):
+            summary = reconcile.check_for_missed_watch_events()
+
+        self.assertEqual(resolved, ['Show'])
+        queued = [c for c in calls if 'series_id' in c]
+        self.assertEqual(summary['found'], 1)
+        self.assertEqual((queued[0]['episode'], queued[0]['watched_at'], queued[0]['source']),
+                         (4, 2500, 'tautulli'))
+
+    def test_rows_collapse_per_resolved_series_not_per_title(self):
+        config = {'rules': {'Standard': {'series': {'42': {'last_season': 1, 'last_episode': 1}}}}}
+        sys.modules['media_processor'] = _fake_media_processor(
+            {'reconcile_enabled': True}, config=config,
+            get_series_id=lambda title: 42 if title in ('The Office (US)', 'The Office') else None,
+        )
+        calls = self._install_fake_pending_module()
+
+        with patch.object(reconcile, '_SWEEPERS', (
+            ('plex', lambda since_ts=0: [(1000, 'The Office (US)', 2, 3, 'alice')]),
+            ('tautulli', lambda since_ts=0: [(2000, 'The Office', 2, 5, 'alice')]),
+        )):
+            summary = reconcile.check_for_missed_watch_events()
+
+        queued = [c for c in calls if 'series_id' in c]
+        self.assertEqual(summary['found'], 1)
+        self.assertEqual((queued[0]['series_title'], queued[0]['episode'], queued[0]['source']),
+                         ('The Office', 5, 'tautulli'))
+
+    def test_sweeps_start_at_the_persisted_watermark(self):
+        sys.modules['media_processor'] = _fake_media_processor({'reconcile_enabled': True})
+        self.watermarks = {'plex': 1500}
+        marked = []
+        self._install_fake_pending_module()
+        sys.modules['pending_watch_events'].mark_checked = lambda **kwargs: marked.append(kwargs)
+        seen = {}
+
+        def plex(since_ts=0):
+            seen['plex'] = since_ts
+            return [(2000, 'Show', 1, 1, 'alice')]
+
+        def broken(since_ts=0):
+            raise RuntimeError('down')
+
+        with patch.object(reconcile, '_SWEEPERS', (('plex', plex), ('emby', broken))):
+            reconcile.check_for_missed_watch_events()
+
+        self.assertEqual(seen['plex'], 1500)
+        # A failed source keeps its old watermark
+        self.assertEqual(marked, [{'watermarks': {'plex': 2000}}])
+
 
 class ReplayWatchEventTestCase(unittest.TestCase):
     def setUp(self):
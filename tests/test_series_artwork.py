@@ -0,0 +1,128 @@
+"""
+Tests for series_artwork.py - the series id -> artwork URL cache fed from
+sonarr_client's bulk snapshot.
+
+sonarr_client.get_all_series / get_series / snapshot_version are patched and
+ARTWORK_FILE points into a temp directory.
+
+Self-contained stdlib unittest, run with:
+    python3 -m unittest tests.test_series_artwork -v
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_IMPORT_TMPDIR = tempfile.mkdtemp(prefix='episeerr_artwork_import_')
+os.environ.setdefault('LOG_DIR', _IMPORT_TMPDIR)
+os.environ.setdefault('SETTINGS_DB_PATH', os.path.join(_IMPORT_TMPDIR, 'settings.db'))
+
+import series_artwork
+
+
+def _series(series_id, *cover_types):
+    return {'id': series_id, 'title': f'Series {series_id}',
+            'images': [{'coverType': t, 'remoteUrl': f'https://img/{series_id}/{t}.jpg'} for t in cover_types]}
+
+
+class SeriesArtworkTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp(prefix='episeerr_artwork_')
+        self.addCleanup(shutil.rmtree, self.tmpdir, ignore_errors=True)
+        self.snapshot = [_series(1, 'poster', 'banner', 'fanart'), _series(2, 'banner')]
+        self.version = 1
+        self.fetches = 0
+
+        def get_all_series(max_age=None, url=None, api_key=None):
+            self.fetches += 1
+            return self.snapshot
+
+        def get_series(series_id, max_age=None, url=None, api_key=None):
+            self.single_fetches += 1
+            return next((s for s in self.snapshot if s['id'] == series_id), None)
+
+        self.single_fetches = 0
+        patches = [
+            patch.object(series_artwork.sonarr_client, 'get_series', side_effect=get_series),
+            patch.object(series_artwork, 'ARTWORK_FILE', os.path.join(self.tmpdir, 'series_artwork.json')),
+            patch.object(series_artwork, '_cache', series_artwork.ArtworkCache()),
+            patch.object(series_artwork.sonarr_client, 'get_all_series', side_effect=get_all_series),
+            patch.object(series_artwork.sonarr_client, 'snapshot_version', side_effect=lambda: self.version),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def _wait_for_sync(self):
+        thread = series_artwork._cache.sync_thread
+        if thread is not None:
+            thread.join(5)
+
+    def test_cover_urls_keeps_backdrop_preference(self):
+        self.assertEqual(series_artwork.cover_urls(_series(3, 'banner', 'fanart'))['backdrop'],
+                         'https://img/3/banner.jpg')
+        self.assertEqual(series_artwork.cover_urls({'images': None}),
+                         {'poster': None, 'banner': None, 'fanart': None, 'backdrop': None})
+
+    def test_miss_fetches_the_series_and_persists(self):
+        # A series' first event already gets its backdrop
+        self.assertEqual(series_artwork.get_backdrop(1), 'https://img/1/banner.jpg')
+        self.assertEqual(series_artwork.get_poster(1), 'https://img/1/poster.jpg')
+        self.assertEqual(self.single_fetches, 1)
+        self.assertIsNone(series_artwork.get_backdrop(99))
+        self._wait_for_sync()
+        self.assertEqual(self.fetches, 1)
+
+        # Same snapshot version: the banner map is served without re-folding
+        self.assertEqual(series_artwork.get_banner_map(), {1: 'https://img/1/banner.jpg', 2: 'https://img/2/banner.jpg'})
+
+        # A restart starts warm from disk
+        with patch.object(series_artwork, '_cache', series_artwork.ArtworkCache()):
+            self.assertEqual(series_artwork.get_backdrop(2), 'https://img/2/banner.jpg')
+            self.assertIsNone(series_artwork._cache.sync_thread)
+
+    def test_lru_bound_and_ttl(self):
+        with patch.object(series_artwork, 'MAX_ENTRIES', 2):
+            series_artwork.update_from_snapshot(self.snapshot)
+            series_artwork.get_artwork(1)                 # 1 is now most recently used
+            series_artwork.update_from_snapshot([_series(3, 'poster')])
+        self.assertEqual(list(series_artwork._cache.entries), [1, 3])
+
+        # A stale entry is still served while a sync is scheduled
+        series_artwork._cache.entries[1]['updated_at'] = time.time() - series_artwork.ARTWORK_TTL - 1
+        self.version = 2
+        self.assertEqual(series_artwork.get_poster(1), 'https://img/1/poster.jpg')
+        self._wait_for_sync()
+        self.assertEqual(series_artwork._cache.synced_version, 2)
+
+
+    def test_stale_entries_refresh_without_a_new_version_and_file_only_changes_with_urls(self):
+        series_artwork.update_from_snapshot(self.snapshot)
+        path = series_artwork.ARTWORK_FILE
+        written = os.stat(path).st_mtime_ns
+
+        # New snapshot version, same artwork: nothing to write
+        self.version = 2
+        os.utime(path, ns=(0, 0))
+        series_artwork._cache.sync()
+        self.assertEqual(os.stat(path).st_mtime_ns, 0)
+        self.assertNotEqual(written, 0)
+
+        # Same version, but an entry outlived its TTL: it is re-folded anyway
+        series_artwork._cache.entries[2]['updated_at'] = time.time() - series_artwork.ARTWORK_TTL - 1
+        self.snapshot = [_series(1, 'poster', 'banner', 'fanart'), _series(2, 'banner', 'poster')]
+        series_artwork._cache.sync()
+        entry, fresh = series_artwork._cache.get(2)
+        self.assertTrue(fresh)
+        self.assertEqual(entry['poster'], 'https://img/2/poster.jpg')
+        self.assertNotEqual(os.stat(path).st_mtime_ns, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
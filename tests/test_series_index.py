@@ -0,0 +1,77 @@
+"""
+Tests for series_index.py - the title -> Sonarr series resolution index
+behind media_processor.get_series_id().
+
+sonarr_client.get_all_series is patched to hand out in-memory snapshots.
+
+Self-contained stdlib unittest, run with:
+    python3 -m unittest tests.test_series_index -v
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_IMPORT_TMPDIR = tempfile.mkdtemp(prefix='episeerr_series_index_import_')
+os.environ.setdefault('LOG_DIR', _IMPORT_TMPDIR)
+os.environ.setdefault('SETTINGS_DB_PATH', os.path.join(_IMPORT_TMPDIR, 'settings.db'))
+
+import series_index
+
+SERIES = [
+    {'id': 1, 'title': 'IT: Welcome to Derry', 'tvdbId': 400, 'tmdbId': 900,
+     'alternateTitles': [{'title': 'Es - Welcome to Derry'}]},
+    {'id': 2, 'title': 'Doctor Who (2005)', 'tvdbId': 401},
+    {'id': 3, 'title': 'Doctor Who (2023)', 'tvdbId': 402},
+    {'id': 4, 'title': 'The Office (US)', 'tmdbId': 2316},
+]
+
+
+class SeriesIndexTestCase(unittest.TestCase):
+    def setUp(self):
+        self.index = series_index.SeriesIndex(SERIES)
+
+    def test_priority_order(self):
+        # ids beat titles, even when the title points elsewhere
+        self.assertEqual(self.index.resolve('The Office (US)', tvdb_id='402'), (3, 'tvdb'))
+        self.assertEqual(self.index.resolve('Unknown', tmdb_id=900), (1, 'tmdb'))
+        self.assertEqual(self.index.resolve('the office (us)'), (4, 'title'))
+        # First series in Sonarr's order wins a year-stripped tie
+        self.assertEqual(self.index.resolve('Doctor Who'), (2, 'title_without_year'))
+        self.assertEqual(self.index.resolve('Es – Welcome to Derry!'), (1, 'alternate_title'))
+        self.assertEqual(self.index.resolve('Severance', tvdb_id='not-a-number'), (None, None))
+
+    def test_close_matches(self):
+        self.assertEqual(self.index.close_matches('doctor'), ['Doctor Who (2005)', 'Doctor Who (2023)'])
+        self.assertEqual(self.index.close_matches(''), [])
+
+    def test_rebuilt_only_when_snapshot_changes(self):
+        snapshots = {'current': list(SERIES)}
+        calls = []
+
+        def fake_get_all_series(max_age=None, url=None, api_key=None):
+            calls.append(max_age)
+            return snapshots['current']
+
+        with patch.object(series_index.sonarr_client, 'get_all_series', side_effect=fake_get_all_series), \
+                patch.object(series_index, '_index', None):
+            first = series_index.get_index()
+            self.assertIs(series_index.get_index(), first)
+
+            snapshots['current'] = SERIES + [{'id': 5, 'title': 'Severance'}]
+            series_id, how, index = series_index.resolve('Severance')
+            self.assertEqual((series_id, how), (5, 'title'))
+            self.assertIsNot(index, first)
+
+            # A miss retries once against a recent snapshot
+            calls.clear()
+            self.assertEqual(series_index.resolve('Andor')[:2], (None, None))
+            self.assertEqual(calls, [None, series_index.MISS_REFRESH_SECONDS])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,160 @@
+"""
+Tests for session_poller.py - the single per-server poller that replaced one
+sleeping thread per playback session in the Plex/Jellyfin/Emby polling mode.
+
+The integration callables are plain fakes; tick() is driven directly except
+in the thread test.
+
+Self-contained stdlib unittest, run with:
+    python3 -m unittest tests.test_session_poller -v
+"""
+
+import os
+import sys
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import session_poller
+from session_poller import SessionPoller, next_interval
+
+
+def _info(episode):
+    return {'series_name': 'Severance', 'season_number': 1, 'episode_number': episode, 'user_name': 'alice'}
+
+
+class SessionPollerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.fetches = 0
+        self.progress = {}              # session key -> progress; missing = ended
+        self.processed = []
+        self.fail_processing = False
+
+        def fetch():
+            self.fetches += 1
+            return dict(self.progress)
+
+        def check(key, info, snapshot):
+            if key not in snapshot:
+                return None
+            if isinstance(snapshot[key], tuple):    # (position, duration, paused) in seconds
+                position, duration, paused = snapshot[key]
+                return {'progress': position / duration * 100, 'is_paused': paused,
+                        'position': position, 'duration': duration}
+            return {'progress': snapshot[key], 'is_paused': False}
+
+        def process(key, info, state):
+            if self.fail_processing:
+                return False
+            self.processed.append(key)
+            return True
+
+        self.poller = SessionPoller('Test', fetch, check, process, lambda: (50.0, 900))
+        # Drive tick() by hand: keep track() from starting the thread
+        self.poller._ensure_thread = lambda: None
+
+    def test_one_fetch_fans_out_to_every_session(self):
+        self.progress = {'a': 10.0, 'b': 60.0, 'c': 20.0}
+        for key, ep in (('a', 1), ('b', 2), ('c', 3), ('gone', 4)):
+            self.assertTrue(self.poller.track(key, _info(ep)))
+        self.assertFalse(self.poller.track('a', _info(1)))
+
+        now = time.time()
+        self.assertEqual(self.poller.tick(now), 2)
+        self.assertEqual(self.fetches, 1)
+        self.assertEqual(self.processed, ['b'])
+        self.assertFalse(self.poller.is_tracking('gone'))
+
+        # Nothing is due yet: no request at all
+        self.poller.tick(now + 1)
+        self.assertEqual(self.fetches, 1)
+
+        # A failed hand-off keeps the session tracked
+        self.progress['c'] = 55.0
+        self.fail_processing = True
+        self.poller.tick(now + 900)
+        self.assertTrue(self.poller.is_tracking('c'))
+        rows = {row['session_id']: row for row in self.poller.status()['tracked_sessions']}
+        self.assertEqual(rows['c']['progress_percent'], 55.0)
+        self.assertEqual(rows['c']['polls'], 2)
+
+    def test_interval_shrinks_near_threshold(self):
+        self.assertEqual(next_interval(10.0, 50.0, 900), 900)
+        self.assertEqual(next_interval(45.0, 50.0, 900), 450)
+        self.assertEqual(next_interval(49.9, 50.0, 900), session_poller.MIN_INTERVAL)
+        self.assertEqual(next_interval(10.0, 50.0, 5), session_poller.MIN_INTERVAL)
+
+        self.progress = {'a': 45.0}
+        self.poller.track('a', _info(1))
+        now = time.time()
+        self.poller.tick(now)
+        self.poller.tick(now + 449)
+        self.assertEqual(self.fetches, 1)
+        self.poller.tick(now + 450)
+        self.assertEqual(self.fetches, 2)
+
+    def test_next_check_lands_on_predicted_crossing(self):
+        # 1200s into a 3000s episode: 50% is 300s of playback away
+        self.progress = {'a': (1200.0, 3000.0, False)}
+        self.poller.track('a', _info(1))
+        now = time.time()
+        self.poller.tick(now)
+        due = now + 300 + session_poller.TRIGGER_MARGIN
+        self.assertAlmostEqual(self.poller.sessions['a']['next_check'], due, places=3)
+
+        # Watching at 2x: the observed rate pulls the estimate in
+        self.progress = {'a': (1300.0, 3000.0, False)}
+        self.poller.sessions['a']['next_check'] = now + 50
+        self.poller.tick(now + 50)
+        self.assertEqual(self.poller.sessions['a']['rate'], 2.0)
+        self.assertAlmostEqual(self.poller.sessions['a']['next_check'],
+                               now + 50 + 100 + session_poller.TRIGGER_MARGIN, places=3)
+
+        # Paused: no estimate, back to the distance-based schedule
+        self.progress = {'a': (1400.0, 3000.0, True)}
+        self.poller.sessions['a']['next_check'] = now + 100
+        self.poller.tick(now + 100)
+        self.assertIsNone(self.poller.sessions['a']['eta'])
+        self.assertAlmostEqual(self.poller.sessions['a']['next_check'],
+                               now + 100 + next_interval(1400 / 30, 50.0, 900), places=3)
+
+        self.progress = {'a': (1501.0, 3000.0, False)}
+        self.poller.tick(now + 1000)
+        self.assertEqual(self.processed, ['a'])
+        self.assertEqual(self.fetches, 4)
+
+    def test_failed_processing_past_threshold_retries_on_poll_interval(self):
+        self.progress = {'a': (1600.0, 3000.0, False)}
+        self.fail_processing = True
+        self.poller.track('a', _info(1))
+        now = time.time()
+        self.poller.tick(now)
+        self.assertEqual(self.poller.sessions['a']['eta'], 0.0)
+        self.assertAlmostEqual(self.poller.sessions['a']['next_check'], now + 900, places=3)
+
+        self.poller.tick(now + session_poller.PREDICTED_MIN_INTERVAL)
+        self.assertEqual(self.fetches, 1)
+
+        self.fail_processing = False
+        self.poller.tick(now + 900)
+        self.assertEqual(self.processed, ['a'])
+        self.assertEqual(self.fetches, 2)
+
+    def test_single_thread_for_many_sessions(self):
+        del self.poller._ensure_thread
+        self.progress = {str(n): 80.0 for n in range(12)}
+        for n in range(12):
+            self.poller.track(str(n), _info(n))
+        deadline = time.time() + 5
+        while len(self.processed) < 12 and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(sorted(self.processed, key=int), [str(n) for n in range(12)])
+        self.assertLessEqual(self.fetches, 12)
+        names = [t.name for t in threading.enumerate() if t.name == 'TestSessionPoller']
+        self.assertEqual(names, ['TestSessionPoller'])
+
+
+if __name__ == '__main__':
+    unittest.main()
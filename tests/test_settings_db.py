@@ -0,0 +1,92 @@
+"""
+Tests for settings_db.py's connection reuse and read cache: repeated reads
+must not touch SQLite, writes through the module must invalidate, and a
+write from another connection must be picked up.
+
+DB_PATH points at a fresh temp database per test.
+
+Self-contained stdlib unittest, run with:
+    python3 -m unittest tests.test_settings_db -v
+"""
+
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_IMPORT_TMPDIR = tempfile.mkdtemp(prefix='episeerr_settings_import_')
+os.environ.setdefault('SETTINGS_DB_PATH', os.path.join(_IMPORT_TMPDIR, 'settings.db'))
+
+import settings_db
+
+
+class SettingsDbCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp(prefix='episeerr_settings_')
+        self.addCleanup(shutil.rmtree, self.tmpdir, ignore_errors=True)
+        self.db_path = os.path.join(self.tmpdir, 'settings.db')
+        patches = [
+            patch.object(settings_db, 'DB_PATH', self.db_path),
+            patch.object(settings_db, '_cache', {}),
+            patch.object(settings_db, '_db_sig', None),
+            patch.object(settings_db, '_last_external_check', 0.0),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        settings_db.init_settings_db()
+        self.queries = []
+        settings_db._connect().set_trace_callback(self.queries.append)
+        self.addCleanup(lambda: settings_db._connect().set_trace_callback(None))
+
+    def test_repeated_reads_are_served_from_cache(self):
+        settings_db.save_service('jellyfin', 'default', 'http://jf:8096', 'key',
+                                 {'poll_interval': 900, 'trigger_percentage': 50.0})
+        settings_db.set_setting('theme', {'dark': True})
+        self.queries.clear()
+
+        for _ in range(5):
+            self.assertEqual(settings_db.get_jellyfin_config()['poll_interval'], 900)
+            self.assertEqual(settings_db.get_setting('theme'), {'dark': True})
+            self.assertEqual(settings_db.get_setting('missing', 'fallback'), 'fallback')
+        self.assertEqual(len([q for q in self.queries if q.startswith('SELECT')]), 3)
+
+        # Callers get their own copy
+        settings_db.get_service('jellyfin')['config']['poll_interval'] = 1
+        self.assertEqual(settings_db.get_service('jellyfin')['config']['poll_interval'], 900)
+
+    def test_writes_invalidate(self):
+        settings_db.save_service('emby', 'default', 'http://emby', 'k', {'user_id': 'a'})
+        self.assertEqual(settings_db.get_emby_config()['user_id'], 'a')
+
+        settings_db.save_service('emby', 'default', 'http://emby', 'k', {'user_id': 'b'})
+        self.assertEqual(settings_db.get_emby_config()['user_id'], 'b')
+
+        self.assertTrue(settings_db.set_service_enabled('emby', 'default', False))
+        self.assertIsNone(settings_db.get_service('emby'))
+        self.assertTrue(settings_db.is_service_disabled('emby'))
+
+        settings_db.delete_service('emby', 'default')
+        self.assertIsNone(settings_db.get_service_row('emby'))
+        self.assertFalse(settings_db.is_service_disabled('emby'))
+
+    def test_write_from_another_connection_is_picked_up(self):
+        settings_db.set_setting('poll', 5)
+        self.assertEqual(settings_db.get_setting('poll'), 5)
+
+        other = sqlite3.connect(self.db_path)
+        other.execute("UPDATE settings SET value = '7' WHERE key = 'poll'")
+        other.commit()
+        other.close()
+
+        with patch.object(settings_db, 'EXTERNAL_CHECK_SECONDS', 0):
+            self.assertEqual(settings_db.get_setting('poll'), 7)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+"""
+Tests for settings_store.py - the in-memory owner of global_settings.json.
+
+SETTINGS_PATH points into a temp directory and the module state is reset
+per test.
+
+Self-contained stdlib unittest, run with:
+    python3 -m unittest tests.test_settings_store -v
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import settings_store
+
+
+class SettingsStoreTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp(prefix='episeerr_settings_store_')
+        self.addCleanup(shutil.rmtree, self.tmpdir, ignore_errors=True)
+        self.path = os.path.join(self.tmpdir, 'config', 'global_settings.json')
+        self.notified = []
+        patches = [
+            patch.object(settings_store, 'SETTINGS_PATH', self.path),
+            patch.object(settings_store, '_doc', None),
+            patch.object(settings_store, '_sig', None),
+            patch.object(settings_store, '_listeners', [lambda: self.notified.append(settings_store._version)]),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def _write_file(self, settings):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, 'w') as f:
+            json.dump(settings, f)
+
+    def test_migrates_once_then_serves_from_memory(self):
+        self._write_file({'cleanup_interval_hours': 12})
+        settings = settings_store.load_settings()
+        self.assertEqual(settings['cleanup_interval_hours'], 12)
+        self.assertTrue(settings['dry_run_mode'])
+        self.assertFalse(settings['automation_held'])
+        with open(self.path) as f:
+            self.assertIn('automation_held', json.load(f))
+
+        settings['cleanup_interval_hours'] = 1          # callers get a copy
+        with patch('builtins.open', side_effect=AssertionError('re-read from disk')):
+            self.assertEqual(settings_store.load_settings()['cleanup_interval_hours'], 12)
+        self.assertEqual(self.notified, [])
+
+    def test_save_and_external_edit_notify_listeners(self):
+        settings_store.load_settings()                  # missing file -> defaults written
+        self.assertTrue(os.path.exists(self.path))
+        version = settings_store.get_version()
+
+        self.assertTrue(settings_store.save_settings({**settings_store.load_settings(), 'automation_held': True}))
+        self.assertTrue(settings_store.load_settings()['automation_held'])
+        self.assertTrue(os.path.exists(self.path + '.bak'))
+        self.assertEqual(len(self.notified), 1)
+
+        # Another process rewrites the file
+        self._write_file({'dry_run_mode': False, 'automation_held': False, 'cleanup_interval_hours': 3})
+        self.assertGreater(settings_store.get_version(), version + 1)
+        self.assertEqual(len(self.notified), 2)
+        self.assertEqual(settings_store.load_settings()['cleanup_interval_hours'], 3)
+
+    def test_unreadable_file_keeps_last_good_copy(self):
+        self._write_file({'dry_run_mode': False, 'automation_held': True})
+        self.assertTrue(settings_store.load_settings()['automation_held'])
+        with open(self.path, 'w') as f:
+            f.write('{not json')
+        self.assertTrue(settings_store.load_settings()['automation_held'])
+
+
+if __name__ == '__main__':
+    unittest.main()
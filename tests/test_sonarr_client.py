@@ -0,0 +1,126 @@
+"""
+Tests for sonarr_client.py - the shared Sonarr series/episode cache.
+
+The series list is fetched once per TTL and shared; concurrent identical
+requests are coalesced into one HTTP call; webhook invalidation and our own
+series PUTs keep the snapshot honest. http.get is patched - no Sonarr needed.
+
+Self-contained stdlib unittest, run with:
+    python3 -m unittest tests.test_sonarr_client -v
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_IMPORT_TMPDIR = tempfile.mkdtemp(prefix='episeerr_sonarr_client_import_')
+os.environ.setdefault('LOG_DIR', _IMPORT_TMPDIR)
+os.environ.setdefault('SETTINGS_DB_PATH', os.path.join(_IMPORT_TMPDIR, 'settings.db'))
+
+import sonarr_client
+
+URL = 'http://sonarr'
+KEY = 'key'
+SERIES = [{'id': 1, 'title': 'Severance', 'tags': []}, {'id': 2, 'title': 'Andor', 'tags': [3]}]
+
+
+def _response(payload, status=200):
+    response = MagicMock()
+    response.status_code = status
+    response.ok = status < 400
+    response.json.return_value = payload
+    return response
+
+
+class SonarrClientTestCase(unittest.TestCase):
+    def setUp(self):
+        self.cache = sonarr_client.SonarrCache()
+        self.patches = [patch.object(sonarr_client, '_cache', self.cache)]
+        for p in self.patches:
+            p.start()
+        self.calls = []
+
+    def tearDown(self):
+        for p in self.patches:
+            p.stop()
+
+    def _get(self, payload_for=None, gate=None):
+        def fake_get(url, **kwargs):
+            self.calls.append(url)
+            if gate is not None:
+                gate.wait(5)
+            if payload_for:
+                return payload_for(url)
+            return _response([dict(s) for s in SERIES])
+        return patch.object(sonarr_client.http, 'get', side_effect=fake_get)
+
+    def test_snapshot_is_shared_within_ttl(self):
+        with self._get():
+            first = sonarr_client.get_all_series(url=URL, api_key=KEY)
+            second = sonarr_client.get_all_series(url=URL, api_key=KEY)
+            self.assertIs(first, second)
+            self.assertEqual(sonarr_client.get_series_lookup(url=URL, api_key=KEY)[2]['title'], 'Andor')
+            self.assertEqual(sonarr_client.get_series(1, url=URL, api_key=KEY)['title'], 'Severance')
+            self.assertEqual(len(self.calls), 1)
+
+            sonarr_client.get_all_series(max_age=0, url=URL, api_key=KEY)
+        self.assertEqual(len(self.calls), 2)
+        self.assertEqual(sonarr_client.snapshot_version(), 2)
+
+    def test_concurrent_requests_are_coalesced(self):
+        gate = threading.Event()
+        results = []
+        with self._get(gate=gate):
+            threads = [threading.Thread(target=lambda: results.append(
+                sonarr_client.get_all_series(url=URL, api_key=KEY))) for _ in range(5)]
+            for t in threads:
+                t.start()
+            while self.cache.stats['coalesced'] + self.cache.stats['fetches'] < 5:
+                threading.Event().wait(0.01)
+            gate.set()
+            for t in threads:
+                t.join(5)
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(len(results), 5)
+        self.assertTrue(all(r is results[0] for r in results))
+
+    def test_invalidate_and_copies(self):
+        with self._get():
+            copied = sonarr_client.get_all_series(url=URL, api_key=KEY, copy=True)
+            copied[0]['title'] = 'changed'
+            self.assertEqual(sonarr_client.get_all_series(url=URL, api_key=KEY)[0]['title'], 'Severance')
+            sonarr_client.invalidate(2)
+            sonarr_client.get_all_series(url=URL, api_key=KEY)
+        self.assertEqual(len(self.calls), 2)
+
+    def test_remember_series_updates_snapshot(self):
+        with self._get():
+            before = sonarr_client.get_all_series(url=URL, api_key=KEY)
+            sonarr_client.remember_series({'id': 2, 'title': 'Andor', 'tags': [3, 4]}, url=URL, api_key=KEY)
+            after = sonarr_client.get_all_series(url=URL, api_key=KEY)
+        self.assertEqual(before[1]['tags'], [3])
+        self.assertEqual(after[1]['tags'], [3, 4])
+        self.assertEqual(len(self.calls), 1)
+
+    def test_episodes_cache_and_missing_series(self):
+        def payload_for(url):
+            if '/episode' in url:
+                return _response([{'id': 10, 'seasonNumber': 1}])
+            return _response(None, status=404)
+
+        with self._get(payload_for):
+            self.assertEqual(sonarr_client.get_episodes(1, url=URL, api_key=KEY)[0]['id'], 10)
+            sonarr_client.get_episodes(1, url=URL, api_key=KEY)
+            sonarr_client.invalidate_episodes(1)
+            sonarr_client.get_episodes(1, url=URL, api_key=KEY)
+            self.assertIsNone(sonarr_client.get_series(9, max_age=0, url=URL, api_key=KEY))
+        self.assertEqual(len([c for c in self.calls if '/episode' in c]), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+"""
+Tests for startup_tasks.py - the background pipeline that replaced the
+import-time Sonarr/Radarr work in initialize_episeerr().
+
+Steps are plain functions here; STATE_FILE and LOCK_FILE point into a temp
+directory.
+
+Self-contained stdlib unittest, run with:
+    python3 -m unittest tests.test_startup_tasks -v
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import startup_tasks
+
+
+class StartupTasksTestCase(unittest.TestCase):
+    def setUp(self):
+        tmpdir = tempfile.mkdtemp(prefix='episeerr_startup_')
+        patches = [
+            patch.object(startup_tasks, 'STATE_FILE', os.path.join(tmpdir, 'startup_state.json')),
+            patch.object(startup_tasks, 'LOCK_FILE', os.path.join(tmpdir, 'startup_tasks.lock')),
+            patch.object(startup_tasks, '_current', None),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def _run(self, steps):
+        run, started = startup_tasks.start(steps)
+        self.assertTrue(started)
+        self.assertTrue(run.done_event.wait(5))
+        return run
+
+    def test_independent_steps_run_concurrently_after_dependencies(self):
+        barrier = threading.Barrier(2, timeout=5)
+        order = []
+
+        def snapshot(ctx):
+            order.append('snapshot')
+            ctx['series'] = 3
+
+        def parallel(name):
+            def step(ctx):
+                barrier.wait()          # deadlocks unless both run at once
+                order.append(name)
+            return step
+
+        def reconcile(ctx):
+            order.append('reconcile')
+            return {'checked': ctx['series']}
+
+        run = self._run([
+            startup_tasks.Step('reconcile', reconcile, after=['snapshot', 'a']),
+            startup_tasks.Step('snapshot', snapshot),
+            startup_tasks.Step('a', parallel('a'), after=['snapshot']),
+            startup_tasks.Step('b', parallel('b')),
+        ])
+
+        self.assertEqual(run.status, 'done')
+        self.assertEqual(order[-1], 'reconcile')
+        self.assertLess(order.index('snapshot'), order.index('a'))
+        steps = {s['name']: s for s in run.to_dict()['steps']}
+        self.assertEqual(steps['reconcile']['result'], {'checked': 3})
+        self.assertIsNotNone(steps['a']['duration_seconds'])
+
+    def test_failure_skips_dependents_and_is_persisted(self):
+        def boom(ctx):
+            raise RuntimeError('sonarr down')
+
+        run = self._run([
+            startup_tasks.Step('snapshot', boom),
+            startup_tasks.Step('migrate', lambda ctx: None, after=['snapshot']),
+            startup_tasks.Step('drift', lambda ctx: None, after=['migrate']),
+            startup_tasks.Step('delay_profile', lambda ctx: 'ok'),
+        ])
+
+        self.assertEqual(run.status, 'failed')
+        statuses = {s.name: s.status for s in run.steps}
+        self.assertEqual(statuses, {'snapshot': 'failed', 'migrate': 'skipped',
+                                    'drift': 'skipped', 'delay_profile': 'done'})
+
+        # A restarted worker sees the previous run
+        startup_tasks._current = None
+        status = startup_tasks.get_status()
+        self.assertEqual(status['previous']['run_id'], run.run_id)
+        self.assertEqual(status['previous']['steps'][0]['error'], 'sonarr down')
+
+    def test_second_process_is_skipped_while_lock_held(self):
+        with patch.object(startup_tasks, '_acquire_process_lock', return_value=None):
+            run = self._run([startup_tasks.Step('snapshot', lambda ctx: self.fail('ran'))])
+        self.assertEqual(run.status, 'skipped')
+        self.assertIsNone(startup_tasks._load_previous())
+
+
+if __name__ == '__main__':
+    unittest.main()
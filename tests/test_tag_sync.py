@@ -0,0 +1,103 @@
+"""
+Tests for tag_sync.py - batched rule-tag reconciliation through Sonarr's
+/api/v3/series/editor endpoint.
+
+Series lookups are passed in explicitly and the tag helpers in
+episeerr_utils plus http.put are patched - no Sonarr needed.
+
+Self-contained stdlib unittest, run with:
+    python3 -m unittest tests.test_tag_sync -v
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_IMPORT_TMPDIR = tempfile.mkdtemp(prefix='episeerr_tag_sync_import_')
+os.environ.setdefault('LOG_DIR', _IMPORT_TMPDIR)
+os.environ.setdefault('SETTINGS_DB_PATH', os.path.join(_IMPORT_TMPDIR, 'settings.db'))
+
+import episeerr_utils
+import tag_sync
+
+TAGS = {1: 'episeerr_default', 2: 'episeerr_binge', 3: 'episeerr_select', 9: '4k'}
+RULE_TAG_IDS = {'default': 1, 'binge': 2}
+
+
+def _lookup():
+    return {
+        10: {'id': 10, 'title': 'Severance', 'tags': [1, 9]},
+        11: {'id': 11, 'title': 'Andor', 'tags': [1]},
+        12: {'id': 12, 'title': 'Shogun', 'tags': [2, 3]},
+        13: {'id': 13, 'title': 'Slow Horses', 'tags': []},
+    }
+
+
+class TagSyncTestCase(unittest.TestCase):
+    def setUp(self):
+        self.puts = []
+        self.fail_remove = False
+        patches = [
+            patch.object(episeerr_utils, 'get_or_create_rule_tag_id', side_effect=RULE_TAG_IDS.get),
+            patch.object(episeerr_utils, 'get_tag_mapping', return_value=dict(TAGS)),
+            patch.object(episeerr_utils, 'get_sonarr_headers', return_value={}),
+            patch.object(tag_sync.http, 'put', side_effect=self._put),
+            patch.object(tag_sync.sonarr_client, 'invalidate'),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def _put(self, url, json=None, **kwargs):
+        self.puts.append(json)
+        response = MagicMock()
+        response.ok = not (self.fail_remove and json['applyTags'] == 'remove')
+        response.status_code = 200 if response.ok else 500
+        response.text = ''
+        return response
+
+    def test_assignments_are_grouped_into_editor_batches(self):
+        report = tag_sync.sync_rule_tags({10: 'binge', 11: 'binge', 12: 'binge', 99: 'binge'}, _lookup())
+
+        # 10 and 11 share one (add binge, remove default) diff; 12 is in sync
+        self.assertEqual(self.puts, [
+            {'seriesIds': [10, 11], 'tags': [1], 'applyTags': 'remove'},
+            {'seriesIds': [10, 11], 'tags': [2], 'applyTags': 'add'},
+        ])
+        self.assertEqual(report['series_updated'], 2)
+        self.assertEqual(report['series_in_sync'], 1)
+        self.assertEqual(report['not_found'], [99])
+        self.assertEqual(report['batches'], [
+            {'add': ['episeerr_binge'], 'remove': ['episeerr_default'], 'series_count': 2}])
+
+    def test_select_tag_kept_and_unknown_rule_skipped(self):
+        report = tag_sync.sync_rule_tags({12: 'default', 13: 'missing'}, _lookup(), dry_run=True)
+        self.assertEqual(self.puts, [])
+        self.assertEqual(report['skipped'], [13])
+        self.assertEqual(report['changes'], [
+            {'series_id': 12, 'title': 'Shogun', 'add': ['episeerr_default'], 'remove': ['episeerr_binge']}])
+
+    def test_failed_remove_skips_add(self):
+        self.fail_remove = True
+        report = tag_sync.sync_rule_tags({10: 'binge'}, _lookup())
+        self.assertEqual([p['applyTags'] for p in self.puts], ['remove'])
+        self.assertEqual(report['failed'], [10])
+        self.assertEqual(report['changes'], [])
+
+    def test_unassign_and_tag_removal(self):
+        tag_sync.sync_rule_tags({10: None, 12: None, 13: None}, _lookup())
+        self.assertEqual(self.puts, [
+            {'seriesIds': [10], 'tags': [1], 'applyTags': 'remove'},
+            {'seriesIds': [12], 'tags': [2, 3], 'applyTags': 'remove'},
+        ])
+
+        plan = tag_sync.plan_tag_removal(1, _lookup())
+        self.assertEqual(list(plan.groups().values()), [[10, 11]])
+
+
+if __name__ == '__main__':
+    unittest.main()
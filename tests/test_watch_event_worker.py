@@ -0,0 +1,175 @@
+"""
+Tests for watch_event_worker.py - the in-process pool that replaced the
+per-event `python3 media_processor.py` subprocess. submit_watch_event() must
+return a job id without waiting for processing, run the job on a pool
+thread, and only fall back to the subprocess path when
+watch_event_subprocess is set. Events for one series must run one at a
+time and coalesce to the furthest episode; different series run in
+parallel.
+
+Self-contained stdlib unittest, run with:
+    python3 -m unittest tests.test_watch_event_worker -v
+"""
+
+import os
+import sys
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import watch_event_worker
+
+PAYLOAD = {
+    'server_title': 'Test Show',
+    'server_season_num': 2,
+    'server_ep_num': 5,
+    'sonarr_series_id': 42,
+    'source': 'jellyfin',
+}
+
+
+class WatchEventWorkerTestCase(unittest.TestCase):
+    def _submit_and_wait(self, payload, settings=None, **patches):
+        done = threading.Event()
+        finished = {}
+
+        def on_complete(job):
+            finished['job'] = job
+            done.set()
+
+        with patch.object(watch_event_worker, '_load_settings', return_value=settings or {}):
+            with patch.multiple(watch_event_worker, **patches):
+                job_id = watch_event_worker.submit_watch_event(payload, on_complete=on_complete)
+                self.assertIsNotNone(job_id)
+                self.assertTrue(done.wait(5), "job never completed")
+        return job_id, finished['job']
+
+    def test_submit_returns_before_processing_finishes(self):
+        release = threading.Event()
+        done = threading.Event()
+
+        def slow(job):
+            release.wait(5)
+            return True
+
+        with patch.object(watch_event_worker, '_load_settings', return_value={}), \
+             patch.object(watch_event_worker, '_run_in_process', side_effect=slow):
+            job_id = watch_event_worker.submit_watch_event(PAYLOAD, on_complete=lambda j: done.set())
+            self.assertIn(watch_event_worker.get_job(job_id)['status'], ('queued', 'running'))
+            release.set()
+            self.assertTrue(done.wait(5))
+
+    def test_in_process_path_is_default(self):
+        calls = []
+        job_id, job = self._submit_and_wait(
+            PAYLOAD,
+            _run_in_process=lambda j: calls.append('in') or True,
+            _run_subprocess=lambda j: calls.append('sub') or True,
+        )
+        self.assertEqual(calls, ['in'])
+        self.assertEqual(job.status, 'done')
+        self.assertTrue(job.result)
+        self.assertEqual(watch_event_worker.get_job(job_id)['source'], 'jellyfin')
+
+    def test_subprocess_setting_keeps_isolated_path(self):
+        calls = []
+        _, job = self._submit_and_wait(
+            PAYLOAD,
+            settings={'watch_event_subprocess': True},
+            _run_in_process=lambda j: calls.append('in') or True,
+            _run_subprocess=lambda j: calls.append('sub') or True,
+        )
+        self.assertEqual(calls, ['sub'])
+
+    def test_failure_is_recorded_not_raised(self):
+        def boom(job):
+            raise RuntimeError("sonarr down")
+
+        _, job = self._submit_and_wait(PAYLOAD, _run_in_process=boom)
+        self.assertEqual(job.status, 'failed')
+        self.assertFalse(job.result)
+        self.assertIn('sonarr down', job.error)
+
+    def test_prefetch_payload_is_typed_as_prefetch(self):
+        _, job = self._submit_and_wait(dict(PAYLOAD, prefetch_only=True),
+                                       _run_in_process=lambda j: True)
+        self.assertEqual(job.kind, watch_event_worker.JOB_KIND_PREFETCH)
+
+    def test_same_series_backlog_coalesces_to_furthest_episode(self):
+        release = threading.Event()
+        ran = []
+
+        def run(job):
+            ran.append(job.payload['server_ep_num'])
+            if job.payload['server_ep_num'] == 1:
+                release.wait(5)
+            return True
+
+        done = threading.Event()
+        finished = []
+
+        def on_complete(job):
+            finished.append(job)
+            if len(finished) == 4:
+                done.set()
+
+        with patch.object(watch_event_worker, '_load_settings', return_value={}), \
+             patch.object(watch_event_worker, '_run_in_process', side_effect=run):
+            ids = [watch_event_worker.submit_watch_event(dict(PAYLOAD, server_ep_num=1), on_complete=on_complete)]
+            time.sleep(0.2)  # E1 is now running and blocking the lane
+            for ep in (3, 4, 2):
+                ids.append(watch_event_worker.submit_watch_event(dict(PAYLOAD, server_ep_num=ep),
+                                                                 on_complete=on_complete))
+            release.set()
+            self.assertTrue(done.wait(5))
+
+        self.assertEqual(ran, [1, 4])
+        statuses = {watch_event_worker.get_job(i)['episode']: watch_event_worker.get_job(i) for i in ids}
+        self.assertEqual(statuses['Test Show S2E3']['status'], 'coalesced')
+        self.assertEqual(statuses['Test Show S2E3']['coalesced_into'], ids[2])
+        self.assertTrue(statuses['Test Show S2E2']['result'])
+
+    def test_prefetch_behind_watched_is_dropped_but_later_prefetch_runs(self):
+        batch = [
+            watch_event_worker.WatchEventJob(dict(PAYLOAD, server_ep_num=3, prefetch_only=True)),
+            watch_event_worker.WatchEventJob(dict(PAYLOAD, server_ep_num=4)),
+            watch_event_worker.WatchEventJob(dict(PAYLOAD, server_ep_num=5, prefetch_only=True)),
+        ]
+        to_run, superseded = watch_event_worker._coalesce(batch)
+        self.assertEqual([j.payload['server_ep_num'] for j in to_run], [4, 5])
+        self.assertEqual(list(superseded), [batch[0]])
+
+        to_run, _ = watch_event_worker._coalesce(batch[:2])
+        self.assertEqual([j.kind for j in to_run], [watch_event_worker.JOB_KIND_WATCHED])
+
+    def test_different_series_run_in_parallel(self):
+        both_running = threading.Barrier(2, timeout=5)
+        results = []
+
+        def run(job):
+            both_running.wait()  # deadlocks (BrokenBarrierError) if serialized
+            return True
+
+        done = threading.Event()
+
+        def on_complete(job):
+            results.append(job.status)
+            if len(results) == 2:
+                done.set()
+
+        with patch.object(watch_event_worker, '_load_settings', return_value={}), \
+             patch.object(watch_event_worker, '_run_in_process', side_effect=run):
+            watch_event_worker.submit_watch_event(dict(PAYLOAD, sonarr_series_id=100), on_complete=on_complete)
+            watch_event_worker.submit_watch_event(dict(PAYLOAD, sonarr_series_id=200), on_complete=on_complete)
+            self.assertTrue(done.wait(5))
+        self.assertEqual(results, ['done', 'done'])
+
+    def test_unknown_job_id(self):
+        self.assertIsNone(watch_event_worker.get_job('nope'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,337 @@
+"""
+In-process watch-event worker pool.
+
+Every integration (Jellyfin, Emby, Plex, Tautulli and the legacy /webhook
+route) used to write a temp file and block on `python3 media_processor.py`
+for each watch event - a fresh interpreter re-importing requests, dotenv and
+settings_db and re-reading config from scratch, with the gthread worker that
+received the webhook held for the whole run. Integrations now hand the same
+payload dict to submit_watch_event(), which queues a job on a small
+long-lived pool and returns a job id straight away. The worker calls
+media_processor.process_webhook_payload() directly, which keeps main()'s
+held-automation gate.
+
+Jobs are dispatched per Sonarr series: events for one series run strictly
+in submission order on one worker at a time, different series run in
+parallel. Events that pile up behind a running one are coalesced - S2E3 and
+S2E4 queued together collapse to a single get/keep evaluation for S2E4 -
+so two viewers finishing the same show seconds apart can no longer race
+each other's load_config()/save_config() for that series.
+
+Set watch_event_subprocess in global settings to get the old per-event
+process isolation back; the subprocess then runs on a pool thread instead of
+the request thread. watch_event_workers (default 2) sizes the pool and is
+read once when the pool starts.
+"""
+
+import json
+import logging
+import os
+import queue
+import subprocess
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 2
+MAX_QUEUED_JOBS = 200
+MAX_JOB_HISTORY = 100
+
+JOB_KIND_WATCHED = 'watched'
+JOB_KIND_PREFETCH = 'prefetch'
+
+
+class WatchEventJob:
+    """One queued watch event.
+
+    status: queued -> running -> done | failed, or queued -> coalesced when a
+    later event for the same series made it redundant.
+    """
+
+    def __init__(self, payload, source=None, on_complete=None):
+        self.job_id = uuid.uuid4().hex[:12]
+        self.payload = dict(payload)
+        self.source = source or payload.get('source') or 'unknown'
+        self.kind = JOB_KIND_PREFETCH if payload.get('prefetch_only') else JOB_KIND_WATCHED
+        self.on_complete = on_complete
+        self.status = 'queued'
+        self.result = None
+        self.error = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.coalesced_into = None
+
+    def describe(self):
+        title = self.payload.get('server_title') or self.payload.get('plex_title') or '?'
+        season = self.payload.get('server_season_num') or self.payload.get('plex_season_num')
+        episode = self.payload.get('server_ep_num') or self.payload.get('plex_ep_num')
+        return f"{title} S{season}E{episode}"
+
+    def to_dict(self):
+        return {
+            'job_id': self.job_id,
+            'kind': self.kind,
+            'source': self.source,
+            'episode': self.describe(),
+            'status': self.status,
+            'result': self.result,
+            'error': self.error,
+            'submitted_at': self.submitted_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'coalesced_into': self.coalesced_into,
+        }
+
+
+# Per-series lanes. A series key is "claimed" from the moment it is put on
+# _ready until the worker that took it finds its lane empty, so at most one
+# worker ever runs a given series.
+_lanes = {}
+_claimed = set()
+_pending = 0
+_lanes_lock = threading.Lock()
+_ready = queue.Queue()
+_history = OrderedDict()
+_history_lock = threading.Lock()
+_workers = []
+_start_lock = threading.Lock()
+
+
+def _series_key(payload):
+    series_id = payload.get('sonarr_series_id')
+    if series_id:
+        return f"id:{series_id}"
+    title = payload.get('server_title') or payload.get('plex_title') or ''
+    return f"title:{title.strip().lower()}"
+
+
+def _position(job):
+    """(season, episode, submitted_at) - furthest episode wins, latest submission breaks ties."""
+    def _int(value):
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return 0
+    p = job.payload
+    season = p.get('server_season_num') or p.get('plex_season_num')
+    episode = p.get('server_ep_num') or p.get('plex_ep_num')
+    return (_int(season), _int(episode), job.submitted_at)
+
+
+def _coalesce(batch):
+    """Collapse a lane's backlog to the jobs worth running.
+
+    The furthest watched event runs (it covers every earlier episode's
+    get/keep evaluation). A playback-start prefetch only survives if it is
+    past that - prefetching an episode already watched stages nothing new.
+    Returns (to_run, superseded) where superseded maps job -> covering job.
+    """
+    watched = [j for j in batch if j.kind == JOB_KIND_WATCHED]
+    prefetch = [j for j in batch if j.kind == JOB_KIND_PREFETCH]
+
+    to_run = []
+    furthest_watched = max(watched, key=_position) if watched else None
+    if furthest_watched:
+        to_run.append(furthest_watched)
+    furthest_prefetch = max(prefetch, key=_position) if prefetch else None
+    if furthest_prefetch and (furthest_watched is None or
+                              _position(furthest_prefetch)[:2] > _position(furthest_watched)[:2]):
+        to_run.append(furthest_prefetch)
+
+    superseded = {}
+    for job in batch:
+        if job in to_run:
+            continue
+        if job.kind == JOB_KIND_WATCHED or furthest_prefetch not in to_run:
+            superseded[job] = furthest_watched
+        else:
+            superseded[job] = furthest_prefetch
+    return to_run, superseded
+
+
+def _load_settings():
+    try:
+        from media_processor import load_global_settings
+        return load_global_settings()
+    except Exception as e:
+        logger.error(f"Error loading global settings for watch-event worker: {e}")
+        return {}
+
+
+def _run_subprocess(job):
+    """The pre-pool path: temp file + `python3 media_processor.py <file>`."""
+    temp_dir = os.path.join(os.getcwd(), 'temp')
+    os.makedirs(temp_dir, exist_ok=True)
+    temp_path = os.path.join(temp_dir, f'data_from_server_{os.urandom(4).hex()}.json')
+    with open(temp_path, 'w') as fh:
+        json.dump(job.payload, fh)
+
+    try:
+        result = subprocess.run(
+            ["python3", os.path.join(os.getcwd(), "media_processor.py"), temp_path],
+            capture_output=True,
+            text=True,
+        )
+    finally:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+
+    if result.returncode != 0:
+        job.error = (result.stderr or '').strip() or f"rc={result.returncode}"
+        logger.error(f"media_processor failed for {job.describe()} (rc={result.returncode}): {result.stderr}")
+        return False
+    return True
+
+
+def _run_in_process(job):
+    # Resolved per job rather than at import: episeerr.reload_module_configs()
+    # swaps the media_processor module out when settings change.
+    import media_processor
+    return bool(media_processor.process_webhook_payload(job.payload))
+
+
+def _run_job(job):
+    job.status = 'running'
+    job.started_at = time.time()
+    try:
+        if _load_settings().get('watch_event_subprocess', False):
+            job.result = _run_subprocess(job)
+        else:
+            job.result = _run_in_process(job)
+        job.status = 'done' if job.error is None else 'failed'
+    except Exception as e:
+        job.status = 'failed'
+        job.result = False
+        job.error = str(e)
+        logger.error(f"Watch-event job {job.job_id} ({job.describe()}) failed: {e}", exc_info=True)
+    finally:
+        job.finished_at = time.time()
+
+    elapsed = job.finished_at - job.started_at
+    logger.info(f"Watch-event job {job.job_id} [{job.source}/{job.kind}] {job.describe()}: "
+                f"{job.status} in {elapsed:.2f}s")
+
+
+def _complete(job):
+    if job.on_complete:
+        try:
+            job.on_complete(job)
+        except Exception as e:
+            logger.error(f"Watch-event job {job.job_id} completion callback failed: {e}")
+
+
+def _run_batch(batch):
+    to_run, superseded = _coalesce(batch)
+    if superseded:
+        logger.info(f"Coalesced {len(superseded)} queued watch event(s) for {to_run[0].describe()}")
+
+    for job in to_run:
+        _run_job(job)
+
+    for job, covering in superseded.items():
+        job.status = 'coalesced'
+        job.coalesced_into = covering.job_id
+        job.result = covering.result
+        job.error = covering.error
+        job.started_at = covering.started_at
+        job.finished_at = covering.finished_at
+
+    for job in sorted(batch, key=lambda j: j.submitted_at):
+        _complete(job)
+
+
+def _worker_loop():
+    global _pending
+    while True:
+        key = _ready.get()
+        with _lanes_lock:
+            batch = list(_lanes.get(key, ()))
+            _lanes[key] = []
+            _pending -= len(batch)
+        try:
+            if batch:
+                _run_batch(batch)
+        except Exception as e:
+            logger.error(f"Watch-event dispatcher error for {key}: {e}", exc_info=True)
+        finally:
+            with _lanes_lock:
+                if _lanes.get(key):
+                    _ready.put(key)
+                else:
+                    _lanes.pop(key, None)
+                    _claimed.discard(key)
+
+
+def _ensure_started():
+    if _workers:
+        return
+    with _start_lock:
+        if _workers:
+            return
+        try:
+            count = max(1, int(_load_settings().get('watch_event_workers', DEFAULT_WORKERS)))
+        except (TypeError, ValueError):
+            count = DEFAULT_WORKERS
+        for i in range(count):
+            t = threading.Thread(target=_worker_loop, name=f"watch-event-{i}", daemon=True)
+            t.start()
+            _workers.append(t)
+        logger.info(f"Started {count} watch-event worker(s)")
+
+
+def _remember(job):
+    with _history_lock:
+        _history[job.job_id] = job
+        while len(_history) > MAX_JOB_HISTORY:
+            _history.popitem(last=False)
+
+
+def submit_watch_event(payload, source=None, on_complete=None):
+    """Queue a watch event for processing and return its job id.
+
+    payload is the dict the integrations used to write to temp/ for
+    media_processor (server_title / server_season_num / server_ep_num, plus
+    optional ids, sonarr_series_id and prefetch_only). on_complete(job) runs
+    on the worker thread once the job finishes - or once the job it was
+    coalesced into finishes. Returns None if the queue is full.
+    """
+    global _pending
+    _ensure_started()
+    job = WatchEventJob(payload, source=source, on_complete=on_complete)
+    key = _series_key(job.payload)
+    with _lanes_lock:
+        if _pending >= MAX_QUEUED_JOBS:
+            logger.error(f"Watch-event queue full ({MAX_QUEUED_JOBS}) - dropping {job.describe()}")
+            return None
+        _lanes.setdefault(key, []).append(job)
+        _pending += 1
+        if key not in _claimed:
+            _claimed.add(key)
+            _ready.put(key)
+    _remember(job)
+    logger.info(f"Queued watch-event job {job.job_id} [{job.source}/{job.kind}] {job.describe()}")
+    return job.job_id
+
+
+def get_job(job_id):
+    """Status dict for a recent job, or None if unknown / aged out."""
+    with _history_lock:
+        job = _history.get(job_id)
+    return job.to_dict() if job else None
+
+
+def get_status():
+    with _history_lock:
+        recent = [job.to_dict() for job in reversed(_history.values())]
+    return {
+        'workers': len(_workers),
+        'queued': _pending,
+        'active_series': len(_claimed),
+        'recent_jobs': recent,
+    }
@@ -2,20 +2,22 @@
 Sonarr and legacy Tautulli webhook handlers.
 
 Extracted from episeerr.py to keep the main module manageable.
-Circular-import risk: load_config / save_config / get_external_ids / search_tv_shows
-live in episeerr.py, so they are imported inside each function rather than at the
-top of the module (same pattern used by integrations/tautulli.py etc.).
+Circular-import risk: get_external_ids / search_tv_shows live in episeerr.py, so
+they are imported inside each function rather than at the top of the module
+(same pattern used by integrations/tautulli.py etc.). load_config / save_config
+come from config_store, which has no such dependency.
 """
 
 import os
 import json
 import time
-import subprocess
 
 from flask import Blueprint, request, jsonify, current_app
 
 import episeerr_utils
 import sonarr_utils
+import sonarr_client
+import dashboard_snapshots
 from episeerr_utils import http
 from settings_db import add_pending_request
 
@@ -41,6 +43,13 @@ def process_sonarr_webhook():
         event_type = json_data.get('eventType')
         current_app.logger.info(f"Sonarr webhook event type: {event_type}")
 
+        # Keep sonarr_client's shared snapshot in step with the library
+        event_series_id = (json_data.get('series') or {}).get('id')
+        if event_type in ('SeriesAdd', 'SeriesDelete'):
+            sonarr_client.invalidate(event_series_id)
+        elif event_type in ('Download', 'EpisodeFileDelete', 'Rename') and event_series_id:
+            sonarr_client.invalidate_episodes(event_series_id)
+
         if event_type == 'Grab':
             return handle_episode_grab(json_data)
 
@@ -105,7 +114,7 @@ def process_sonarr_webhook():
 
         # Tag resolution shared with reconcile.py's episeerr_delay sweep -
         # see episeerr_utils.resolve_rule_from_tags docstring.
-        from episeerr import load_config
+        from config_store import load_config
         config = load_config()
         assigned_rule, is_select_request = episeerr_utils.resolve_rule_from_tags(
             series_tags, tag_mapping, config
@@ -125,7 +134,7 @@ def process_sonarr_webhook():
 
             if global_settings.get('auto_assign_new_series', False):
                 if config is None:
-                    from episeerr import load_config
+                    from config_store import load_config
                     config = load_config()
                 default_rule_name = config.get('default_rule', 'default')
 
@@ -138,7 +147,7 @@ def process_sonarr_webhook():
                 series_dict = target_rule['series']
 
                 if series_id_str not in series_dict:
-                    from episeerr import save_config
+                    from config_store import save_config
                     series_dict[series_id_str] = {'activity_date': None}
                     save_config(config)
                     try:
@@ -274,7 +283,7 @@ def process_sonarr_webhook():
 
         # ─── Rule processing ─────────────────────────────────────────────
         if config is None:
-            from episeerr import load_config
+            from config_store import load_config
             config = load_config()
 
         current_app.logger.info(f"Applying rule: {assigned_rule}")
@@ -339,18 +348,12 @@ def handle_episode_grab(json_data):
         # ──────────────────────────────────────────────────────
         # 1. MARK AS CLEANED (stops grace checking)
         # ──────────────────────────────────────────────────────
-        from episeerr import load_config, save_config
-        config = load_config()
-
-        for rule_name, rule in config['rules'].items():
-            if str(series_id) in rule.get('series', {}):
-                series_data = rule['series'][str(series_id)]
-
-                if isinstance(series_data, dict):
-                    series_data['grace_cleaned'] = True
-                    save_config(config)
-                    current_app.logger.info(f"✓ Marked as cleaned in rule '{rule_name}'")
-                break
+        import config_store
+        rule_name, series_data = config_store.get_series_entry(series_id)
+        if rule_name and isinstance(series_data, dict):
+            series_data['grace_cleaned'] = True
+            config_store.set_series_entry(rule_name, series_id, series_data)
+            current_app.logger.info(f"✓ Marked as cleaned in rule '{rule_name}'")
 
         # ──────────────────────────────────────────────────────
         # 2. LOG DOWNLOAD FOR DASHBOARD (7-day rolling window)
@@ -400,6 +403,7 @@ def handle_episode_grab(json_data):
                 json.dump(downloads, f, indent=2)
 
             current_app.logger.info(f"📥 Logged download for dashboard: {series_title} S{season_num}E{episode_num}")
+            dashboard_snapshots.invalidate('calendar')
 
         except Exception as e:
             current_app.logger.error(f"Error logging download for dashboard: {e}")
@@ -470,7 +474,7 @@ def handle_server_webhook():
 
         # ─── Tag sync & drift correction BEFORE processing ───
         from media_processor import get_series_id
-        from episeerr import load_config, save_config
+        from config_store import load_config, save_config
 
         series_id = get_series_id(series_title, thetvdb_id, themoviedb_id)
         final_rule = None
@@ -482,10 +486,6 @@ def handle_server_webhook():
             if modified:
                 save_config(config)
 
-        # ─── Original temp file creation ───
-        temp_dir = os.path.join(os.getcwd(), 'temp')
-        os.makedirs(temp_dir, exist_ok=True)
-
         plex_data = {
             "server_title": series_title,
             "server_season_num": season_number,
@@ -496,34 +496,38 @@ def handle_server_webhook():
             "rule": final_rule
         }
 
-        temp_file_path = os.path.join(temp_dir, 'data_from_server.json')
-        with open(temp_file_path, 'w') as f:
-            json.dump(plex_data, f)
-
-        # ─── Original subprocess call ───
-        result = subprocess.run(
-            ["python3", os.path.join(os.getcwd(), "media_processor.py")],
-            capture_output=True,
-            text=True
-        )
-
-        if result.returncode != 0:
-            current_app.logger.error(f"media_processor.py failed with return code {result.returncode}")
-            if result.stderr:
-                current_app.logger.error(f"Error output: {result.stderr}")
-        else:
-            current_app.logger.info("media_processor.py completed successfully")
-            if result.stderr:
-                current_app.logger.info(f"Processor output: {result.stderr}")
+        # ─── Hand off to the watch-event worker pool ───
+        from watch_event_worker import submit_watch_event
+        job_id = submit_watch_event(plex_data, source='tautulli')
+        if not job_id:
+            current_app.logger.error("Could not queue webhook for processing")
+            return jsonify({'status': 'error', 'message': 'watch-event queue full'}), 503
 
-        current_app.logger.info("Webhook processing completed - activity tracked, next content processed")
-        return jsonify({'status': 'success'}), 200
+        current_app.logger.info(f"Webhook queued for processing (job {job_id})")
+        return jsonify({'status': 'success', 'job_id': job_id}), 200
 
     except Exception as e:
         current_app.logger.error(f"Failed to process Tautulli webhook: {str(e)}")
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
 
+@sonarr_webhooks_bp.route('/api/watch-events', methods=['GET'])
+def watch_event_status():
+    """Watch-event worker pool status and recently finished jobs."""
+    import watch_event_worker
+    return jsonify(watch_event_worker.get_status()), 200
+
+
+@sonarr_webhooks_bp.route('/api/watch-events/<job_id>', methods=['GET'])
+def watch_event_job_status(job_id):
+    """Status of a single queued watch-event job (job_id from the webhook response)."""
+    import watch_event_worker
+    job = watch_event_worker.get_job(job_id)
+    if job is None:
+        return jsonify({'status': 'error', 'message': 'Unknown job id'}), 404
+    return jsonify(job), 200
+
+
 # ============================================================================
 # RADARR WEBHOOK
 # ============================================================================
@@ -587,7 +591,7 @@ def _handle_movie_added(data):
             return jsonify({'status': 'success', 'message': 'Movie already tagged'}), 200
 
         # Look up default movie rule
-        from episeerr import load_config
+        from config_store import load_config
         config = load_config()
         default_movie_rule = config.get('default_movie_rule')
         movie_rules = config.get('movie_rules', {})